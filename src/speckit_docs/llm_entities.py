@@ -66,14 +66,14 @@ class LLMSection:
     This entity is specifically for LLM transform workflow.
 
     Attributes:
-        file: File name (README.md or QUICKSTART.md)
-        heading: Heading text (e.g., "## Installation")
+        file: File name (README.md, QUICKSTART.md or spec.md)
+        heading: Heading text (e.g., "Installation")
         level: Heading level (h2 or h3)
         content: Section body content
-        token_count: Token count (estimated as len(content) // 4)
+        token_count: Token count (estimated by llm_transform.estimate_token_count)
     """
 
-    file: Literal["README.md", "QUICKSTART.md"]
+    file: Literal["README.md", "QUICKSTART.md", "spec.md"]
     heading: str
     level: Literal["h2", "h3"]
     content: str
@@ -111,12 +111,16 @@ class SectionPriorityResult:
         total_sections: Total number of sections
         included_sections: Number of sections included within 10,000 token limit
         excluded_sections: List of sections excluded due to token limit
+        token_budget: Token limit the sections were packed into
+        included_tokens: Total token count of the included sections
     """
 
     prioritized_sections: list[PrioritizedSection]
     total_sections: int
     included_sections: int
     excluded_sections: list[LLMSection]
+    token_budget: int = 10000
+    included_tokens: int = 0
 
     def __post_init__(self) -> None:
         """Validation rules."""
@@ -126,6 +130,17 @@ class SectionPriorityResult:
                 f"included_sections ({self.included_sections}) + "
                 f"excluded_sections ({len(self.excluded_sections)})"
             )
+        if self.token_budget < 1:
+            raise ValueError(f"token_budget must be >= 1, got {self.token_budget}")
+        if not (0 <= self.included_tokens <= self.token_budget):
+            raise ValueError(
+                f"included_tokens must be in range 0-{self.token_budget}: {self.included_tokens}"
+            )
+
+    @property
+    def utilization(self) -> float:
+        """Fraction of the token budget used by the included sections (0.0-1.0)."""
+        return self.included_tokens / self.token_budget
 
 
 @dataclass(frozen=True)
@@ -283,3 +298,42 @@ class SectionPriority:
             raise ValueError(f"priority must be >= 1, got {self.priority}")
         if self.token_count < 1:
             raise ValueError(f"token_count must be >= 1, got {self.token_count}")
+
+
+# LLM call types (one per request builder in speckit_docs.utils.llm_transform)
+LLMCallType = Literal["audience", "classify", "inconsistency", "priority", "transform"]
+
+
+@dataclass(frozen=True)
+class LLMUsage:
+    """Token usage of a single LLM call, including prompt cache counters.
+
+    Attributes:
+        call_type: Kind of call (audience, classify, inconsistency, priority, transform)
+        model: Model that served the call
+        input_tokens: Uncached input tokens
+        output_tokens: Output tokens
+        cache_creation_input_tokens: Input tokens written to the prompt cache
+        cache_read_input_tokens: Input tokens read from the prompt cache
+        ttft_seconds: Time to first token (streamed calls only)
+        latency_seconds: Wall-clock time of the call, including retries and backoff
+            (None for Message Batches API results)
+        retries: Attempts beyond the first
+        feature: Key of the feature the call was made for (e.g. "001-user-auth")
+    """
+
+    call_type: LLMCallType
+    model: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_creation_input_tokens: int = 0
+    cache_read_input_tokens: int = 0
+    ttft_seconds: float | None = None
+    latency_seconds: float | None = None
+    retries: int = 0
+    feature: str | None = None
+
+    @property
+    def total_input_tokens(self) -> int:
+        """All input tokens (uncached + cache write + cache read)."""
+        return self.input_tokens + self.cache_creation_input_tokens + self.cache_read_input_tokens
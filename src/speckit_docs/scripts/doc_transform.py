@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+"""
+doc_transform.py - Run LLM transformation for all features concurrently
+
+This script can be executed by /doc-update (Step 1) to produce the
+--transformed-content JSON file consumed by doc_update.py.
+
+FR-022b: LLM transformation workflow (Step 1.1-1.3)
+FR-038e: LLM transform cache reuse for unchanged features
+
+--batch submits all requests through the Message Batches API (for overnight
+full regenerations: lower price, no interactive latency).
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import typer
+from rich.console import Console
+
+# Import from parent package
+try:
+    from speckit_docs.exceptions import SpecKitDocsError
+    from speckit_docs.utils.cache import LLMTransformCache, TransformCache
+    from speckit_docs.utils.cache_journal import JournalTransformCache, migrate_json_to_journal
+    from speckit_docs.utils.cache_mmap import MappedTransformCache, migrate_json_to_mapped
+    from speckit_docs.utils.cache_sqlite import (
+        DEFAULT_MAX_BYTES,
+        BlobCodec,
+        SQLiteTransformCache,
+        migrate_json_cache,
+    )
+    from speckit_docs.utils.feature_discovery import FeatureDiscoverer
+    from speckit_docs.utils.git import ChangeDetector
+    from speckit_docs.utils.llm_batch import MessageBatchRunner, run_batch_transform
+    from speckit_docs.utils.llm_engine import (
+        DEFAULT_MAX_CONCURRENCY,
+        referenced_cache_keys,
+        run_transform_engine,
+    )
+    from speckit_docs.utils.llm_memo import LLMCallMemo, set_llm_memo
+    from speckit_docs.utils.llm_ratelimit import AdaptiveRateLimiter, set_rate_limiter
+    from speckit_docs.utils.llm_resilience import ResilientCaller, RetryBudget, set_resilient_caller
+    from speckit_docs.utils.llm_routing import (
+        ModelRoutingPolicy,
+        parse_model_overrides,
+        set_model_routing,
+    )
+    from speckit_docs.utils.llm_session import LLMSessionConfig, configure_llm_session
+    from speckit_docs.utils.llm_singleflight import SingleFlight, set_single_flight
+    from speckit_docs.utils.llm_telemetry import JSONLTelemetrySink
+    from speckit_docs.utils.llm_tokens import (
+        AnthropicTokenCounter,
+        MemoizedTokenCounter,
+        set_token_counter,
+    )
+    from speckit_docs.utils.llm_transform import DEFAULT_MODEL, get_anthropic_client
+    from speckit_docs.utils.llm_usage import usage_recorder
+    from speckit_docs.utils.section_delta import SectionDeltaStats
+    from speckit_docs.utils.transform_packing import TransformPackStats
+except ImportError:
+    # When running as script directly, try relative imports
+    import os
+
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+    from speckit_docs.exceptions import SpecKitDocsError
+    from speckit_docs.utils.cache import LLMTransformCache, TransformCache
+    from speckit_docs.utils.cache_journal import JournalTransformCache, migrate_json_to_journal
+    from speckit_docs.utils.cache_mmap import MappedTransformCache, migrate_json_to_mapped
+    from speckit_docs.utils.cache_sqlite import (
+        DEFAULT_MAX_BYTES,
+        BlobCodec,
+        SQLiteTransformCache,
+        migrate_json_cache,
+    )
+    from speckit_docs.utils.feature_discovery import FeatureDiscoverer
+    from speckit_docs.utils.git import ChangeDetector
+    from speckit_docs.utils.llm_batch import MessageBatchRunner, run_batch_transform
+    from speckit_docs.utils.llm_engine import (
+        DEFAULT_MAX_CONCURRENCY,
+        referenced_cache_keys,
+        run_transform_engine,
+    )
+    from speckit_docs.utils.llm_memo import LLMCallMemo, set_llm_memo
+    from speckit_docs.utils.llm_ratelimit import AdaptiveRateLimiter, set_rate_limiter
+    from speckit_docs.utils.llm_resilience import ResilientCaller, RetryBudget, set_resilient_caller
+    from speckit_docs.utils.llm_routing import (
+        ModelRoutingPolicy,
+        parse_model_overrides,
+        set_model_routing,
+    )
+    from speckit_docs.utils.llm_session import LLMSessionConfig, configure_llm_session
+    from speckit_docs.utils.llm_singleflight import SingleFlight, set_single_flight
+    from speckit_docs.utils.llm_telemetry import JSONLTelemetrySink
+    from speckit_docs.utils.llm_tokens import (
+        AnthropicTokenCounter,
+        MemoizedTokenCounter,
+        set_token_counter,
+    )
+    from speckit_docs.utils.llm_transform import DEFAULT_MODEL, get_anthropic_client
+    from speckit_docs.utils.llm_usage import usage_recorder
+    from speckit_docs.utils.section_delta import SectionDeltaStats
+    from speckit_docs.utils.transform_packing import TransformPackStats
+
+app = typer.Typer()
+console = Console()
+
+CACHE_FILE = Path(".claude") / ".cache" / "llm-transforms.json"
+SQLITE_CACHE_FILE = Path(".claude") / ".cache" / "llm-transforms.sqlite3"
+JOURNAL_CACHE_FILE = Path(".claude") / ".cache" / "llm-transforms.journal"
+MAPPED_CACHE_FILE = Path(".claude") / ".cache" / "llm-transforms.data"
+MEMO_FILE = Path(".claude") / ".cache" / "llm-analysis.json"
+TELEMETRY_FILE = Path(".claude") / ".cache" / "llm-telemetry.jsonl"
+
+
+def open_transform_cache(
+    backend: str,
+    max_bytes: int | None = None,
+    ttl_seconds: float | None = None,
+    codec: BlobCodec = "zlib",
+    store_original: bool = False,
+) -> TransformCache:
+    """Open the LLM transform cache of a storage backend.
+
+    The first time the SQLite cache, the journal or the mapped cache is
+    created, the entries of an existing JSON cache are migrated into it (the
+    JSON file is kept). The bounds and blob options apply to the SQLite
+    cache only; store_original to every backend but JSON.
+
+    Args:
+        backend: "sqlite", "journal", "mmap" or "json"
+        max_bytes: Byte cap of the stored blobs (None: unbounded)
+        ttl_seconds: Expire entries unused for this long (None: no TTL)
+        codec: Compression of new blobs
+        store_original: Store original contents, not only their hashes
+
+    Returns:
+        Loaded cache
+    """
+    if backend == "json":
+        json_cache = LLMTransformCache(CACHE_FILE)
+        json_cache.load_cache()
+        return json_cache
+
+    if backend == "journal":
+        created = not JOURNAL_CACHE_FILE.exists()
+        journal_cache = JournalTransformCache(JOURNAL_CACHE_FILE, store_original=store_original)
+        journal_cache.load_cache()
+        if created and CACHE_FILE.exists():
+            migrated = migrate_json_to_journal(CACHE_FILE, journal_cache)
+            console.print(f"[dim]  変換キャッシュを移行しました: {CACHE_FILE} → {JOURNAL_CACHE_FILE}（{migrated} 件）[/dim]")
+        return journal_cache
+
+    if backend == "mmap":
+        created = not MAPPED_CACHE_FILE.exists()
+        mapped_cache = MappedTransformCache(MAPPED_CACHE_FILE, store_original=store_original)
+        mapped_cache.load_cache()
+        if created and CACHE_FILE.exists():
+            migrated = migrate_json_to_mapped(CACHE_FILE, mapped_cache)
+            mapped_cache.save_cache()
+            console.print(f"[dim]  変換キャッシュを移行しました: {CACHE_FILE} → {MAPPED_CACHE_FILE}（{migrated} 件）[/dim]")
+        return mapped_cache
+
+    created = not SQLITE_CACHE_FILE.exists()
+    cache = SQLiteTransformCache(
+        SQLITE_CACHE_FILE,
+        max_bytes=max_bytes,
+        ttl_seconds=ttl_seconds,
+        codec=codec,
+        store_original=store_original,
+    )
+    cache.load_cache()
+    if created and CACHE_FILE.exists():
+        migrated = migrate_json_cache(CACHE_FILE, cache)
+        console.print(f"[dim]  変換キャッシュを移行しました: {CACHE_FILE} → {SQLITE_CACHE_FILE}（{migrated} 件）[/dim]")
+    return cache
+
+
+@app.command()
+def main(
+    output: Path = typer.Option(
+        ..., "--output", help="Path of the JSON file to write (input of doc_update --transformed-content)"
+    ),
+    quick: bool = typer.Option(
+        False, "--quick/--no-quick", help="Quick mode: only transform changed features"
+    ),
+    concurrency: int = typer.Option(
+        DEFAULT_MAX_CONCURRENCY, "--concurrency", min=1, help="Upper bound of concurrent LLM requests (adapted below it on rate limits)"
+    ),
+    batch: bool = typer.Option(
+        False, "--batch/--no-batch", help="Use the Message Batches API (waits until the batch has ended)"
+    ),
+    poll_interval: float = typer.Option(
+        30.0, "--poll-interval", min=0.0, help="Seconds between batch status polls (--batch only)"
+    ),
+    max_connections: int = typer.Option(
+        20, "--max-connections", min=1, help="Size of the shared HTTP connection pool for LLM calls"
+    ),
+    stream: bool = typer.Option(
+        False, "--stream/--no-stream", help="Stream analysis responses (early abort on inconsistency, TTFT)"
+    ),
+    retry_budget: int = typer.Option(
+        100, "--retry-budget", min=0, help="Total retries of transient LLM API errors allowed for this run"
+    ),
+    speculative: bool = typer.Option(
+        False, "--speculative/--no-speculative", help="Prioritize sections in parallel with inconsistency detection"
+    ),
+    memo: bool = typer.Option(
+        True, "--memo/--no-memo", help="Reuse analysis results (inconsistency, priority, classification) for unchanged inputs"
+    ),
+    exact_tokens: bool = typer.Option(
+        False, "--exact-tokens/--approx-tokens", help="Count tokens with the count-tokens API instead of the offline estimate"
+    ),
+    base_url: str | None = typer.Option(
+        None, "--base-url", envvar="ANTHROPIC_BASE_URL", help="Anthropic API base URL (e.g. a local llm_fake_server)"
+    ),
+    tiering: bool = typer.Option(
+        True, "--tiering/--no-tiering", help="Route classification and audience detection to a fast model"
+    ),
+    model: list[str] = typer.Option(
+        [], "--model", help="Model of a call type, as <call_type>=<model> (repeatable)"
+    ),
+    section_delta: bool = typer.Option(
+        True, "--section-delta/--no-section-delta", help="Re-transform only the changed sections of spec.md extracts"
+    ),
+    map_reduce: bool = typer.Option(
+        True, "--map-reduce/--no-map-reduce", help="Transform spec.md extracts over 10,000 tokens in chunks instead of failing"
+    ),
+    pack: bool = typer.Option(
+        True, "--pack/--no-pack", help="Send small spec.md transformations of several features in one request"
+    ),
+    cache_backend: str = typer.Option(
+        "sqlite", "--cache-backend", help="Storage of the LLM transform cache: sqlite, journal, mmap or json"
+    ),
+    cache_max_mb: float | None = typer.Option(
+        None, "--cache-max-mb", min=0.0, help="Size cap of the SQLite cache in MB; least recently used entries are evicted (default: 64, 0: unbounded)"
+    ),
+    cache_ttl_days: float | None = typer.Option(
+        None, "--cache-ttl-days", min=0.0, help="Evict SQLite cache entries unused for this many days (default: 0, no TTL)"
+    ),
+    cache_codec: str | None = typer.Option(
+        None, "--cache-codec", help="Compression of SQLite cache blobs: zlib (default) or lzma"
+    ),
+    cache_debug: bool = typer.Option(
+        False, "--cache-debug/--no-cache-debug", help="Store original contents in the cache, not only their hashes (not with --cache-backend json)"
+    ),
+    gc: bool = typer.Option(
+        True, "--gc/--no-gc", help="Drop cache entries no current feature refers to (full runs only)"
+    ),
+) -> int:
+    """Transform feature content with the LLM and write the transformed-content JSON.
+
+    Args:
+        output: Output JSON file path
+        quick: Enable quick mode (only transform changed features using Git diff)
+        concurrency: Upper bound of concurrent features / LLM requests
+        batch: Submit requests through the Message Batches API
+        poll_interval: Seconds between batch status polls
+        max_connections: Size of the shared HTTP connection pool
+        stream: Stream analysis responses (interactive mode only)
+        retry_budget: Total retries allowed for this run
+        speculative: Run prioritization speculatively (interactive mode only)
+        memo: Memoize analysis calls in .claude/.cache/llm-analysis.json
+        exact_tokens: Use the count-tokens API for the 10,000-token gates
+        base_url: API base URL override (default: the Anthropic API)
+        tiering: Send audience/classify calls to the fast model (see llm_routing)
+        model: Per-call-type model overrides ("<call_type>=<model>")
+        section_delta: Cache spec.md transforms per section (interactive mode only)
+        map_reduce: Map-reduce transformation of long spec.md extracts (interactive mode only)
+        pack: Pack small spec.md transformations across features (interactive mode only)
+        cache_backend: LLM transform cache storage ("sqlite": .claude/.cache/llm-transforms.sqlite3,
+            migrated from llm-transforms.json on first use; "journal": append-only
+            llm-transforms.journal, migrated likewise; "mmap": llm-transforms.data with the
+            memory-mapped index llm-transforms.idx, migrated likewise; "json": llm-transforms.json)
+        cache_max_mb: Byte cap of the SQLite cache (LRU eviction)
+        cache_ttl_days: Age cap of SQLite cache entries since their last use
+        cache_codec: Blob compression of the SQLite cache
+        cache_debug: Keep original contents in the SQLite, journal or mapped cache
+        gc: Drop cache entries of deleted features and outdated content (skipped with quick)
+
+    The SQLite-only options are rejected with another --cache-backend
+    rather than ignored. Every LLM call of the run is appended to
+    .claude/.cache/llm-telemetry.jsonl (summarized by doc_update).
+    """
+    if cache_backend not in ("sqlite", "journal", "mmap", "json"):
+        console.print(f"[red]✗[/red] 不明なキャッシュ形式です: {cache_backend}", style="bold")
+        console.print("  💡 --cache-backend には sqlite、journal、mmap または json を指定してください。")
+        return 1
+    unsupported = [
+        flag
+        for flag, given in (
+            ("--cache-max-mb", cache_max_mb is not None),
+            ("--cache-ttl-days", cache_ttl_days is not None),
+            ("--cache-codec", cache_codec is not None),
+            ("--cache-debug", cache_debug and cache_backend == "json"),
+        )
+        if given and cache_backend != "sqlite"
+    ]
+    if unsupported:
+        console.print(
+            f"[red]✗[/red] {'、'.join(unsupported)} は --cache-backend {cache_backend} では使用できません。",
+            style="bold",
+        )
+        console.print("  💡 --cache-backend sqlite を指定するか、これらのオプションを外してください。")
+        return 1
+    if cache_codec not in (None, "zlib", "lzma"):
+        console.print(f"[red]✗[/red] 不明な圧縮形式です: {cache_codec}", style="bold")
+        console.print("  💡 --cache-codec には zlib または lzma を指定してください。")
+        return 1
+    codec: BlobCodec = cache_codec or "zlib"  # type: ignore[assignment]
+
+    # Telemetry of the previous run is replaced, not accumulated
+    TELEMETRY_FILE.unlink(missing_ok=True)
+    telemetry_sink = JSONLTelemetrySink(TELEMETRY_FILE)
+    usage_recorder.add_listener(telemetry_sink)
+    try:
+        configure_llm_session(
+            LLMSessionConfig(
+                max_connections=max_connections,
+                max_keepalive_connections=min(10, max_connections),
+                base_url=base_url,
+            )
+        )
+        routing = ModelRoutingPolicy() if tiering else ModelRoutingPolicy.single_model()
+        set_model_routing(routing.with_overrides(parse_model_overrides(model)))
+        caller = ResilientCaller(budget=RetryBudget(max_retries=retry_budget))
+        set_resilient_caller(caller)
+        # AIMD: start low, grow while calls succeed, halve on 429 (never above --concurrency)
+        limiter = AdaptiveRateLimiter(initial_limit=min(4, concurrency), max_limit=concurrency)
+        set_rate_limiter(limiter)
+        analysis_memo = LLMCallMemo(MEMO_FILE) if memo else None
+        if analysis_memo is not None:
+            analysis_memo.load()
+        set_llm_memo(analysis_memo)
+        # Identical requests in flight at the same time (shared boilerplate) are sent once
+        single_flight = SingleFlight()
+        set_single_flight(single_flight)
+        if exact_tokens:
+            set_token_counter(MemoizedTokenCounter(AnthropicTokenCounter(get_anthropic_client(), DEFAULT_MODEL)))
+
+        console.print("\n[bold]機能を検出中...[/bold]")
+        features = FeatureDiscoverer().discover_features()
+
+        if quick:
+            try:
+                changed_features = ChangeDetector().get_changed_features()
+                changed_keys = {f"{f.id}-{f.name}" for f in changed_features}
+                features = [f for f in features if f"{f.id}-{f.name}" in changed_keys]
+            except Exception:
+                console.print(
+                    "[yellow]Note:[/yellow] Git履歴が見つかりません。フル更新にフォールバックします。"
+                )
+
+        if not features:
+            console.print("[green]✓[/green] 変換対象の機能がありません。")
+            output.write_text("{}", encoding="utf-8")
+            return 0
+
+        cache = open_transform_cache(
+            cache_backend,
+            max_bytes=DEFAULT_MAX_BYTES if cache_max_mb is None else int(cache_max_mb * 1024 * 1024) or None,
+            ttl_seconds=(cache_ttl_days or 0.0) * 86400 or None,
+            codec=codec,
+            store_original=cache_debug,
+        )
+        # Collecting walks every feature (and counts tokens with --exact-tokens):
+        # full runs only, so that --quick stays proportional to the changes
+        collected = cache.collect_garbage(referenced_cache_keys(features, map_reduce)) if gc and not quick else 0
+        delta_stats = SectionDeltaStats()
+        pack_stats = TransformPackStats()
+
+        if batch:
+            console.print(f"[green]✓[/green] {len(features)} 個の機能を変換します（バッチモード）")
+            console.print("\n[bold]Message Batches APIでLLM変換を実行中...[/bold]")
+            client = get_anthropic_client()
+            runner = MessageBatchRunner(client, poll_interval_seconds=poll_interval)
+            try:
+                batch_result = run_batch_transform(features, client, cache=cache, runner=runner)
+            finally:
+                # Keep every succeeded result, even when another request failed
+                cache.save_cache()
+                if analysis_memo is not None:
+                    analysis_memo.save()
+            content_map = batch_result.content_map
+            console.print(
+                f"[dim]  バッチ: {', '.join(batch_result.batch_ids) or 'なし'}、"
+                f"キャッシュ再利用: {batch_result.cached_features}件[/dim]"
+            )
+        else:
+            console.print(
+                f"[green]✓[/green] {len(features)} 個の機能を変換します（同時実行数: {concurrency}）"
+            )
+            console.print("\n[bold]LLM変換を実行中...[/bold]")
+            try:
+                content_map = run_transform_engine(
+                    features,
+                    max_concurrency=concurrency,
+                    cache=cache,
+                    stream=stream,
+                    speculative=speculative,
+                    section_delta=section_delta,
+                    delta_stats=delta_stats,
+                    map_reduce=map_reduce,
+                    pack=pack,
+                    pack_stats=pack_stats,
+                )
+            finally:
+                if analysis_memo is not None:
+                    analysis_memo.save()
+            cache.save_cache()
+
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(content_map, f, indent=2, ensure_ascii=False)
+
+        console.print(f"[green]✓[/green] {len(content_map)} 件の変換済みコンテンツを保存しました: {output}")
+        totals = usage_recorder.totals()
+        if totals["calls"]:
+            console.print(
+                f"[dim]  トークン使用量: 入力 {totals['input_tokens']}、出力 {totals['output_tokens']}、"
+                f"キャッシュ書込 {totals['cache_creation_input_tokens']}、"
+                f"キャッシュ読込 {totals['cache_read_input_tokens']}（{totals['calls']} 回呼び出し）[/dim]"
+            )
+        ttfts = sorted(u.ttft_seconds for u in usage_recorder.records() if u.ttft_seconds is not None)
+        if ttfts:
+            console.print(
+                f"[dim]  最初のトークンまでの時間（TTFT）: 中央値 {ttfts[len(ttfts) // 2]:.2f}秒、"
+                f"最大 {ttfts[-1]:.2f}秒（ストリーミング {len(ttfts)} 回）[/dim]"
+            )
+        if analysis_memo is not None and analysis_memo.hits:
+            console.print(
+                f"[dim]  分析結果の再利用: {analysis_memo.hits} 件（API呼び出し {analysis_memo.misses} 件）[/dim]"
+            )
+        if delta_stats.delta_documents:
+            console.print(
+                f"[dim]  セクション単位の差分変換: {delta_stats.delta_documents} 件"
+                f"（再利用 {delta_stats.sections_reused} セクション、送信 {delta_stats.sections_sent} セクション）[/dim]"
+            )
+        if collected:
+            console.print(f"[dim]  変換キャッシュの整理: 参照されないエントリ {collected} 件を削除[/dim]")
+        if isinstance(cache, SQLiteTransformCache) and cache.evicted:
+            console.print(
+                f"[dim]  変換キャッシュの上限: {cache.evicted} 件を削除"
+                f"（保存サイズ {cache.stored_bytes() / 1024 / 1024:.1f} MB）[/dim]"
+            )
+        if isinstance(cache, MappedTransformCache) and cache.compactions:
+            console.print(f"[dim]  変換キャッシュのデータファイルを圧縮しました（{len(cache)} 件）[/dim]")
+        if isinstance(cache, JournalTransformCache) and cache.compactions:
+            console.print(f"[dim]  変換キャッシュのジャーナルを圧縮しました（{cache.records} 件）[/dim]")
+        if pack_stats.packed_requests:
+            console.print(
+                f"[dim]  小さな変換のまとめ送信: {pack_stats.packed_documents} 件を "
+                f"{pack_stats.packed_requests} リクエストで変換（個別に再送 {pack_stats.fallback_documents} 件）[/dim]"
+            )
+        if single_flight.shared:
+            console.print(f"[dim]  重複リクエストの共有: {single_flight.shared} 件[/dim]")
+        if limiter.rate_limited:
+            console.print(
+                f"[dim]  レート制限: 429 を {limiter.rate_limited} 回受信、"
+                f"最終同時実行数 {limiter.limit}、事前待機合計 {limiter.throttle_seconds:.1f}秒[/dim]"
+            )
+        if caller.metrics.retries:
+            reasons = ", ".join(f"{k}: {v}" for k, v in sorted(caller.metrics.retries_by_reason.items()))
+            console.print(
+                f"[dim]  リトライ: {caller.metrics.retries} 回（{reasons}）、"
+                f"待機合計 {caller.metrics.backoff_seconds:.1f}秒[/dim]"
+            )
+        return 0
+
+    except SpecKitDocsError as e:
+        console.print(f"[red]✗[/red] {e.message}", style="bold")
+        console.print(f"  💡 {e.suggestion}")
+        return 1
+    except Exception as e:
+        console.print(f"[red]✗[/red] 予期しないエラーが発生しました: {e}", style="bold")
+        return 1
+    finally:
+        usage_recorder.remove_listener(telemetry_sink)
+
+
+if __name__ == "__main__":
+    sys.exit(app())
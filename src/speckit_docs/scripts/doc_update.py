@@ -13,6 +13,9 @@ FR-019: Incremental update
 FR-020: Update summary display
 FR-038f: LLM-transformed content integration (T071-T074)
 FR-038g: Skip LLM transformation option (T072)
+
+The summary ends with the telemetry of the last doc_transform run
+(latency percentiles, tokens, estimated cost, slowest features).
 """
 
 import json
@@ -30,6 +33,7 @@ try:
     from speckit_docs.models import GeneratorTool, StructureType
     from speckit_docs.utils.feature_discovery import FeatureDiscoverer
     from speckit_docs.utils.git import ChangeDetector
+    from speckit_docs.utils.llm_telemetry import load_telemetry, summarize, summarize_by_model
 except ImportError:
     # When running as script directly, try relative imports
     import os
@@ -41,10 +45,39 @@ except ImportError:
     from speckit_docs.models import GeneratorTool, StructureType
     from speckit_docs.utils.feature_discovery import FeatureDiscoverer
     from speckit_docs.utils.git import ChangeDetector
+    from speckit_docs.utils.llm_telemetry import load_telemetry, summarize, summarize_by_model
 
 app = typer.Typer()
 console = Console()
 
+# Written by doc_transform.py (one JSON line per LLM call)
+TELEMETRY_FILE = Path(".claude") / ".cache" / "llm-telemetry.jsonl"
+
+
+def print_telemetry_summary(telemetry_file: Path = TELEMETRY_FILE) -> None:
+    """Print the LLM call telemetry of the last doc_transform run, if any."""
+    records = load_telemetry(telemetry_file)
+    if not records:
+        return
+    summary = summarize(records)
+    if summary.p50_latency is not None and summary.p95_latency is not None:
+        console.print(
+            f"[dim]  レイテンシ: p50 {summary.p50_latency:.2f}秒、p95 {summary.p95_latency:.2f}秒"
+            f"（{summary.calls} 回呼び出し、リトライ {summary.retries} 回）[/dim]"
+        )
+    console.print(
+        f"[dim]  トークン合計: {summary.total_tokens}、推定コスト: ${summary.estimated_cost:.4f}[/dim]"
+    )
+    if summary.slowest_features:
+        slowest = "、".join(f"{key} ({seconds:.1f}秒)" for key, seconds in summary.slowest_features)
+        console.print(f"[dim]  処理時間の長い機能: {slowest}[/dim]")
+    for stats in summarize_by_model(records):
+        latency = f"p50 {stats.p50_latency:.2f}秒、" if stats.p50_latency is not None else ""
+        console.print(
+            f"[dim]  モデル {stats.model}（{', '.join(stats.call_types)}）: {stats.calls} 回、{latency}"
+            f"平均出力 {stats.mean_output_tokens:.0f} トークン、推定コスト ${stats.estimated_cost:.4f}[/dim]"
+        )
+
 
 @app.command()
 def main(
@@ -188,6 +221,7 @@ def main(
         else:
             # Default mode: show success and failure counts
             console.print(f"\n[bold]LLM変換:[/bold] 成功{successful_count}件、失敗{failed_count}件")
+        print_telemetry_summary()
 
         return 0
 
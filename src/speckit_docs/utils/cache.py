@@ -5,12 +5,22 @@ incremental updates. Transformations are cached using MD5 hashes of original con
 and stored in JSON format.
 
 Implements FR-038e (Git diff integration with cache reuse for unchanged features).
+
+Storage backends implement the TransformCache protocol: LLMTransformCache
+(one JSON file, loaded and rewritten as a whole) and SQLiteTransformCache
+in speckit_docs.utils.cache_sqlite (one row per entry, for large caches and
+concurrent runs). The transform engines store entries under the versioned
+keys of speckit_docs.utils.cache_keys (content hash plus model, prompt and
+schema version); the backends treat a key as an opaque string, except that
+collect_garbage() compares keys by cache_key_identity().
 """
 
 import hashlib
 import json
+from collections.abc import Iterable
 from datetime import datetime
 from pathlib import Path
+from typing import Protocol
 
 
 def compute_content_hash(content: str) -> str:
@@ -29,6 +39,57 @@ def compute_content_hash(content: str) -> str:
     return hashlib.md5(content.encode("utf-8")).hexdigest()
 
 
+def cache_key_identity(key: str) -> str:
+    """Transform type and content hash of a versioned cache key.
+
+    Garbage collection compares keys by identity: an entry stored by another
+    model, prompt or schema version of a current source is left to eviction
+    (e.g. a single run with ``--model transform=...`` must not drop the
+    entries of the default model). Keys not in the versioned format
+    ("<transform_type>:<model>:<prompt_version>:v<schema_version>:<content_hash>")
+    are their own identity.
+
+    Args:
+        key: Cache key
+
+    Returns:
+        "<transform_type>:<content_hash>", or the key itself
+
+    Example:
+        >>> cache_key_identity("spec_section:claude-sonnet-4-5:0f3a9c21:v1:65a8e27d")
+        'spec_section:65a8e27d'
+    """
+    if key.count(":") < 4:
+        return key
+    return f"{key.split(':', 1)[0]}:{key.rsplit(':', 1)[1]}"
+
+
+class TransformCache(Protocol):
+    """Storage of LLM transformations keyed by content hash."""
+
+    def load_cache(self) -> None:
+        """Open the cache (before the first lookup)."""
+        ...
+
+    def save_cache(self) -> None:
+        """Persist the entries set since load_cache()."""
+        ...
+
+    def get_cached_transform(self, content_hash: str) -> str | None:
+        """Transformed content cached under content_hash, or None."""
+        ...
+
+    def set_cached_transform(
+        self, content_hash: str, original_content: str, transformed_content: str
+    ) -> None:
+        """Cache transformed content under content_hash."""
+        ...
+
+    def collect_garbage(self, referenced: Iterable[str]) -> int:
+        """Drop the entries whose key identity is not referenced; return how many were dropped."""
+        ...
+
+
 class LLMTransformCache:
     """LLM transform cache manager (T064).
 
@@ -118,3 +179,21 @@ class LLMTransformCache:
             "transformed_content": transformed_content,
             "timestamp": datetime.now().isoformat(),
         }
+
+    def collect_garbage(self, referenced: Iterable[str]) -> int:
+        """Drop the entries of deleted features and outdated content.
+
+        Entries are compared by cache_key_identity(): one referenced under
+        another model, prompt or schema version is kept.
+
+        Args:
+            referenced: Cache keys of the current features (see llm_engine.referenced_cache_keys())
+
+        Returns:
+            Number of entries dropped (persisted by the next save_cache())
+        """
+        keep = {cache_key_identity(key) for key in referenced}
+        stale = [content_hash for content_hash in self._cache if cache_key_identity(content_hash) not in keep]
+        for content_hash in stale:
+            del self._cache[content_hash]
+        return len(stale)
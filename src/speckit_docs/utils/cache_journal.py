@@ -0,0 +1,349 @@
+"""Append-only journal storage of the LLM transform cache.
+
+LLMTransformCache rewrites the whole llm-transforms.json on every
+save_cache(), which costs O(cache size), and an interrupted run loses every
+transform set since the last save. JournalTransformCache keeps the
+LLMTransformCache in-memory layout and API but persists writes as a JSON
+Lines journal (llm-transforms.journal):
+
+- One record per write: set_cached_transform() appends a "set" record,
+  collect_garbage() one "del" record per dropped entry. Like the SQLite
+  cache, a record keeps the original content only as its SHA-256
+  (``original_hash``) unless ``store_original`` (debug mode) is set
+- Crash safety: each record is written to the file as soon as it is set
+  (one write() of a complete line), so an interrupted run keeps every
+  transform already paid for. fsync is batched: every ``sync_every``
+  records, after ``sync_interval_seconds``, and on save_cache()
+- Replay: load_cache() applies the records in order (the last record of a
+  key wins). A torn last record from a crash is cut off; other unreadable
+  lines are skipped
+- Compaction: superseded and deleted records stay in the journal until
+  compact() rewrites it with one record per live entry (temporary file,
+  fsync, atomic rename). save_cache() compacts once the dead-record ratio
+  reaches ``compact_ratio``
+
+Like the JSON file, a journal has a single writer; concurrent runs should
+use the SQLite backend (cache_sqlite).
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from speckit_docs.utils.cache import LLMTransformCache, cache_key_identity
+from speckit_docs.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_SYNC_EVERY = 32
+DEFAULT_SYNC_INTERVAL_SECONDS = 1.0
+# Compact when at least this share of the records is superseded or deleted
+DEFAULT_COMPACT_RATIO = 0.5
+# ... and the journal holds at least this many records (small journals are cheap to replay)
+DEFAULT_COMPACT_MIN_RECORDS = 64
+
+
+def _encode(record: dict[str, Any]) -> bytes:
+    return (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def hash_original(original_content: str) -> str:
+    """Stored form of an original content outside debug mode (SHA-256 hex digest)."""
+    return hashlib.sha256(original_content.encode("utf-8")).hexdigest()
+
+
+def fsync_directory(directory: Path) -> None:
+    """Persist a rename in directory (not supported on every platform)."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class JournalTransformCache(LLMTransformCache):
+    """LLM transform cache persisted as an append-only journal.
+
+    Attributes:
+        records: Records in the journal (live and dead)
+        compactions: Compactions done since load_cache()
+
+    Example:
+        >>> cache = JournalTransformCache(Path(".claude/.cache/llm-transforms.journal"))
+        >>> cache.load_cache()
+        >>> cache.set_cached_transform(key, "original", "transformed")  # on disk now
+        >>> cache.save_cache()  # fsync, compact if needed
+    """
+
+    def __init__(
+        self,
+        journal_file: Path,
+        sync_every: int = DEFAULT_SYNC_EVERY,
+        sync_interval_seconds: float = DEFAULT_SYNC_INTERVAL_SECONDS,
+        compact_ratio: float = DEFAULT_COMPACT_RATIO,
+        compact_min_records: int = DEFAULT_COMPACT_MIN_RECORDS,
+        store_original: bool = False,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            journal_file: Journal path (typically .claude/.cache/llm-transforms.journal)
+            sync_every: fsync after this many unsynced records (>= 1)
+            sync_interval_seconds: fsync a record written this long after the last fsync
+            compact_ratio: Dead-record ratio from which save_cache() compacts (0 < ratio <= 1)
+            compact_min_records: Journal size from which save_cache() compacts
+            store_original: Store the original content for debugging (default: False)
+            clock: Time source of the sync interval
+
+        Raises:
+            ValueError: If sync_every or compact_ratio is out of range
+        """
+        if sync_every < 1:
+            raise ValueError(f"sync_every must be >= 1, got {sync_every}")
+        if not 0 < compact_ratio <= 1:
+            raise ValueError(f"compact_ratio must be in (0, 1], got {compact_ratio}")
+        super().__init__(journal_file)
+        self.sync_every = sync_every
+        self.sync_interval_seconds = sync_interval_seconds
+        self.compact_ratio = compact_ratio
+        self.compact_min_records = compact_min_records
+        self.store_original = store_original
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._fd: int | None = None
+        self._unsynced = 0
+        self._last_sync = clock()
+        self.records = 0
+        self.compactions = 0
+
+    @property
+    def dead_records(self) -> int:
+        """Records superseded by a later record or deleted."""
+        return self.records - len(self._cache)
+
+    def load_cache(self) -> None:
+        """Replay the journal into memory.
+
+        A missing journal is an empty cache. A last record without its
+        newline (a write torn by a crash) is truncated, so that the next
+        record starts on a fresh line.
+        """
+        with self._lock:
+            self._close()
+            self._cache = {}
+            self.records = 0
+            try:
+                data = self._cache_file.read_bytes()
+            except FileNotFoundError:
+                return
+            except OSError as e:
+                logger.warning("Unreadable cache journal %s: %s", self._cache_file, e)
+                return
+
+            valid_end = 0
+            offset = 0
+            for line in data.splitlines(keepends=True):
+                offset += len(line)
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                    self._apply(record)
+                except (ValueError, KeyError, TypeError):
+                    logger.warning("Skipping unreadable cache journal record at byte %d", offset - len(line))
+                self.records += 1
+                valid_end = offset
+
+            if valid_end < len(data):
+                logger.warning("Truncating torn cache journal record: %s", self._cache_file)
+                with open(self._cache_file, "r+b") as f:
+                    f.truncate(valid_end)
+
+    def _original_fields(self, record: dict[str, Any]) -> dict[str, str]:
+        """original_content (debug mode) or original_hash of a record or JSON entry.
+
+        Outside debug mode an original content (from a journal written with
+        ``store_original`` or from a JSON cache) is reduced to its hash, so
+        the next compaction drops it from the journal.
+        """
+        if "original_content" not in record:
+            return {"original_hash": str(record["original_hash"])}
+        original_content = str(record["original_content"])
+        if self.store_original:
+            return {"original_content": original_content}
+        return {"original_hash": hash_original(original_content)}
+
+    def _apply(self, record: dict[str, Any]) -> None:
+        """Apply one replayed record to the in-memory cache."""
+        if record["op"] == "set":
+            self._cache[record["key"]] = {
+                **self._original_fields(record),
+                "transformed_content": str(record["transformed_content"]),
+                "timestamp": str(record["timestamp"]),
+            }
+        elif record["op"] == "del":
+            self._cache.pop(record["key"], None)
+        else:
+            raise ValueError(f"unknown journal op: {record['op']!r}")
+
+    def save_cache(self) -> None:
+        """fsync the records written since the last fsync; compact when needed.
+
+        Records are on disk as soon as they are set; save_cache() only makes
+        them durable and bounds the dead records.
+        """
+        with self._lock:
+            self._sync()
+            if self.records >= self.compact_min_records and self.dead_records >= self.compact_ratio * self.records:
+                self._compact()
+
+    def set_cached_transform(
+        self, content_hash: str, original_content: str, transformed_content: str
+    ) -> None:
+        """Cache a transformation and append its record to the journal.
+
+        Args:
+            content_hash: Cache key of the transformation
+            original_content: Original content (stored as a hash unless store_original)
+            transformed_content: LLM-transformed content
+        """
+        entry = {
+            **self._original_fields({"original_content": original_content}),
+            "transformed_content": transformed_content,
+            "timestamp": datetime.now().isoformat(),
+        }
+        with self._lock:
+            self._append([{"op": "set", "key": content_hash, **entry}])
+            self._cache[content_hash] = entry
+
+    def collect_garbage(self, referenced: Iterable[str]) -> int:
+        """Drop the entries whose key identity is not referenced (one "del" record each).
+
+        Entries are compared by cache_key_identity(), like LLMTransformCache.
+
+        Args:
+            referenced: Cache keys of the current features (see llm_engine.referenced_cache_keys())
+
+        Returns:
+            Number of entries dropped
+        """
+        keep = {cache_key_identity(key) for key in referenced}
+        with self._lock:
+            stale = [content_hash for content_hash in self._cache if cache_key_identity(content_hash) not in keep]
+            if stale:
+                self._append([{"op": "del", "key": content_hash} for content_hash in stale])
+            for content_hash in stale:
+                del self._cache[content_hash]
+        return len(stale)
+
+    def compact(self) -> None:
+        """Rewrite the journal with one record per live entry."""
+        with self._lock:
+            self._compact()
+
+    def close(self) -> None:
+        """fsync pending records and close the journal."""
+        with self._lock:
+            self._close()
+
+    def _open(self) -> int:
+        if self._fd is None:
+            self._cache_file.parent.mkdir(parents=True, exist_ok=True)
+            self._fd = os.open(self._cache_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        return self._fd
+
+    def _close(self) -> None:
+        if self._fd is not None:
+            self._sync()
+            os.close(self._fd)
+            self._fd = None
+
+    def _append(self, records: list[dict[str, Any]]) -> None:
+        """Write complete records (caller holds the lock); fsync when a batch is due."""
+        data = b"".join(_encode(record) for record in records)
+        fd = self._open()
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+        self.records += len(records)
+        self._unsynced += len(records)
+        if (
+            self._unsynced >= self.sync_every
+            or self._clock() - self._last_sync >= self.sync_interval_seconds
+        ):
+            self._sync()
+
+    def _sync(self) -> None:
+        if self._fd is not None and self._unsynced:
+            os.fsync(self._fd)
+        self._unsynced = 0
+        self._last_sync = self._clock()
+
+    def _compact(self) -> None:
+        """Replace the journal by a snapshot of the live entries (caller holds the lock)."""
+        self._close()
+        self._cache_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = self._cache_file.with_name(self._cache_file.name + ".tmp")
+        with open(temp_file, "wb") as f:
+            for content_hash, entry in self._cache.items():
+                f.write(_encode({"op": "set", "key": content_hash, **entry}))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, self._cache_file)
+        fsync_directory(self._cache_file.parent)
+        self.records = len(self._cache)
+        self.compactions += 1
+
+
+def migrate_json_to_journal(json_file: Path, cache: JournalTransformCache) -> int:
+    """Import the entries of a JSON cache file (LLMTransformCache) into a journal.
+
+    Entries already in the journal are kept; entries without transformed
+    content are skipped. Original contents are imported as hashes unless
+    the cache stores originals. The JSON file is left untouched.
+
+    Args:
+        json_file: JSON cache file (typically .claude/.cache/llm-transforms.json)
+        cache: Destination cache (loaded)
+
+    Returns:
+        Number of entries imported (0 if the file is missing or not valid JSON)
+    """
+    try:
+        with open(json_file, encoding="utf-8") as f:
+            entries = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return 0
+    if not isinstance(entries, dict):
+        return 0
+
+    records = []
+    with cache._lock:
+        for content_hash, entry in entries.items():
+            if content_hash in cache._cache:
+                continue
+            if not isinstance(entry, dict) or not isinstance(entry.get("transformed_content"), str):
+                continue
+            imported = {
+                **cache._original_fields({"original_content": entry.get("original_content", "")}),
+                "transformed_content": entry["transformed_content"],
+                "timestamp": str(entry.get("timestamp", datetime.now().isoformat())),
+            }
+            records.append({"op": "set", "key": content_hash, **imported})
+            cache._cache[content_hash] = imported
+        if records:
+            cache._append(records)
+            cache._sync()
+    return len(records)
@@ -0,0 +1,120 @@
+"""Versioned keys of the LLM transform cache.
+
+compute_content_hash() only hashes the source text. After a model change, a
+prompt edit or a speckit-docs upgrade changing the stored output, stale
+transformations were served until the whole cache was deleted (and every
+feature paid for again). Cache keys are therefore composite, in the style
+of llm_memo.memo_key():
+
+    "<transform_type>:<model>:<prompt_version>:v<schema_version>:<content_hash>"
+
+- transform type: "spec_md_extraction" (spec.md extract), "section_priority"
+  (README.md + QUICKSTART.md pair) or "spec_section" (h2/h3 section of a
+  spec.md extract, see section_delta)
+- model: model the call type of the transformation is routed to (model_for())
+- prompt version: hash of the prompt templates and response schema of the
+  transform type
+- schema version: TRANSFORM_SCHEMA_VERSION
+- content hash: compute_content_hash() of the source
+
+Changing one component changes the keys of the affected transform type
+only; the other entries stay valid. TransformCache.collect_garbage()
+compares keys by transform type and content hash only
+(cache.cache_key_identity()): it drops the entries of deleted features and
+changed content, while entries under another model, prompt or schema
+version are left to eviction (LRU/TTL of the SQLite backend), so that a
+run with another model routing does not drop the default entries.
+"""
+
+import hashlib
+import json
+from collections.abc import Mapping
+from typing import Literal
+
+from speckit_docs.llm_entities import LLMCallType
+from speckit_docs.utils.llm_routing import model_for
+from speckit_docs.utils.llm_schemas import INCONSISTENCY_SCHEMA, SECTION_PRIORITY_SCHEMA
+from speckit_docs.utils.llm_transform import (
+    INCONSISTENCY_DETECTION_PROMPT,
+    INCONSISTENCY_DETECTION_USER_TEMPLATE,
+    SECTION_PRIORITY_PROMPT,
+    SECTION_PRIORITY_USER_TEMPLATE,
+    SPEC_MERGE_PROMPT,
+    SPEC_MERGE_USER_TEMPLATE,
+    SPEC_TRANSFORM_PROMPT,
+    SPEC_TRANSFORM_USER_TEMPLATE,
+)
+from speckit_docs.utils.transform_packing import (
+    SPEC_PACK_TRANSFORM_PROMPT,
+    SPEC_PACK_TRANSFORM_USER_TEMPLATE,
+)
+
+# Bump when the stored transformed content changes incompatibly (e.g. the
+# assembly in build_integrated_result() or the section splitting)
+TRANSFORM_SCHEMA_VERSION = 1
+
+CachedTransformType = Literal["spec_md_extraction", "section_priority", "spec_section"]
+
+# Call type whose routed model produces each transform type
+_CALL_TYPES: Mapping[CachedTransformType, LLMCallType] = {
+    "spec_md_extraction": "transform",
+    "section_priority": "priority",
+    "spec_section": "transform",
+}
+
+_SPEC_TEMPLATES = (
+    SPEC_TRANSFORM_PROMPT,
+    SPEC_TRANSFORM_USER_TEMPLATE,
+    SPEC_MERGE_PROMPT,
+    SPEC_MERGE_USER_TEMPLATE,
+    SPEC_PACK_TRANSFORM_PROMPT,
+    SPEC_PACK_TRANSFORM_USER_TEMPLATE,
+)
+
+# Everything besides the source that shapes the output of each transform type
+_PROMPT_TEMPLATES: dict[CachedTransformType, tuple[str, ...]] = {
+    "spec_md_extraction": _SPEC_TEMPLATES,
+    "section_priority": (
+        INCONSISTENCY_DETECTION_PROMPT,
+        INCONSISTENCY_DETECTION_USER_TEMPLATE,
+        json.dumps(INCONSISTENCY_SCHEMA, sort_keys=True),
+        SECTION_PRIORITY_PROMPT,
+        SECTION_PRIORITY_USER_TEMPLATE,
+        json.dumps(SECTION_PRIORITY_SCHEMA, sort_keys=True),
+    ),
+    "spec_section": _SPEC_TEMPLATES,
+}
+
+
+def transform_prompt_version(transform_type: CachedTransformType) -> str:
+    """Version of the prompts of a transform type (hash of its templates)."""
+    digest = hashlib.sha256()
+    for template in _PROMPT_TEMPLATES[transform_type]:
+        digest.update(template.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()[:16]
+
+
+def transform_cache_key(transform_type: CachedTransformType, content_hash: str) -> str:
+    """Cache key of a transformation.
+
+    Args:
+        transform_type: Kind of transformation
+        content_hash: compute_content_hash() of the source
+
+    Returns:
+        Key string "<transform_type>:<model>:<prompt_version>:v<schema_version>:<content_hash>"
+
+    Example:
+        >>> transform_cache_key("spec_md_extraction", compute_content_hash(extract))
+        'spec_md_extraction:claude-3-5-sonnet-20241022:3f1c...:v1:65a8e27d...'
+    """
+    return ":".join(
+        [
+            transform_type,
+            model_for(_CALL_TYPES[transform_type]),
+            transform_prompt_version(transform_type),
+            f"v{TRANSFORM_SCHEMA_VERSION}",
+            content_hash,
+        ]
+    )
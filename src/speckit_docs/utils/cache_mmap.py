@@ -0,0 +1,559 @@
+"""Memory-mapped hash index storage of the LLM transform cache.
+
+LLMTransformCache and JournalTransformCache read the whole cache into
+memory before the first lookup. With a cache of hundreds of megabytes,
+that load dominates the startup of an incremental run that looks up a
+handful of changed features. MappedTransformCache splits the cache into
+two files:
+
+- Data file (llm-transforms.data): append-only records, each a JSON
+  payload (key, transformed content, timestamp, and the SHA-256 of the
+  original content, or the original itself with ``store_original``)
+  framed by its length and CRC-32
+- Index file (llm-transforms.idx): an open-addressing hash table of
+  fixed-size slots (key digest, record offset and length), at most half
+  full. The 16-byte digest is the 8-byte BLAKE2b hash of the key followed
+  by that of its cache_key_identity(), so that garbage collection reads
+  no record
+
+load_cache() mmaps the index and reads no record. get_cached_transform()
+probes the mapped table and reads one record, whose key and CRC are
+checked, so startup costs about the same whatever the cache size.
+
+Writes append a record to the data file at once (an interrupted run keeps
+every transform it set) and go to an in-memory overlay. save_cache()
+fsyncs the data file and writes a new index (temporary file, fsync, atomic
+rename). Records appended after the last index write are recovered by
+scanning the data file tail on the next load_cache(). An index that does
+not belong to the data file (missing, corrupted or from before a
+compaction) is rebuilt by scanning the whole data file.
+
+Superseded and deleted records stay in the data file until compact()
+rewrites it with the live records only. save_cache() compacts once the
+dead share of the data reaches ``compact_ratio``. Like the journal, the
+files have a single writer; concurrent runs should use the SQLite backend
+(cache_sqlite).
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+import zlib
+from collections.abc import Iterable
+from datetime import datetime
+from pathlib import Path
+from types import TracebackType
+from typing import Any, BinaryIO
+
+from speckit_docs.utils.cache import cache_key_identity
+from speckit_docs.utils.cache_journal import fsync_directory, hash_original
+from speckit_docs.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Data file header: magic, data id (shared with the index of this data file)
+_DATA_HEADER = struct.Struct("<8s8s")
+_DATA_MAGIC = b"SKDCDAT1"
+# Record header: payload length, CRC-32 of the payload
+_RECORD = struct.Struct("<II")
+# Index header: magic, data id, slot count, entry count, indexed data size, live record bytes
+_INDEX_HEADER = struct.Struct("<8s8sQQQQ")
+_INDEX_MAGIC = b"SKDCIDX2"
+# Index slot: key digest, record offset, record length (0: empty slot)
+_SLOT = struct.Struct("<16sQI4x")
+
+MIN_INDEX_SLOTS = 64
+# Compact when at least this share of the data file is superseded or deleted records
+DEFAULT_COMPACT_RATIO = 0.5
+# ... and the data file holds at least this many bytes of records
+DEFAULT_COMPACT_MIN_BYTES = 1024 * 1024
+
+# Location of a record in the data file: (offset, length)
+_Location = tuple[int, int]
+
+
+def _identity_digest(key: str) -> bytes:
+    return hashlib.blake2b(cache_key_identity(key).encode("utf-8"), digest_size=8).digest()
+
+
+def _key_digest(key: str) -> bytes:
+    """Hash of the key (home slot) followed by the hash of its identity (garbage collection)."""
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest() + _identity_digest(key)
+
+
+def _index_slots(entries: int) -> int:
+    """Power-of-two slot count keeping the table at most half full."""
+    slots = MIN_INDEX_SLOTS
+    while slots < 2 * entries:
+        slots *= 2
+    return slots
+
+
+def _home_slot(digest: bytes, slot_count: int) -> int:
+    return int.from_bytes(digest[:8], "little") & (slot_count - 1)
+
+
+def _encode_record(payload: dict[str, str]) -> bytes:
+    data = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return _RECORD.pack(len(data), zlib.crc32(data)) + data
+
+
+def _decode_record(raw: bytes) -> dict[str, Any] | None:
+    """Payload of a framed record, or None if it is truncated or corrupted."""
+    if len(raw) < _RECORD.size:
+        return None
+    size, crc = _RECORD.unpack_from(raw)
+    data = raw[_RECORD.size :]
+    if len(data) != size or zlib.crc32(data) != crc:
+        return None
+    try:
+        payload = json.loads(data)
+    except ValueError:
+        return None
+    return payload if isinstance(payload, dict) and isinstance(payload.get("key"), str) else None
+
+
+class MappedTransformCache:
+    """LLM transform cache with an mmap'ed on-disk hash index.
+
+    Attributes:
+        data_file: Record file
+        index_file: Hash index file
+        compact_ratio: Dead share of the data file from which save_cache() compacts
+        compact_min_bytes: Data file size from which save_cache() compacts
+        compactions: Compactions done since load_cache()
+        rebuilt: Whether load_cache() had to rebuild the index from the data file
+
+    Example:
+        >>> with MappedTransformCache(Path(".claude/.cache/llm-transforms.data")) as cache:
+        ...     cache.get_cached_transform(key)  # probes the index, reads one record
+        ...     cache.set_cached_transform(key, "original", "transformed")
+        ...     cache.save_cache()
+    """
+
+    def __init__(
+        self,
+        data_file: Path,
+        index_file: Path | None = None,
+        compact_ratio: float = DEFAULT_COMPACT_RATIO,
+        compact_min_bytes: int = DEFAULT_COMPACT_MIN_BYTES,
+        store_original: bool = False,
+    ) -> None:
+        """Initialize the cache (files are opened by load_cache()).
+
+        Args:
+            data_file: Record file (typically .claude/.cache/llm-transforms.data)
+            index_file: Hash index file (default: data_file with the suffix .idx)
+            compact_ratio: Dead share from which save_cache() compacts (0 < ratio <= 1)
+            compact_min_bytes: Data file size from which save_cache() compacts
+            store_original: Store the original content for debugging (default: False)
+
+        Raises:
+            ValueError: If compact_ratio is out of range
+        """
+        if not 0 < compact_ratio <= 1:
+            raise ValueError(f"compact_ratio must be in (0, 1], got {compact_ratio}")
+        self.data_file = data_file
+        self.index_file = index_file if index_file is not None else data_file.with_suffix(".idx")
+        self.compact_ratio = compact_ratio
+        self.compact_min_bytes = compact_min_bytes
+        self.store_original = store_original
+        self.compactions = 0
+        self.rebuilt = False
+        self._lock = threading.Lock()
+        self._reader: BinaryIO | None = None
+        self._fd: int | None = None
+        self._data_id = b""
+        self._data_size = 0
+        self._index: mmap.mmap | None = None
+        self._slot_count = 0
+        self._indexed_size = 0
+        # Changes since the index was written (None: deleted)
+        self._pending: dict[bytes, _Location | None] = {}
+
+    def __enter__(self) -> "MappedTransformCache":
+        self.load_cache()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def load_cache(self) -> None:
+        """Open the data file and map the index (no record is read).
+
+        Records appended after the last index write are recovered from the
+        data file tail; a torn last record is truncated and a corrupted record
+        in the middle is skipped. A data file with an
+        unknown header is moved aside (``<name>.corrupt``) and an empty cache
+        is created in its place, like a corrupted JSON cache (CHK028).
+        """
+        with self._lock:
+            self._close()
+            self._pending = {}
+            self._ensure_open()
+
+    def save_cache(self) -> None:
+        """fsync the new records and write the index (compacting when needed).
+
+        Records are in the data file as soon as they are set; save_cache()
+        makes them durable and indexes them for the next load_cache().
+        """
+        with self._lock:
+            if self._reader is None or (not self._pending and not self.rebuilt):
+                return
+            assert self._fd is not None
+            os.fsync(self._fd)
+            entries = self._entries()
+            record_bytes = self._data_size - _DATA_HEADER.size
+            dead_bytes = record_bytes - sum(length for _, length in entries.values())
+            if record_bytes >= self.compact_min_bytes and dead_bytes >= self.compact_ratio * record_bytes:
+                self._compact(entries)
+            else:
+                self._write_index(entries)
+            self.rebuilt = False
+
+    def get_cached_transform(self, content_hash: str) -> str | None:
+        """Transformed content cached under a key (one record read), or None.
+
+        Args:
+            content_hash: Cache key
+
+        Returns:
+            Transformed content if cached, None if cache miss
+        """
+        with self._lock:
+            self._ensure_open()
+            location = self._find(_key_digest(content_hash))
+            payload = self._read(location) if location is not None else None
+        if payload is None or payload["key"] != content_hash:
+            return None
+        transformed = payload.get("transformed_content")
+        return transformed if isinstance(transformed, str) else None
+
+    def set_cached_transform(
+        self, content_hash: str, original_content: str, transformed_content: str
+    ) -> None:
+        """Append a record for a transformation.
+
+        Args:
+            content_hash: Cache key
+            original_content: Original content (stored as a hash unless store_original)
+            transformed_content: LLM-transformed content
+        """
+        original = (
+            {"original_content": original_content}
+            if self.store_original
+            else {"original_hash": hash_original(original_content)}
+        )
+        record = _encode_record(
+            {
+                "key": content_hash,
+                **original,
+                "transformed_content": transformed_content,
+                "timestamp": datetime.now().isoformat(),
+            }
+        )
+        with self._lock:
+            self._ensure_open()
+            assert self._fd is not None
+            offset = self._data_size
+            view = memoryview(record)
+            while view:
+                view = view[os.write(self._fd, view) :]
+            self._data_size += len(record)
+            self._pending[_key_digest(content_hash)] = (offset, len(record))
+
+    def collect_garbage(self, referenced: Iterable[str]) -> int:
+        """Drop the entries of deleted features and outdated content.
+
+        Entries are compared by cache_key_identity(), like LLMTransformCache,
+        on the identity half of the key digests: no record is read.
+
+        Args:
+            referenced: Cache keys of the current features (see llm_engine.referenced_cache_keys())
+
+        Returns:
+            Number of entries dropped (persisted by the next save_cache())
+        """
+        keep = {_identity_digest(key) for key in referenced}
+        with self._lock:
+            self._ensure_open()
+            stale = [digest for digest in self._entries() if digest[8:] not in keep]
+            for digest in stale:
+                self._pending[digest] = None
+        return len(stale)
+
+    def compact(self) -> None:
+        """Rewrite the data file with the live records only, and re-index it."""
+        with self._lock:
+            self._ensure_open()
+            self._compact(self._entries())
+
+    def data_bytes(self) -> int:
+        """Size of the data file."""
+        with self._lock:
+            self._ensure_open()
+            return self._data_size
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._ensure_open()
+            return len(self._entries())
+
+    def close(self) -> None:
+        """Close the files (unsaved changes stay unindexed until the next load_cache())."""
+        with self._lock:
+            self._close()
+
+    def _ensure_open(self) -> None:
+        """Open the files unless they are open (caller holds the lock)."""
+        if self._reader is None:
+            self._open_data()
+            mapped = self._map_index()
+            self.rebuilt = not mapped and self._data_size > _DATA_HEADER.size
+            self._scan(self._indexed_size if mapped else _DATA_HEADER.size)
+
+    def _open_data(self) -> None:
+        """Open (or create) the data file and read its header."""
+        self.data_file.parent.mkdir(parents=True, exist_ok=True)
+        header = b""
+        if self.data_file.exists():
+            with open(self.data_file, "rb") as f:
+                header = f.read(_DATA_HEADER.size)
+        if header and (len(header) < _DATA_HEADER.size or _DATA_HEADER.unpack(header)[0] != _DATA_MAGIC):
+            corrupt_file = self.data_file.with_name(self.data_file.name + ".corrupt")
+            logger.warning(f"Corrupted LLM transform cache moved to {corrupt_file}")
+            self.data_file.replace(corrupt_file)
+            header = b""
+        if not header:
+            self._create_data_file(self.data_file, os.urandom(8))
+            with open(self.data_file, "rb") as f:
+                header = f.read(_DATA_HEADER.size)
+        self._data_id = _DATA_HEADER.unpack(header)[1]
+        self._reader = open(self.data_file, "rb", buffering=0)
+        self._fd = os.open(self.data_file, os.O_WRONLY | os.O_APPEND)
+        self._data_size = os.fstat(self._fd).st_size
+
+    @staticmethod
+    def _create_data_file(path: Path, data_id: bytes) -> None:
+        with open(path, "wb") as f:
+            f.write(_DATA_HEADER.pack(_DATA_MAGIC, data_id))
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _map_index(self) -> bool:
+        """Map the index if it belongs to the data file; False if it must be rebuilt."""
+        try:
+            with open(self.index_file, "rb") as f:
+                index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return False
+        try:
+            magic, data_id, slot_count, _, indexed_size, _ = _INDEX_HEADER.unpack_from(index)
+        except struct.error:
+            index.close()
+            return False
+        valid = (
+            magic == _INDEX_MAGIC
+            and data_id == self._data_id
+            and slot_count >= MIN_INDEX_SLOTS
+            and slot_count & (slot_count - 1) == 0
+            and len(index) == _INDEX_HEADER.size + slot_count * _SLOT.size
+            and _DATA_HEADER.size <= indexed_size <= self._data_size
+        )
+        if not valid:
+            index.close()
+            return False
+        self._index = index
+        self._slot_count = slot_count
+        self._indexed_size = indexed_size
+        return True
+
+    def _scan(self, start: int) -> None:
+        """Add the records from start to the overlay.
+
+        A record whose declared length runs past the end of the file is a
+        torn write and is truncated with everything after it. A record that
+        fits in the file but fails its CRC or JSON check is skipped, like an
+        unreadable journal line, so the valid records after it are kept.
+        """
+        assert self._reader is not None
+        offset = start
+        while offset < self._data_size:
+            self._reader.seek(offset)
+            header = self._reader.read(_RECORD.size)
+            if len(header) < _RECORD.size:
+                break
+            size, _ = _RECORD.unpack(header)
+            if offset + _RECORD.size + size > self._data_size:
+                break
+            payload = _decode_record(header + self._reader.read(size))
+            if payload is None:
+                logger.warning(f"Skipping unreadable LLM transform cache record at byte {offset}: {self.data_file}")
+            else:
+                self._pending[_key_digest(payload["key"])] = (offset, _RECORD.size + size)
+            offset += _RECORD.size + size
+        if offset < self._data_size:
+            logger.warning(f"Truncating torn LLM transform cache record at byte {offset}: {self.data_file}")
+            os.truncate(self.data_file, offset)
+            self._data_size = offset
+
+    def _find(self, digest: bytes) -> _Location | None:
+        """Location of the record of a key digest (overlay first, then the mapped index)."""
+        if digest in self._pending:
+            return self._pending[digest]
+        if self._index is None:
+            return None
+        mask = self._slot_count - 1
+        slot = _home_slot(digest, self._slot_count)
+        for _ in range(self._slot_count):
+            slot_digest, offset, length = _SLOT.unpack_from(self._index, _INDEX_HEADER.size + slot * _SLOT.size)
+            if length == 0:
+                return None
+            if slot_digest == digest:
+                return offset, length
+            slot = (slot + 1) & mask
+        return None
+
+    def _read(self, location: _Location) -> dict[str, Any] | None:
+        assert self._reader is not None
+        offset, length = location
+        self._reader.seek(offset)
+        return _decode_record(self._reader.read(length))
+
+    def _entries(self) -> dict[bytes, _Location]:
+        """Locations of all live entries: the mapped index updated by the overlay."""
+        entries: dict[bytes, _Location] = {}
+        if self._index is not None:
+            for slot in range(self._slot_count):
+                digest, offset, length = _SLOT.unpack_from(self._index, _INDEX_HEADER.size + slot * _SLOT.size)
+                if length:
+                    entries[digest] = (offset, length)
+        for digest, location in self._pending.items():
+            if location is None:
+                entries.pop(digest, None)
+            else:
+                entries[digest] = location
+        return entries
+
+    def _write_index(self, entries: dict[bytes, _Location]) -> None:
+        """Replace the index file by a table of entries (caller holds the lock)."""
+        slot_count = _index_slots(len(entries))
+        mask = slot_count - 1
+        table = bytearray(_INDEX_HEADER.size + slot_count * _SLOT.size)
+        for digest, (offset, length) in entries.items():
+            slot = _home_slot(digest, slot_count)
+            while _SLOT.unpack_from(table, _INDEX_HEADER.size + slot * _SLOT.size)[2]:
+                slot = (slot + 1) & mask
+            _SLOT.pack_into(table, _INDEX_HEADER.size + slot * _SLOT.size, digest, offset, length)
+        _INDEX_HEADER.pack_into(
+            table,
+            0,
+            _INDEX_MAGIC,
+            self._data_id,
+            slot_count,
+            len(entries),
+            self._data_size,
+            sum(length for _, length in entries.values()),
+        )
+
+        temp_file = self.index_file.with_name(self.index_file.name + ".tmp")
+        with open(temp_file, "wb") as f:
+            f.write(table)
+            f.flush()
+            os.fsync(f.fileno())
+        if self._index is not None:
+            # A mapped file cannot be replaced on every platform
+            self._index.close()
+            self._index = None
+        os.replace(temp_file, self.index_file)
+        fsync_directory(self.index_file.parent)
+        self._pending = {}
+        if not self._map_index():
+            raise OSError(f"LLM transform cache index could not be mapped: {self.index_file}")
+
+    def _compact(self, entries: dict[bytes, _Location]) -> None:
+        """Rewrite the data file with the live records, then re-index (caller holds the lock).
+
+        The new data file gets a new data id, so a crash between the two
+        renames leaves an index that does not match and is rebuilt.
+        """
+        data_id = os.urandom(8)
+        temp_file = self.data_file.with_name(self.data_file.name + ".tmp")
+        self._create_data_file(temp_file, data_id)
+        relocated: dict[bytes, _Location] = {}
+        with open(temp_file, "ab") as f:
+            offset = _DATA_HEADER.size
+            for digest, location in sorted(entries.items(), key=lambda item: item[1][0]):
+                assert self._reader is not None
+                self._reader.seek(location[0])
+                raw = self._reader.read(location[1])
+                if _decode_record(raw) is None:
+                    continue
+                f.write(raw)
+                relocated[digest] = (offset, len(raw))
+                offset += len(raw)
+            f.flush()
+            os.fsync(f.fileno())
+
+        self._close()
+        os.replace(temp_file, self.data_file)
+        fsync_directory(self.data_file.parent)
+        self._open_data()
+        self._write_index(relocated)
+        self.compactions += 1
+
+    def _close(self) -> None:
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+def migrate_json_to_mapped(json_file: Path, cache: MappedTransformCache) -> int:
+    """Import the entries of a JSON cache file (LLMTransformCache) into a mapped cache.
+
+    Entries already in the cache are kept; entries without transformed
+    content are skipped. Original contents are imported as hashes unless
+    the cache stores originals. The JSON file is left untouched. The
+    imported entries are indexed by the next save_cache().
+
+    Args:
+        json_file: JSON cache file (typically .claude/.cache/llm-transforms.json)
+        cache: Destination cache
+
+    Returns:
+        Number of entries imported (0 if the file is missing or not valid JSON)
+    """
+    try:
+        with open(json_file, encoding="utf-8") as f:
+            entries = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return 0
+    if not isinstance(entries, dict):
+        return 0
+
+    imported = 0
+    for content_hash, entry in entries.items():
+        if not isinstance(entry, dict) or not isinstance(entry.get("transformed_content"), str):
+            continue
+        if cache.get_cached_transform(content_hash) is not None:
+            continue
+        cache.set_cached_transform(
+            content_hash, str(entry.get("original_content", "")), entry["transformed_content"]
+        )
+        imported += 1
+    return imported
@@ -0,0 +1,534 @@
+"""SQLite storage backend of the LLM transform cache.
+
+LLMTransformCache loads all of llm-transforms.json into memory and rewrites
+the whole file on every save_cache(): slow and memory-hungry with thousands
+of entries, and the last of two concurrent runs silently drops the other's
+entries. SQLiteTransformCache keeps the same get_cached_transform() /
+set_cached_transform() API on a SQLite database:
+
+- Point lookups: a lookup reads one row, nothing is loaded up front
+- Row-level upserts: each set_cached_transform() is its own small
+  transaction, so an interrupted run keeps every transform already paid for
+- Multi-process access: WAL journal mode lets readers run next to a writer,
+  and writers wait for each other (busy timeout) instead of failing
+
+The cache is bounded. Transformed content is stored as a zlib (or lzma)
+compressed blob keyed by its SHA-256, so identical transformations share
+one blob; the original content is kept only as a hash unless
+``store_original`` (debug mode) is set. save_cache() evicts entries unused
+for longer than ``ttl_seconds`` and then least recently used entries until
+the blobs fit in ``max_bytes``. collect_garbage() drops the entries no
+current feature refers to.
+
+migrate_json_cache() imports an existing JSON cache once.
+"""
+
+import hashlib
+import json
+import lzma
+import sqlite3
+import threading
+import time
+import zlib
+from collections import Counter
+from collections.abc import Callable, Iterable
+from datetime import datetime
+from pathlib import Path
+from types import TracebackType
+from typing import Literal
+
+from speckit_docs.utils.cache import cache_key_identity
+from speckit_docs.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Stored in PRAGMA user_version (1: uncompressed rows with the original content)
+SCHEMA_VERSION = 2
+
+# Upper bound of the stored (compressed) blobs
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+BlobCodec = Literal["zlib", "lzma"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    blob_hash TEXT PRIMARY KEY,
+    codec TEXT NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    content_hash TEXT PRIMARY KEY,
+    original_hash TEXT NOT NULL,
+    original_blob TEXT,
+    transformed_blob TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used);
+"""
+
+_UPSERT = """
+INSERT INTO entries (content_hash, original_hash, original_blob, transformed_blob, timestamp, last_used)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (content_hash) DO UPDATE SET
+    original_hash = excluded.original_hash,
+    original_blob = excluded.original_blob,
+    transformed_blob = excluded.transformed_blob,
+    timestamp = excluded.timestamp,
+    last_used = excluded.last_used
+"""
+
+_DROP_ORPHAN_BLOBS = """
+DELETE FROM blobs WHERE blob_hash NOT IN (
+    SELECT transformed_blob FROM entries
+    UNION SELECT original_blob FROM entries WHERE original_blob IS NOT NULL
+)
+"""
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def compress_text(text: str, codec: BlobCodec = "zlib") -> tuple[str, bytes]:
+    """Compress text for a blob.
+
+    Args:
+        text: Text to store
+        codec: Compression codec
+
+    Returns:
+        (codec, data); codec is "raw" when compression would not save space
+    """
+    raw = text.encode("utf-8")
+    data = zlib.compress(raw, 6) if codec == "zlib" else lzma.compress(raw)
+    return (codec, data) if len(data) < len(raw) else ("raw", raw)
+
+
+def decompress_text(codec: str, data: bytes) -> str:
+    """Inverse of compress_text()."""
+    if codec == "zlib":
+        data = zlib.decompress(data)
+    elif codec == "lzma":
+        data = lzma.decompress(data)
+    return data.decode("utf-8")
+
+
+class SQLiteTransformCache:
+    """LLM transform cache stored in a SQLite database (WAL mode).
+
+    The connection is opened on first use and shared by the threads of the
+    process (access is serialized by a lock). Lookups record the entry's
+    last use in memory; save_cache() writes them back in one transaction
+    and then enforces the TTL and the byte cap.
+
+    Attributes:
+        db_file: Path to the database file
+        busy_timeout_seconds: How long a write waits for another process's write
+        max_bytes: Upper bound of the stored blobs (None: unbounded)
+        ttl_seconds: Entries unused for longer are expired (None: no TTL)
+        codec: Compression of new blobs
+        store_original: Keep the original content, not only its hash (debug mode)
+        evicted: Entries dropped by the TTL or the byte cap
+        collected: Entries dropped by collect_garbage()
+
+    Example:
+        >>> cache = SQLiteTransformCache(Path(".claude/.cache/llm-transforms.sqlite3"))
+        >>> cache.load_cache()
+        >>> cache.set_cached_transform(content_hash, "original", "transformed")
+        >>> cache.get_cached_transform(content_hash)
+        'transformed'
+    """
+
+    def __init__(
+        self,
+        db_file: Path,
+        busy_timeout_seconds: float = 30.0,
+        max_bytes: int | None = DEFAULT_MAX_BYTES,
+        ttl_seconds: float | None = None,
+        codec: BlobCodec = "zlib",
+        store_original: bool = False,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Initialize the cache (the database is opened on first use).
+
+        Args:
+            db_file: Path to the database file (typically .claude/.cache/llm-transforms.sqlite3)
+            busy_timeout_seconds: Wait for concurrent writers up to this long (default: 30)
+            max_bytes: Byte cap of the stored blobs (default: 64 MiB, None: unbounded)
+            ttl_seconds: Expire entries unused for this long (default: None, no TTL)
+            codec: Compression of new blobs, "zlib" or "lzma" (default: zlib)
+            store_original: Store the original content for debugging (default: False)
+            clock: Wall clock in seconds (injectable for tests)
+
+        Raises:
+            ValueError: If max_bytes or ttl_seconds is negative
+        """
+        if max_bytes is not None and max_bytes < 0:
+            raise ValueError(f"max_bytes must be >= 0, got {max_bytes}")
+        if ttl_seconds is not None and ttl_seconds < 0:
+            raise ValueError(f"ttl_seconds must be >= 0, got {ttl_seconds}")
+
+        self.db_file = db_file
+        self.busy_timeout_seconds = busy_timeout_seconds
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.codec = codec
+        self.store_original = store_original
+        self.evicted = 0
+        self.collected = 0
+        self._clock = clock
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        # content hash -> last use not yet written back
+        self._touched: dict[str, float] = {}
+
+    def _open(self) -> sqlite3.Connection:
+        """Open the database, creating or upgrading its schema if needed."""
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit: every statement is its own transaction unless BEGIN is issued
+        connection = sqlite3.connect(
+            self.db_file,
+            timeout=self.busy_timeout_seconds,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            # Durable at checkpoints; a power loss may drop the last commits, never corrupt
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.create_function("cache_key_identity", 1, cache_key_identity, deterministic=True)
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                (version,) = connection.execute("PRAGMA user_version").fetchone()
+                # One statement at a time: executescript() would commit the transaction
+                for statement in _SCHEMA.split(";"):
+                    if statement.strip():
+                        connection.execute(statement)
+                if version == 1:
+                    self._upgrade_v1(connection)
+                connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+                connection.execute("COMMIT")
+            except BaseException:
+                if connection.in_transaction:
+                    connection.execute("ROLLBACK")
+                raise
+        except sqlite3.DatabaseError:
+            connection.close()
+            raise
+        return connection
+
+    def _upgrade_v1(self, connection: sqlite3.Connection) -> None:
+        """Move schema 1 rows (plain text) into compressed blobs."""
+        rows = connection.execute(
+            "SELECT content_hash, original_content, transformed_content, timestamp FROM transforms"
+        ).fetchall()
+        now = self._clock()
+        for content_hash, original_content, transformed_content, timestamp in rows:
+            self._put(connection, content_hash, original_content, transformed_content, timestamp, now)
+        connection.execute("DROP TABLE transforms")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Shared connection; call with the lock held."""
+        if self._connection is None:
+            self._connection = self._open()
+        return self._connection
+
+    def _put_blob(self, connection: sqlite3.Connection, text: str) -> str:
+        """Store text as a deduplicated blob and return its hash."""
+        blob_hash = _text_hash(text)
+        if connection.execute("SELECT 1 FROM blobs WHERE blob_hash = ?", (blob_hash,)).fetchone() is None:
+            codec, data = compress_text(text, self.codec)
+            connection.execute(
+                "INSERT INTO blobs (blob_hash, codec, data) VALUES (?, ?, ?)", (blob_hash, codec, data)
+            )
+        return blob_hash
+
+    def _put(
+        self,
+        connection: sqlite3.Connection,
+        content_hash: str,
+        original_content: str,
+        transformed_content: str,
+        timestamp: str,
+        last_used: float,
+    ) -> None:
+        """Upsert an entry; call inside a transaction."""
+        original_blob = self._put_blob(connection, original_content) if self.store_original else None
+        connection.execute(
+            _UPSERT,
+            (
+                content_hash,
+                _text_hash(original_content),
+                original_blob,
+                self._put_blob(connection, transformed_content),
+                timestamp,
+                last_used,
+            ),
+        )
+
+    def load_cache(self) -> None:
+        """Open the database (no entries are loaded).
+
+        A corrupted database file is moved aside (``<name>.corrupt``) and an
+        empty cache is created in its place, like a corrupted JSON cache (CHK028).
+        """
+        with self._lock:
+            if self._connection is not None:
+                return
+            try:
+                self._connection = self._open()
+            except sqlite3.DatabaseError as e:
+                corrupt_file = self.db_file.with_name(self.db_file.name + ".corrupt")
+                logger.warning(f"Corrupted LLM transform cache moved to {corrupt_file}: {e}")
+                self.db_file.replace(corrupt_file)
+                for suffix in ("-wal", "-shm"):
+                    self.db_file.with_name(self.db_file.name + suffix).unlink(missing_ok=True)
+                self._connection = self._open()
+
+    def save_cache(self) -> None:
+        """Record last uses, enforce the TTL and byte cap, and checkpoint the WAL.
+
+        Entries themselves are committed by set_cached_transform().
+        Readers still using old pages are not waited for by the checkpoint.
+        """
+        with self._lock:
+            if self._connection is None:
+                return
+            connection = self._connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.executemany(
+                    "UPDATE entries SET last_used = MAX(last_used, ?) WHERE content_hash = ?",
+                    [(last_used, content_hash) for content_hash, last_used in self._touched.items()],
+                )
+                self._touched.clear()
+                self.evicted += self._evict(connection)
+                connection.execute(_DROP_ORPHAN_BLOBS)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def _evict(self, connection: sqlite3.Connection) -> int:
+        """Drop expired entries, then least recently used ones over the byte cap."""
+        evicted = 0
+        if self.ttl_seconds is not None:
+            evicted += connection.execute(
+                "DELETE FROM entries WHERE last_used < ?", (self._clock() - self.ttl_seconds,)
+            ).rowcount
+        if self.max_bytes is None:
+            return evicted
+
+        connection.execute(_DROP_ORPHAN_BLOBS)
+        sizes = dict(connection.execute("SELECT blob_hash, length(data) FROM blobs").fetchall())
+        total = sum(sizes.values())
+        if total <= self.max_bytes:
+            return evicted
+
+        rows = connection.execute(
+            "SELECT content_hash, transformed_blob, original_blob FROM entries ORDER BY last_used, content_hash"
+        ).fetchall()
+        references = Counter(blob for _, *blobs in rows for blob in blobs if blob is not None)
+        victims = []
+        for content_hash, *blobs in rows:
+            if total <= self.max_bytes:
+                break
+            victims.append((content_hash,))
+            for blob in blobs:
+                if blob is None:
+                    continue
+                references[blob] -= 1
+                # A blob shared with a kept entry frees nothing
+                if references[blob] == 0:
+                    total -= sizes[blob]
+        connection.executemany("DELETE FROM entries WHERE content_hash = ?", victims)
+        return evicted + len(victims)
+
+    def get_cached_transform(self, content_hash: str) -> str | None:
+        """Get cached transformation for given content hash.
+
+        Args:
+            content_hash: MD5 hash of original content
+
+        Returns:
+            Transformed content if cached (and not expired), None if cache miss
+        """
+        now = self._clock()
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT e.last_used, b.codec, b.data FROM entries e "
+                "JOIN blobs b ON b.blob_hash = e.transformed_blob WHERE e.content_hash = ?",
+                (content_hash,),
+            ).fetchone()
+            if row is None:
+                return None
+            last_used, codec, data = row
+            last_used = max(last_used, self._touched.get(content_hash, 0.0))
+            if self.ttl_seconds is not None and last_used < now - self.ttl_seconds:
+                return None
+            self._touched[content_hash] = now
+        return decompress_text(codec, data)
+
+    def get_original_content(self, content_hash: str) -> str | None:
+        """Original content of an entry (only stored with ``store_original``).
+
+        Returns:
+            Original content, or None if the entry or its original is not stored
+        """
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT b.codec, b.data FROM entries e "
+                "JOIN blobs b ON b.blob_hash = e.original_blob WHERE e.content_hash = ?",
+                (content_hash,),
+            ).fetchone()
+        return None if row is None else decompress_text(*row)
+
+    def set_cached_transform(
+        self, content_hash: str, original_content: str, transformed_content: str
+    ) -> None:
+        """Insert or replace the entry of a content hash (committed immediately).
+
+        Args:
+            content_hash: MD5 hash of original content
+            original_content: Original content (stored as a hash unless store_original)
+            transformed_content: LLM-transformed content
+        """
+        with self._lock:
+            connection = self._connect()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._put(
+                    connection,
+                    content_hash,
+                    original_content,
+                    transformed_content,
+                    datetime.now().isoformat(),
+                    self._clock(),
+                )
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            self._touched.pop(content_hash, None)
+
+    def collect_garbage(self, referenced: Iterable[str]) -> int:
+        """Drop the entries of deleted features and outdated content.
+
+        Entries are compared by cache_key_identity(), like LLMTransformCache:
+        one referenced under another model, prompt or schema version is left
+        to LRU/TTL eviction.
+
+        Args:
+            referenced: Cache keys of the current features (see llm_engine.referenced_cache_keys())
+
+        Returns:
+            Number of entries dropped
+        """
+        with self._lock:
+            connection = self._connect()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.execute("CREATE TEMP TABLE IF NOT EXISTS referenced (key TEXT PRIMARY KEY)")
+                connection.execute("DELETE FROM referenced")
+                connection.executemany(
+                    "INSERT OR IGNORE INTO referenced (key) VALUES (?)",
+                    [(cache_key_identity(key),) for key in referenced],
+                )
+                dropped = connection.execute(
+                    "DELETE FROM entries WHERE cache_key_identity(content_hash) NOT IN (SELECT key FROM referenced)"
+                ).rowcount
+                connection.execute(_DROP_ORPHAN_BLOBS)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        self.collected += dropped
+        return int(dropped)
+
+    def stored_bytes(self) -> int:
+        """Size of the stored (compressed) blobs in bytes."""
+        with self._lock:
+            (total,) = self._connect().execute("SELECT COALESCE(SUM(length(data)), 0) FROM blobs").fetchone()
+        return int(total)
+
+    def __len__(self) -> int:
+        """Number of cached transformations."""
+        with self._lock:
+            (count,) = self._connect().execute("SELECT COUNT(*) FROM entries").fetchone()
+        return int(count)
+
+    def close(self) -> None:
+        """Close the database connection (reopened on next use).
+
+        Last uses recorded since the last save_cache() are not written.
+        """
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def __enter__(self) -> "SQLiteTransformCache":
+        self.load_cache()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+def migrate_json_cache(json_file: Path, cache: SQLiteTransformCache) -> int:
+    """Import the entries of a JSON cache file (LLMTransformCache) into SQLite.
+
+    Runs in one transaction. Entries already in the database are kept (they
+    are at least as recent as the JSON file being replaced); entries without
+    transformed content are skipped. The JSON file is left untouched.
+
+    Args:
+        json_file: JSON cache file (typically .claude/.cache/llm-transforms.json)
+        cache: Destination cache
+
+    Returns:
+        Number of entries imported (0 if the file is missing or not valid JSON)
+    """
+    try:
+        with open(json_file, encoding="utf-8") as f:
+            entries = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return 0
+    if not isinstance(entries, dict):
+        return 0
+
+    now = cache._clock()
+    imported = 0
+    with cache._lock:
+        connection = cache._connect()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            for content_hash, entry in entries.items():
+                if not isinstance(entry, dict) or not isinstance(entry.get("transformed_content"), str):
+                    continue
+                exists = connection.execute(
+                    "SELECT 1 FROM entries WHERE content_hash = ?", (content_hash,)
+                ).fetchone()
+                if exists is not None:
+                    continue
+                cache._put(
+                    connection,
+                    content_hash,
+                    str(entry.get("original_content", "")),
+                    entry["transformed_content"],
+                    str(entry.get("timestamp") or datetime.now().isoformat()),
+                    now,
+                )
+                imported += 1
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+    return imported
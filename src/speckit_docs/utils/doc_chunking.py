@@ -0,0 +1,130 @@
+"""Streamed reading and section-bounded chunking of large Markdown documents.
+
+Single-call analyses only look at the start of a document (the first 8,000
+characters for target audience detection, 4,000 per classified section).
+read_head() reads just that prefix instead of the whole file. Documents
+that do not fit are split by iter_markdown_chunks() into chunks that end at
+h1-h3 section boundaries where possible, so every part of the document can
+be analysed on its own (map) and the partial results merged (reduce; see
+the ``map_reduce`` options of llm_transform and llm_engine).
+
+Chunking works on a line stream: iter_file_chunks() holds one chunk and the
+section being read in memory, not the whole file.
+"""
+
+import re
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+
+# ATX heading of level 1-3 (the section boundaries of parse_markdown_sections())
+_SECTION_HEADING = re.compile(r"^ {0,3}#{1,3}(?:[ \t]|$)")
+_FENCE = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+
+# Split points of a section too large for one chunk, coarsest first
+_SEPARATORS = ("\n\n", "\n")
+
+
+def read_head(path: Path, max_chars: int) -> tuple[str, bool]:
+    """Read the first max_chars characters of a text file.
+
+    Args:
+        path: UTF-8 text file
+        max_chars: Number of characters to read
+
+    Returns:
+        (text, truncated): truncated is True if the file has more characters
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+    """
+    with open(path, encoding="utf-8") as f:
+        text = f.read(max_chars + 1)
+    return text[:max_chars], len(text) > max_chars
+
+
+def _iter_sections(lines: Iterable[str]) -> Iterator[str]:
+    """Group a line stream into h1-h3 sections (headings inside code fences ignored)."""
+    section: list[str] = []
+    fence: str | None = None
+    for line in lines:
+        if fence is None and section and _SECTION_HEADING.match(line):
+            yield "".join(section)
+            section = []
+        match = _FENCE.match(line)
+        if match:
+            marker = match.group(1)
+            if fence is None:
+                fence = marker
+            elif marker.startswith(fence):
+                fence = None
+        section.append(line)
+    if section:
+        yield "".join(section)
+
+
+def _split_oversized(
+    text: str, max_size: int, size: Callable[[str], int], separators: tuple[str, ...] = _SEPARATORS
+) -> Iterator[str]:
+    """Split text larger than max_size at paragraph, then line, then character boundaries."""
+    if size(text) <= max_size:
+        yield text
+        return
+    if not separators:
+        step = max(1, max_size)
+        for start in range(0, len(text), step):
+            yield text[start : start + step]
+        return
+    parts = text.split(separators[0])
+    for n, part in enumerate(parts):
+        piece = part + separators[0] if n < len(parts) - 1 else part
+        yield from _split_oversized(piece, max_size, size, separators[1:])
+
+
+def iter_markdown_chunks(
+    lines: Iterable[str], max_size: int, size: Callable[[str], int] = len
+) -> Iterator[str]:
+    """Split Markdown into chunks of at most max_size, preferring section boundaries.
+
+    Consecutive sections are packed into one chunk while they fit. A section
+    larger than max_size is split at blank lines (then line breaks) and its
+    pieces are packed the same way. Concatenating the chunks gives back the
+    input. Chunk sizes are the sum of their pieces' sizes, which is exact for
+    characters and an estimate for token counts.
+
+    Args:
+        lines: Markdown lines, line endings included (e.g. an open file)
+        max_size: Maximum chunk size (>= 1), measured by ``size``
+        size: Size of a text (default: characters; e.g. estimate_token_count)
+
+    Returns:
+        Iterator over non-empty chunks in document order
+
+    Raises:
+        ValueError: If max_size is less than 1
+    """
+    if max_size < 1:
+        raise ValueError(f"max_size must be >= 1, got {max_size}")
+
+    chunk, chunk_size = "", 0
+    for section in _iter_sections(lines):
+        for piece in _split_oversized(section, max_size, size):
+            piece_size = size(piece)
+            if chunk and chunk_size + piece_size > max_size:
+                yield chunk
+                chunk, chunk_size = "", 0
+            chunk += piece
+            chunk_size += piece_size
+    if chunk.strip():
+        yield chunk
+
+
+def iter_file_chunks(
+    path: Path, max_size: int, size: Callable[[str], int] = len
+) -> Iterator[str]:
+    """Stream a UTF-8 Markdown file as chunks (see iter_markdown_chunks()).
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+    """
+    with open(path, encoding="utf-8") as f:
+        yield from iter_markdown_chunks(f, max_size, size)
@@ -0,0 +1,351 @@
+"""Message Batches API transform mode for speckit-docs.
+
+Full regenerations do not need interactive latency. This module submits every
+per-feature LLM request (inconsistency detection, section prioritization,
+spec.md transformation and, optionally, batched section classification)
+through the Anthropic Message Batches endpoint in one batch, polls until the
+batch has ended, and assembles the results into LLMTransformCache and the
+{feature_key: {"spec_content": ...}} map consumed by scripts/doc_update.py.
+
+Requests are built with the same helpers as the interactive path
+(speckit_docs.utils.llm_transform), so cached results are interchangeable.
+"""
+
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal
+
+if TYPE_CHECKING:
+    from anthropic import Anthropic
+
+from speckit_docs.exceptions import SpecKitDocsError
+from speckit_docs.llm_entities import LLMSection, SectionClassification
+from speckit_docs.models import Feature
+from speckit_docs.utils.cache import TransformCache, compute_content_hash
+from speckit_docs.utils.cache_keys import transform_cache_key
+from speckit_docs.utils.llm_resilience import get_resilient_caller
+from speckit_docs.utils.llm_routing import model_for
+from speckit_docs.utils.llm_transform import (
+    build_batch_classification_request,
+    build_inconsistency_request,
+    build_integrated_result,
+    build_section_priority_request,
+    build_spec_transform_request,
+    get_response_text,
+    inconsistency_error,
+    parse_batch_classification_response,
+    parse_inconsistency_response,
+    parse_markdown_sections,
+    parse_section_priority_response,
+    parse_spec_transform_response,
+    select_content_source,
+)
+from speckit_docs.utils.llm_usage import feature_scope, record_usage
+from speckit_docs.utils.section_delta import (
+    split_fragments,
+    split_transformed,
+    store_section_transforms,
+)
+from speckit_docs.utils.spec_extractor import extract_spec_minimal
+
+# Message Batches API limit on requests per batch
+MAX_BATCH_REQUESTS = 100_000
+
+BatchCallType = Literal["inconsistency", "priority", "transform", "classify"]
+
+
+@dataclass(frozen=True)
+class BatchRequest:
+    """A single request inside a message batch.
+
+    Attributes:
+        custom_id: Batch-unique request id (^[a-zA-Z0-9_-]{1,64}$)
+        params: messages.create() parameters (without timeout)
+    """
+
+    custom_id: str
+    params: dict[str, Any]
+
+
+@dataclass(frozen=True)
+class BatchTransformResult:
+    """Result of a batch transform run.
+
+    Attributes:
+        content_map: {feature_key: {"spec_content": ...}} for doc_update.py
+        classifications: Section classifications per feature key (classify mode only)
+        batch_ids: IDs of the submitted message batches
+        cached_features: Number of features served from LLMTransformCache
+    """
+
+    content_map: dict[str, dict[str, str]]
+    classifications: dict[str, list[SectionClassification]] = field(default_factory=dict)
+    batch_ids: list[str] = field(default_factory=list)
+    cached_features: int = 0
+
+
+class MessageBatchRunner:
+    """Submit requests as message batches and wait for their results.
+
+    Attributes:
+        client: Anthropic API client
+        poll_interval_seconds: Seconds between status polls
+        max_wait_seconds: Give up waiting after this many seconds
+    """
+
+    def __init__(
+        self,
+        client: "Anthropic",
+        poll_interval_seconds: float = 30.0,
+        max_wait_seconds: float = 24 * 60 * 60,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """Initialize the runner.
+
+        Args:
+            client: Anthropic API client
+            poll_interval_seconds: Seconds between status polls (default: 30)
+            max_wait_seconds: Maximum wait for a batch (default: 24h, the batch expiry)
+            sleep: Sleep function (injectable for tests)
+        """
+        self.client = client
+        self.poll_interval_seconds = poll_interval_seconds
+        self.max_wait_seconds = max_wait_seconds
+        self._sleep = sleep
+        self.batch_ids: list[str] = []
+        self.failures: dict[str, str] = {}
+
+    def run(self, requests: list[BatchRequest]) -> dict[str, Any]:
+        """Run requests through the Message Batches API.
+
+        Requests that did not succeed (errored, canceled, expired) are recorded
+        in ``failures`` instead of raising, so the caller can keep every result
+        that was already paid for.
+
+        Args:
+            requests: Requests to submit (split into several batches above MAX_BATCH_REQUESTS)
+
+        Returns:
+            Mapping of custom_id to the succeeded Message
+
+        Raises:
+            SpecKitDocsError: If a batch does not end within max_wait_seconds
+        """
+        messages: dict[str, Any] = {}
+
+        for start in range(0, len(requests), MAX_BATCH_REQUESTS):
+            chunk = requests[start : start + MAX_BATCH_REQUESTS]
+            batch_requests = [{"custom_id": r.custom_id, "params": r.params} for r in chunk]
+            batch = get_resilient_caller().call(
+                lambda: self.client.messages.batches.create(requests=batch_requests)  # type: ignore[arg-type]
+            )
+            self.batch_ids.append(batch.id)
+            self._wait_until_ended(batch.id)
+
+            results = get_resilient_caller().call(
+                lambda: self.client.messages.batches.results(batch.id)
+            )
+            for entry in results:
+                if entry.result.type == "succeeded":
+                    messages[entry.custom_id] = entry.result.message
+                else:
+                    self.failures[entry.custom_id] = entry.result.type
+
+        for request in requests:
+            if request.custom_id not in messages:
+                self.failures.setdefault(request.custom_id, "missing")
+        return messages
+
+    def _wait_until_ended(self, batch_id: str) -> None:
+        """Poll a batch until its processing_status is "ended"."""
+        waited = 0.0
+        while True:
+            batch = get_resilient_caller().call(
+                lambda: self.client.messages.batches.retrieve(batch_id)
+            )
+            if batch.processing_status == "ended":
+                return
+            if waited >= self.max_wait_seconds:
+                raise SpecKitDocsError(
+                    message=f"Message batch {batch_id} did not finish within {self.max_wait_seconds} seconds (status: {batch.processing_status}).",
+                    suggestion="Check the batch in the Anthropic Console and re-run later.",
+                    error_type="LLM Batch Timeout",
+                )
+            self._sleep(self.poll_interval_seconds)
+            waited += self.poll_interval_seconds
+
+
+@dataclass
+class _FeaturePlan:
+    """Requests planned for one feature (internal)."""
+
+    feature_key: str
+    source_type: str
+    cache_source: str = ""
+    cache_key: str = ""
+    contents: tuple[str, ...] = ()
+    custom_ids: dict[BatchCallType, str] = field(default_factory=dict)
+    sections: list[LLMSection] = field(default_factory=list)
+    classify_items: list[tuple[Path, LLMSection]] = field(default_factory=list)
+    files: tuple[Path, ...] = ()
+
+
+def run_batch_transform(
+    features: list[Feature],
+    client: "Anthropic",
+    cache: TransformCache | None = None,
+    classify: bool = False,
+    runner: MessageBatchRunner | None = None,
+) -> BatchTransformResult:
+    """Transform features through the Message Batches API.
+
+    Args:
+        features: Features to transform
+        client: Anthropic API client
+        cache: Optional LLM transform cache; hits are not submitted, results are stored
+        classify: Also submit one batched section classification per README/QUICKSTART feature
+        runner: Batch runner (default: MessageBatchRunner(client))
+
+    Returns:
+        BatchTransformResult
+
+    Raises:
+        SpecKitDocsError: If a request did not succeed or README/QUICKSTART are
+            inconsistent. Results of the other features are cached before the
+            first error is raised.
+    """
+    runner = runner if runner is not None else MessageBatchRunner(client)
+    requests: list[BatchRequest] = []
+    plans: list[_FeaturePlan] = []
+    content_map: dict[str, dict[str, str]] = {}
+    cached_features = 0
+
+    def _add(plan: _FeaturePlan, call_type: BatchCallType, params: dict[str, Any]) -> None:
+        custom_id = f"req-{len(requests):06d}"
+        plan.custom_ids[call_type] = custom_id
+        requests.append(BatchRequest(custom_id=custom_id, params=params))
+
+    for feature in features:
+        feature_key = f"{feature.id}-{feature.name}"
+        source_type, source = select_content_source(feature.directory_path)
+        plan = _FeaturePlan(feature_key=feature_key, source_type=source_type)
+        plans.append(plan)
+
+        if source_type in ("readme", "quickstart"):
+            assert isinstance(source, Path)
+            plan.files = (source,)
+            content = source.read_text(encoding="utf-8")
+            content_map[feature_key] = {"spec_content": content}
+            filename: Literal["README.md", "QUICKSTART.md"] = (
+                "README.md" if source_type == "readme" else "QUICKSTART.md"
+            )
+            plan.classify_items = [(source, s) for s in parse_markdown_sections(content, filename)]
+        elif source_type == "both":
+            assert isinstance(source, tuple)
+            plan.files = source
+            readme_content = source[0].read_text()
+            quickstart_content = source[1].read_text()
+            readme_sections = parse_markdown_sections(readme_content, "README.md")
+            quickstart_sections = parse_markdown_sections(quickstart_content, "QUICKSTART.md")
+            plan.sections = readme_sections + quickstart_sections
+            plan.classify_items = [(source[0], s) for s in readme_sections] + [
+                (source[1], s) for s in quickstart_sections
+            ]
+            plan.contents = (readme_content, quickstart_content)
+            plan.cache_source = readme_content + "\n\n---\n\n" + quickstart_content
+            plan.cache_key = transform_cache_key("section_priority", compute_content_hash(plan.cache_source))
+            cached = cache.get_cached_transform(plan.cache_key) if cache else None
+            if cached is not None:
+                content_map[feature_key] = {"spec_content": cached}
+                cached_features += 1
+            else:
+                _add(plan, "inconsistency", build_inconsistency_request(readme_content, quickstart_content))
+                _add(plan, "priority", build_section_priority_request(plan.sections))
+        else:
+            assert isinstance(source, Path)
+            plan.cache_source = extract_spec_minimal(source).to_markdown()
+            plan.cache_key = transform_cache_key("spec_md_extraction", compute_content_hash(plan.cache_source))
+            cached = cache.get_cached_transform(plan.cache_key) if cache else None
+            if cached is not None:
+                content_map[feature_key] = {"spec_content": cached}
+                cached_features += 1
+            else:
+                _add(plan, "transform", build_spec_transform_request(plan.cache_source))
+
+        if classify and plan.classify_items:
+            _add(plan, "classify", build_batch_classification_request(plan.classify_items))
+
+    if not requests:
+        return BatchTransformResult(content_map=content_map, cached_features=cached_features)
+
+    messages = runner.run(requests)
+    classifications: dict[str, list[SectionClassification]] = {}
+    first_error: SpecKitDocsError | None = None
+
+    for plan in plans:
+        failed = {
+            call_type: runner.failures[custom_id]
+            for call_type, custom_id in plan.custom_ids.items()
+            if custom_id in runner.failures
+        }
+        if failed:
+            first_error = first_error or SpecKitDocsError(
+                message=f"Batch requests for feature '{plan.feature_key}' did not succeed: "
+                + ", ".join(f"{call_type}={reason}" for call_type, reason in failed.items()),
+                suggestion="Re-run the batch transform; succeeded results are already cached.",
+                file_path=plan.files[0] if plan.files else None,
+                error_type="LLM Batch Failed",
+            )
+            continue
+
+        texts: dict[BatchCallType, str] = {}
+        for call_type, custom_id in plan.custom_ids.items():
+            with feature_scope(plan.feature_key):
+                record_usage(messages[custom_id], call_type, model_for(call_type))
+            texts[call_type] = get_response_text(messages[custom_id])
+        try:
+            if "classify" in texts:
+                classifications[plan.feature_key] = parse_batch_classification_response(
+                    texts["classify"], plan.classify_items
+                )
+            if "inconsistency" in texts:
+                readme_file, quickstart_file = plan.files
+                inconsistency_result = parse_inconsistency_response(texts["inconsistency"])
+                if not inconsistency_result.is_consistent:
+                    raise inconsistency_error(readme_file, quickstart_file, inconsistency_result)
+                priority_result = parse_section_priority_response(texts["priority"], plan.sections)
+                readme_content, quickstart_content = plan.contents
+                transformed = build_integrated_result(
+                    readme_content, quickstart_content, priority_result
+                ).transformed_content
+            elif "transform" in texts:
+                transformed = parse_spec_transform_response(
+                    texts["transform"], plan.cache_source
+                ).transformed_content
+            else:
+                continue
+        except SpecKitDocsError as e:
+            first_error = first_error or e
+            continue
+
+        content_map[plan.feature_key] = {"spec_content": transformed}
+        if cache is not None:
+            cache.set_cached_transform(plan.cache_key, plan.cache_source, transformed)
+            if "transform" in texts:
+                # Seed the section cache so later interactive runs can send deltas
+                fragments = split_fragments(plan.cache_source).fragments
+                section_texts = split_transformed(transformed, len(fragments))
+                if section_texts is not None:
+                    store_section_transforms(cache, fragments, section_texts)
+
+    if first_error is not None:
+        raise first_error
+
+    return BatchTransformResult(
+        content_map={plan.feature_key: content_map[plan.feature_key] for plan in plans},
+        classifications=classifications,
+        batch_ids=list(runner.batch_ids),
+        cached_features=cached_features,
+    )
@@ -0,0 +1,919 @@
+"""Concurrent LLM transform engine for speckit-docs.
+
+Runs the per-feature LLM workflow of /speckit.doc-update (FR-022b Step 1:
+content source selection → inconsistency detection → section prioritization
+→ spec.md transformation) for many features at once on AsyncAnthropic.
+
+Requests and responses are built/parsed by the same helpers as the blocking
+functions in speckit_docs.utils.llm_transform, so both paths send identical
+prompts. The engine result is the {feature_key: {"spec_content": ...}} map
+consumed by scripts/doc_update.py (--transformed-content).
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TypeVar
+
+if TYPE_CHECKING:
+    from anthropic import APIError, APITimeoutError, AsyncAnthropic, RateLimitError
+else:
+    try:
+        from anthropic import APIError, APITimeoutError, AsyncAnthropic, RateLimitError
+    except ImportError:
+        # Anthropic is optional for non-LLM workflows
+        AsyncAnthropic = None  # type: ignore[assignment,misc]
+        APIError = Exception  # type: ignore[assignment,misc]
+        APITimeoutError = Exception  # type: ignore[assignment,misc]
+        RateLimitError = Exception  # type: ignore[assignment,misc]
+
+from speckit_docs.exceptions import SpecKitDocsError
+from speckit_docs.llm_entities import (
+    InconsistencyDetectionResult,
+    LLMCallType,
+    LLMSection,
+    LLMTransformResult,
+    PrioritizedSection,
+    SectionClassification,
+    SectionPriorityResult,
+    TargetAudienceResult,
+)
+from speckit_docs.models import Feature
+from speckit_docs.utils.cache import TransformCache, compute_content_hash
+from speckit_docs.utils.cache_keys import transform_cache_key
+from speckit_docs.utils.doc_chunking import iter_file_chunks, iter_markdown_chunks, read_head
+from speckit_docs.utils.llm_memo import MemoizedMessage, get_llm_memo, memo_key
+from speckit_docs.utils.llm_ratelimit import get_rate_limiter
+from speckit_docs.utils.llm_resilience import get_resilient_caller
+from speckit_docs.utils.llm_session import get_llm_session
+from speckit_docs.utils.llm_singleflight import get_single_flight
+from speckit_docs.utils.llm_stream import (
+    JSONEventHandler,
+    StreamedMessage,
+    read_stream_async,
+    replay_stream,
+)
+from speckit_docs.utils.llm_tokens import count_tokens_async
+from speckit_docs.utils.llm_transform import (
+    CLASSIFICATION_BATCH_TOKEN_BUDGET,
+    DEFAULT_MODEL,
+    MAP_REDUCE_MAX_WORKERS,
+    SECTION_CLASSIFICATION_CONTENT_CHARS,
+    STREAM_KEY_PREFIX,
+    TARGET_AUDIENCE_CONTENT_CHARS,
+    InconsistencyStreamCollector,
+    SectionPriorityStreamCollector,
+    build_batch_classification_request,
+    build_classification_merge_request,
+    build_inconsistency_request,
+    build_integrated_result,
+    build_section_classification_request,
+    build_section_priority_request,
+    build_spec_merge_request,
+    build_spec_transform_request,
+    build_target_audience_merge_request,
+    build_target_audience_request,
+    check_not_truncated,
+    estimate_request_tokens,
+    estimate_token_count,
+    get_response_text,
+    inconsistency_error,
+    join_spec_parts,
+    llm_api_error,
+    merge_unanimous_audience,
+    merge_unanimous_classification,
+    parse_batch_classification_response,
+    parse_inconsistency_response,
+    parse_markdown_sections,
+    parse_section_classification_response,
+    parse_section_priority_response,
+    parse_spec_merge_response,
+    parse_spec_transform_response,
+    parse_target_audience_response,
+    plan_classification_batches,
+    select_content_source,
+    split_spec_extract,
+)
+from speckit_docs.utils.llm_usage import feature_scope, record_usage
+from speckit_docs.utils.logging import get_logger
+from speckit_docs.utils.section_delta import (
+    SectionDeltaStats,
+    SectionFragment,
+    plan_section_delta,
+    split_fragments,
+    split_transformed,
+    store_section_transforms,
+)
+from speckit_docs.utils.spec_extractor import SPEC_TOKEN_LIMIT, extract_spec_minimal
+from speckit_docs.utils.transform_packing import (
+    PackJob,
+    TransformPackStats,
+    build_packed_transform_request,
+    is_packable,
+    pack_timeout_seconds,
+    plan_transform_packs,
+    split_packed_response,
+)
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 8
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def get_async_anthropic_client() -> "AsyncAnthropic":
+    """Get the shared asynchronous Anthropic API client of the process-wide LLM session.
+
+    Returns:
+        AsyncAnthropic API client (bound to the running event loop)
+
+    Raises:
+        SpecKitDocsError: If anthropic is not installed or ANTHROPIC_API_KEY is not set
+    """
+    return get_llm_session().async_client
+
+
+async def create_message_async(
+    client: "AsyncAnthropic", params: dict[str, Any], call_type: LLMCallType, timeout_seconds: float
+) -> Any:
+    """Async variant of llm_transform.create_message()."""
+    memo = get_llm_memo()
+    if memo is not None and (cached := memo.get(call_type, params)) is not None:
+        return MemoizedMessage(cached)
+
+    limiter = get_rate_limiter()
+    input_tokens, output_tokens = estimate_request_tokens(params)
+
+    async def _create() -> Any:
+        return await client.messages.create(**params, timeout=timeout_seconds)
+
+    attempts = 0
+
+    async def _attempt() -> Any:
+        nonlocal attempts
+        attempts += 1
+        return await limiter.acall(_create, input_tokens, output_tokens)
+
+    async def _send() -> Any:
+        started = time.monotonic()
+        response = await get_resilient_caller().acall(_attempt)
+        record_usage(
+            response,
+            call_type,
+            params.get("model", DEFAULT_MODEL),
+            latency_seconds=time.monotonic() - started,
+            retries=attempts - 1,
+        )
+        if memo is not None:
+            memo.put(call_type, params, get_response_text(response))
+        return response
+
+    group = get_single_flight()
+    if group is None:
+        return await _send()
+    return await group.ado(memo_key(call_type, params), _send)
+
+
+async def stream_message_async(
+    client: "AsyncAnthropic",
+    params: dict[str, Any],
+    call_type: LLMCallType,
+    timeout_seconds: float,
+    on_event: JSONEventHandler | None = None,
+) -> StreamedMessage:
+    """Async variant of llm_transform.stream_message()."""
+    memo = get_llm_memo()
+    if memo is not None and (cached := memo.get(call_type, params)) is not None:
+        return replay_stream(cached, MemoizedMessage(cached), on_event)
+
+    limiter = get_rate_limiter()
+    input_tokens, output_tokens = estimate_request_tokens(params)
+
+    async def _read() -> StreamedMessage:
+        return await read_stream_async(
+            lambda: client.messages.stream(**params, timeout=timeout_seconds), on_event
+        )
+
+    attempts = 0
+
+    async def _attempt() -> StreamedMessage:
+        nonlocal attempts
+        attempts += 1
+        return await limiter.acall(_read, input_tokens, output_tokens)
+
+    led = False
+
+    async def _send() -> StreamedMessage:
+        nonlocal led
+        led = True
+        started = time.monotonic()
+        streamed = await get_resilient_caller().acall(_attempt)
+        record_usage(
+            streamed.message,
+            call_type,
+            params.get("model", DEFAULT_MODEL),
+            streamed.ttft_seconds,
+            latency_seconds=time.monotonic() - started,
+            retries=attempts - 1,
+        )
+        if memo is not None and not streamed.aborted:
+            memo.put(call_type, params, streamed.text)
+        return streamed
+
+    group = get_single_flight()
+    if group is None:
+        return await _send()
+    streamed = await group.ado(STREAM_KEY_PREFIX + memo_key(call_type, params), _send)
+    return streamed if led else replay_stream(streamed.text, streamed.message, on_event)
+
+
+async def map_chunks_async(
+    fn: Callable[[T], Awaitable[R]],
+    chunks: Iterable[T],
+    max_concurrency: int = MAP_REDUCE_MAX_WORKERS,
+) -> list[R]:
+    """Async variant of llm_transform.map_chunks(): at most max_concurrency chunks in flight."""
+    slots = asyncio.Semaphore(max_concurrency)
+    tasks: list[asyncio.Task[R]] = []
+
+    async def _run(chunk: T) -> R:
+        try:
+            return await fn(chunk)
+        finally:
+            slots.release()
+
+    try:
+        for chunk in chunks:
+            await slots.acquire()
+            if any(t.done() and t.exception() is not None for t in tasks):
+                slots.release()
+                break
+            tasks.append(asyncio.create_task(_run(chunk)))
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            _discard(task)
+        raise
+
+
+async def detect_target_audience_async(
+    file_path: Path,
+    client: "AsyncAnthropic",
+    timeout_seconds: int = 30,
+    map_reduce: bool = True,
+) -> TargetAudienceResult:
+    """Async variant of llm_transform.detect_target_audience() (FR-038-target)."""
+    try:
+        content, truncated = read_head(file_path, TARGET_AUDIENCE_CONTENT_CHARS)
+    except FileNotFoundError:
+        raise SpecKitDocsError(
+            message=f"File not found: {file_path}",
+            suggestion="Check that the file path is correct.",
+            file_path=file_path,
+            error_type="File Not Found",
+        )
+
+    async def _detect(chunk: str) -> tuple[int, TargetAudienceResult]:
+        response = await create_message_async(
+            client, build_target_audience_request(chunk), "audience", timeout_seconds
+        )
+        return len(chunk), parse_target_audience_response(get_response_text(response), file_path)
+
+    try:
+        if not (truncated and map_reduce):
+            return (await _detect(content))[1]
+
+        partials = await map_chunks_async(
+            _detect, iter_file_chunks(file_path, TARGET_AUDIENCE_CONTENT_CHARS)
+        )
+        merged = merge_unanimous_audience(partials, file_path)
+        if merged is not None:
+            return merged
+        response = await create_message_async(
+            client, build_target_audience_merge_request(partials), "audience", timeout_seconds
+        )
+        return parse_target_audience_response(get_response_text(response), file_path)
+    except (RateLimitError, APITimeoutError, APIError) as e:
+        raise llm_api_error(e, timeout_seconds, file_path)
+
+
+async def classify_section_async(
+    file_path: Path,
+    heading: str,
+    content: str,
+    client: "AsyncAnthropic",
+    timeout_seconds: int = 30,
+    map_reduce: bool = True,
+) -> SectionClassification:
+    """Async variant of llm_transform.classify_section() (FR-038-classify)."""
+
+    async def _classify(chunk: str) -> tuple[int, SectionClassification]:
+        response = await create_message_async(
+            client, build_section_classification_request(heading, chunk), "classify", timeout_seconds
+        )
+        return len(chunk), parse_section_classification_response(
+            get_response_text(response), file_path, heading
+        )
+
+    try:
+        if not map_reduce or len(content) <= SECTION_CLASSIFICATION_CONTENT_CHARS:
+            return (await _classify(content))[1]
+
+        partials = await map_chunks_async(
+            _classify,
+            iter_markdown_chunks(content.splitlines(keepends=True), SECTION_CLASSIFICATION_CONTENT_CHARS),
+        )
+        merged = merge_unanimous_classification(partials)
+        if merged is not None:
+            return merged
+        response = await create_message_async(
+            client, build_classification_merge_request(heading, partials), "classify", timeout_seconds
+        )
+        return parse_section_classification_response(
+            get_response_text(response), file_path, heading
+        )
+    except (RateLimitError, APITimeoutError, APIError) as e:
+        raise llm_api_error(e, timeout_seconds, file_path)
+
+
+async def classify_sections_async(
+    sections: list[tuple[Path, LLMSection]],
+    client: "AsyncAnthropic",
+    timeout_seconds: int = 60,
+    token_budget: int = CLASSIFICATION_BATCH_TOKEN_BUDGET,
+) -> list[SectionClassification]:
+    """Async variant of llm_transform.classify_sections(); batches are sent concurrently."""
+
+    async def _classify(batch: list[tuple[Path, LLMSection]]) -> list[SectionClassification]:
+        try:
+            response = await create_message_async(
+                client, build_batch_classification_request(batch), "classify", timeout_seconds
+            )
+        except (RateLimitError, APITimeoutError, APIError) as e:
+            raise llm_api_error(e, timeout_seconds, batch[0][0])
+        return parse_batch_classification_response(get_response_text(response), batch)
+
+    batches = plan_classification_batches(sections, token_budget)
+    results = await asyncio.gather(*(_classify(batch) for batch in batches))
+    return [classification for batch_result in results for classification in batch_result]
+
+
+async def detect_inconsistency_async(
+    readme_content: str,
+    quickstart_content: str,
+    client: "AsyncAnthropic",
+    timeout_seconds: int = 30,
+    stream: bool = False,
+) -> InconsistencyDetectionResult:
+    """Async variant of llm_transform.detect_inconsistency() (T065)."""
+    try:
+        params = build_inconsistency_request(readme_content, quickstart_content)
+        if stream:
+            collector = InconsistencyStreamCollector()
+            streamed = await stream_message_async(
+                client, params, "inconsistency", timeout_seconds, collector
+            )
+            return collector.result(streamed)
+        response = await create_message_async(client, params, "inconsistency", timeout_seconds)
+        return parse_inconsistency_response(get_response_text(response))
+    except (RateLimitError, APITimeoutError, APIError) as e:
+        raise llm_api_error(e, timeout_seconds)
+
+
+async def prioritize_sections_async(
+    sections: list[LLMSection],
+    client: "AsyncAnthropic",
+    timeout_seconds: int = 45,
+    stream: bool = False,
+    on_section: Callable[[PrioritizedSection], None] | None = None,
+    preserve_order: bool = False,
+) -> SectionPriorityResult:
+    """Async variant of llm_transform.prioritize_sections() (T067, T068)."""
+    try:
+        params = build_section_priority_request(sections)
+        if stream:
+            collector = SectionPriorityStreamCollector(sections, on_section, preserve_order)
+            streamed = await stream_message_async(
+                client, params, "priority", timeout_seconds, collector
+            )
+            return collector.result(streamed)
+        response = await create_message_async(client, params, "priority", timeout_seconds)
+        return parse_section_priority_response(get_response_text(response), sections, preserve_order)
+    except (RateLimitError, APITimeoutError, APIError) as e:
+        raise llm_api_error(e, timeout_seconds)
+
+
+async def transform_spec_content_async(
+    spec_content: str,
+    client: "AsyncAnthropic",
+    timeout_seconds: int = 60,
+    map_reduce: bool = True,
+) -> LLMTransformResult:
+    """Async variant of llm_transform.transform_spec_content() (T069)."""
+
+    async def _transform(chunk: str) -> str:
+        response = await create_message_async(
+            client, build_spec_transform_request(chunk), "transform", timeout_seconds
+        )
+        check_not_truncated(response)
+        return parse_spec_transform_response(get_response_text(response), chunk).transformed_content
+
+    try:
+        if not map_reduce or await count_tokens_async(spec_content) <= SPEC_TOKEN_LIMIT:
+            response = await create_message_async(
+                client, build_spec_transform_request(spec_content), "transform", timeout_seconds
+            )
+            check_not_truncated(response)
+            return parse_spec_transform_response(get_response_text(response), spec_content)
+
+        # Map: transform each chunk; reduce: join the partial documents in order
+        parts = await map_chunks_async(_transform, split_spec_extract(spec_content))
+    except (RateLimitError, APITimeoutError, APIError) as e:
+        raise llm_api_error(e, timeout_seconds)
+    if len(parts) == 1:
+        return parse_spec_transform_response(parts[0], spec_content)
+
+    try:
+        response = await create_message_async(
+            client, build_spec_merge_request(parts), "transform", timeout_seconds
+        )
+    except (RateLimitError, APITimeoutError, APIError) as e:
+        # Transitions are cosmetic: the parts are joined without them
+        logger.warning("spec.md merge call failed, joining the parts without transitions: %s", e)
+        return parse_spec_transform_response(join_spec_parts(parts), spec_content)
+    return parse_spec_merge_response(response, parts, spec_content)
+
+
+async def integrate_readme_quickstart_async(
+    readme_file: Path,
+    quickstart_file: Path,
+    client: "AsyncAnthropic",
+    stream: bool = False,
+    speculative: bool = False,
+) -> LLMTransformResult:
+    """Async variant of llm_transform.integrate_readme_quickstart() (T065-T068).
+
+    With ``speculative``, prioritization runs as a concurrent task and is
+    cancelled if the files turn out to be inconsistent.
+    """
+    readme_content = readme_file.read_text()
+    quickstart_content = quickstart_file.read_text()
+
+    if not speculative:
+        inconsistency_result = await detect_inconsistency_async(
+            readme_content, quickstart_content, client, stream=stream
+        )
+        if not inconsistency_result.is_consistent:
+            raise inconsistency_error(readme_file, quickstart_file, inconsistency_result)
+
+    all_sections = parse_markdown_sections(readme_content, "README.md") + parse_markdown_sections(
+        quickstart_content, "QUICKSTART.md"
+    )
+
+    if not speculative:
+        priority_result = await prioritize_sections_async(all_sections, client, stream=stream)
+        return build_integrated_result(readme_content, quickstart_content, priority_result)
+
+    priority_task = asyncio.create_task(
+        prioritize_sections_async(all_sections, client, stream=stream)
+    )
+    try:
+        inconsistency_result = await detect_inconsistency_async(
+            readme_content, quickstart_content, client, stream=stream
+        )
+        if not inconsistency_result.is_consistent:
+            raise inconsistency_error(readme_file, quickstart_file, inconsistency_result)
+    except BaseException:
+        _discard(priority_task)
+        raise
+    priority_result = await priority_task
+
+    return build_integrated_result(readme_content, quickstart_content, priority_result)
+
+
+def _discard(task: "asyncio.Task[Any]") -> None:
+    """Cancel a speculative task whose result is no longer needed."""
+    task.cancel()
+    # Retrieve a failure that happened before the cancellation (no "never retrieved" warning)
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+
+def _paired_cache_source(readme_file: Path, quickstart_file: Path) -> str:
+    """Cache source of a README.md + QUICKSTART.md pair."""
+    return readme_file.read_text() + "\n\n---\n\n" + quickstart_file.read_text()
+
+
+def _spec_cache_source(spec_file: Path, map_reduce: bool) -> str:
+    """Cache source of spec.md: its minimal extraction (no token limit with map-reduce)."""
+    token_limit = None if map_reduce else SPEC_TOKEN_LIMIT
+    return extract_spec_minimal(spec_file, token_limit).to_markdown()
+
+
+def _spec_cache_key(spec_content: str) -> str:
+    """Cache key of the whole-document transformation of a spec.md extract."""
+    return transform_cache_key("spec_md_extraction", compute_content_hash(spec_content))
+
+
+def referenced_cache_keys(features: list[Feature], map_reduce: bool = True) -> set[str]:
+    """Cache keys under which the current transformations of features are stored.
+
+    These are the whole-document keys (spec.md extracts, README.md +
+    QUICKSTART.md pairs) and the section keys of spec.md extracts, for the
+    current model routing and prompts (see cache_keys).
+    TransformCache.collect_garbage() compares them by transform type and
+    content hash (cache.cache_key_identity()) and drops the entries of
+    deleted features and outdated content only. Features whose source
+    cannot be selected or extracted refer to nothing.
+
+    Args:
+        features: All current features (not only the changed ones)
+        map_reduce: Whether spec.md extracts are taken without token limit
+
+    Returns:
+        Set of cache keys
+    """
+    keys: set[str] = set()
+    for feature in features:
+        try:
+            source_type, source = select_content_source(feature.directory_path)
+            if source_type == "both":
+                assert isinstance(source, tuple)
+                paired_source = _paired_cache_source(*source)
+                keys.add(transform_cache_key("section_priority", compute_content_hash(paired_source)))
+            elif source_type == "spec":
+                assert isinstance(source, Path)
+                cache_source = _spec_cache_source(source, map_reduce)
+                keys.add(_spec_cache_key(cache_source))
+                keys.update(fragment.key for fragment in split_fragments(cache_source).fragments)
+        except (SpecKitDocsError, OSError):
+            continue
+    return keys
+
+
+class AsyncTransformEngine:
+    """Transform many features concurrently with bounded concurrency.
+
+    Each feature runs its own LLM calls in sequence (inconsistency detection
+    must finish before prioritization), while up to ``max_concurrency``
+    features are processed at once. The first failure cancels the remaining
+    features and is re-raised (no fallback, Session 2025-10-17 Q2).
+
+    Attributes:
+        client: AsyncAnthropic API client
+        max_concurrency: Maximum number of features transformed at once
+        cache: Optional LLM transform cache (FR-038e); unchanged sources skip the LLM
+        stream: Stream the JSON analysis calls (early abort on inconsistency, TTFT)
+        speculative: Prioritize sections in parallel with inconsistency detection
+        section_delta: Re-transform only the changed sections of spec.md extracts
+            (requires cache; see section_delta)
+        delta_stats: Counters of section-level delta transforms
+        map_reduce: Transform spec.md extracts over SPEC_TOKEN_LIMIT tokens in
+            chunks instead of failing (see llm_transform.transform_spec_content())
+        pack: Transform the small spec.md extracts of several features in one
+            request (see transform_packing)
+        pack_stats: Counters of packed transformations
+
+    Example:
+        >>> engine = AsyncTransformEngine(max_concurrency=16)
+        >>> content_map = asyncio.run(engine.transform_features(features))
+        >>> content_map["001-user-auth"]["spec_content"]
+    """
+
+    def __init__(
+        self,
+        client: "AsyncAnthropic | None" = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        cache: TransformCache | None = None,
+        stream: bool = False,
+        speculative: bool = False,
+        section_delta: bool = True,
+        delta_stats: SectionDeltaStats | None = None,
+        map_reduce: bool = True,
+        pack: bool = True,
+        pack_stats: TransformPackStats | None = None,
+    ) -> None:
+        """Initialize the engine.
+
+        Args:
+            client: AsyncAnthropic API client (default: created from ANTHROPIC_API_KEY)
+            max_concurrency: Maximum number of features transformed at once (>= 1)
+            cache: Optional LLM transform cache
+            stream: Stream the JSON analysis calls (default: False)
+            speculative: Prioritize sections speculatively (default: False)
+            section_delta: Cache and re-transform spec.md extracts per section (default: True)
+            delta_stats: Counters to update (default: a new SectionDeltaStats)
+            map_reduce: Transform long spec.md extracts in chunks (default: True)
+            pack: Pack small spec.md transformations across features (default: True)
+            pack_stats: Counters to update (default: a new TransformPackStats)
+
+        Raises:
+            ValueError: If max_concurrency is less than 1
+        """
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be >= 1, got {max_concurrency}")
+
+        self.client = client if client is not None else get_async_anthropic_client()
+        self.max_concurrency = max_concurrency
+        self.cache = cache
+        self.stream = stream
+        self.speculative = speculative
+        self.section_delta = section_delta
+        self.delta_stats = delta_stats if delta_stats is not None else SectionDeltaStats()
+        self.map_reduce = map_reduce
+        self.pack = pack
+        self.pack_stats = pack_stats if pack_stats is not None else TransformPackStats()
+
+    def _extract_spec(self, spec_file: Path) -> str:
+        """Minimal extraction of spec.md (no token limit when map-reduce is on).
+
+        Blocking (the token gate may call the count-tokens API): async code
+        runs it in a worker thread.
+        """
+        return _spec_cache_source(spec_file, self.map_reduce)
+
+    async def transform_feature(self, feature: Feature) -> str:
+        """Transform one feature into end-user Markdown.
+
+        Args:
+            feature: Feature to transform
+
+        Returns:
+            Transformed Markdown content for the feature page
+
+        Raises:
+            SpecKitDocsError: If content selection, extraction, or an LLM call fails
+        """
+        source_type, source = select_content_source(feature.directory_path)
+
+        if source_type in ("readme", "quickstart"):
+            # README.md / QUICKSTART.md alone are used as-is (LLM pass-through)
+            assert isinstance(source, Path)
+            return source.read_text(encoding="utf-8")
+
+        if source_type == "both":
+            assert isinstance(source, tuple)
+            readme_file, quickstart_file = source
+            cache_source = _paired_cache_source(readme_file, quickstart_file)
+            cache_key = transform_cache_key("section_priority", compute_content_hash(cache_source))
+        else:
+            assert isinstance(source, Path)
+            cache_source = await asyncio.to_thread(self._extract_spec, source)
+            cache_key = _spec_cache_key(cache_source)
+
+        if self.cache is not None:
+            cached = self.cache.get_cached_transform(cache_key)
+            if cached is not None:
+                return cached
+
+        if source_type == "both":
+            result = await integrate_readme_quickstart_async(
+                readme_file,
+                quickstart_file,
+                self.client,
+                stream=self.stream,
+                speculative=self.speculative,
+            )
+        else:
+            result = await self._transform_spec(cache_source)
+
+        if self.cache is not None:
+            self.cache.set_cached_transform(cache_key, cache_source, result.transformed_content)
+        return result.transformed_content
+
+    async def _transform_spec(self, spec_content: str) -> LLMTransformResult:
+        """Transform a spec.md extract, sending only uncached sections when possible.
+
+        Falls back to a whole-document transformation when no section is
+        cached, or when the delta result does not keep the section structure
+        or fails the quality check. Whole-document results seed the section
+        cache for the next run. Extracts too long for one call are transformed
+        by map-reduce, without section deltas.
+        """
+        oversized = self.map_reduce and await count_tokens_async(spec_content) > SPEC_TOKEN_LIMIT
+        if self.cache is None or not self.section_delta or oversized:
+            return await transform_spec_content_async(
+                spec_content, self.client, map_reduce=self.map_reduce
+            )
+
+        plan = plan_section_delta(spec_content, self.cache)
+        missing = [plan.document.fragments[i] for i in plan.missing]
+        if plan.is_partial:
+            try:
+                delta = await transform_spec_content_async(
+                    plan.delta_source(), self.client, map_reduce=False
+                )
+                texts = split_transformed(delta.transformed_content, len(missing))
+            except SpecKitDocsError as e:
+                if e.error_type != "LLM Transform Quality Error":
+                    raise
+                texts = None
+            if texts is not None:
+                store_section_transforms(self.cache, missing, texts)
+                self.delta_stats.record(reused=len(plan.cached), sent=len(missing), delta=True)
+                content = plan.assemble(texts)
+                return LLMTransformResult(
+                    transform_type="spec_md_extraction",
+                    source_content=spec_content,
+                    transformed_content=content,
+                    token_count=estimate_token_count(content),
+                )
+
+        result = await transform_spec_content_async(spec_content, self.client, map_reduce=False)
+        self._seed_sections(plan.document.fragments, result)
+        return result
+
+    def _seed_sections(self, fragments: tuple[SectionFragment, ...], result: LLMTransformResult) -> None:
+        """Cache the sections of a whole-document transformation for later deltas."""
+        assert self.cache is not None
+        texts = split_transformed(result.transformed_content, len(fragments))
+        if texts is not None:
+            store_section_transforms(self.cache, fragments, texts)
+        self.delta_stats.record(reused=0, sent=len(fragments), delta=False)
+
+    def _pack_jobs(self, features: list[Feature]) -> list[PackJob]:
+        """Small spec.md extracts that need a whole-document transformation.
+
+        Features whose transformation is cached, or can be done as a section
+        delta, are left to transform_feature(), as are features failing
+        source selection or extraction (the error is raised there).
+        """
+        jobs: list[PackJob] = []
+        for feature in features:
+            try:
+                source_type, source = select_content_source(feature.directory_path)
+                if source_type != "spec":
+                    continue
+                assert isinstance(source, Path)
+                spec_content = self._extract_spec(source)
+            except SpecKitDocsError:
+                continue
+            if not is_packable(spec_content):
+                continue
+            if self.cache is not None:
+                if self.cache.get_cached_transform(_spec_cache_key(spec_content)) is not None:
+                    continue
+                if self.section_delta and plan_section_delta(spec_content, self.cache).is_partial:
+                    continue
+            jobs.append((f"{feature.id}-{feature.name}", spec_content))
+        return jobs
+
+    async def transform_pack(self, jobs: list[PackJob]) -> dict[str, str]:
+        """Transform several small spec.md extracts with one request.
+
+        Only the documents split cleanly from the response and passing the
+        T069 quality check are returned (and cached like single
+        transformations); the caller transforms the others on their own.
+        A failed request (timeout, rate limit or API error, after retries)
+        returns no document, so the whole pack falls back.
+
+        Args:
+            jobs: (feature key, spec.md extract) pairs of one pack
+
+        Returns:
+            Transformed Markdown content by feature key
+        """
+        params = build_packed_transform_request(jobs)
+        timeout_seconds = pack_timeout_seconds(params["max_tokens"])
+        try:
+            response = await create_message_async(self.client, params, "transform", timeout_seconds)
+        except (RateLimitError, APITimeoutError, APIError) as e:
+            logger.warning("Packed transformation of %d documents failed, sending them one by one: %s", len(jobs), e)
+            self.pack_stats.record(packed=0, fallback=len(jobs))
+            return {}
+        parts = split_packed_response(get_response_text(response), [key for key, _ in jobs]) or {}
+
+        contents: dict[str, str] = {}
+        for key, spec_content in jobs:
+            if key not in parts:
+                continue
+            try:
+                result = parse_spec_transform_response(parts[key], spec_content)
+            except SpecKitDocsError as e:
+                if e.error_type != "LLM Transform Quality Error":
+                    raise
+                continue
+            if self.cache is not None:
+                self.cache.set_cached_transform(
+                    _spec_cache_key(spec_content), spec_content, result.transformed_content
+                )
+                if self.section_delta:
+                    self._seed_sections(split_fragments(spec_content).fragments, result)
+            contents[key] = result.transformed_content
+        self.pack_stats.record(packed=len(contents), fallback=len(jobs) - len(contents))
+        return contents
+
+    async def transform_features(self, features: list[Feature]) -> dict[str, dict[str, str]]:
+        """Transform features concurrently.
+
+        Args:
+            features: Features to transform
+
+        With ``pack``, the small spec.md extracts needing a transformation
+        are sent in packs (one request and one concurrency slot per pack);
+        the other features, and packed documents the response did not
+        deliver, run one task each.
+
+        Returns:
+            Mapping of feature keys to transformed content, in feature order
+            Format: {"001-user-auth": {"spec_content": "..."}}
+
+        Raises:
+            SpecKitDocsError: The first failure; remaining features are cancelled
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        by_key = {f"{feature.id}-{feature.name}": feature for feature in features}
+        jobs = await asyncio.to_thread(self._pack_jobs, features) if self.pack else []
+        packs = [pack for pack in plan_transform_packs(jobs) if len(pack) > 1]
+        packed_keys = {key for pack in packs for key, _ in pack}
+
+        async def _run(feature: Feature) -> dict[str, str]:
+            key = f"{feature.id}-{feature.name}"
+            async with semaphore:
+                # Each task runs in its own context: calls are attributed to this feature
+                with feature_scope(key):
+                    return {key: await self.transform_feature(feature)}
+
+        async def _run_pack(pack: list[PackJob]) -> dict[str, str]:
+            async with semaphore:
+                # A packed request is attributed to all of its features
+                with feature_scope("+".join(key for key, _ in pack)):
+                    contents = await self.transform_pack(pack)
+            # Documents the pack did not deliver are transformed on their own
+            for single in await asyncio.gather(
+                *(_run(by_key[key]) for key, _ in pack if key not in contents)
+            ):
+                contents.update(single)
+            return contents
+
+        tasks = [asyncio.create_task(_run(feature)) for key, feature in by_key.items() if key not in packed_keys]
+        tasks += [asyncio.create_task(_run_pack(pack)) for pack in packs]
+        if not tasks:
+            return {}
+
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in done:
+            error = task.exception()
+            if error is not None:
+                for other in pending:
+                    other.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                raise error
+
+        contents: dict[str, str] = {}
+        for task in tasks:
+            contents.update(task.result())
+        return {key: {"spec_content": contents[key]} for key in by_key}
+
+
+def run_transform_engine(
+    features: list[Feature],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    cache: TransformCache | None = None,
+    client: "AsyncAnthropic | None" = None,
+    stream: bool = False,
+    speculative: bool = False,
+    section_delta: bool = True,
+    delta_stats: SectionDeltaStats | None = None,
+    map_reduce: bool = True,
+    pack: bool = True,
+    pack_stats: TransformPackStats | None = None,
+) -> dict[str, dict[str, str]]:
+    """Blocking entry point for AsyncTransformEngine.
+
+    Args:
+        features: Features to transform
+        max_concurrency: Maximum number of features transformed at once
+        cache: Optional LLM transform cache
+        client: AsyncAnthropic API client (default: created from ANTHROPIC_API_KEY)
+        stream: Stream the JSON analysis calls
+        speculative: Prioritize sections in parallel with inconsistency detection
+        section_delta: Re-transform only the changed sections of spec.md extracts
+        delta_stats: Counters of section-level delta transforms to update
+        map_reduce: Transform spec.md extracts over SPEC_TOKEN_LIMIT tokens in chunks
+        pack: Transform small spec.md extracts of several features in one request
+        pack_stats: Counters of packed transformations to update
+
+    Returns:
+        Mapping of feature keys to transformed content
+    """
+
+    async def _run() -> dict[str, dict[str, str]]:
+        # Created inside the loop so the shared async client is bound to it
+        engine = AsyncTransformEngine(
+            client=client,
+            max_concurrency=max_concurrency,
+            cache=cache,
+            stream=stream,
+            speculative=speculative,
+            section_delta=section_delta,
+            delta_stats=delta_stats,
+            map_reduce=map_reduce,
+            pack=pack,
+            pack_stats=pack_stats,
+        )
+        return await engine.transform_features(features)
+
+    return asyncio.run(_run())
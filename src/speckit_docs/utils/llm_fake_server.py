@@ -0,0 +1,647 @@
+"""Local stand-in for the Anthropic API, for deterministic performance testing.
+
+FakeAnthropicServer implements the subset of the Messages API used by
+speckit-docs:
+
+- POST /v1/messages (blocking and ``stream: true`` server-sent events)
+- POST /v1/messages/count_tokens
+- POST /v1/messages/batches, GET /v1/messages/batches/{id} and
+  GET /v1/messages/batches/{id}/results
+
+Responses are canned per prompt type (identified by the system prompt of the
+build_*_request() helpers) and valid for the response parsers, so the whole
+pipeline runs end-to-end without API credits. Latency follows a configurable
+distribution, and 429 / 529 / timeout faults can be injected at random
+(seeded) or queued for the next requests.
+
+Point the pipeline at the server with ``doc_transform --base-url`` (or
+LLMSessionConfig.base_url / ANTHROPIC_BASE_URL); any API key is accepted:
+
+    uv run python -m speckit_docs.utils.llm_fake_server --port 8765 --latency 0.8
+    ANTHROPIC_API_KEY=fake uv run python -m speckit_docs.scripts.doc_transform \\
+        --output transformed.json --base-url http://127.0.0.1:8765
+"""
+
+import json
+import math
+import random
+import re
+import sys
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Literal
+
+import typer
+from rich.console import Console
+
+LatencyDistribution = Literal["constant", "uniform", "normal", "lognormal"]
+FaultKind = Literal["rate_limit", "overloaded", "timeout"]
+
+# Call type of each canned response; "classify_batch" is batched classification,
+# "transform_pack" a packed transformation of several spec.md extracts, "merge" the
+# transitions between the partial documents of a map-reduced spec.md transformation
+FakeCallKind = Literal[
+    "audience",
+    "classify",
+    "classify_batch",
+    "inconsistency",
+    "merge",
+    "priority",
+    "transform",
+    "transform_pack",
+]
+
+# Passes the T069 quality check of spec.md transformations
+CANNED_TRANSFORM_TEXT = (
+    "## ユーザーストーリーの目的\n\n"
+    "この機能を使うと、コマンドを一つ実行するだけでプロジェクトのドキュメントを簡単に作成できます。"
+)
+
+
+@dataclass(frozen=True)
+class LatencyProfile:
+    """Distribution of the server-side latency of a response.
+
+    Attributes:
+        distribution: constant (mean), uniform (mean ± spread), normal
+            (standard deviation spread) or lognormal (median mean, sigma spread)
+        mean_seconds: Mean (median for lognormal) latency
+        spread_seconds: Width of the distribution (see distribution)
+        stream_chunk_seconds: Delay between streamed text chunks
+    """
+
+    distribution: LatencyDistribution = "constant"
+    mean_seconds: float = 0.0
+    spread_seconds: float = 0.0
+    stream_chunk_seconds: float = 0.0
+
+    def __post_init__(self) -> None:
+        """Validation rules."""
+        if self.mean_seconds < 0 or self.spread_seconds < 0 or self.stream_chunk_seconds < 0:
+            raise ValueError("latencies must be >= 0")
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw a latency in seconds (never negative)."""
+        if self.distribution == "uniform":
+            value = rng.uniform(self.mean_seconds - self.spread_seconds, self.mean_seconds + self.spread_seconds)
+        elif self.distribution == "normal":
+            value = rng.gauss(self.mean_seconds, self.spread_seconds)
+        elif self.distribution == "lognormal":
+            value = self.mean_seconds * math.exp(rng.gauss(0.0, self.spread_seconds)) if self.mean_seconds else 0.0
+        else:
+            value = self.mean_seconds
+        return max(0.0, value)
+
+
+@dataclass(frozen=True)
+class FakeServerConfig:
+    """Behaviour of a FakeAnthropicServer.
+
+    Attributes:
+        latency: Latency of /v1/messages responses
+        rate_limit_probability: Probability of answering 429 rate_limit_error
+        overloaded_probability: Probability of answering 529 overloaded_error
+        timeout_probability: Probability of holding the response for timeout_seconds
+        timeout_seconds: How long a "timeout" fault holds the response
+            (longer than the client timeout, so the client gives up)
+        retry_after_seconds: retry-after header of injected 429 responses (None: omitted)
+        seed: Seed of the random faults and latencies
+        batch_polls_until_ended: Batch status polls before a batch has ended
+        tool_use: Answer requests forcing a tool call with a tool_use block
+            (False: answer with text, like a server without tool support)
+    """
+
+    latency: LatencyProfile = field(default_factory=LatencyProfile)
+    rate_limit_probability: float = 0.0
+    overloaded_probability: float = 0.0
+    timeout_probability: float = 0.0
+    timeout_seconds: float = 5.0
+    retry_after_seconds: float | None = None
+    seed: int = 0
+    batch_polls_until_ended: int = 2
+    tool_use: bool = True
+
+    def __post_init__(self) -> None:
+        """Validation rules."""
+        probabilities = (self.rate_limit_probability, self.overloaded_probability, self.timeout_probability)
+        if any(not 0.0 <= p <= 1.0 for p in probabilities) or sum(probabilities) > 1.0:
+            raise ValueError("fault probabilities must be within [0, 1] and sum to at most 1")
+        if self.batch_polls_until_ended < 0:
+            raise ValueError(f"batch_polls_until_ended must be >= 0, got {self.batch_polls_until_ended}")
+
+
+def _system_text(params: dict[str, Any]) -> str:
+    system = params.get("system", "")
+    if isinstance(system, list):
+        return "".join(str(block.get("text", "")) for block in system)
+    return str(system)
+
+
+def _user_text(params: dict[str, Any]) -> str:
+    messages = params.get("messages") or [{}]
+    content = messages[0].get("content", "")
+    if isinstance(content, list):
+        return "".join(str(block.get("text", "")) for block in content)
+    return str(content)
+
+
+def classify_request(params: dict[str, Any]) -> FakeCallKind:
+    """Identify the prompt type of a request by its system prompt.
+
+    Args:
+        params: messages.create() parameters
+
+    Returns:
+        Kind of call ("transform" for unknown prompts)
+    """
+    from speckit_docs.utils import llm_transform, transform_packing
+
+    prompts: dict[str, FakeCallKind] = {
+        llm_transform.TARGET_AUDIENCE_PROMPT.strip(): "audience",
+        llm_transform.TARGET_AUDIENCE_MERGE_PROMPT.strip(): "audience",
+        llm_transform.SECTION_CLASSIFICATION_PROMPT.strip(): "classify",
+        llm_transform.SECTION_CLASSIFICATION_MERGE_PROMPT.strip(): "classify",
+        llm_transform.BATCH_SECTION_CLASSIFICATION_PROMPT.strip(): "classify_batch",
+        llm_transform.INCONSISTENCY_DETECTION_PROMPT.strip(): "inconsistency",
+        llm_transform.SECTION_PRIORITY_PROMPT.strip(): "priority",
+        llm_transform.SPEC_TRANSFORM_PROMPT.strip(): "transform",
+        llm_transform.SPEC_MERGE_PROMPT.strip(): "merge",
+        transform_packing.SPEC_PACK_TRANSFORM_PROMPT.strip(): "transform_pack",
+    }
+    return prompts.get(_system_text(params).strip(), "transform")
+
+
+def _json_list_after(text: str, marker: str) -> list[dict[str, Any]]:
+    """Parse the JSON list following marker in a user message ([] if absent)."""
+    if marker not in text:
+        return []
+    try:
+        items = json.loads(text.split(marker, 1)[1].strip().split("\n\n", 1)[0])
+    except json.JSONDecodeError:
+        return []
+    return items if isinstance(items, list) else []
+
+
+def canned_response_text(params: dict[str, Any]) -> str:
+    """Deterministic response text for a request, valid for its response parser.
+
+    - inconsistency: consistent
+    - priority: every section, in request order
+    - classify / classify_batch: "both" with confidence 0.9
+    - audience: end_user with confidence 0.9
+    - transform: CANNED_TRANSFORM_TEXT
+    - transform_pack: CANNED_TRANSFORM_TEXT in a <document> tag per packed key
+    - merge: no transitions
+
+    Args:
+        params: messages.create() parameters
+
+    Returns:
+        Response text
+    """
+    kind = classify_request(params)
+    user_text = _user_text(params)
+    if kind == "inconsistency":
+        return json.dumps({"is_consistent": True, "inconsistencies": [], "summary": "Consistent."})
+    if kind == "priority":
+        sections = _json_list_after(user_text, "**Sections from README.md and QUICKSTART.md:**")
+        return json.dumps(
+            {
+                "prioritized_sections": [
+                    {"file": s.get("file"), "heading": s.get("heading"), "priority": i, "reason": "Canned"}
+                    for i, s in enumerate(sections, start=1)
+                ]
+            },
+            ensure_ascii=False,
+        )
+    if kind == "classify_batch":
+        items = _json_list_after(user_text, "**Sections (JSON list):**")
+        return json.dumps(
+            {
+                "classifications": [
+                    {"index": item.get("index"), "section_type": "both", "confidence": 0.9}
+                    for item in items
+                ]
+            }
+        )
+    if kind == "classify":
+        return json.dumps({"section_type": "both", "confidence": 0.9, "reasoning": "Canned"})
+    if kind == "audience":
+        return json.dumps({"audience_type": "end_user", "confidence": 0.9, "reasoning": "Canned"})
+    if kind == "merge":
+        return json.dumps({"transitions": []})
+    if kind == "transform_pack":
+        return "\n\n".join(
+            f'<document key="{key}">\n{CANNED_TRANSFORM_TEXT}\n</document>'
+            for key in re.findall(r'<document key="([^"]*)">', user_text)
+        )
+    return CANNED_TRANSFORM_TEXT
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def _min_cacheable_tokens(model: str) -> int:
+    """Shortest prompt prefix, in tokens, that the API caches for model (Haiku needs more)."""
+    return 2048 if "haiku" in model else 1024
+
+
+class FakeAnthropicServer(ThreadingHTTPServer):
+    """Stand-in for the Messages API endpoints used by speckit-docs.
+
+    Attributes:
+        config: Server behaviour
+        requests: Parameters of every /v1/messages request, in arrival order
+        faults_injected: Faults answered so far, by kind
+        batches: Submitted batches by id
+        errored_custom_ids: Batch requests answered with an "errored" result
+        responder: Function producing the response text of a request
+    """
+
+    daemon_threads = True
+    block_on_close = False
+
+    def __init__(
+        self,
+        config: FakeServerConfig | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        responder: Callable[[dict[str, Any]], str] = canned_response_text,
+    ) -> None:
+        """Bind the server (port 0: any free port); serve with start() or serve_forever().
+
+        Args:
+            config: Server behaviour (default: FakeServerConfig())
+            host: Interface to bind
+            port: Port to bind
+            responder: Function producing the response text of a request
+        """
+        super().__init__((host, port), _FakeAnthropicHandler)
+        self.config = config if config is not None else FakeServerConfig()
+        self.responder = responder
+        self._lock = threading.Lock()
+        self._rng = random.Random(self.config.seed)
+        self._queued_faults: deque[FaultKind] = deque()
+        self._cached_prefixes: set[str] = set()
+        self._thread: threading.Thread | None = None
+        self.requests: list[dict[str, Any]] = []
+        self.faults_injected: dict[FaultKind, int] = {}
+        self.batches: dict[str, dict[str, Any]] = {}
+        self.errored_custom_ids: set[str] = set()
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to configure the Anthropic client with."""
+        host, port = self.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def start(self) -> "FakeAnthropicServer":
+        """Serve in a daemon thread; returns self."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and release the socket."""
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self) -> "FakeAnthropicServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def inject(self, *faults: FaultKind) -> None:
+        """Answer the next /v1/messages requests with these faults, in order."""
+        with self._lock:
+            self._queued_faults.extend(faults)
+
+    def next_fault(self) -> FaultKind | None:
+        """Fault to answer the current request with (queued first, then random)."""
+        with self._lock:
+            if self._queued_faults:
+                fault: FaultKind | None = self._queued_faults.popleft()
+            else:
+                draw = self._rng.random()
+                fault = None
+                for kind, probability in (
+                    ("rate_limit", self.config.rate_limit_probability),
+                    ("overloaded", self.config.overloaded_probability),
+                    ("timeout", self.config.timeout_probability),
+                ):
+                    if draw < probability:
+                        fault = kind  # type: ignore[assignment]
+                        break
+                    draw -= probability
+            if fault is not None:
+                self.faults_injected[fault] = self.faults_injected.get(fault, 0) + 1
+            return fault
+
+    def sample_latency(self) -> float:
+        """Draw a response latency from the configured distribution."""
+        with self._lock:
+            return self.config.latency.sample(self._rng)
+
+    def record_request(self, params: dict[str, Any]) -> None:
+        """Remember the parameters of a /v1/messages request."""
+        with self._lock:
+            self.requests.append(params)
+
+    def build_message(self, params: dict[str, Any], text: str, message_id: str) -> dict[str, Any]:
+        """Message JSON for a response, with prompt cache usage counters.
+
+        The first request with a given cache_control system prompt writes it
+        to the cache; later ones read it. Like the API, a marked prompt shorter
+        than the minimum cacheable prefix of the model is not cached. A request
+        forcing a tool call gets the canned JSON as the input of a tool_use block.
+        """
+        system = _system_text(params)
+        system_tokens = _estimate_tokens(system) if system else 0
+        cacheable = (
+            isinstance(params.get("system"), list)
+            and any("cache_control" in block for block in params["system"])
+            and system_tokens >= _min_cacheable_tokens(str(params.get("model", "")))
+        )
+        cache_creation = cache_read = 0
+        if cacheable:
+            with self._lock:
+                if system in self._cached_prefixes:
+                    cache_read = system_tokens
+                else:
+                    self._cached_prefixes.add(system)
+                    cache_creation = system_tokens
+        input_tokens = _estimate_tokens(_user_text(params)) + (0 if cacheable else system_tokens)
+        tool_choice = params.get("tool_choice") or {}
+        content: dict[str, Any] = {"type": "text", "text": text}
+        if self.config.tool_use and tool_choice.get("type") == "tool":
+            content = {
+                "type": "tool_use",
+                "id": f"toolu_{message_id}",
+                "name": tool_choice["name"],
+                "input": json.loads(text),
+            }
+        return {
+            "id": message_id,
+            "type": "message",
+            "role": "assistant",
+            "model": params.get("model", "claude-fake"),
+            "content": [content],
+            "stop_reason": "tool_use" if content["type"] == "tool_use" else "end_turn",
+            "stop_sequence": None,
+            "usage": {
+                "input_tokens": input_tokens,
+                "output_tokens": _estimate_tokens(text),
+                "cache_creation_input_tokens": cache_creation,
+                "cache_read_input_tokens": cache_read,
+            },
+        }
+
+
+class _FakeAnthropicHandler(BaseHTTPRequestHandler):
+    server: FakeAnthropicServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _read_json(self) -> dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        body: dict[str, Any] = json.loads(self.rfile.read(length)) if length else {}
+        return body
+
+    def _send(
+        self,
+        status: int,
+        body: bytes,
+        content_type: str = "application/json",
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, data: Any, headers: dict[str, str] | None = None) -> None:
+        self._send(status, json.dumps(data, ensure_ascii=False).encode(), headers=headers)
+
+    def _send_error(self, status: int, error_type: str, message: str, headers: dict[str, str] | None = None) -> None:
+        self._send_json(status, {"type": "error", "error": {"type": error_type, "message": message}}, headers)
+
+    def do_POST(self) -> None:
+        path = self.path.split("?", 1)[0].rstrip("/")
+        body = self._read_json()
+        if path == "/v1/messages":
+            self._messages(body)
+        elif path == "/v1/messages/count_tokens":
+            self._send_json(200, {"input_tokens": _estimate_tokens(_system_text(body) + _user_text(body))})
+        elif path == "/v1/messages/batches":
+            self._create_batch(body)
+        else:
+            self._send_error(404, "not_found_error", f"Unknown endpoint: {path}")
+
+    def do_GET(self) -> None:
+        parts = self.path.split("?", 1)[0].strip("/").split("/")
+        if len(parts) < 4 or parts[:3] != ["v1", "messages", "batches"] or parts[3] not in self.server.batches:
+            self._send_error(404, "not_found_error", f"Unknown endpoint: {self.path}")
+        elif len(parts) == 5 and parts[4] == "results":
+            self._batch_results(parts[3])
+        else:
+            self.server.batches[parts[3]]["polls"] += 1
+            self._send_json(200, self._batch_json(parts[3]))
+
+    def _messages(self, params: dict[str, Any]) -> None:
+        server = self.server
+        server.record_request(params)
+        fault = server.next_fault()
+        if fault == "rate_limit":
+            retry_after = server.config.retry_after_seconds
+            headers = {"retry-after": f"{retry_after:g}"} if retry_after is not None else None
+            self._send_error(429, "rate_limit_error", "Injected rate limit", headers)
+            return
+        if fault == "overloaded":
+            self._send_error(529, "overloaded_error", "Injected overload")
+            return
+        if fault == "timeout":
+            # Hold the response until the client has given up, then drop the connection
+            time.sleep(server.config.timeout_seconds)
+            self.close_connection = True
+            return
+
+        time.sleep(server.sample_latency())
+        message = server.build_message(params, server.responder(params), f"msg_fake_{len(server.requests):06d}")
+        if params.get("stream"):
+            self._stream(message)
+        else:
+            self._send_json(200, message)
+
+    def _stream(self, message: dict[str, Any]) -> None:
+        """Send a message as server-sent events (message_start ... message_stop)."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.close_connection = True
+        self.end_headers()
+
+        def _event(name: str, data: dict[str, Any]) -> None:
+            payload = json.dumps({"type": name, **data}, ensure_ascii=False)
+            self.wfile.write(f"event: {name}\ndata: {payload}\n\n".encode())
+            self.wfile.flush()
+
+        block = message["content"][0]
+        usage = message["usage"]
+        _event(
+            "message_start",
+            {"message": {**message, "content": [], "stop_reason": None, "usage": {**usage, "output_tokens": 1}}},
+        )
+        if block["type"] == "tool_use":
+            text = json.dumps(block["input"], ensure_ascii=False)
+            _event("content_block_start", {"index": 0, "content_block": {**block, "input": {}}})
+        else:
+            text = block["text"]
+            _event("content_block_start", {"index": 0, "content_block": {"type": "text", "text": ""}})
+        chunk_delay = self.server.config.latency.stream_chunk_seconds
+        for start in range(0, len(text), 32):
+            if start and chunk_delay:
+                time.sleep(chunk_delay)
+            piece = text[start : start + 32]
+            delta = (
+                {"type": "input_json_delta", "partial_json": piece}
+                if block["type"] == "tool_use"
+                else {"type": "text_delta", "text": piece}
+            )
+            _event("content_block_delta", {"index": 0, "delta": delta})
+        _event("content_block_stop", {"index": 0})
+        _event(
+            "message_delta",
+            {
+                "delta": {"stop_reason": message["stop_reason"], "stop_sequence": None},
+                "usage": {"output_tokens": usage["output_tokens"]},
+            },
+        )
+        _event("message_stop", {})
+
+    def _create_batch(self, body: dict[str, Any]) -> None:
+        server = self.server
+        with server._lock:
+            batch_id = f"msgbatch_{len(server.batches) + 1:04d}"
+            server.batches[batch_id] = {"requests": body.get("requests", []), "polls": 0}
+        self._send_json(200, self._batch_json(batch_id))
+
+    def _batch_json(self, batch_id: str) -> dict[str, Any]:
+        batch = self.server.batches[batch_id]
+        ended = batch["polls"] >= self.server.config.batch_polls_until_ended
+        count = len(batch["requests"])
+        errored = sum(1 for r in batch["requests"] if r.get("custom_id") in self.server.errored_custom_ids)
+        return {
+            "id": batch_id,
+            "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": {
+                "processing": 0 if ended else count,
+                "succeeded": count - errored if ended else 0,
+                "errored": errored if ended else 0,
+                "canceled": 0,
+                "expired": 0,
+            },
+            "created_at": "2025-10-18T00:00:00Z",
+            "expires_at": "2025-10-19T00:00:00Z",
+            "ended_at": "2025-10-18T01:00:00Z" if ended else None,
+            "cancel_initiated_at": None,
+            "archived_at": None,
+            "results_url": f"{self.server.base_url}/v1/messages/batches/{batch_id}/results" if ended else None,
+        }
+
+    def _batch_results(self, batch_id: str) -> None:
+        server = self.server
+        lines = []
+        for request in server.batches[batch_id]["requests"]:
+            custom_id = request["custom_id"]
+            if custom_id in server.errored_custom_ids:
+                result: dict[str, Any] = {
+                    "type": "errored",
+                    "error": {"type": "error", "error": {"type": "api_error", "message": "Injected error"}},
+                }
+            else:
+                params = request["params"]
+                result = {
+                    "type": "succeeded",
+                    "message": server.build_message(params, server.responder(params), f"msg_{custom_id}"),
+                }
+            lines.append(json.dumps({"custom_id": custom_id, "result": result}, ensure_ascii=False))
+        self._send(200, "\n".join(lines).encode(), "application/binary")
+
+
+app = typer.Typer()
+console = Console()
+
+
+@app.command()
+def main(
+    host: str = typer.Option("127.0.0.1", "--host", help="Interface to bind"),
+    port: int = typer.Option(8765, "--port", min=0, help="Port to bind (0: any free port)"),
+    distribution: str = typer.Option(
+        "lognormal", "--distribution", help="Latency distribution: constant, uniform, normal or lognormal"
+    ),
+    latency: float = typer.Option(0.5, "--latency", min=0.0, help="Mean (lognormal: median) latency in seconds"),
+    spread: float = typer.Option(0.3, "--spread", min=0.0, help="Spread of the latency distribution"),
+    rate_limit: float = typer.Option(0.0, "--rate-limit", min=0.0, max=1.0, help="Probability of a 429 response"),
+    overloaded: float = typer.Option(0.0, "--overloaded", min=0.0, max=1.0, help="Probability of a 529 response"),
+    timeout: float = typer.Option(0.0, "--timeout", min=0.0, max=1.0, help="Probability of a response that never arrives"),
+    seed: int = typer.Option(0, "--seed", help="Seed of the random faults and latencies"),
+    tool_use: bool = typer.Option(
+        True, "--tool-use/--no-tool-use", help="Answer forced tool calls with tool_use blocks (off: text answers)"
+    ),
+) -> int:
+    """Serve the fake Anthropic API until interrupted.
+
+    Args:
+        host: Interface to bind
+        port: Port to bind
+        distribution: Latency distribution
+        latency: Mean latency in seconds
+        spread: Spread of the latency distribution
+        rate_limit: Probability of injecting 429 rate_limit_error
+        overloaded: Probability of injecting 529 overloaded_error
+        timeout: Probability of injecting a timeout
+        seed: Random seed
+        tool_use: Answer forced tool calls with tool_use blocks
+    """
+    if distribution not in ("constant", "uniform", "normal", "lognormal"):
+        console.print(f"[red]✗[/red] 不明なレイテンシ分布です: {distribution}", style="bold")
+        return 1
+    dist: LatencyDistribution = distribution  # type: ignore[assignment]
+    try:
+        config = FakeServerConfig(
+            latency=LatencyProfile(distribution=dist, mean_seconds=latency, spread_seconds=spread),
+            rate_limit_probability=rate_limit,
+            overloaded_probability=overloaded,
+            timeout_probability=timeout,
+            seed=seed,
+            tool_use=tool_use,
+        )
+    except ValueError as e:
+        console.print(f"[red]✗[/red] 設定が不正です: {e}", style="bold")
+        return 1
+
+    server = FakeAnthropicServer(config, host=host, port=port)
+    console.print(f"[green]✓[/green] Fake Anthropic API: {server.base_url}（Ctrl+C で停止）")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(app())
@@ -0,0 +1,219 @@
+"""Memoization of LLM analysis calls.
+
+LLMTransformCache (FR-038e) only stores transformed content. The analysis
+calls (inconsistency detection, section prioritization, section
+classification, target audience detection) would otherwise be recomputed on
+every run, even when README.md / QUICKSTART.md are byte-identical.
+
+LLMCallMemo stores the response text of these calls keyed on:
+
+- call type
+- prompt version (hash of the system prompt, so editing a prompt
+  invalidates its entries)
+- model
+- input hash (messages and the remaining request parameters)
+
+llm_transform.create_message() / stream_message() and their async variants
+consult the process-wide memo before sending a request, so every function
+built on them (detect_inconsistency, prioritize_sections, classify_section,
+detect_target_audience, ...) skips the network for unchanged inputs.
+Memoization is disabled until a memo is installed with set_llm_memo()
+(doc_transform installs a persistent one).
+"""
+
+import hashlib
+import json
+import threading
+from collections.abc import Iterable
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from speckit_docs.llm_entities import LLMCallType
+
+# Bump when the stored format or the response parsing changes incompatibly
+MEMO_FORMAT_VERSION = 1
+
+# Call types memoized by default ("transform" output is kept in LLMTransformCache)
+ANALYSIS_CALL_TYPES: frozenset[LLMCallType] = frozenset(
+    {"audience", "classify", "inconsistency", "priority"}
+)
+
+
+def _digest(value: Any) -> str:
+    """SHA-256 of the canonical JSON encoding of value."""
+    encoded = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def prompt_version(params: dict[str, Any]) -> str:
+    """Version of the prompt used by a request (hash of its system prompt)."""
+    system = params.get("system", "")
+    if isinstance(system, list):
+        system = "".join(str(block.get("text", "")) for block in system)
+    return hashlib.sha256(str(system).encode("utf-8")).hexdigest()[:16]
+
+
+def memo_key(call_type: LLMCallType, params: dict[str, Any]) -> str:
+    """Memo key of a request: (call type, prompt version, model, input hash).
+
+    Args:
+        call_type: Kind of call
+        params: Request parameters from one of the build_*_request() helpers
+
+    Returns:
+        Key string "<call_type>:<prompt_version>:<model>:<input_hash>"
+    """
+    inputs = {k: v for k, v in params.items() if k not in ("system", "model")}
+    return ":".join(
+        [call_type, prompt_version(params), str(params.get("model", "")), _digest(inputs)]
+    )
+
+
+class LLMCallMemo:
+    """Response text of LLM analysis calls keyed by memo_key().
+
+    Entries live in memory and, when ``cache_file`` is given, are persisted as
+    JSON next to the LLM transform cache (.claude/.cache/llm-analysis.json).
+
+    Attributes:
+        hits: Lookups answered from the memo
+        misses: Lookups that had to call the API
+    """
+
+    def __init__(
+        self,
+        cache_file: Path | None = None,
+        call_types: Iterable[LLMCallType] = ANALYSIS_CALL_TYPES,
+    ) -> None:
+        """Initialize an empty memo.
+
+        Args:
+            cache_file: JSON file to load from / save to (None: in memory only)
+            call_types: Call types to memoize
+        """
+        self._cache_file = cache_file
+        self.call_types = frozenset(call_types)
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict[str, str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """Number of memoized responses."""
+        with self._lock:
+            return len(self._entries)
+
+    def load(self) -> None:
+        """Load entries from the cache file.
+
+        A missing, corrupted or outdated (other MEMO_FORMAT_VERSION) file
+        yields an empty memo.
+        """
+        entries: dict[str, dict[str, str]] = {}
+        if self._cache_file is not None and self._cache_file.exists():
+            try:
+                with open(self._cache_file, encoding="utf-8") as f:
+                    data = json.load(f)
+                if isinstance(data, dict) and data.get("version") == MEMO_FORMAT_VERSION:
+                    entries = data.get("entries", {})
+            except (OSError, json.JSONDecodeError):
+                # Gracefully handle corrupted memo file
+                entries = {}
+        with self._lock:
+            self._entries = entries
+
+    def save(self) -> None:
+        """Write entries to the cache file (no-op for an in-memory memo)."""
+        if self._cache_file is None:
+            return
+        with self._lock:
+            data = {"version": MEMO_FORMAT_VERSION, "entries": dict(self._entries)}
+        self._cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self._cache_file, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+    def get(self, call_type: LLMCallType, params: dict[str, Any]) -> str | None:
+        """Return the memoized response text of a request (None on a miss).
+
+        Call types that are not memoized always miss without being counted.
+        """
+        if call_type not in self.call_types:
+            return None
+        key = memo_key(call_type, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry["response_text"]
+
+    def put(self, call_type: LLMCallType, params: dict[str, Any], text: str) -> None:
+        """Memoize the response text of a request.
+
+        Responses that are not valid JSON are not stored, so a malformed
+        answer is retried on the next run instead of being replayed.
+        """
+        if call_type not in self.call_types:
+            return
+        try:
+            json.loads(text)
+        except (TypeError, ValueError):
+            return
+        key = memo_key(call_type, params)
+        with self._lock:
+            self._entries[key] = {
+                "call_type": call_type,
+                "model": str(params.get("model", "")),
+                "response_text": text,
+                "timestamp": datetime.now().isoformat(),
+            }
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+
+class MemoizedMessage:
+    """Stand-in for an anthropic Message answered from the memo (no usage)."""
+
+    def __init__(self, text: str) -> None:
+        """Wrap memoized response text as a single text content block."""
+        self.content = [_MemoizedTextBlock(text)]
+        self.usage = None
+
+
+class _MemoizedTextBlock:
+    """Text content block of a MemoizedMessage."""
+
+    type = "text"
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+
+_memo: LLMCallMemo | None = None
+_memo_lock = threading.Lock()
+
+
+def get_llm_memo() -> LLMCallMemo | None:
+    """Return the process-wide analysis memo (None: memoization disabled)."""
+    with _memo_lock:
+        return _memo
+
+
+def set_llm_memo(memo: LLMCallMemo | None) -> LLMCallMemo | None:
+    """Install (or, with None, remove) the process-wide analysis memo.
+
+    Args:
+        memo: New memo, or None to disable memoization
+
+    Returns:
+        The previous memo
+    """
+    global _memo
+    with _memo_lock:
+        previous, _memo = _memo, memo
+        return previous
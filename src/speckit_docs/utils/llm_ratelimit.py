@@ -0,0 +1,343 @@
+"""Adaptive (AIMD) concurrency control for LLM calls.
+
+A fixed concurrency is either too timid or triggers 429 storms depending on
+the organisation's rate-limit tier and the time of day. AdaptiveRateLimiter
+caps the number of in-flight LLM requests and adapts the cap:
+
+- additive increase: the limit grows by about one per window of successful calls
+- multiplicative decrease: a 429 (RateLimitError) cuts the limit by ``decrease_factor``
+- pre-emptive throttling: the ``anthropic-ratelimit-*`` response headers
+  (requests / input tokens / output tokens remaining and reset times) are
+  tracked, and a call waits for the reset when its estimated tokens would
+  exceed what is left in the current window
+
+Headers are fed by an httpx response hook installed by LLMSession, so every
+call made through the shared clients contributes. llm_transform.create_message()
+and llm_engine.create_message_async() hold a slot for each request attempt.
+"""
+
+import asyncio
+import threading
+import time
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import TypeVar
+
+from speckit_docs.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+RATELIMIT_HEADER_PREFIX = "anthropic-ratelimit-"
+
+
+@dataclass
+class _Bucket:
+    """Remaining capacity of one rate-limit dimension until ``reset_at``."""
+
+    remaining: int
+    reset_at: datetime
+
+
+def _parse_reset(value: str) -> datetime | None:
+    """Parse an RFC 3339 reset timestamp."""
+    try:
+        reset_at = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return reset_at if reset_at.tzinfo is not None else reset_at.replace(tzinfo=UTC)
+
+
+class RateLimitState:
+    """Last known rate-limit windows from ``anthropic-ratelimit-*`` headers.
+
+    Dimensions are "requests", "input-tokens" and "output-tokens". Capacity
+    reserved by calls in flight is subtracted locally until the next response
+    reports fresh numbers.
+    """
+
+    DIMENSIONS = ("requests", "input-tokens", "output-tokens")
+
+    def __init__(self, now: Callable[[], datetime] = lambda: datetime.now(UTC)) -> None:
+        """Initialize an empty state.
+
+        Args:
+            now: Wall clock returning an aware datetime (injectable for tests)
+        """
+        self._now = now
+        self._lock = threading.Lock()
+        self._buckets: dict[str, _Bucket] = {}
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        """Record the rate-limit windows reported by a response."""
+        with self._lock:
+            for dimension in self.DIMENSIONS:
+                remaining = headers.get(f"{RATELIMIT_HEADER_PREFIX}{dimension}-remaining")
+                reset = headers.get(f"{RATELIMIT_HEADER_PREFIX}{dimension}-reset")
+                if remaining is None or reset is None:
+                    continue
+                reset_at = _parse_reset(reset)
+                try:
+                    remaining_count = int(remaining)
+                except ValueError:
+                    continue
+                if reset_at is not None:
+                    self._buckets[dimension] = _Bucket(remaining_count, reset_at)
+
+    def remaining(self, dimension: str) -> int | None:
+        """Remaining capacity of a dimension in the current window (None if unknown or reset)."""
+        with self._lock:
+            bucket = self._buckets.get(dimension)
+            if bucket is None or bucket.reset_at <= self._now():
+                return None
+            return bucket.remaining
+
+    def reserve(self, input_tokens: int, output_tokens: int) -> float:
+        """Reserve capacity for one request.
+
+        Args:
+            input_tokens: Estimated input tokens of the request
+            output_tokens: Expected output tokens (max_tokens)
+
+        Returns:
+            Seconds to wait before sending (0.0 when capacity is available);
+            nothing is reserved when a wait is required
+        """
+        needed = {"requests": 1, "input-tokens": input_tokens, "output-tokens": output_tokens}
+        with self._lock:
+            now = self._now()
+            wait = 0.0
+            for dimension, amount in needed.items():
+                bucket = self._buckets.get(dimension)
+                if bucket is None or bucket.reset_at <= now:
+                    continue
+                if bucket.remaining < amount:
+                    wait = max(wait, (bucket.reset_at - now).total_seconds())
+            if wait > 0:
+                return wait
+            for dimension, amount in needed.items():
+                bucket = self._buckets.get(dimension)
+                if bucket is not None and bucket.reset_at > now:
+                    bucket.remaining -= amount
+            return 0.0
+
+
+class AdaptiveRateLimiter:
+    """AIMD limit on in-flight LLM requests plus header-driven throttling.
+
+    Usable from threads (acquire/release) and from any event loop
+    (acquire_async/release).
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        decrease_factor: float = 0.5,
+        decrease_interval_seconds: float = 1.0,
+        max_throttle_seconds: float = 60.0,
+        state: RateLimitState | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        async_sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        """Initialize the limiter.
+
+        Args:
+            initial_limit: Starting number of concurrent requests
+            min_limit: Lower bound of the limit
+            max_limit: Upper bound of the limit
+            decrease_factor: Multiplier applied to the limit on a 429 (0 < f < 1)
+            decrease_interval_seconds: 429s within this interval count as one decrease
+            max_throttle_seconds: Upper bound of a single pre-emptive wait
+            state: Rate-limit header state (default: new RateLimitState)
+            clock: Monotonic clock (injectable for tests)
+            sleep: Blocking sleep used for pre-emptive throttling (injectable for tests)
+            async_sleep: Async sleep used for pre-emptive throttling (injectable for tests)
+
+        Raises:
+            ValueError: If the limits or decrease_factor are out of range
+        """
+        if not (1 <= min_limit <= initial_limit <= max_limit):
+            raise ValueError(
+                f"expected 1 <= min_limit <= initial_limit <= max_limit, got {min_limit}, {initial_limit}, {max_limit}"
+            )
+        if not (0 < decrease_factor < 1):
+            raise ValueError(f"decrease_factor must be between 0 and 1, got {decrease_factor}")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        self.decrease_interval_seconds = decrease_interval_seconds
+        self.max_throttle_seconds = max_throttle_seconds
+        self.state = state if state is not None else RateLimitState()
+        self._clock = clock
+        self._sleep = sleep
+        self._async_sleep = async_sleep
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._last_decrease = float("-inf")
+        self._async_waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = []
+        self.successes = 0
+        self.rate_limited = 0
+        self.throttle_seconds = 0.0
+
+    @property
+    def limit(self) -> int:
+        """Current concurrency limit."""
+        with self._lock:
+            return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """Requests currently holding a slot."""
+        with self._lock:
+            return self._in_flight
+
+    def _wake_all(self) -> None:
+        """Wake every waiter (caller holds the lock)."""
+        self._cond.notify_all()
+        waiters, self._async_waiters = self._async_waiters, []
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # Event loop already closed; the waiter is gone
+                pass
+
+    def acquire(self) -> None:
+        """Block until a request slot is available."""
+        with self._cond:
+            while self._in_flight >= int(self._limit):
+                self._cond.wait()
+            self._in_flight += 1
+
+    async def acquire_async(self) -> None:
+        """Wait (without blocking the event loop) until a request slot is available."""
+        while True:
+            with self._lock:
+                if self._in_flight < int(self._limit):
+                    self._in_flight += 1
+                    return
+                event = asyncio.Event()
+                self._async_waiters.append((asyncio.get_running_loop(), event))
+            await event.wait()
+
+    def release(self) -> None:
+        """Return a request slot."""
+        with self._lock:
+            self._in_flight -= 1
+            self._wake_all()
+
+    def on_success(self) -> None:
+        """Additive increase: about +1 per window of ``limit`` successful calls."""
+        with self._lock:
+            self.successes += 1
+            previous = int(self._limit)
+            self._limit = min(float(self.max_limit), self._limit + 1.0 / self._limit)
+            if int(self._limit) > previous:
+                self._wake_all()
+
+    def on_rate_limited(self) -> None:
+        """Multiplicative decrease after a 429 (at most once per decrease interval)."""
+        with self._lock:
+            self.rate_limited += 1
+            now = self._clock()
+            if now - self._last_decrease < self.decrease_interval_seconds:
+                return
+            self._last_decrease = now
+            self._limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+            logger.warning(f"LLM API rate limited; concurrency limit reduced to {int(self._limit)}")
+
+    def throttle_delay(self, input_tokens: int, output_tokens: int) -> float:
+        """Reserve header-reported capacity; return the seconds to wait first."""
+        delay = min(self.state.reserve(input_tokens, output_tokens), self.max_throttle_seconds)
+        if delay > 0:
+            with self._lock:
+                self.throttle_seconds += delay
+        return delay
+
+    def observe_headers(self, headers: Mapping[str, str]) -> None:
+        """Feed ``anthropic-ratelimit-*`` headers of a response."""
+        self.state.update(headers)
+
+    def _on_error(self, error: Exception) -> None:
+        """Feed back a failed request (429 → multiplicative decrease)."""
+        if getattr(error, "status_code", None) == 429:
+            headers = getattr(getattr(error, "response", None), "headers", None)
+            if headers is not None:
+                self.observe_headers(headers)
+            self.on_rate_limited()
+
+    def call(self, fn: Callable[[], T], input_tokens: int = 0, output_tokens: int = 0) -> T:
+        """Run one request attempt under the limiter.
+
+        Args:
+            fn: Function sending the request
+            input_tokens: Estimated input tokens (for header-driven throttling)
+            output_tokens: Expected output tokens (for header-driven throttling)
+
+        Returns:
+            Result of fn
+        """
+        while (delay := self.throttle_delay(input_tokens, output_tokens)) > 0:
+            self._sleep(delay)
+        self.acquire()
+        try:
+            result = fn()
+        except Exception as e:
+            self._on_error(e)
+            raise
+        finally:
+            self.release()
+        self.on_success()
+        return result
+
+    async def acall(
+        self, fn: Callable[[], Awaitable[T]], input_tokens: int = 0, output_tokens: int = 0
+    ) -> T:
+        """Async variant of call()."""
+        while (delay := self.throttle_delay(input_tokens, output_tokens)) > 0:
+            await self._async_sleep(delay)
+        await self.acquire_async()
+        try:
+            result = await fn()
+        except Exception as e:
+            self._on_error(e)
+            raise
+        finally:
+            self.release()
+        self.on_success()
+        return result
+
+
+_limiter: AdaptiveRateLimiter | None = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> AdaptiveRateLimiter:
+    """Return the process-wide rate limiter (created on first use)."""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = AdaptiveRateLimiter()
+        return _limiter
+
+
+def set_rate_limiter(limiter: AdaptiveRateLimiter | None) -> AdaptiveRateLimiter | None:
+    """Replace the process-wide rate limiter.
+
+    Args:
+        limiter: New limiter, or None to create a default one on next use
+
+    Returns:
+        The previous limiter
+    """
+    global _limiter
+    with _limiter_lock:
+        previous, _limiter = _limiter, limiter
+        return previous
@@ -0,0 +1,434 @@
+"""Resilient LLM call layer for speckit-docs.
+
+A single 429 or timeout partway through a long run should not discard the
+work done so far. ResilientCaller wraps every messages.create() call with:
+
+- jittered exponential backoff that honours ``retry-after`` / ``retry-after-ms``
+- a per-run retry budget (retries are shared by all calls of the run)
+- a circuit breaker that fails fast once the API is clearly down
+- RetryMetrics counting attempts, retries and give-ups
+
+Only transient errors are retried (connection errors/timeouts, 408, 409,
+429 and 5xx/529). Other API errors (e.g. 400 invalid request) are raised
+immediately, as before.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Any, Literal, TypeVar
+
+if TYPE_CHECKING:
+    from anthropic import APIConnectionError, APIStatusError
+else:
+    try:
+        from anthropic import APIConnectionError, APIStatusError
+    except ImportError:
+        # Anthropic is optional for non-LLM workflows
+        class APIConnectionError(Exception):  # noqa: N818
+            """Placeholder when anthropic is not installed."""
+
+        class APIStatusError(Exception):  # noqa: N818
+            """Placeholder when anthropic is not installed."""
+
+from speckit_docs.exceptions import SpecKitDocsError
+from speckit_docs.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# HTTP status codes worth retrying (Anthropic: 429 rate limit, 529 overloaded)
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429})
+
+CircuitState = Literal["closed", "open", "half_open"]
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Backoff configuration.
+
+    Attributes:
+        max_attempts: Attempts per call, including the first one
+        base_delay_seconds: Backoff base (attempt n waits up to base * 2**n)
+        max_delay_seconds: Upper bound of the exponential backoff
+        max_retry_after_seconds: Upper bound for a server-provided retry-after
+    """
+
+    max_attempts: int = 5
+    base_delay_seconds: float = 1.0
+    max_delay_seconds: float = 60.0
+    max_retry_after_seconds: float = 300.0
+
+    def __post_init__(self) -> None:
+        """Validation rules."""
+        if self.max_attempts < 1:
+            raise ValueError(f"max_attempts must be >= 1, got {self.max_attempts}")
+        if self.base_delay_seconds < 0 or self.max_delay_seconds < 0:
+            raise ValueError("delays must be >= 0")
+
+
+@dataclass
+class RetryMetrics:
+    """Counters of the resilient call layer.
+
+    Attributes:
+        calls: Calls made through the layer
+        attempts: HTTP attempts (calls + retries)
+        retries: Retries performed
+        retries_by_reason: Retries per reason ("429", "529", "timeout", "connection", ...)
+        backoff_seconds: Total time spent waiting before retries
+        gave_up: Calls that failed after exhausting max_attempts
+        budget_exhausted: Retries refused because the run's retry budget was spent
+        circuit_rejections: Calls rejected while the circuit breaker was open
+    """
+
+    calls: int = 0
+    attempts: int = 0
+    retries: int = 0
+    retries_by_reason: dict[str, int] = field(default_factory=dict)
+    backoff_seconds: float = 0.0
+    gave_up: int = 0
+    budget_exhausted: int = 0
+    circuit_rejections: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters as a plain dictionary."""
+        return {
+            "calls": self.calls,
+            "attempts": self.attempts,
+            "retries": self.retries,
+            "retries_by_reason": dict(self.retries_by_reason),
+            "backoff_seconds": round(self.backoff_seconds, 3),
+            "gave_up": self.gave_up,
+            "budget_exhausted": self.budget_exhausted,
+            "circuit_rejections": self.circuit_rejections,
+        }
+
+
+class RetryBudget:
+    """Retries allowed for a whole run (shared by all calls)."""
+
+    def __init__(self, max_retries: int = 100) -> None:
+        """Initialize the budget.
+
+        Args:
+            max_retries: Total retries allowed for the run
+        """
+        if max_retries < 0:
+            raise ValueError(f"max_retries must be >= 0, got {max_retries}")
+        self.max_retries = max_retries
+        self._used = 0
+        self._lock = threading.Lock()
+
+    @property
+    def remaining(self) -> int:
+        """Retries left in the budget."""
+        with self._lock:
+            return self.max_retries - self._used
+
+    def try_acquire(self) -> bool:
+        """Take one retry from the budget; False if it is spent."""
+        with self._lock:
+            if self._used >= self.max_retries:
+                return False
+            self._used += 1
+            return True
+
+
+class CircuitBreaker:
+    """Fail fast after repeated transient failures.
+
+    The circuit opens after ``failure_threshold`` consecutive transient
+    failures. While open, calls are rejected with SpecKitDocsError. After
+    ``cooldown_seconds`` one trial call is let through (half-open): success
+    closes the circuit, failure opens it again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        cooldown_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the breaker.
+
+        Args:
+            failure_threshold: Consecutive transient failures that open the circuit
+            cooldown_seconds: Time the circuit stays open before a trial call
+            clock: Monotonic clock (injectable for tests)
+        """
+        if failure_threshold < 1:
+            raise ValueError(f"failure_threshold must be >= 1, got {failure_threshold}")
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state: CircuitState = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state (open turns into half_open once the cooldown has passed)."""
+        with self._lock:
+            if self._state == "open" and self._clock() - self._opened_at >= self.cooldown_seconds:
+                return "half_open"
+            return self._state
+
+    def allow_request(self) -> bool:
+        """Return whether a call may be made now."""
+        with self._lock:
+            if self._state == "closed":
+                return True
+            if self._state == "open":
+                if self._clock() - self._opened_at < self.cooldown_seconds:
+                    return False
+                self._state = "half_open"
+                self._trial_in_flight = False
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        """Record a successful call (closes the circuit)."""
+        with self._lock:
+            self._state = "closed"
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a transient failure."""
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == "half_open" or self._failures >= self.failure_threshold:
+                self._state = "open"
+                self._opened_at = self._clock()
+
+    def release(self) -> None:
+        """Release a half-open trial slot without judging the API (non-transient error)."""
+        with self._lock:
+            self._trial_in_flight = False
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Return whether an API error is transient and worth retrying."""
+    if isinstance(error, APIConnectionError):  # includes APITimeoutError
+        return True
+    if isinstance(error, APIStatusError):
+        status: int = error.status_code
+        return status in RETRYABLE_STATUS_CODES or status >= 500
+    return False
+
+
+def retry_reason(error: BaseException) -> str:
+    """Short label of a retryable error for RetryMetrics.retries_by_reason."""
+    if isinstance(error, APIStatusError):
+        return str(error.status_code)
+    if "Timeout" in type(error).__name__:
+        return "timeout"
+    return "connection"
+
+
+def retry_after_seconds(error: BaseException) -> float | None:
+    """Read the server-requested delay from retry-after-ms / retry-after headers.
+
+    Returns:
+        Delay in seconds, or None if the response carries no usable header
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers is None:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms is not None:
+        try:
+            return max(0.0, float(retry_after_ms) / 1000)
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if retry_after is None:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=UTC)
+    return max(0.0, (retry_at - datetime.now(UTC)).total_seconds())
+
+
+class ResilientCaller:
+    """Retry, budget and circuit breaker around LLM API calls.
+
+    One instance is meant to be shared by all calls of a run (see
+    get_resilient_caller()), so the budget, breaker and metrics are per run.
+    """
+
+    def __init__(
+        self,
+        policy: RetryPolicy | None = None,
+        budget: RetryBudget | None = None,
+        breaker: CircuitBreaker | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+        async_sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        rng: random.Random | None = None,
+    ) -> None:
+        """Initialize the caller.
+
+        Args:
+            policy: Backoff configuration (default: RetryPolicy())
+            budget: Retry budget of the run (default: RetryBudget())
+            breaker: Circuit breaker (default: CircuitBreaker())
+            sleep: Blocking sleep (injectable for tests)
+            async_sleep: Async sleep (injectable for tests)
+            rng: Random source for jitter (injectable for tests)
+        """
+        self.policy = policy if policy is not None else RetryPolicy()
+        self.budget = budget if budget is not None else RetryBudget()
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.metrics = RetryMetrics()
+        self._sleep = sleep
+        self._async_sleep = async_sleep
+        self._rng = rng if rng is not None else random.Random()
+        self._lock = threading.Lock()
+
+    def backoff_delay(self, attempt: int, error: BaseException) -> float:
+        """Delay before retry number ``attempt`` (1-based).
+
+        Full jitter over the exponential window; a server-provided retry-after
+        is a lower bound (plus a small jitter so clients do not retry in lockstep).
+        """
+        policy = self.policy
+        window = min(policy.max_delay_seconds, policy.base_delay_seconds * (2 ** (attempt - 1)))
+        delay = self._rng.uniform(0, window)
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None:
+            jitter = self._rng.uniform(0, policy.base_delay_seconds)
+            delay = max(delay, min(retry_after, policy.max_retry_after_seconds) + jitter)
+        return delay
+
+    def _before_attempt(self) -> None:
+        if not self.breaker.allow_request():
+            with self._lock:
+                self.metrics.circuit_rejections += 1
+            raise SpecKitDocsError(
+                message="LLM API circuit breaker is open: too many consecutive API failures.",
+                suggestion=f"The API appears to be unavailable. Wait about {int(self.breaker.cooldown_seconds)} seconds and re-run.",
+                error_type="LLM Circuit Open",
+            )
+        with self._lock:
+            self.metrics.attempts += 1
+
+    def _after_failure(self, error: BaseException, attempt: int) -> float | None:
+        """Record a failed attempt; return the delay before retrying, or None to give up."""
+        if not is_retryable(error):
+            self.breaker.release()
+            return None
+        self.breaker.record_failure()
+
+        if attempt >= self.policy.max_attempts:
+            with self._lock:
+                self.metrics.gave_up += 1
+            return None
+        if not self.budget.try_acquire():
+            with self._lock:
+                self.metrics.budget_exhausted += 1
+                self.metrics.gave_up += 1
+            return None
+
+        delay = self.backoff_delay(attempt, error)
+        reason = retry_reason(error)
+        with self._lock:
+            self.metrics.retries += 1
+            self.metrics.retries_by_reason[reason] = self.metrics.retries_by_reason.get(reason, 0) + 1
+            self.metrics.backoff_seconds += delay
+        logger.warning(
+            f"LLM API call failed ({reason}); retry {attempt}/{self.policy.max_attempts - 1} in {delay:.1f}s"
+        )
+        return delay
+
+    def call(self, fn: Callable[[], T]) -> T:
+        """Call ``fn`` with retries.
+
+        Raises:
+            SpecKitDocsError: If the circuit breaker is open
+            Exception: The last API error once retries are exhausted or not allowed
+        """
+        with self._lock:
+            self.metrics.calls += 1
+        attempt = 0
+        while True:
+            attempt += 1
+            self._before_attempt()
+            try:
+                result = fn()
+            except Exception as e:
+                delay = self._after_failure(e, attempt)
+                if delay is None:
+                    raise
+                self._sleep(delay)
+                continue
+            self.breaker.record_success()
+            return result
+
+    async def acall(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """Async variant of call()."""
+        with self._lock:
+            self.metrics.calls += 1
+        attempt = 0
+        while True:
+            attempt += 1
+            self._before_attempt()
+            try:
+                result = await fn()
+            except Exception as e:
+                delay = self._after_failure(e, attempt)
+                if delay is None:
+                    raise
+                await self._async_sleep(delay)
+                continue
+            self.breaker.record_success()
+            return result
+
+
+_caller: ResilientCaller | None = None
+_caller_lock = threading.Lock()
+
+
+def get_resilient_caller() -> ResilientCaller:
+    """Return the process-wide resilient caller (created on first use)."""
+    global _caller
+    with _caller_lock:
+        if _caller is None:
+            _caller = ResilientCaller()
+        return _caller
+
+
+def set_resilient_caller(caller: ResilientCaller | None) -> ResilientCaller | None:
+    """Replace the process-wide resilient caller (e.g. one per run).
+
+    Args:
+        caller: New caller, or None to create a default one on next use
+
+    Returns:
+        The previous caller
+    """
+    global _caller
+    with _caller_lock:
+        previous, _caller = _caller, caller
+        return previous
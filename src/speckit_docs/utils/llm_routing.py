@@ -0,0 +1,128 @@
+"""Model routing of LLM calls by call type.
+
+Classifying a 4,000-character section or detecting the target audience
+does not need the large model used for spec.md transformations. The
+process-wide ModelRoutingPolicy maps each call type to a model; the
+build_*_request() helpers in llm_transform ask it for the model of their
+request, so blocking, async, streamed and batched calls are all routed the
+same way.
+
+Default tiering:
+
+- audience, classify: FAST_MODEL (short, structured answers)
+- inconsistency, priority, transform: LARGE_MODEL
+
+Per-model latency, token and cost figures are reported by
+llm_telemetry.summarize_by_model(), to check that quality holds while
+latency drops.
+"""
+
+import threading
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field, replace
+from typing import get_args
+
+from speckit_docs.exceptions import SpecKitDocsError
+from speckit_docs.llm_entities import LLMCallType
+
+LARGE_MODEL = "claude-3-5-sonnet-20241022"
+FAST_MODEL = "claude-3-5-haiku-20241022"
+
+DEFAULT_MODEL_TIERS: Mapping[LLMCallType, str] = {
+    "audience": FAST_MODEL,
+    "classify": FAST_MODEL,
+    "inconsistency": LARGE_MODEL,
+    "priority": LARGE_MODEL,
+    "transform": LARGE_MODEL,
+}
+
+
+@dataclass(frozen=True)
+class ModelRoutingPolicy:
+    """Model of each call type.
+
+    Attributes:
+        models: Model by call type (call types not listed use default_model)
+        default_model: Model of unlisted call types
+    """
+
+    models: Mapping[LLMCallType, str] = field(default_factory=lambda: dict(DEFAULT_MODEL_TIERS))
+    default_model: str = LARGE_MODEL
+
+    def __post_init__(self) -> None:
+        """Validation rules."""
+        unknown = set(self.models) - set(get_args(LLMCallType))
+        if unknown:
+            raise ValueError(f"unknown call types: {', '.join(sorted(unknown))}")
+        if not self.default_model or not all(self.models.values()):
+            raise ValueError("model names must not be empty")
+
+    @classmethod
+    def single_model(cls, model: str = LARGE_MODEL) -> "ModelRoutingPolicy":
+        """Policy sending every call type to one model (no tiering)."""
+        return cls(models={}, default_model=model)
+
+    def model_for(self, call_type: LLMCallType) -> str:
+        """Return the model to use for a call type."""
+        return self.models.get(call_type, self.default_model)
+
+    def with_overrides(self, overrides: Mapping[LLMCallType, str]) -> "ModelRoutingPolicy":
+        """Return a copy with some call types routed to other models."""
+        return replace(self, models={**self.models, **overrides})
+
+
+def parse_model_overrides(specs: Iterable[str]) -> dict[LLMCallType, str]:
+    """Parse ``<call_type>=<model>`` options (e.g. ``classify=claude-3-5-sonnet-20241022``).
+
+    Args:
+        specs: Option values
+
+    Returns:
+        Model by call type
+
+    Raises:
+        SpecKitDocsError: If a value is malformed or names an unknown call type
+    """
+    call_types = get_args(LLMCallType)
+    overrides: dict[LLMCallType, str] = {}
+    for spec in specs:
+        call_type, _, model = spec.partition("=")
+        call_type, model = call_type.strip(), model.strip()
+        if call_type not in call_types or not model:
+            raise SpecKitDocsError(
+                f"Invalid model routing: '{spec}'",
+                f"Use <call_type>=<model> with call_type one of: {', '.join(call_types)}",
+                error_type="Invalid Model Routing",
+            )
+        overrides[call_type] = model  # type: ignore[index]
+    return overrides
+
+
+_routing = ModelRoutingPolicy()
+_routing_lock = threading.Lock()
+
+
+def get_model_routing() -> ModelRoutingPolicy:
+    """Return the process-wide model routing policy."""
+    with _routing_lock:
+        return _routing
+
+
+def set_model_routing(policy: ModelRoutingPolicy) -> ModelRoutingPolicy:
+    """Replace the process-wide model routing policy.
+
+    Args:
+        policy: New policy
+
+    Returns:
+        The previous policy
+    """
+    global _routing
+    with _routing_lock:
+        previous, _routing = _routing, policy
+        return previous
+
+
+def model_for(call_type: LLMCallType) -> str:
+    """Model of a call type under the process-wide policy."""
+    return get_model_routing().model_for(call_type)
@@ -0,0 +1,282 @@
+"""Tool-use response schemas of the LLM analysis calls.
+
+The analysis prompts describe a "Response format (JSON)", but a free-form
+text answer may wrap the JSON in prose or a code fence, which used to fail
+json.loads() and abort the run. Each analysis request is therefore sent
+with one ResponseTool and a forced tool_choice: the model answers with a
+tool_use block whose input is a JSON object matching the tool's schema,
+never with text.
+
+The schemas mirror the llm_entities dataclasses the responses are decoded
+into (TargetAudienceResult, SectionClassification, InconsistencyDetectionResult,
+PrioritizedSection): fields without a default are required. The spec.md
+merge call (SPEC_MERGE_TOOL) only returns transitions between partial
+documents, which are joined in code.
+get_response_text() in llm_transform turns a tool_use block into canonical
+JSON text, so memoization, single-flight replay and streaming keep working
+on text; decode_response() validates that text against the schema before
+the entities are built.
+
+Text fallback: a response without a tool_use block (a server without tool
+support, memo entries written by older versions) is decoded from its text,
+taking the outermost JSON object when prose or a fence surrounds it.
+"""
+
+import json
+from dataclasses import dataclass
+from typing import Any
+
+from speckit_docs.exceptions import SpecKitDocsError
+
+_AUDIENCE_TYPES = ["end_user", "developer", "both"]
+_CONFIDENCE: dict[str, Any] = {"type": "number", "minimum": 0.0, "maximum": 1.0}
+
+TARGET_AUDIENCE_SCHEMA: dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "audience_type": {"type": "string", "enum": _AUDIENCE_TYPES},
+        "confidence": _CONFIDENCE,
+        "reasoning": {"type": "string"},
+    },
+    "required": ["audience_type"],
+}
+
+SECTION_CLASSIFICATION_SCHEMA: dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "section_type": {"type": "string", "enum": _AUDIENCE_TYPES},
+        "confidence": _CONFIDENCE,
+    },
+    "required": ["section_type"],
+}
+
+BATCH_SECTION_CLASSIFICATION_SCHEMA: dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "classifications": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "index": {"type": "integer", "minimum": 0},
+                    "section_type": {"type": "string", "enum": _AUDIENCE_TYPES},
+                    "confidence": _CONFIDENCE,
+                },
+                "required": ["index", "section_type"],
+            },
+        }
+    },
+    "required": ["classifications"],
+}
+
+INCONSISTENCY_SCHEMA: dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        # First, so a streamed verdict arrives before the details
+        "is_consistent": {"type": "boolean"},
+        "inconsistencies": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "type": {"type": "string", "enum": ["technology_stack", "features", "purpose"]},
+                    "readme_claim": {"type": "string"},
+                    "quickstart_claim": {"type": "string"},
+                    "severity": {"type": "string", "enum": ["critical", "minor"]},
+                },
+                "required": ["type", "readme_claim", "quickstart_claim", "severity"],
+            },
+        },
+        "summary": {"type": "string"},
+    },
+    "required": ["is_consistent", "inconsistencies", "summary"],
+}
+
+SECTION_PRIORITY_SCHEMA: dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "prioritized_sections": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "file": {"type": "string"},
+                    "heading": {"type": "string"},
+                    "priority": {"type": "integer", "minimum": 1},
+                    "reason": {"type": "string"},
+                },
+                "required": ["file", "heading", "priority", "reason"],
+            },
+        }
+    },
+    "required": ["prioritized_sections"],
+}
+
+SPEC_MERGE_SCHEMA: dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "transitions": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "boundary": {"type": "integer", "minimum": 1},
+                    "text": {"type": "string"},
+                },
+                "required": ["boundary", "text"],
+            },
+        }
+    },
+    "required": ["transitions"],
+}
+
+
+@dataclass(frozen=True)
+class ResponseTool:
+    """A tool the model must call to answer (its input is the response).
+
+    Attributes:
+        name: Tool name
+        description: What the tool records
+        schema: JSON schema of the tool input
+    """
+
+    name: str
+    description: str
+    schema: dict[str, Any]
+
+    def definition(self) -> dict[str, Any]:
+        """Tool definition for the ``tools`` request parameter."""
+        return {"name": self.name, "description": self.description, "input_schema": self.schema}
+
+
+TARGET_AUDIENCE_TOOL = ResponseTool(
+    "record_target_audience", "Record the target audience of the document.", TARGET_AUDIENCE_SCHEMA
+)
+SECTION_CLASSIFICATION_TOOL = ResponseTool(
+    "record_section_classification",
+    "Record the classification of the documentation section.",
+    SECTION_CLASSIFICATION_SCHEMA,
+)
+BATCH_SECTION_CLASSIFICATION_TOOL = ResponseTool(
+    "record_section_classifications",
+    "Record one classification per documentation section, by section index.",
+    BATCH_SECTION_CLASSIFICATION_SCHEMA,
+)
+INCONSISTENCY_TOOL = ResponseTool(
+    "record_inconsistencies",
+    "Record whether README.md and QUICKSTART.md are consistent, and the inconsistencies found.",
+    INCONSISTENCY_SCHEMA,
+)
+SECTION_PRIORITY_TOOL = ResponseTool(
+    "record_section_priorities",
+    "Record the priority of each documentation section.",
+    SECTION_PRIORITY_SCHEMA,
+)
+SPEC_MERGE_TOOL = ResponseTool(
+    "record_transitions",
+    "Record the transition sentences to insert between consecutive partial documents.",
+    SPEC_MERGE_SCHEMA,
+)
+
+
+def with_response_tool(params: dict[str, Any], tool: ResponseTool) -> dict[str, Any]:
+    """Add the tool to messages.create() parameters and force the model to call it."""
+    return {**params, "tools": [tool.definition()], "tool_choice": {"type": "tool", "name": tool.name}}
+
+
+def tool_input_text(response: Any) -> str | None:
+    """Input of the first tool_use block of a Message as JSON text (None without one)."""
+    for block in getattr(response, "content", None) or []:
+        if getattr(block, "type", None) == "tool_use":
+            return json.dumps(block.input, ensure_ascii=False)
+    return None
+
+
+def schema_errors(value: Any, schema: dict[str, Any], path: str = "$") -> list[str]:
+    """Check a decoded JSON value against a schema.
+
+    Supports the keywords used by the response schemas: type, enum,
+    properties, required, items, minimum and maximum. Unknown properties
+    are allowed, and optional properties may be null (the dataclass default).
+
+    Args:
+        value: Decoded JSON value
+        schema: JSON schema
+        path: Location of value, for messages
+
+    Returns:
+        One message per violation (empty if the value is valid)
+    """
+    expected = schema.get("type")
+    checks = {
+        "object": lambda v: isinstance(v, dict),
+        "array": lambda v: isinstance(v, list),
+        "string": lambda v: isinstance(v, str),
+        "boolean": lambda v: isinstance(v, bool),
+        "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+        "number": lambda v: isinstance(v, int | float) and not isinstance(v, bool),
+    }
+    if expected in checks and not checks[expected](value):
+        return [f"{path}: expected {expected}, got {type(value).__name__}"]
+
+    errors: list[str] = []
+    if "enum" in schema and value not in schema["enum"]:
+        errors.append(f"{path}: {value!r} is not one of {schema['enum']}")
+    if "minimum" in schema and value < schema["minimum"]:
+        errors.append(f"{path}: {value} is less than {schema['minimum']}")
+    if "maximum" in schema and value > schema["maximum"]:
+        errors.append(f"{path}: {value} is greater than {schema['maximum']}")
+    if isinstance(value, dict):
+        required = schema.get("required", [])
+        errors.extend(f"{path}: missing '{key}'" for key in required if key not in value)
+        for key, subschema in schema.get("properties", {}).items():
+            if key in value and (value[key] is not None or key in required):
+                errors.extend(schema_errors(value[key], subschema, f"{path}.{key}"))
+    if isinstance(value, list) and "items" in schema:
+        for i, item in enumerate(value):
+            errors.extend(schema_errors(item, schema["items"], f"{path}[{i}]"))
+    return errors
+
+
+def _outermost_object(text: str) -> Any:
+    """Decode the outermost {...} of a text answer (prose or a code fence around it)."""
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end < start:
+        raise ValueError("no JSON object in response")
+    return json.loads(text[start : end + 1])
+
+
+def decode_response(text: str, tool: ResponseTool) -> dict[str, Any]:
+    """Decode a response and validate it against the tool's schema.
+
+    Args:
+        text: Tool input JSON (see tool_input_text()) or, as a fallback, a text answer
+        tool: Tool of the request
+
+    Returns:
+        The decoded JSON object
+
+    Raises:
+        SpecKitDocsError: If no JSON object can be decoded or it does not match the schema
+    """
+    try:
+        value = json.loads(text)
+    except json.JSONDecodeError:
+        try:
+            value = _outermost_object(text)
+        except ValueError:
+            raise SpecKitDocsError(
+                message=f"LLM response is not a JSON object ({tool.name}): {text[:200]!r}",
+                suggestion="Retry the call. If this persists, check that the API endpoint supports tool use.",
+                error_type="LLM Response Error",
+            )
+
+    errors = schema_errors(value, tool.schema)
+    if errors:
+        raise SpecKitDocsError(
+            message=f"LLM response does not match the {tool.name} schema: {'; '.join(errors[:5])}",
+            suggestion="Retry the call. If this persists, check the model routing (--model).",
+            error_type="LLM Response Error",
+        )
+    return dict(value)
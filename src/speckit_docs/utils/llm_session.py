@@ -0,0 +1,233 @@
+"""Process-wide LLM client session for speckit-docs.
+
+Constructing an Anthropic client per call creates a new HTTP connection pool
+each time (a TLS handshake per request, no keep-alive). LLMSession owns one
+sync client and one async client per event loop, both backed by a pooled
+httpx client configured from LLMSessionConfig (with a response hook that
+feeds anthropic-ratelimit-* headers to llm_ratelimit), and is shared by
+llm_transform, llm_engine, llm_batch and the backend scripts.
+
+Tests and callers can replace the process-wide session with set_llm_session()
+or pass a client explicitly to each llm_transform function.
+"""
+
+import asyncio
+import os
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import httpx
+    from anthropic import Anthropic, AsyncAnthropic, DefaultAsyncHttpxClient, DefaultHttpxClient
+else:
+    try:
+        import httpx
+        from anthropic import Anthropic, AsyncAnthropic, DefaultAsyncHttpxClient, DefaultHttpxClient
+    except ImportError:
+        # Anthropic is optional for non-LLM workflows
+        httpx = None
+        Anthropic = None
+        AsyncAnthropic = None
+        DefaultAsyncHttpxClient = None
+        DefaultHttpxClient = None
+
+from speckit_docs.exceptions import SpecKitDocsError
+from speckit_docs.utils.llm_ratelimit import get_rate_limiter
+
+
+def _observe_rate_limit_headers(response: "httpx.Response") -> None:
+    """httpx response hook feeding anthropic-ratelimit-* headers to the rate limiter."""
+    get_rate_limiter().observe_headers(response.headers)
+
+
+async def _observe_rate_limit_headers_async(response: "httpx.Response") -> None:
+    """Async variant of _observe_rate_limit_headers()."""
+    _observe_rate_limit_headers(response)
+
+
+@dataclass(frozen=True)
+class LLMSessionConfig:
+    """Connection pool and timeout configuration of an LLMSession.
+
+    Attributes:
+        max_connections: Maximum number of concurrent connections in the pool
+        max_keepalive_connections: Idle connections kept open for reuse
+        keepalive_expiry_seconds: Idle time after which a kept-alive connection is closed
+        connect_timeout_seconds: TCP/TLS connect timeout
+        timeout_seconds: Default read/write timeout (per-call timeout overrides it)
+        max_retries: SDK-level retries (default 0: retries are handled by llm_resilience)
+        base_url: API base URL override (default: ANTHROPIC_BASE_URL or the SDK default)
+        api_key: API key (default: ANTHROPIC_API_KEY)
+    """
+
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry_seconds: float = 30.0
+    connect_timeout_seconds: float = 10.0
+    timeout_seconds: float = 60.0
+    max_retries: int = 0
+    base_url: str | None = None
+    api_key: str | None = None
+
+    def __post_init__(self) -> None:
+        """Validation rules."""
+        if self.max_connections < 1:
+            raise ValueError(f"max_connections must be >= 1, got {self.max_connections}")
+        if not (0 <= self.max_keepalive_connections <= self.max_connections):
+            raise ValueError(
+                "max_keepalive_connections must be between 0 and max_connections, "
+                f"got {self.max_keepalive_connections}"
+            )
+        if self.connect_timeout_seconds <= 0 or self.timeout_seconds <= 0:
+            raise ValueError("timeouts must be > 0")
+
+
+class LLMSession:
+    """Owner of the pooled Anthropic clients.
+
+    Clients are created lazily on first use. The async client is bound to the
+    event loop it was created in (httpx connections cannot move between loops),
+    so a new one is created when a later asyncio.run() uses a different loop.
+    """
+
+    def __init__(self, config: LLMSessionConfig | None = None) -> None:
+        """Initialize the session.
+
+        Args:
+            config: Pool and timeout configuration (default: LLMSessionConfig())
+        """
+        self.config = config if config is not None else LLMSessionConfig()
+        self._lock = threading.Lock()
+        self._client: Anthropic | None = None
+        self._async_client: AsyncAnthropic | None = None
+        self._async_loop: asyncio.AbstractEventLoop | None = None
+
+    def _api_key(self) -> str:
+        if Anthropic is None:
+            raise SpecKitDocsError(
+                "anthropic package is not installed.",
+                "Install it with: uv add anthropic"
+            )
+
+        api_key = self.config.api_key or os.environ.get("ANTHROPIC_API_KEY")
+        if not api_key:
+            raise SpecKitDocsError(
+                "ANTHROPIC_API_KEY environment variable is not set.",
+                "Set it to your Anthropic API key: export ANTHROPIC_API_KEY='sk-...'"
+            )
+        return api_key
+
+    def _limits(self) -> "httpx.Limits":
+        return httpx.Limits(
+            max_connections=self.config.max_connections,
+            max_keepalive_connections=self.config.max_keepalive_connections,
+            keepalive_expiry=self.config.keepalive_expiry_seconds,
+        )
+
+    def _timeout(self) -> "httpx.Timeout":
+        return httpx.Timeout(self.config.timeout_seconds, connect=self.config.connect_timeout_seconds)
+
+    @property
+    def client(self) -> "Anthropic":
+        """Shared synchronous client.
+
+        Raises:
+            SpecKitDocsError: If anthropic is not installed or ANTHROPIC_API_KEY is not set
+        """
+        with self._lock:
+            if self._client is None:
+                self._client = Anthropic(
+                    api_key=self._api_key(),
+                    base_url=self.config.base_url,
+                    timeout=self._timeout(),
+                    max_retries=self.config.max_retries,
+                    http_client=DefaultHttpxClient(
+                        limits=self._limits(),
+                        timeout=self._timeout(),
+                        event_hooks={"response": [_observe_rate_limit_headers]},
+                    ),
+                )
+            return self._client
+
+    @property
+    def async_client(self) -> "AsyncAnthropic":
+        """Shared asynchronous client for the running event loop.
+
+        Raises:
+            SpecKitDocsError: If anthropic is not installed or ANTHROPIC_API_KEY is not set
+        """
+        try:
+            loop: asyncio.AbstractEventLoop | None = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        with self._lock:
+            if self._async_client is None or self._async_loop is not loop:
+                self._async_client = AsyncAnthropic(
+                    api_key=self._api_key(),
+                    base_url=self.config.base_url,
+                    timeout=self._timeout(),
+                    max_retries=self.config.max_retries,
+                    http_client=DefaultAsyncHttpxClient(
+                        limits=self._limits(),
+                        timeout=self._timeout(),
+                        event_hooks={"response": [_observe_rate_limit_headers_async]},
+                    ),
+                )
+                self._async_loop = loop
+            return self._async_client
+
+    def close(self) -> None:
+        """Close the synchronous client's connections (the async client is dropped)."""
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+            self._client = None
+            self._async_client = None
+            self._async_loop = None
+
+
+_session: LLMSession | None = None
+_session_lock = threading.Lock()
+
+
+def get_llm_session() -> LLMSession:
+    """Return the process-wide LLM session (created on first use)."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = LLMSession()
+        return _session
+
+
+def set_llm_session(session: LLMSession | None) -> LLMSession | None:
+    """Replace the process-wide LLM session.
+
+    Args:
+        session: New session, or None to create a default one on next use
+
+    Returns:
+        The previous session (not closed)
+    """
+    global _session
+    with _session_lock:
+        previous, _session = _session, session
+        return previous
+
+
+def configure_llm_session(config: LLMSessionConfig) -> LLMSession:
+    """Install a new process-wide session with the given configuration.
+
+    The previous session is closed.
+
+    Args:
+        config: Pool and timeout configuration
+
+    Returns:
+        The new session
+    """
+    previous = set_llm_session(LLMSession(config))
+    if previous is not None:
+        previous.close()
+    return get_llm_session()
@@ -0,0 +1,152 @@
+"""Single-flight deduplication of identical LLM requests.
+
+Feature directories that share copy-pasted README/QUICKSTART boilerplate
+send the same request several times in one run, often concurrently. The
+process-wide SingleFlight lets the first caller of a request (the leader)
+send it while concurrent callers with the same key wait and share the
+leader's result (or exception).
+
+Keys are llm_memo.memo_key() values, i.e. (call type, prompt version,
+model, input hash). Only requests in flight at the same time are merged;
+persisting results across calls is the job of LLMCallMemo.
+"""
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call:
+    """A request in flight in a thread."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Merges concurrent calls with the same key into one.
+
+    Usable from threads (do) and from event loops (ado). Thread and async
+    callers are tracked separately, and async calls are only merged within
+    the same event loop.
+
+    Attributes:
+        leaders: Calls that actually ran
+        shared: Calls answered with another call's result
+    """
+
+    def __init__(self) -> None:
+        """Initialize with no calls in flight."""
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call] = {}
+        self._async_calls: dict[tuple[int, str], asyncio.Future[Any]] = {}
+        self.leaders = 0
+        self.shared = 0
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        """Run fn, or wait for the identical call already in flight.
+
+        Args:
+            key: Request key
+            fn: Function sending the request
+
+        Returns:
+            Result of fn (possibly from another thread's call)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            result: T = call.result
+            return result
+
+        try:
+            call.result = fn()
+            return call.result  # type: ignore[no-any-return]
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Async variant of do().
+
+        If the leader is cancelled, a waiting caller runs the request itself.
+        """
+        loop = asyncio.get_running_loop()
+        loop_key = (id(loop), key)
+        while True:
+            with self._lock:
+                future = self._async_calls.get(loop_key)
+                if future is None:
+                    future = self._async_calls[loop_key] = loop.create_future()
+                    self.leaders += 1
+                    break
+                self.shared += 1
+            try:
+                result: T = await asyncio.shield(future)
+                return result
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise  # this caller was cancelled, not the leader
+                with self._lock:
+                    self.shared -= 1
+
+        try:
+            value = await fn()
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                # Retrieved by followers, if any; avoid "never retrieved" warnings
+                future.exception()
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                del self._async_calls[loop_key]
+
+
+_single_flight: SingleFlight | None = SingleFlight()
+_single_flight_lock = threading.Lock()
+
+
+def get_single_flight() -> SingleFlight | None:
+    """Return the process-wide single-flight group (None: disabled)."""
+    with _single_flight_lock:
+        return _single_flight
+
+
+def set_single_flight(group: SingleFlight | None) -> SingleFlight | None:
+    """Replace (or, with None, disable) the process-wide single-flight group.
+
+    Args:
+        group: New group, or None to send every request
+
+    Returns:
+        The previous group
+    """
+    global _single_flight
+    with _single_flight_lock:
+        previous, _single_flight = _single_flight, group
+        return previous
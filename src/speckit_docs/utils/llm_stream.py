@@ -0,0 +1,286 @@
+"""Streaming LLM responses with incremental JSON parsing.
+
+The analysis prompts answer with a single JSON object, and with
+max_tokens=4096 the full response can take a long time. Reading the response
+as a stream lets callers act on the JSON while it is still arriving:
+
+- top-level fields are reported as soon as their value is complete
+  (e.g. ``"is_consistent": false`` → abort early)
+- elements of top-level arrays are reported one by one
+  (e.g. each item of ``"prioritized_sections"``)
+- time-to-first-token (TTFT) is measured per call
+
+IncrementalJSONParser skips any text before the first ``{`` (preamble or a
+```json fence), so it accepts the same responses as json.loads() on the
+extracted object. Responses to a forced tool call (see llm_schemas) stream
+the tool input as input_json deltas, which are parsed the same way as text.
+"""
+
+import json
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, Literal
+
+
+@dataclass(frozen=True)
+class JSONEvent:
+    """A completed piece of the streamed JSON object.
+
+    Attributes:
+        kind: "field" for a completed top-level field, "item" for a completed
+            element of a top-level array
+        key: Top-level key the value belongs to
+        value: Decoded JSON value
+    """
+
+    kind: Literal["field", "item"]
+    key: str
+    value: Any
+
+
+class IncrementalJSONParser:
+    """Incremental parser for one top-level JSON object fed in chunks."""
+
+    def __init__(self) -> None:
+        """Initialize the parser."""
+        self._buf = ""
+        self._started = False
+        self._done = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._expect_key = True
+        self._key: str | None = None
+        self._value_start: int | None = None
+        self._array_key: str | None = None
+        self._item_start: int | None = None
+        self.fields: dict[str, Any] = {}
+
+    @property
+    def done(self) -> bool:
+        """Whether the top-level object has been closed."""
+        return self._done
+
+    def feed(self, chunk: str) -> list[JSONEvent]:
+        """Feed the next chunk of text.
+
+        Args:
+            chunk: Text delta of the response
+
+        Returns:
+            Events completed by this chunk, in document order
+
+        Raises:
+            json.JSONDecodeError: If a completed value is not valid JSON
+        """
+        events: list[JSONEvent] = []
+        start = len(self._buf)
+        self._buf += chunk
+        for i in range(start, len(self._buf)):
+            if self._done:
+                break
+            self._step(i, self._buf[i], events)
+        return events
+
+    def _step(self, i: int, c: str, events: list[JSONEvent]) -> None:
+        if not self._started:
+            if c == "{":
+                self._started = True
+                self._depth = 1
+            return
+
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif c == "\\":
+                self._escape = True
+            elif c == '"':
+                self._in_string = False
+                self._string_closed(i, events)
+            return
+
+        if c == '"':
+            self._in_string = True
+            self._string_start = i
+            self._value_begins(i)
+        elif c.isspace():
+            return
+        elif c in "{[":
+            self._value_begins(i)
+            self._depth += 1
+            if self._depth == 2 and c == "[" and self._value_start == i:
+                self._array_key = self._key
+        elif c in "}]":
+            self._scalar_ends(i, events)
+            self._depth -= 1
+            if self._depth == 0:
+                self._done = True
+            else:
+                self._container_closed(i, events)
+        elif c == ",":
+            self._scalar_ends(i, events)
+            if self._depth == 1:
+                self._expect_key = True
+        elif c == ":":
+            if self._depth == 1:
+                self._expect_key = False
+        else:
+            self._value_begins(i)
+
+    def _value_begins(self, i: int) -> None:
+        if self._depth == 1 and not self._expect_key and self._value_start is None:
+            self._value_start = i
+        elif self._depth == 2 and self._array_key is not None and self._item_start is None:
+            self._item_start = i
+
+    def _emit_field(self, raw: str, events: list[JSONEvent]) -> None:
+        assert self._key is not None
+        value = json.loads(raw)
+        self.fields[self._key] = value
+        events.append(JSONEvent("field", self._key, value))
+        self._value_start = None
+        self._array_key = None
+
+    def _emit_item(self, raw: str, events: list[JSONEvent]) -> None:
+        assert self._array_key is not None
+        events.append(JSONEvent("item", self._array_key, json.loads(raw)))
+        self._item_start = None
+
+    def _string_closed(self, i: int, events: list[JSONEvent]) -> None:
+        if self._depth == 1 and self._expect_key:
+            self._key = json.loads(self._buf[self._string_start : i + 1])
+        elif self._depth == 1 and self._value_start == self._string_start:
+            self._emit_field(self._buf[self._value_start : i + 1], events)
+        elif self._depth == 2 and self._array_key is not None and self._item_start == self._string_start:
+            self._emit_item(self._buf[self._item_start : i + 1], events)
+
+    def _scalar_ends(self, i: int, events: list[JSONEvent]) -> None:
+        if self._depth == 1 and self._value_start is not None:
+            self._emit_field(self._buf[self._value_start : i].strip(), events)
+        elif self._depth == 2 and self._array_key is not None and self._item_start is not None:
+            self._emit_item(self._buf[self._item_start : i].strip(), events)
+
+    def _container_closed(self, i: int, events: list[JSONEvent]) -> None:
+        if self._depth == 2 and self._array_key is not None and self._item_start is not None:
+            self._emit_item(self._buf[self._item_start : i + 1], events)
+        elif self._depth == 1 and self._value_start is not None:
+            self._emit_field(self._buf[self._value_start : i + 1], events)
+
+
+# Return True from the callback to stop reading the stream (early abort)
+JSONEventHandler = Callable[[JSONEvent], bool]
+
+
+@dataclass(frozen=True)
+class StreamedMessage:
+    """Outcome of reading one streamed response.
+
+    Attributes:
+        text: Text or tool input JSON received (partial when aborted)
+        message: Final (or, when aborted, the latest snapshot) Message, for usage
+        ttft_seconds: Time from request to the first text or tool input delta
+            (None if none arrived)
+        elapsed_seconds: Time from request to the end of reading
+        aborted: Whether the handler stopped reading early
+    """
+
+    text: str
+    message: Any
+    ttft_seconds: float | None
+    elapsed_seconds: float
+    aborted: bool
+
+
+def _delta_text(event: Any) -> str | None:
+    """JSON text carried by a stream event: a text delta or a tool input delta."""
+    if event.type == "text":
+        return str(event.text)
+    if event.type == "input_json":
+        return str(event.partial_json)
+    return None
+
+
+def _dispatch(parser: IncrementalJSONParser, text: str, on_event: JSONEventHandler | None) -> bool:
+    """Feed text to the parser; return True if the handler asked to abort."""
+    for event in parser.feed(text):
+        if on_event is not None and on_event(event):
+            return True
+    return False
+
+
+def replay_stream(text: str, message: Any, on_event: JSONEventHandler | None = None) -> StreamedMessage:
+    """Deliver an already complete response (e.g. a memoized one) like a stream.
+
+    Args:
+        text: Complete response text
+        message: Message object to report
+        on_event: Called for every JSONEvent; returning True stops the replay
+
+    Returns:
+        StreamedMessage (no TTFT: nothing was received)
+    """
+    aborted = _dispatch(IncrementalJSONParser(), text, on_event)
+    return StreamedMessage(text, message, None, 0.0, aborted)
+
+
+def read_stream(
+    open_stream: Callable[[], Any],
+    on_event: JSONEventHandler | None = None,
+    clock: Callable[[], float] = time.monotonic,
+) -> StreamedMessage:
+    """Read a messages.stream() response, parsing the JSON incrementally.
+
+    Args:
+        open_stream: Returns the MessageStreamManager (e.g. lambda: client.messages.stream(...))
+        on_event: Called for every JSONEvent; returning True aborts the stream
+        clock: Monotonic clock (injectable for tests)
+
+    Returns:
+        StreamedMessage
+    """
+    parser = IncrementalJSONParser()
+    chunks: list[str] = []
+    ttft: float | None = None
+    aborted = False
+    started = clock()
+    with open_stream() as stream:
+        for event in stream:
+            text = _delta_text(event)
+            if not text:
+                continue
+            if ttft is None:
+                ttft = clock() - started
+            chunks.append(text)
+            if _dispatch(parser, text, on_event):
+                aborted = True
+                break
+        message = stream.current_message_snapshot if aborted else stream.get_final_message()
+    return StreamedMessage("".join(chunks), message, ttft, clock() - started, aborted)
+
+
+async def read_stream_async(
+    open_stream: Callable[[], Any],
+    on_event: JSONEventHandler | None = None,
+    clock: Callable[[], float] = time.monotonic,
+) -> StreamedMessage:
+    """Async variant of read_stream() for AsyncAnthropic.messages.stream()."""
+    parser = IncrementalJSONParser()
+    chunks: list[str] = []
+    ttft: float | None = None
+    aborted = False
+    started = clock()
+    async with open_stream() as stream:
+        async for event in stream:
+            text = _delta_text(event)
+            if not text:
+                continue
+            if ttft is None:
+                ttft = clock() - started
+            chunks.append(text)
+            if _dispatch(parser, text, on_event):
+                aborted = True
+                break
+        message = stream.current_message_snapshot if aborted else await stream.get_final_message()
+    return StreamedMessage("".join(chunks), message, ttft, clock() - started, aborted)
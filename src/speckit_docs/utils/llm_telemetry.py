@@ -0,0 +1,210 @@
+"""Per-call LLM telemetry for speckit-docs.
+
+doc_transform appends every LLMUsage record (model, tokens, latency,
+retries, feature) to a JSONL file through JSONLTelemetrySink; doc_update
+reads it back and reports a TelemetrySummary next to the "LLM変換" line, so
+slow or expensive features are visible after every run. summarize_by_model()
+breaks the same figures down per model, to compare the model tiers of
+llm_routing.
+
+Costs are estimates from MODEL_PRICING (list prices per million tokens);
+the Message Batches API discount is not applied.
+"""
+
+import json
+import math
+import threading
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+
+from speckit_docs.llm_entities import LLMUsage
+
+# USD per million tokens: (input, output) by model family
+MODEL_PRICING: dict[str, tuple[float, float]] = {
+    "opus": (15.0, 75.0),
+    "sonnet": (3.0, 15.0),
+    "haiku": (0.80, 4.0),
+}
+
+# Prompt cache prices relative to the input price
+CACHE_WRITE_MULTIPLIER = 1.25
+CACHE_READ_MULTIPLIER = 0.1
+
+
+def estimate_cost(usage: LLMUsage) -> float:
+    """Estimated cost of a call in USD (0.0 for models without known pricing).
+
+    Args:
+        usage: Usage record of the call
+
+    Returns:
+        Cost in USD
+    """
+    for family, (input_price, output_price) in MODEL_PRICING.items():
+        if family in usage.model:
+            return (
+                usage.input_tokens * input_price
+                + usage.cache_creation_input_tokens * input_price * CACHE_WRITE_MULTIPLIER
+                + usage.cache_read_input_tokens * input_price * CACHE_READ_MULTIPLIER
+                + usage.output_tokens * output_price
+            ) / 1_000_000
+    return 0.0
+
+
+class JSONLTelemetrySink:
+    """LLMUsageRecorder listener appending each record as a JSON line."""
+
+    def __init__(self, path: Path) -> None:
+        """Initialize a sink writing to path (parent directories are created).
+
+        Args:
+            path: JSONL file to append to
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def __call__(self, usage: LLMUsage) -> None:
+        """Append one usage record."""
+        line = json.dumps(asdict(usage), ensure_ascii=False)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+def load_telemetry(path: Path) -> list[LLMUsage]:
+    """Read usage records written by JSONLTelemetrySink.
+
+    Malformed lines (e.g. a line truncated by an interrupted run) are skipped.
+
+    Args:
+        path: JSONL telemetry file
+
+    Returns:
+        Usage records in file order (empty if the file does not exist)
+    """
+    if not path.exists():
+        return []
+    known = {f.name for f in fields(LLMUsage)}
+    records: list[LLMUsage] = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                data = json.loads(line)
+                records.append(LLMUsage(**{k: v for k, v in data.items() if k in known}))
+            except (json.JSONDecodeError, TypeError, AttributeError):
+                continue
+    return records
+
+
+def _percentile(sorted_values: list[float], percent: float) -> float:
+    """Nearest-rank percentile of an ascending, non-empty list."""
+    rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+@dataclass(frozen=True)
+class TelemetrySummary:
+    """Aggregate of the LLM calls of a run.
+
+    Attributes:
+        calls: Number of calls
+        total_tokens: Input (uncached + cache write + cache read) and output tokens
+        estimated_cost: Estimated cost in USD
+        retries: Attempts beyond the first, over all calls
+        p50_latency: Median call latency in seconds (None without latency data)
+        p95_latency: 95th percentile call latency in seconds
+        slowest_features: (feature key, summed latency) of the slowest features
+    """
+
+    calls: int
+    total_tokens: int
+    estimated_cost: float
+    retries: int = 0
+    p50_latency: float | None = None
+    p95_latency: float | None = None
+    slowest_features: tuple[tuple[str, float], ...] = ()
+
+
+def summarize(records: list[LLMUsage], top: int = 3) -> TelemetrySummary:
+    """Summarize usage records.
+
+    Args:
+        records: Usage records of a run
+        top: Number of slowest features to report
+
+    Returns:
+        TelemetrySummary
+    """
+    latencies = sorted(r.latency_seconds for r in records if r.latency_seconds is not None)
+    by_feature: dict[str, float] = {}
+    for r in records:
+        if r.feature is not None and r.latency_seconds is not None:
+            by_feature[r.feature] = by_feature.get(r.feature, 0.0) + r.latency_seconds
+    slowest = sorted(by_feature.items(), key=lambda item: item[1], reverse=True)[:top]
+    return TelemetrySummary(
+        calls=len(records),
+        total_tokens=sum(r.total_input_tokens + r.output_tokens for r in records),
+        estimated_cost=sum(estimate_cost(r) for r in records),
+        retries=sum(r.retries for r in records),
+        p50_latency=_percentile(latencies, 50) if latencies else None,
+        p95_latency=_percentile(latencies, 95) if latencies else None,
+        slowest_features=tuple(slowest),
+    )
+
+
+@dataclass(frozen=True)
+class ModelStats:
+    """Aggregate of the LLM calls served by one model.
+
+    Attributes:
+        model: Model name
+        calls: Number of calls
+        call_types: Call types routed to the model
+        total_tokens: Input and output tokens
+        mean_output_tokens: Average output tokens per call
+        estimated_cost: Estimated cost in USD
+        retries: Attempts beyond the first
+        p50_latency: Median call latency in seconds (None without latency data)
+        p95_latency: 95th percentile call latency in seconds
+    """
+
+    model: str
+    calls: int
+    call_types: tuple[str, ...]
+    total_tokens: int
+    mean_output_tokens: float
+    estimated_cost: float
+    retries: int = 0
+    p50_latency: float | None = None
+    p95_latency: float | None = None
+
+
+def summarize_by_model(records: list[LLMUsage]) -> list[ModelStats]:
+    """Summarize usage records per model.
+
+    Args:
+        records: Usage records of a run
+
+    Returns:
+        ModelStats per model, most called first
+    """
+    by_model: dict[str, list[LLMUsage]] = {}
+    for r in records:
+        by_model.setdefault(r.model, []).append(r)
+    stats = []
+    for model, model_records in by_model.items():
+        summary = summarize(model_records, top=0)
+        stats.append(
+            ModelStats(
+                model=model,
+                calls=summary.calls,
+                call_types=tuple(sorted({r.call_type for r in model_records})),
+                total_tokens=summary.total_tokens,
+                mean_output_tokens=sum(r.output_tokens for r in model_records) / summary.calls,
+                estimated_cost=summary.estimated_cost,
+                retries=summary.retries,
+                p50_latency=summary.p50_latency,
+                p95_latency=summary.p95_latency,
+            )
+        )
+    return sorted(stats, key=lambda s: (-s.calls, s.model))
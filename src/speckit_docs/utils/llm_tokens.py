@@ -0,0 +1,272 @@
+"""Token counting for speckit-docs.
+
+The 10,000-token gates (T064/T068, extract_spec_minimal, LLMTransformResult)
+used to estimate tokens as ``len(text) // 4``. That ratio holds for English,
+but Claude's tokenizer spends about one token per Japanese character, so
+Japanese specs were undercounted by up to 4x and overflowed the context.
+
+Counters:
+
+- ApproximateTokenCounter: fast offline estimate calibrated per script
+  (CJK characters, other non-ASCII characters, ASCII text)
+- AnthropicTokenCounter: exact count via the count-tokens endpoint
+  (``client.messages.count_tokens``), falling back to the approximation
+  when the API is unavailable. It has its own ResilientCaller, so counting
+  never spends the retry budget or trips the breaker of messages.create
+- MemoizedTokenCounter: LRU memo keyed by the content hash, so counting the
+  same section or prompt again is free
+
+Two entry points:
+
+- count_tokens(): the process-wide gate counter (get_token_counter /
+  set_token_counter), used only at the 10,000-token gates. It is a memoized
+  ApproximateTokenCounter unless replaced, e.g. by doc_transform
+  --exact-tokens; an exact counter blocks on HTTP, so async code calls
+  count_tokens_async() (a worker thread)
+- estimate_tokens(): always the memoized approximation, for per-section
+  counts, chunk sizing and packing, which run far more often
+"""
+
+import asyncio
+import hashlib
+import math
+import threading
+from collections import OrderedDict
+from typing import Any, Protocol
+
+from speckit_docs.utils.llm_resilience import ResilientCaller
+from speckit_docs.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Unicode blocks counted as CJK (about one token per character)
+_CJK_RANGES = (
+    (0x1100, 0x11FF),  # Hangul Jamo
+    (0x2E80, 0x2FDF),  # CJK Radicals, Kangxi Radicals
+    (0x3000, 0x303F),  # CJK Symbols and Punctuation (、。「」)
+    (0x3040, 0x30FF),  # Hiragana, Katakana
+    (0x3100, 0x31FF),  # Bopomofo, Katakana Phonetic Extensions
+    (0x3200, 0x4DBF),  # Enclosed CJK, CJK Extension A
+    (0x4E00, 0x9FFF),  # CJK Unified Ideographs
+    (0xAC00, 0xD7AF),  # Hangul Syllables
+    (0xF900, 0xFAFF),  # CJK Compatibility Ideographs
+    (0xFF00, 0xFFEF),  # Halfwidth and Fullwidth Forms
+    (0x20000, 0x2FFFF),  # CJK Extensions B-F
+)
+
+
+def _is_cjk(code_point: int) -> bool:
+    """Whether a code point belongs to a CJK block."""
+    return any(start <= code_point <= end for start, end in _CJK_RANGES)
+
+
+class TokenCounter(Protocol):
+    """Counts the tokens of a text."""
+
+    def count(self, text: str) -> int:
+        """Return the token count of text."""
+        ...
+
+
+class ApproximateTokenCounter:
+    """Offline token estimate calibrated per script.
+
+    Default ratios follow Claude's tokenizer on typical documentation: ASCII
+    text averages about 4 characters per token, kana/kanji about 1 character
+    per token, and other non-ASCII text (accented Latin, Cyrillic, emoji)
+    about 2 characters per token. Erring high on CJK keeps the token gates
+    on the safe side of the context window. The estimate is rounded up, so any non-empty text counts as at least
+    one token.
+    """
+
+    def __init__(
+        self,
+        ascii_chars_per_token: float = 4.0,
+        cjk_chars_per_token: float = 1.0,
+        other_chars_per_token: float = 2.0,
+    ) -> None:
+        """Initialize the counter.
+
+        Args:
+            ascii_chars_per_token: Average ASCII characters per token
+            cjk_chars_per_token: Average CJK characters per token
+            other_chars_per_token: Average characters per token for other scripts
+
+        Raises:
+            ValueError: If a ratio is not positive
+        """
+        for name, value in (
+            ("ascii_chars_per_token", ascii_chars_per_token),
+            ("cjk_chars_per_token", cjk_chars_per_token),
+            ("other_chars_per_token", other_chars_per_token),
+        ):
+            if value <= 0:
+                raise ValueError(f"{name} must be positive, got {value}")
+        self.ascii_chars_per_token = ascii_chars_per_token
+        self.cjk_chars_per_token = cjk_chars_per_token
+        self.other_chars_per_token = other_chars_per_token
+
+    def count(self, text: str) -> int:
+        """Estimate the token count of text."""
+        if text.isascii():
+            return math.ceil(len(text) / self.ascii_chars_per_token)
+        ascii_chars = cjk_chars = other_chars = 0
+        for c in text:
+            code_point = ord(c)
+            if code_point < 0x80:
+                ascii_chars += 1
+            elif _is_cjk(code_point):
+                cjk_chars += 1
+            else:
+                other_chars += 1
+        return math.ceil(
+            ascii_chars / self.ascii_chars_per_token
+            + cjk_chars / self.cjk_chars_per_token
+            + other_chars / self.other_chars_per_token
+        )
+
+
+class AnthropicTokenCounter:
+    """Exact token count via the count-tokens endpoint.
+
+    The text is counted as a single user message, so the result includes the
+    few tokens of message framing. If a request fails, the approximation is
+    used for that text and a warning is logged once. Calls block (including
+    retry backoff); async code goes through count_tokens_async().
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        model: str,
+        fallback: TokenCounter | None = None,
+        caller: ResilientCaller | None = None,
+    ) -> None:
+        """Initialize the counter.
+
+        Args:
+            client: Anthropic client
+            model: Model whose tokenizer is used
+            fallback: Counter used when the API call fails (default: ApproximateTokenCounter)
+            caller: Retry/breaker wrapper of the count calls (default: a ResilientCaller
+                of its own, separate from the process-wide one of messages.create)
+        """
+        self.client = client
+        self.model = model
+        self.fallback = fallback if fallback is not None else ApproximateTokenCounter()
+        self.caller = caller if caller is not None else ResilientCaller()
+        self.api_calls = 0
+        self.fallbacks = 0
+
+    def count(self, text: str) -> int:
+        """Count the tokens of text with the model's tokenizer."""
+        if not text:
+            return 0
+        try:
+            result = self.caller.call(
+                lambda: self.client.messages.count_tokens(
+                    model=self.model, messages=[{"role": "user", "content": text}]
+                )
+            )
+            self.api_calls += 1
+            return int(result.input_tokens)
+        except Exception as e:
+            if self.fallbacks == 0:
+                logger.warning(f"count_tokens failed, using the approximate token count: {e}")
+            self.fallbacks += 1
+            return self.fallback.count(text)
+
+
+class MemoizedTokenCounter:
+    """LRU memo in front of another counter, keyed by the SHA-256 of the text."""
+
+    def __init__(self, counter: TokenCounter, maxsize: int = 4096) -> None:
+        """Initialize the memo.
+
+        Args:
+            counter: Counter computing uncached counts
+            maxsize: Maximum number of memoized counts
+
+        Raises:
+            ValueError: If maxsize is less than 1
+        """
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be >= 1, got {maxsize}")
+        self.counter = counter
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._memo: OrderedDict[bytes, int] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def count(self, text: str) -> int:
+        """Return the memoized count of text, computing it on a miss."""
+        key = hashlib.sha256(text.encode("utf-8")).digest()
+        with self._lock:
+            cached = self._memo.get(key)
+            if cached is not None:
+                self._memo.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+        # Count outside the lock: an exact counter makes an HTTP request
+        result = self.counter.count(text)
+        with self._lock:
+            self._memo[key] = result
+            self._memo.move_to_end(key)
+            while len(self._memo) > self.maxsize:
+                self._memo.popitem(last=False)
+        return result
+
+    def clear(self) -> None:
+        """Drop every memoized count."""
+        with self._lock:
+            self._memo.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_counter: TokenCounter | None = None
+_counter_lock = threading.Lock()
+
+
+def get_token_counter() -> TokenCounter:
+    """Return the process-wide token counter (created on first use)."""
+    global _counter
+    with _counter_lock:
+        if _counter is None:
+            _counter = MemoizedTokenCounter(ApproximateTokenCounter())
+        return _counter
+
+
+def set_token_counter(counter: TokenCounter | None) -> TokenCounter | None:
+    """Replace the process-wide token counter.
+
+    Args:
+        counter: New counter, or None to create the default one on next use
+
+    Returns:
+        The previous counter
+    """
+    global _counter
+    with _counter_lock:
+        previous, _counter = _counter, counter
+        return previous
+
+
+def count_tokens(text: str) -> int:
+    """Count the tokens of text with the process-wide gate counter."""
+    return get_token_counter().count(text)
+
+
+async def count_tokens_async(text: str) -> int:
+    """count_tokens() in a worker thread, so an exact counter does not block the event loop."""
+    return await asyncio.to_thread(count_tokens, text)
+
+
+_estimator = MemoizedTokenCounter(ApproximateTokenCounter())
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the tokens of text offline (memoized approximation, never an API call)."""
+    return _estimator.count(text)
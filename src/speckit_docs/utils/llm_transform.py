@@ -13,10 +13,14 @@ Implementation tasks:
 - T068: Section integration (within 10,000 tokens)
 """
 
+import contextvars
 import json
-import os
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Literal, cast
+from typing import TYPE_CHECKING, Any, Literal, TypeVar, cast
 
 if TYPE_CHECKING:
     from anthropic import Anthropic, APIError, APITimeoutError, RateLimitError
@@ -44,6 +48,7 @@ from speckit_docs.exceptions import SpecKitDocsError
 from speckit_docs.llm_entities import (
     Inconsistency,
     InconsistencyDetectionResult,
+    LLMCallType,
     LLMSection,
     LLMTransformResult,
     PrioritizedSection,
@@ -51,9 +56,44 @@ from speckit_docs.llm_entities import (
     SectionPriorityResult,
     TargetAudienceResult,
 )
+from speckit_docs.utils.doc_chunking import iter_file_chunks, iter_markdown_chunks, read_head
+from speckit_docs.utils.llm_memo import MemoizedMessage, get_llm_memo, memo_key
+from speckit_docs.utils.llm_ratelimit import get_rate_limiter
+from speckit_docs.utils.llm_resilience import get_resilient_caller
+from speckit_docs.utils.llm_routing import LARGE_MODEL, model_for
+from speckit_docs.utils.llm_schemas import (
+    BATCH_SECTION_CLASSIFICATION_TOOL,
+    INCONSISTENCY_TOOL,
+    SECTION_CLASSIFICATION_TOOL,
+    SECTION_PRIORITY_TOOL,
+    SPEC_MERGE_TOOL,
+    TARGET_AUDIENCE_TOOL,
+    decode_response,
+    tool_input_text,
+    with_response_tool,
+)
+from speckit_docs.utils.llm_session import get_llm_session
+from speckit_docs.utils.llm_singleflight import get_single_flight
+from speckit_docs.utils.llm_stream import (
+    JSONEvent,
+    JSONEventHandler,
+    StreamedMessage,
+    read_stream,
+    replay_stream,
+)
+from speckit_docs.utils.llm_tokens import ApproximateTokenCounter, count_tokens, estimate_tokens
+from speckit_docs.utils.llm_usage import record_usage
+from speckit_docs.utils.logging import get_logger
+from speckit_docs.utils.section_packing import DEFAULT_TOKEN_BUDGET, PackingStrategy, pack_sections
+from speckit_docs.utils.spec_extractor import SPEC_TOKEN_LIMIT
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
 
 
-# T064: Token count estimation (characters // 4)
+# T064: Token count estimation (see speckit_docs.utils.llm_tokens)
 def estimate_token_count(text: str) -> int:
     """Estimate token count for text.
 
@@ -61,9 +101,11 @@ def estimate_token_count(text: str) -> int:
         text: Text to estimate token count for
 
     Returns:
-        Estimated token count (len(text) // 4)
+        CJK-aware approximate token count, memoized by content hash. The
+        10,000-token gates use llm_tokens.count_tokens() instead, which is
+        exact with doc_transform --exact-tokens
     """
-    return len(text) // 4
+    return estimate_tokens(text)
 
 
 # T062: Content source selection
@@ -115,62 +157,49 @@ def select_content_source(feature_dir: Path) -> tuple[Literal["readme", "quickst
 
 # T066: Section-level parsing (using markdown-it-py)
 def parse_markdown_sections(
-    markdown_content: str, filename: Literal["README.md", "QUICKSTART.md"]
+    markdown_content: str, filename: Literal["README.md", "QUICKSTART.md", "spec.md"]
 ) -> list[LLMSection]:
-    """Parse Markdown content into sections using markdown-it-py.
+    """Parse Markdown content into h2/h3 sections using markdown-it-py.
+
+    A section runs from its heading to the next h2/h3 heading with text; an
+    h1 or empty heading in between, and the text under it, stays in the
+    section's body so no document text is dropped. Its heading is the
+    heading text (without ``#`` markers) and its content is the Markdown
+    source of the body, so code fences and lists are kept verbatim.
 
     Args:
         markdown_content: Markdown content to parse
-        filename: Filename ("README.md" or "QUICKSTART.md")
+        filename: Filename ("README.md", "QUICKSTART.md" or "spec.md")
 
     Returns:
-        List of LLMSection objects
+        List of LLMSection objects, in document order
 
     Raises:
         SpecKitDocsError: If parsing fails
     """
     try:
-        md = MarkdownIt()
-        tokens = md.parse(markdown_content)
+        tokens = MarkdownIt().parse(markdown_content)
+        lines = markdown_content.splitlines(keepends=True)
+        # (heading line, first body line, tag, heading text) of the h2/h3 headings
+        # starting a section; h1 and empty headings stay in the current section
+        headings = [
+            (token.map[0], token.map[1], token.tag, tokens[i + 1].content)
+            for i, token in enumerate(tokens)
+            if token.type == "heading_open"
+            and token.tag in ("h2", "h3")
+            and token.map
+            and tokens[i + 1].content.strip()
+        ]
+
         sections = []
-        current_heading = None
-        current_level = None
-        current_content: list[str] = []
-
-        for token in tokens:
-            if token.type == "heading_open" and token.tag in ["h2", "h3"]:
-                # Save previous section
-                if current_heading and current_level:
-                    content = "".join(current_content)
-                    sections.append(
-                        LLMSection(
-                            file=filename,
-                            heading=current_heading,
-                            level=cast(Literal["h2", "h3"], current_level),
-                            content=content,
-                            token_count=estimate_token_count(content),
-                        )
-                    )
-                # Start new section
-                current_level = token.tag
-                current_content = []
-            elif token.type == "heading_close":
-                pass  # Skip closing tags
-            elif token.type == "inline" and current_level is None:
-                # This is the heading text before a section starts
-                current_heading = token.content
-            elif current_level is not None:
-                # Accumulate section content
-                current_content.append(token.content or "")
-
-        # Save last section
-        if current_heading and current_level:
-            content = "".join(current_content)
+        for n, (_, body_start, tag, heading) in enumerate(headings):
+            body_end = headings[n + 1][0] if n + 1 < len(headings) else len(lines)
+            content = "".join(lines[body_start:body_end]).strip("\n")
             sections.append(
                 LLMSection(
                     file=filename,
-                    heading=current_heading,
-                    level=cast(Literal["h2", "h3"], current_level),
+                    heading=heading,
+                    level=cast(Literal["h2", "h3"], tag),
                     content=content,
                     token_count=estimate_token_count(content),
                 )
@@ -188,14 +217,9 @@ def parse_markdown_sections(
 
 
 # T065: Inconsistency detection (using LLM API)
+# Static instructions (system block, prompt-cached); variable content goes in the user turn
 INCONSISTENCY_DETECTION_PROMPT = """
-You are a technical documentation analyzer. Your task is to detect inconsistencies between two documentation files.
-
-**README.md content:**
-{readme_content}
-
-**QUICKSTART.md content:**
-{quickstart_content}
+You are a technical documentation analyzer. Your task is to detect inconsistencies between two documentation files, README.md and QUICKSTART.md, given in the user message.
 
 **Analysis criteria:**
 1. Do these files describe the same project?
@@ -212,27 +236,31 @@ You are a technical documentation analyzer. Your task is to detect inconsistenci
 - Different project purposes
 
 **Response format (JSON):**
-{{
+{
   "is_consistent": true/false,
   "inconsistencies": [
-    {{
+    {
       "type": "technology_stack" | "features" | "purpose",
       "readme_claim": "...",
       "quickstart_claim": "...",
       "severity": "critical" | "minor"
-    }}
+    }
   ],
   "summary": "Brief explanation of the analysis result"
-}}
+}
+"""
+
+INCONSISTENCY_DETECTION_USER_TEMPLATE = """**README.md content:**
+{readme_content}
+
+**QUICKSTART.md content:**
+{quickstart_content}
 """
 
 
 # T061: Target audience detection (FR-038-target)
 TARGET_AUDIENCE_PROMPT = """
-You are a technical documentation analyst. Your task is to determine the target audience of a document.
-
-**Document content:**
-{document_content}
+You are a technical documentation analyst. Your task is to determine the target audience of the document given in the user message.
 
 **Audience types:**
 - "end_user": Non-technical users (customers, product managers, sales teams)
@@ -246,23 +274,73 @@ You are a technical documentation analyst. Your task is to determine the target
 - Tone and language complexity
 
 **Response format (JSON):**
-{{
+{
   "audience_type": "end_user" | "developer" | "both",
   "confidence": 0.0-1.0,
   "reasoning": "Brief explanation for the decision"
-}}
+}
 """
 
+TARGET_AUDIENCE_USER_TEMPLATE = """Determine the target audience of this document.
+
+**Document content:**
+{document_content}
+"""
+
+# Characters of a document analysed by one target audience call
+TARGET_AUDIENCE_CONTENT_CHARS = 8000
+
+# Map-reduce: merge of per-chunk target audience results
+TARGET_AUDIENCE_MERGE_PROMPT = """
+You are a technical documentation analyst. A long document was split into consecutive parts, and the target audience of each part was determined separately. Your task is to determine the target audience of the whole document from the per-part results given in the user message.
+
+**Audience types:**
+- "end_user": Non-technical users (customers, product managers, sales teams)
+- "developer": Technical users (developers, engineers, DevOps)
+- "both": Mixed audience (both technical and non-technical)
+
+**Merge criteria:**
+- Weigh each part by its length and confidence
+- A document whose substantial parts address different audiences is "both"
+- Summarize the reasoning of the parts that decide the result
+
+**Response format (JSON):**
+{
+  "audience_type": "end_user" | "developer" | "both",
+  "confidence": 0.0-1.0,
+  "reasoning": "Brief explanation for the decision"
+}
+"""
+
+TARGET_AUDIENCE_MERGE_USER_TEMPLATE = """Determine the target audience of the whole document.
+
+**Per-part results (JSON list, in document order):**
+{partial_results}
+"""
+
+# Chunks analysed at once by a map-reduce call
+MAP_REDUCE_MAX_WORKERS = 4
+
 
 def detect_target_audience(
     file_path: Path,
     timeout_seconds: int = 30,
+    client: "Anthropic | None" = None,
+    map_reduce: bool = True,
 ) -> TargetAudienceResult:
     """Detect target audience of a document (FR-038-target).
 
+    Only the first TARGET_AUDIENCE_CONTENT_CHARS characters are read for a
+    single call. With ``map_reduce``, a longer document is analysed in
+    section-bounded chunks in parallel and the chunk results are merged
+    (see detect_target_audience_map_reduce()).
+
     Args:
         file_path: Path to the document file
         timeout_seconds: Timeout in seconds (default: 30)
+        client: Anthropic API client (default: shared session client)
+        map_reduce: Analyse the whole of a long document (default: True);
+            False analyses its first TARGET_AUDIENCE_CONTENT_CHARS characters
 
     Returns:
         TargetAudienceResult
@@ -278,9 +356,9 @@ def detect_target_audience(
             error_type="Missing Dependency",
         )
 
-    # Read file content
+    # Read the part of the file a single call analyses
     try:
-        content = file_path.read_text(encoding="utf-8")
+        content, truncated = read_head(file_path, TARGET_AUDIENCE_CONTENT_CHARS)
     except FileNotFoundError:
         raise SpecKitDocsError(
             message=f"File not found: {file_path}",
@@ -289,62 +367,102 @@ def detect_target_audience(
             error_type="File Not Found",
         )
 
-    client = get_anthropic_client()
+    if client is None:
+        client = get_anthropic_client()
+
+    if truncated and map_reduce:
+        return detect_target_audience_map_reduce(file_path, client, timeout_seconds)
 
     try:
-        response = client.messages.create(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=1024,
-            messages=[
-                {
-                    "role": "user",
-                    "content": TARGET_AUDIENCE_PROMPT.format(document_content=content[:8000]),
-                }
-            ],
-            timeout=timeout_seconds,
-        )
-
-        # Extract text from first content block (always TextBlock for our prompts)
-        text_block = cast("TextBlock", response.content[0])
-        result_json = json.loads(text_block.text)
-        return TargetAudienceResult(
-            file_path=file_path,
-            audience_type=result_json["audience_type"],
-            confidence=result_json.get("confidence"),
-            reasoning=result_json.get("reasoning"),
+        response = create_message(
+            client, build_target_audience_request(content), "audience", timeout_seconds
         )
+        return parse_target_audience_response(get_response_text(response), file_path)
 
-    except RateLimitError as e:
-        raise SpecKitDocsError(
-            message=f"Anthropic API rate limit exceeded: {e}.",
-            suggestion="Please wait a few minutes and retry later.",
-            file_path=file_path,
-            error_type="LLM API call failed",
-        )
-    except APITimeoutError as e:
-        raise SpecKitDocsError(
-            message=f"Anthropic API timeout after {timeout_seconds} seconds: {e}.",
-            suggestion="Please check your network connection and retry.",
-            file_path=file_path,
-            error_type="LLM API call failed",
+    except (RateLimitError, APITimeoutError, APIError) as e:
+        raise llm_api_error(e, timeout_seconds, file_path)
+
+
+def detect_target_audience_map_reduce(
+    file_path: Path, client: "Anthropic", timeout_seconds: int = 30
+) -> TargetAudienceResult:
+    """Detect the target audience of a long document chunk by chunk.
+
+    Map: the file is streamed in section-bounded chunks of at most
+    TARGET_AUDIENCE_CONTENT_CHARS characters, each analysed by its own call
+    (up to MAP_REDUCE_MAX_WORKERS at once). Reduce: a merge call combines the
+    chunk results; it is skipped when all chunks agree.
+
+    Args:
+        file_path: Path to the document file
+        client: Anthropic API client
+        timeout_seconds: Timeout in seconds per call (default: 30)
+
+    Returns:
+        TargetAudienceResult of the whole document
+
+    Raises:
+        SpecKitDocsError: If an LLM API call fails
+    """
+
+    def _detect(chunk: str) -> tuple[int, TargetAudienceResult]:
+        response = create_message(
+            client, build_target_audience_request(chunk), "audience", timeout_seconds
         )
-    except APIError as e:
-        raise SpecKitDocsError(
-            message=f"Anthropic API error: {e}.",
-            suggestion="Please check your API key and account status. Set ANTHROPIC_API_KEY environment variable.",
-            file_path=file_path,
-            error_type="LLM API call failed",
+        return len(chunk), parse_target_audience_response(get_response_text(response), file_path)
+
+    try:
+        partials = map_chunks(_detect, iter_file_chunks(file_path, TARGET_AUDIENCE_CONTENT_CHARS))
+        merged = merge_unanimous_audience(partials, file_path)
+        if merged is not None:
+            return merged
+        response = create_message(
+            client, build_target_audience_merge_request(partials), "audience", timeout_seconds
         )
+        return parse_target_audience_response(get_response_text(response), file_path)
 
+    except (RateLimitError, APITimeoutError, APIError) as e:
+        raise llm_api_error(e, timeout_seconds, file_path)
 
-# T062: Section classification (FR-038-classify)
-SECTION_CLASSIFICATION_PROMPT = """
-You are a technical documentation analyst. Your task is to classify a documentation section.
 
-**Section heading:** {heading}
+def map_chunks(
+    fn: Callable[[T], R], chunks: Iterable[T], max_workers: int = MAP_REDUCE_MAX_WORKERS
+) -> list[R]:
+    """Apply fn to chunks in worker threads, reading at most max_workers chunks ahead.
+
+    Chunks are pulled from the iterable only when a worker is free, so a
+    streamed document is never held in memory as a whole. Each call runs in
+    a copy of the caller's context (feature attribution of LLM calls).
+
+    Args:
+        fn: Map function (e.g. one LLM call per chunk)
+        chunks: Chunks in document order
+        max_workers: Maximum number of concurrent calls (>= 1)
+
+    Returns:
+        Results in chunk order
+
+    Raises:
+        Exception: The exception of the first failed chunk (no chunk is started
+            after a failure is seen)
+    """
+    slots = threading.Semaphore(max_workers)
+    futures: list[Future[R]] = []
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="speckit-map") as executor:
+        for chunk in chunks:
+            slots.acquire()
+            if any(f.done() and f.exception() is not None for f in futures):
+                slots.release()
+                break
+            future = executor.submit(contextvars.copy_context().run, fn, chunk)
+            future.add_done_callback(lambda _: slots.release())
+            futures.append(future)
+    return [f.result() for f in futures]
 
-**Section content:**
-{content}
+
+# T062: Section classification (FR-038-classify)
+SECTION_CLASSIFICATION_PROMPT = """
+You are a technical documentation analyst. Your task is to classify the documentation section given in the user message.
 
 **Section types:**
 - "end_user": For non-technical users (installation guides, quick starts, FAQs)
@@ -358,10 +476,49 @@ You are a technical documentation analyst. Your task is to classify a documentat
 - Practical vs theoretical focus
 
 **Response format (JSON):**
-{{
+{
   "section_type": "end_user" | "developer" | "both",
   "confidence": 0.0-1.0
-}}
+}
+"""
+
+SECTION_CLASSIFICATION_USER_TEMPLATE = """Classify this documentation section.
+
+**Section heading:** {heading}
+
+**Section content:**
+{content}
+"""
+
+# Characters of a section body analysed by one classification call
+SECTION_CLASSIFICATION_CONTENT_CHARS = 4000
+
+# Map-reduce: merge of per-chunk section classifications
+SECTION_CLASSIFICATION_MERGE_PROMPT = """
+You are a technical documentation analyst. A long documentation section was split into consecutive parts, and each part was classified separately. Your task is to classify the whole section from the per-part results given in the user message.
+
+**Section types:**
+- "end_user": For non-technical users (installation guides, quick starts, FAQs)
+- "developer": For technical users (API references, architecture diagrams, code examples)
+- "both": Relevant to both audiences (overview, features, troubleshooting)
+
+**Merge criteria:**
+- Weigh each part by its length and confidence
+- A section whose substantial parts address different audiences is "both"
+
+**Response format (JSON):**
+{
+  "section_type": "end_user" | "developer" | "both",
+  "confidence": 0.0-1.0
+}
+"""
+
+SECTION_CLASSIFICATION_MERGE_USER_TEMPLATE = """Classify the whole documentation section.
+
+**Section heading:** {heading}
+
+**Per-part results (JSON list, in section order):**
+{partial_results}
 """
 
 
@@ -370,14 +527,22 @@ def classify_section(
     heading: str,
     content: str,
     timeout_seconds: int = 30,
+    client: "Anthropic | None" = None,
+    map_reduce: bool = True,
 ) -> SectionClassification:
     """Classify a documentation section (FR-038-classify).
 
+    A single call classifies the first SECTION_CLASSIFICATION_CONTENT_CHARS
+    characters of the body. With ``map_reduce``, a longer body is classified
+    in chunks in parallel and the chunk results are merged.
+
     Args:
         file_path: Path to the file containing this section
         heading: Section heading (e.g., "## Installation")
         content: Section body content
         timeout_seconds: Timeout in seconds (default: 30)
+        client: Anthropic API client (default: shared session client)
+        map_reduce: Classify the whole of a long body (default: True)
 
     Returns:
         SectionClassification
@@ -393,62 +558,180 @@ def classify_section(
             error_type="Missing Dependency",
         )
 
-    client = get_anthropic_client()
+    if client is None:
+        client = get_anthropic_client()
 
-    try:
-        response = client.messages.create(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=512,
-            messages=[
-                {
-                    "role": "user",
-                    "content": SECTION_CLASSIFICATION_PROMPT.format(
-                        heading=heading,
-                        content=content[:4000],
-                    ),
-                }
-            ],
-            timeout=timeout_seconds,
-        )
-
-        # Extract text from first content block (always TextBlock for our prompts)
-        text_block = cast("TextBlock", response.content[0])
-        result_json = json.loads(text_block.text)
-        return SectionClassification(
-            file_path=file_path,
-            heading=heading,
-            section_type=result_json["section_type"],
-            confidence=result_json.get("confidence"),
+    def _classify(chunk: str) -> tuple[int, SectionClassification]:
+        response = create_message(
+            client, build_section_classification_request(heading, chunk), "classify", timeout_seconds
+        )
+        return len(chunk), parse_section_classification_response(
+            get_response_text(response), file_path, heading
         )
 
-    except RateLimitError as e:
-        raise SpecKitDocsError(
-            message=f"Anthropic API rate limit exceeded: {e}.",
-            suggestion="Please wait a few minutes and retry later.",
-            file_path=file_path,
-            error_type="LLM API call failed",
+    try:
+        if not map_reduce or len(content) <= SECTION_CLASSIFICATION_CONTENT_CHARS:
+            return _classify(content)[1]
+
+        # Map: classify each chunk of the body; reduce: merge call unless unanimous
+        partials = map_chunks(
+            _classify,
+            iter_markdown_chunks(content.splitlines(keepends=True), SECTION_CLASSIFICATION_CONTENT_CHARS),
         )
-    except APITimeoutError as e:
-        raise SpecKitDocsError(
-            message=f"Anthropic API timeout after {timeout_seconds} seconds: {e}.",
-            suggestion="Please check your network connection and retry.",
-            file_path=file_path,
-            error_type="LLM API call failed",
+        merged = merge_unanimous_classification(partials)
+        if merged is not None:
+            return merged
+        response = create_message(
+            client, build_classification_merge_request(heading, partials), "classify", timeout_seconds
         )
-    except APIError as e:
+        return parse_section_classification_response(
+            get_response_text(response), file_path, heading
+        )
+
+    except (RateLimitError, APITimeoutError, APIError) as e:
+        raise llm_api_error(e, timeout_seconds, file_path)
+
+
+# FR-038-classify: Batched section classification (one request per document set)
+BATCH_SECTION_CLASSIFICATION_PROMPT = """
+You are a technical documentation analyst. Your task is to classify each of the documentation sections given in the user message as a JSON list.
+
+**Section types:**
+- "end_user": For non-technical users (installation guides, quick starts, FAQs)
+- "developer": For technical users (API references, architecture diagrams, code examples)
+- "both": Relevant to both audiences (overview, features, troubleshooting)
+
+**Analysis criteria:**
+- Technical depth
+- Code examples presence
+- Assumed background knowledge
+- Practical vs theoretical focus
+
+**Response format (JSON):**
+Return exactly one classification per section, using the section's "index".
+{
+  "classifications": [
+    {
+      "index": 0,
+      "section_type": "end_user" | "developer" | "both",
+      "confidence": 0.0-1.0
+    }
+  ]
+}
+"""
+
+BATCH_SECTION_CLASSIFICATION_USER_TEMPLATE = """Classify each of these documentation sections.
+
+**Sections (JSON list):**
+{sections_list}
+"""
+
+# Input token budget per batched classification request
+CLASSIFICATION_BATCH_TOKEN_BUDGET = 20000
+# Upper bound on sections per request (keeps the JSON response well below max_tokens)
+CLASSIFICATION_BATCH_MAX_SECTIONS = 100
+
+
+def plan_classification_batches(
+    sections: list[tuple[Path, LLMSection]],
+    token_budget: int = CLASSIFICATION_BATCH_TOKEN_BUDGET,
+    max_sections: int = CLASSIFICATION_BATCH_MAX_SECTIONS,
+) -> list[list[tuple[Path, LLMSection]]]:
+    """Split sections into as few classification requests as the token budget allows.
+
+    Sections are kept in their original order. A section whose estimate alone
+    exceeds the budget is sent in a request of its own.
+
+    Args:
+        sections: (file path, section) pairs to classify
+        token_budget: Estimated input token budget per request
+        max_sections: Maximum number of sections per request
+
+    Returns:
+        List of batches, each a list of (file path, section) pairs
+    """
+    overhead = estimate_token_count(
+        BATCH_SECTION_CLASSIFICATION_PROMPT + BATCH_SECTION_CLASSIFICATION_USER_TEMPLATE
+    )
+    batches: list[list[tuple[Path, LLMSection]]] = []
+    current: list[tuple[Path, LLMSection]] = []
+    current_tokens = overhead
+
+    for item in sections:
+        _, section = item
+        # Same per-section truncation as build_batch_classification_request()
+        item_tokens = estimate_token_count(
+            section.heading + section.content[:SECTION_CLASSIFICATION_CONTENT_CHARS]
+        )
+        if current and (
+            current_tokens + item_tokens > token_budget or len(current) >= max_sections
+        ):
+            batches.append(current)
+            current = []
+            current_tokens = overhead
+        current.append(item)
+        current_tokens += item_tokens
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+def classify_sections(
+    sections: list[tuple[Path, LLMSection]],
+    client: "Anthropic | None" = None,
+    timeout_seconds: int = 60,
+    token_budget: int = CLASSIFICATION_BATCH_TOKEN_BUDGET,
+) -> list[SectionClassification]:
+    """Classify many sections with as few LLM calls as possible (FR-038-classify).
+
+    All sections of one or more files are sent in a single request; the
+    sections are split across several requests only when the estimated
+    input tokens would exceed ``token_budget``.
+
+    Args:
+        sections: (file path, section) pairs, e.g. from parse_markdown_sections()
+        client: Anthropic API client (default: shared session client)
+        timeout_seconds: Timeout in seconds per request (default: 60)
+        token_budget: Estimated input token budget per request
+
+    Returns:
+        List of SectionClassification in the same order as ``sections``
+
+    Raises:
+        SpecKitDocsError: If an LLM API call fails or a classification is missing
+    """
+    if not sections:
+        return []
+
+    if Anthropic is None:
         raise SpecKitDocsError(
-            message=f"Anthropic API error: {e}.",
-            suggestion="Please check your API key and account status. Set ANTHROPIC_API_KEY environment variable.",
-            file_path=file_path,
-            error_type="LLM API call failed",
+            "anthropic package is not installed.",
+            "Install it with: uv add anthropic"
         )
 
+    if client is None:
+        client = get_anthropic_client()
+
+    results: list[SectionClassification] = []
+    for batch in plan_classification_batches(sections, token_budget):
+        try:
+            response = create_message(
+                client, build_batch_classification_request(batch), "classify", timeout_seconds
+            )
+        except (RateLimitError, APITimeoutError, APIError) as e:
+            raise llm_api_error(e, timeout_seconds, batch[0][0])
+        results.extend(parse_batch_classification_response(get_response_text(response), batch))
+
+    return results
+
 
 def detect_inconsistency(
     readme_content: str,
     quickstart_content: str,
     client: "Anthropic",
     timeout_seconds: int = 30,
+    stream: bool = False,
 ) -> InconsistencyDetectionResult:
     """Detect inconsistencies between README.md and QUICKSTART.md.
 
@@ -457,6 +740,8 @@ def detect_inconsistency(
         quickstart_content: QUICKSTART.md content
         client: Anthropic API client
         timeout_seconds: Timeout in seconds (default: 30)
+        stream: Stream the response and stop reading as soon as
+            ``is_consistent: false`` and the first inconsistency are known
 
     Returns:
         InconsistencyDetectionResult
@@ -471,55 +756,21 @@ def detect_inconsistency(
         )
 
     try:
-        response = client.messages.create(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=4096,
-            messages=[
-                {
-                    "role": "user",
-                    "content": INCONSISTENCY_DETECTION_PROMPT.format(
-                        readme_content=readme_content,
-                        quickstart_content=quickstart_content,
-                    ),
-                }
-            ],
-            timeout=timeout_seconds,
-        )
-
-        # Extract text from first content block (always TextBlock for our prompts)
-        text_block = cast("TextBlock", response.content[0])
-        result_json = json.loads(text_block.text)
-        return InconsistencyDetectionResult(
-            is_consistent=result_json["is_consistent"],
-            inconsistencies=[
-                Inconsistency(**item) for item in result_json["inconsistencies"]
-            ],
-            summary=result_json["summary"],
-        )
+        params = build_inconsistency_request(readme_content, quickstart_content)
+        if stream:
+            collector = InconsistencyStreamCollector()
+            streamed = stream_message(client, params, "inconsistency", timeout_seconds, collector)
+            return collector.result(streamed)
+        response = create_message(client, params, "inconsistency", timeout_seconds)
+        return parse_inconsistency_response(get_response_text(response))
 
-    except RateLimitError as e:
-        raise SpecKitDocsError(
-            f"Anthropic API rate limit exceeded: {e}.",
-            "Please wait a few minutes and retry later."
-        )
-    except APITimeoutError as e:
-        raise SpecKitDocsError(
-            f"Anthropic API timeout after {timeout_seconds} seconds: {e}.",
-            "Please check your network connection and retry."
-        )
-    except APIError as e:
-        raise SpecKitDocsError(
-            f"Anthropic API error: {e}.",
-            "Please check your API key and account status. Set ANTHROPIC_API_KEY environment variable."
-        )
+    except (RateLimitError, APITimeoutError, APIError) as e:
+        raise llm_api_error(e, timeout_seconds)
 
 
 # T067: Section prioritization (using LLM API)
 SECTION_PRIORITY_PROMPT = """
-You are a technical documentation organizer. Your task is to prioritize documentation sections for end-user comprehension.
-
-**Sections from README.md and QUICKSTART.md:**
-{sections_list}
+You are a technical documentation organizer. Your task is to prioritize the documentation sections given in the user message for end-user comprehension.
 
 **Prioritization criteria:**
 1. End-user importance (non-technical users should understand the project)
@@ -527,27 +778,36 @@ You are a technical documentation organizer. Your task is to prioritize document
 3. Essential information first
 
 **Response format (JSON):**
-{{
+{
   "prioritized_sections": [
-    {{
+    {
       "file": "README.md",
       "heading": "## Overview",
       "priority": 1,
       "reason": "Essential introduction for all users"
-    }},
-    {{
+    },
+    {
       "file": "QUICKSTART.md",
       "heading": "## Quick Start",
       "priority": 2,
       "reason": "Immediate hands-on guide"
-    }}
+    }
   ]
-}}
+}
+"""
+
+SECTION_PRIORITY_USER_TEMPLATE = """**Sections from README.md and QUICKSTART.md:**
+{sections_list}
 """
 
 
 def prioritize_sections(
-    sections: list[LLMSection], client: "Anthropic", timeout_seconds: int = 45
+    sections: list[LLMSection],
+    client: "Anthropic",
+    timeout_seconds: int = 45,
+    stream: bool = False,
+    on_section: Callable[[PrioritizedSection], None] | None = None,
+    preserve_order: bool = False,
 ) -> SectionPriorityResult:
     """Prioritize sections using LLM API.
 
@@ -555,6 +815,11 @@ def prioritize_sections(
         sections: List of sections to prioritize
         client: Anthropic API client
         timeout_seconds: Timeout in seconds (default: 45)
+        stream: Stream the response and build PrioritizedSections as items arrive
+        on_section: Called with each PrioritizedSection as soon as it is known
+            (in response order, before the token limit is applied; stream only)
+        preserve_order: Return the included sections in document order
+            instead of priority order (T068 packing is unchanged)
 
     Returns:
         SectionPriorityResult
@@ -569,94 +834,1024 @@ def prioritize_sections(
         )
 
     try:
-        section_list = [
-            {"file": s.file, "heading": s.heading, "content_preview": s.content[:200]}
-            for s in sections
-        ]
+        params = build_section_priority_request(sections)
+        if stream:
+            priority_collector = SectionPriorityStreamCollector(sections, on_section, preserve_order)
+            streamed = stream_message(client, params, "priority", timeout_seconds, priority_collector)
+            return priority_collector.result(streamed)
+        response = create_message(client, params, "priority", timeout_seconds)
+        return parse_section_priority_response(get_response_text(response), sections, preserve_order)
+
+    except (RateLimitError, APITimeoutError, APIError) as e:
+        raise llm_api_error(e, timeout_seconds)
+
+
+# T069: spec.md minimal extraction → end-user document (FR-022b Step 1.2)
+SPEC_TRANSFORM_PROMPT = """
+You are a technical writer. Your task is to rewrite the feature specification extract given in the user message as end-user documentation.
+
+**Guidelines:**
+1. Write for non-technical readers (customers, product managers)
+2. Keep the document structure (## / ### headings) of the extract
+3. Explain what the feature does and why it is useful, not how it is implemented
+4. Keep the language of the extract (e.g., Japanese stays Japanese)
+
+**Response format:**
+Return only the rewritten Markdown document, without any preamble or code fences.
+"""
 
-        response = client.messages.create(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=4096,
-            messages=[
-                {
-                    "role": "user",
-                    "content": SECTION_PRIORITY_PROMPT.format(
-                        sections_list=json.dumps(section_list, ensure_ascii=False)
-                    ),
-                }
-            ],
-            timeout=timeout_seconds,
-        )
-
-        # Extract text from first content block (always TextBlock for our prompts)
-        text_block = cast("TextBlock", response.content[0])
-        result_json = json.loads(text_block.text)
-
-        # Map sections by (file, heading) for lookup
-        section_map = {(s.file, s.heading): s for s in sections}
-        prioritized = []
-        prioritized_keys = set()
-
-        for item in result_json["prioritized_sections"]:
-            key = (item["file"], item["heading"])
-            if key in section_map:
-                prioritized.append(
-                    PrioritizedSection(
-                        section=section_map[key],
-                        priority=item["priority"],
-                        reason=item["reason"],
-                    )
-                )
-                prioritized_keys.add(key)
+SPEC_TRANSFORM_USER_TEMPLATE = """**Specification extract:**
+{spec_content}
+"""
+
+# Map-reduce: transitions between end-user documents transformed from consecutive
+# extract chunks. The partial documents are joined in code (join_spec_parts()), so
+# the merge call only sees the text around each boundary and never rewrites a part.
+SPEC_MERGE_PROMPT = """
+You are a technical writer. A long feature specification extract was split into consecutive parts, and each part was rewritten as end-user documentation separately. The parts are joined in order; your task is to smooth the boundaries where they meet.
+
+For each boundary in the user message you get the end of the part before it and the start of the part after it.
+
+**Guidelines:**
+1. Write at most one or two short sentences per boundary, only where the text would otherwise read abruptly; return an empty text otherwise
+2. Do not repeat, summarize or rewrite the parts, and do not add headings
+3. Keep the language of the parts (e.g., Japanese stays Japanese)
+
+**Response format:**
+Call the tool with one transition per boundary you smooth, by boundary number.
+"""
+
+SPEC_MERGE_USER_TEMPLATE = """**Boundaries between the partial documents (in order):**
+{boundaries}
+"""
+
+# Characters of each part shown on either side of a boundary in the merge call
+SPEC_MERGE_CONTEXT_CHARS = 600
+# Output budget of the merge call per boundary (a transition is one or two sentences)
+SPEC_MERGE_TOKENS_PER_BOUNDARY = 256
+
+
+def transform_spec_content(
+    spec_content: str,
+    client: "Anthropic",
+    timeout_seconds: int = 60,
+    map_reduce: bool = True,
+) -> LLMTransformResult:
+    """Transform spec.md minimal extraction into end-user documentation.
+
+    With ``map_reduce``, an extract of more than SPEC_TOKEN_LIMIT tokens is
+    transformed in section-bounded chunks in parallel, and the partial
+    documents are merged by a final call (see transform_spec_content_map_reduce()).
+
+    Args:
+        spec_content: Markdown from SpecExtractionResult.to_markdown()
+        client: Anthropic API client
+        timeout_seconds: Timeout in seconds (default: 60)
+        map_reduce: Transform long extracts chunk by chunk (default: True)
+
+    Returns:
+        LLMTransformResult (transform_type="spec_md_extraction")
+
+    Raises:
+        SpecKitDocsError: If LLM API call fails or the result fails the T069 quality check
+    """
+    if Anthropic is None:
+        raise SpecKitDocsError(
+            "anthropic package is not installed.",
+            "Install it with: uv add anthropic"
+        )
+
+    if map_reduce and count_tokens(spec_content) > SPEC_TOKEN_LIMIT:
+        return transform_spec_content_map_reduce(spec_content, client, timeout_seconds)
+
+    try:
+        response = create_message(
+            client, build_spec_transform_request(spec_content), "transform", timeout_seconds
+        )
+        check_not_truncated(response)
+        return parse_spec_transform_response(get_response_text(response), spec_content)
+
+    except (RateLimitError, APITimeoutError, APIError) as e:
+        raise llm_api_error(e, timeout_seconds)
 
-        # Sort by priority
-        prioritized.sort(key=lambda x: x.priority)
 
-        # T068: Section integration (within 10,000 tokens)
-        total_tokens = 0
-        included_sections = 0
-        excluded_sections = []
+def split_spec_extract(spec_content: str, token_limit: int = SPEC_TOKEN_LIMIT) -> list[str]:
+    """Split a spec.md extract into section-bounded chunks of at most token_limit tokens."""
+    return list(
+        iter_markdown_chunks(spec_content.splitlines(keepends=True), token_limit, estimate_token_count)
+    )
+
+
+def transform_spec_content_map_reduce(
+    spec_content: str, client: "Anthropic", timeout_seconds: int = 60
+) -> LLMTransformResult:
+    """Transform a long spec.md extract chunk by chunk and join the results.
+
+    Map: each chunk of split_spec_extract() is transformed by its own call
+    (up to MAP_REDUCE_MAX_WORKERS at once). Reduce: the partial documents
+    are joined in order (join_spec_parts()); a merge call only writes
+    transitions between them, so no part is lost to the output limit of a
+    single call. A single chunk needs no merge.
+
+    Args:
+        spec_content: Markdown from SpecExtractionResult.to_markdown()
+        client: Anthropic API client
+        timeout_seconds: Timeout in seconds per call (default: 60)
+
+    Returns:
+        LLMTransformResult of the joined document
+
+    Raises:
+        SpecKitDocsError: If an LLM API call of a chunk fails or a result fails the T069 quality check
+    """
+
+    def _transform(chunk: str) -> str:
+        response = create_message(
+            client, build_spec_transform_request(chunk), "transform", timeout_seconds
+        )
+        check_not_truncated(response)
+        return parse_spec_transform_response(get_response_text(response), chunk).transformed_content
+
+    try:
+        parts = map_chunks(_transform, split_spec_extract(spec_content))
+    except (RateLimitError, APITimeoutError, APIError) as e:
+        raise llm_api_error(e, timeout_seconds)
+    if len(parts) == 1:
+        return parse_spec_transform_response(parts[0], spec_content)
+
+    try:
+        response = create_message(client, build_spec_merge_request(parts), "transform", timeout_seconds)
+    except (RateLimitError, APITimeoutError, APIError) as e:
+        # Transitions are cosmetic: the parts are joined without them
+        logger.warning("spec.md merge call failed, joining the parts without transitions: %s", e)
+        return parse_spec_transform_response(join_spec_parts(parts), spec_content)
+    return parse_spec_merge_response(response, parts, spec_content)
+
+
+# ============================================================================
+# Request construction and response parsing
+#
+# Shared by the blocking functions above and the concurrent engine in
+# speckit_docs.utils.llm_engine, so both send identical requests.
+# ============================================================================
+
+# Model of requests without a routed call type (see llm_routing for per-call-type models)
+DEFAULT_MODEL = LARGE_MODEL
+
+
+def system_prompt(prompt: str) -> list[dict[str, Any]]:
+    """Build the system block of the static instructions of a call type.
+
+    The instructions stay out of the user turn, which only carries the
+    variable content. They are not marked with cache_control: the API only
+    caches prefixes of 1024 tokens or more (2048 for Haiku models), and every
+    built-in prompt is far shorter, while no longer content is shared by
+    successive requests. The prompt cache counters of the responses are
+    still recorded (see llm_usage).
+    """
+    return [{"type": "text", "text": prompt.strip()}]
+
+
+def build_target_audience_request(content: str) -> dict[str, Any]:
+    """Build messages.create() parameters for target audience detection."""
+    params = {
+        "model": model_for("audience"),
+        "max_tokens": 1024,
+        "system": system_prompt(TARGET_AUDIENCE_PROMPT),
+        "messages": [
+            {
+                "role": "user",
+                "content": TARGET_AUDIENCE_USER_TEMPLATE.format(
+                    document_content=content[:TARGET_AUDIENCE_CONTENT_CHARS]
+                ),
+            }
+        ],
+    }
+    return with_response_tool(params, TARGET_AUDIENCE_TOOL)
+
+
+def build_section_classification_request(heading: str, content: str) -> dict[str, Any]:
+    """Build messages.create() parameters for section classification."""
+    params = {
+        "model": model_for("classify"),
+        "max_tokens": 512,
+        "system": system_prompt(SECTION_CLASSIFICATION_PROMPT),
+        "messages": [
+            {
+                "role": "user",
+                "content": SECTION_CLASSIFICATION_USER_TEMPLATE.format(
+                    heading=heading,
+                    content=content[:SECTION_CLASSIFICATION_CONTENT_CHARS],
+                ),
+            }
+        ],
+    }
+    return with_response_tool(params, SECTION_CLASSIFICATION_TOOL)
+
+
+def build_batch_classification_request(
+    sections: list[tuple[Path, LLMSection]],
+) -> dict[str, Any]:
+    """Build messages.create() parameters for batched section classification."""
+    section_list = [
+        {
+            "index": index,
+            "file": str(file_path),
+            "heading": section.heading,
+            "content": section.content[:SECTION_CLASSIFICATION_CONTENT_CHARS],
+        }
+        for index, (file_path, section) in enumerate(sections)
+    ]
+    params = {
+        "model": model_for("classify"),
+        # ~40 output tokens per classification plus JSON framing
+        "max_tokens": min(4096, 256 + 40 * len(sections)),
+        "system": system_prompt(BATCH_SECTION_CLASSIFICATION_PROMPT),
+        "messages": [
+            {
+                "role": "user",
+                "content": BATCH_SECTION_CLASSIFICATION_USER_TEMPLATE.format(
+                    sections_list=json.dumps(section_list, ensure_ascii=False)
+                ),
+            }
+        ],
+    }
+    return with_response_tool(params, BATCH_SECTION_CLASSIFICATION_TOOL)
+
+
+def build_inconsistency_request(readme_content: str, quickstart_content: str) -> dict[str, Any]:
+    """Build messages.create() parameters for inconsistency detection."""
+    params = {
+        "model": model_for("inconsistency"),
+        "max_tokens": 4096,
+        "system": system_prompt(INCONSISTENCY_DETECTION_PROMPT),
+        "messages": [
+            {
+                "role": "user",
+                "content": INCONSISTENCY_DETECTION_USER_TEMPLATE.format(
+                    readme_content=readme_content,
+                    quickstart_content=quickstart_content,
+                ),
+            }
+        ],
+    }
+    return with_response_tool(params, INCONSISTENCY_TOOL)
+
+
+def build_section_priority_request(sections: list[LLMSection]) -> dict[str, Any]:
+    """Build messages.create() parameters for section prioritization."""
+    section_list = [
+        {"file": s.file, "heading": s.heading, "content_preview": s.content[:200]}
+        for s in sections
+    ]
+    params = {
+        "model": model_for("priority"),
+        "max_tokens": 4096,
+        "system": system_prompt(SECTION_PRIORITY_PROMPT),
+        "messages": [
+            {
+                "role": "user",
+                "content": SECTION_PRIORITY_USER_TEMPLATE.format(
+                    sections_list=json.dumps(section_list, ensure_ascii=False)
+                ),
+            }
+        ],
+    }
+    return with_response_tool(params, SECTION_PRIORITY_TOOL)
+
+
+def build_spec_transform_request(spec_content: str) -> dict[str, Any]:
+    """Build messages.create() parameters for spec.md end-user transformation."""
+    return {
+        "model": model_for("transform"),
+        "max_tokens": 4096,
+        "system": system_prompt(SPEC_TRANSFORM_PROMPT),
+        "messages": [
+            {
+                "role": "user",
+                "content": SPEC_TRANSFORM_USER_TEMPLATE.format(spec_content=spec_content),
+            }
+        ],
+    }
+
+
+def build_target_audience_merge_request(
+    partials: list[tuple[int, TargetAudienceResult]],
+) -> dict[str, Any]:
+    """Build messages.create() parameters merging (chunk length, result) pairs."""
+    results = [
+        {
+            "part": index,
+            "characters": length,
+            "audience_type": result.audience_type,
+            "confidence": result.confidence,
+            "reasoning": result.reasoning,
+        }
+        for index, (length, result) in enumerate(partials, start=1)
+    ]
+    params = {
+        "model": model_for("audience"),
+        "max_tokens": 1024,
+        "system": system_prompt(TARGET_AUDIENCE_MERGE_PROMPT),
+        "messages": [
+            {
+                "role": "user",
+                "content": TARGET_AUDIENCE_MERGE_USER_TEMPLATE.format(
+                    partial_results=json.dumps(results, ensure_ascii=False, indent=2)
+                ),
+            }
+        ],
+    }
+    return with_response_tool(params, TARGET_AUDIENCE_TOOL)
+
+
+def build_classification_merge_request(
+    heading: str, partials: list[tuple[int, SectionClassification]]
+) -> dict[str, Any]:
+    """Build messages.create() parameters merging (chunk length, classification) pairs."""
+    results = [
+        {
+            "part": index,
+            "characters": length,
+            "section_type": result.section_type,
+            "confidence": result.confidence,
+        }
+        for index, (length, result) in enumerate(partials, start=1)
+    ]
+    params = {
+        "model": model_for("classify"),
+        "max_tokens": 512,
+        "system": system_prompt(SECTION_CLASSIFICATION_MERGE_PROMPT),
+        "messages": [
+            {
+                "role": "user",
+                "content": SECTION_CLASSIFICATION_MERGE_USER_TEMPLATE.format(
+                    heading=heading,
+                    partial_results=json.dumps(results, ensure_ascii=False, indent=2),
+                ),
+            }
+        ],
+    }
+    return with_response_tool(params, SECTION_CLASSIFICATION_TOOL)
+
+
+def build_spec_merge_request(parts: list[str]) -> dict[str, Any]:
+    """Build messages.create() parameters asking for transitions between partial documents.
+
+    Only the text around each boundary is sent, and max_tokens grows with
+    the number of boundaries (see join_spec_parts() for the reduce itself).
+    """
+    boundaries = "\n\n".join(
+        f'<boundary index="{index}">\n'
+        f"<before>\n{before.strip()[-SPEC_MERGE_CONTEXT_CHARS:]}\n</before>\n"
+        f"<after>\n{after.strip()[:SPEC_MERGE_CONTEXT_CHARS]}\n</after>\n"
+        "</boundary>"
+        for index, (before, after) in enumerate(zip(parts, parts[1:], strict=False), start=1)
+    )
+    params = {
+        "model": model_for("transform"),
+        "max_tokens": min(4096, SPEC_MERGE_TOKENS_PER_BOUNDARY * max(1, len(parts) - 1)),
+        "system": system_prompt(SPEC_MERGE_PROMPT),
+        "messages": [
+            {
+                "role": "user",
+                "content": SPEC_MERGE_USER_TEMPLATE.format(boundaries=boundaries),
+            }
+        ],
+    }
+    return with_response_tool(params, SPEC_MERGE_TOOL)
+
+
+def join_spec_parts(parts: list[str], transitions: dict[int, str] | None = None) -> str:
+    """Join partial end-user documents in order (the reduce of the spec.md map-reduce).
+
+    Every part is kept verbatim. A part starting with the heading the
+    previous part ended under (a section split across chunks) drops that
+    repeated heading line. ``transitions[k]`` is inserted between part k
+    and part k + 1 (1-based); heading lines in a transition are dropped, so
+    it can never open a section of its own.
+
+    Args:
+        parts: Transformed documents of consecutive extract chunks
+        transitions: Transition text by boundary number
+
+    Returns:
+        Joined Markdown document
+    """
+    transitions = transitions or {}
+    blocks: list[str] = []
+    last_heading: str | None = None
+    for index, part in enumerate(parts, start=1):
+        lines = part.strip().splitlines()
+        if lines and last_heading is not None and lines[0].strip() == last_heading:
+            lines = lines[1:]
+        text = "\n".join(lines).strip()
+        if text:
+            blocks.append(text)
+        headings = [line.strip() for line in lines if line.lstrip().startswith("#")]
+        if headings:
+            last_heading = headings[-1]
+        transition = "\n".join(
+            line for line in transitions.get(index, "").splitlines() if not line.lstrip().startswith("#")
+        ).strip()
+        if transition and index < len(parts):
+            blocks.append(transition)
+    return "\n\n".join(blocks)
+
+
+def parse_spec_merge_response(
+    response: Any, parts: list[str], spec_content: str
+) -> LLMTransformResult:
+    """Join the partial documents with the transitions of a merge response.
+
+    A merge response cut off by max_tokens or not matching SPEC_MERGE_TOOL
+    loses its transitions only: the parts are joined without them.
+
+    Raises:
+        SpecKitDocsError: If the joined document fails the T069 quality check
+    """
+    transitions: dict[int, str] = {}
+    if getattr(response, "stop_reason", None) == "max_tokens":
+        logger.warning("spec.md merge response hit max_tokens, joining the parts without transitions")
+    else:
+        try:
+            data = decode_response(get_response_text(response), SPEC_MERGE_TOOL)
+            transitions = {int(item["boundary"]): str(item["text"]) for item in data["transitions"]}
+        except SpecKitDocsError as e:
+            logger.warning("Invalid spec.md merge response, joining the parts without transitions: %s", e.message)
+    return parse_spec_transform_response(join_spec_parts(parts, transitions), spec_content)
+
+
+def _min_confidence(confidences: list[float | None]) -> float | None:
+    """Lowest known confidence (None if no result has one)."""
+    known = [c for c in confidences if c is not None]
+    return min(known) if known else None
+
+
+def merge_unanimous_audience(
+    partials: list[tuple[int, TargetAudienceResult]], file_path: Path
+) -> TargetAudienceResult | None:
+    """Reduce chunk results without a merge call when all chunks agree.
+
+    Returns:
+        The common audience with the lowest chunk confidence and the reasoning
+        of the longest chunk, or None if the chunks disagree
+    """
+    if len({result.audience_type for _, result in partials}) != 1:
+        return None
+    _, longest = max(partials, key=lambda item: item[0])
+    return TargetAudienceResult(
+        file_path=file_path,
+        audience_type=longest.audience_type,
+        confidence=_min_confidence([result.confidence for _, result in partials]),
+        reasoning=longest.reasoning,
+    )
+
+
+def merge_unanimous_classification(
+    partials: list[tuple[int, SectionClassification]],
+) -> SectionClassification | None:
+    """Reduce chunk classifications without a merge call when all chunks agree."""
+    if len({result.section_type for _, result in partials}) != 1:
+        return None
+    _, first = partials[0]
+    return SectionClassification(
+        file_path=first.file_path,
+        heading=first.heading,
+        section_type=first.section_type,
+        confidence=_min_confidence([result.confidence for _, result in partials]),
+    )
+
+
+_request_token_counter = ApproximateTokenCounter()
+
+
+def estimate_request_tokens(params: dict[str, Any]) -> tuple[int, int]:
+    """Estimate (input tokens, output tokens) of a request for rate-limit throttling.
+
+    Input is estimated from the tool definitions, system and message text;
+    output uses max_tokens (the upper bound the API may produce). Always
+    approximate, even when the process-wide counter is exact: this runs
+    before every request.
+    """
+    text = json.dumps(params.get("tools", []), ensure_ascii=False) if params.get("tools") else ""
+    text += "".join(block["text"] for block in params.get("system", []))
+    text += "".join(str(message["content"]) for message in params.get("messages", []))
+    return _request_token_counter.count(text), int(params.get("max_tokens", 0))
+
 
-        for ps in prioritized:
-            if total_tokens + ps.section.token_count <= 10000:
-                total_tokens += ps.section.token_count
-                included_sections += 1
-            else:
-                excluded_sections.append(ps.section)
+# Streamed and non-streamed calls are merged separately (different result types)
+STREAM_KEY_PREFIX = "stream:"
 
-        # Add sections not included in prioritized list to excluded
-        for section in sections:
-            key = (section.file, section.heading)
-            if key not in prioritized_keys:
-                excluded_sections.append(section)
 
-        return SectionPriorityResult(
-            prioritized_sections=prioritized[:included_sections],
-            total_sections=len(sections),
-            included_sections=included_sections,
-            excluded_sections=excluded_sections,
+def create_message(
+    client: "Anthropic", params: dict[str, Any], call_type: LLMCallType, timeout_seconds: float
+) -> Any:
+    """Send one messages.create() request through the resilient call layer.
+
+    Transient failures (429, 5xx/529, timeouts) are retried with backoff by the
+    process-wide ResilientCaller. Each attempt holds a slot of the process-wide
+    AdaptiveRateLimiter (AIMD concurrency, header-driven throttling). Token
+    usage of the response is recorded.
+
+    When a process-wide LLMCallMemo is installed, a memoized response for the
+    same (call type, prompt version, model, input) is returned without a
+    request, and new analysis responses are memoized. Identical requests in
+    flight at the same time are sent once (process-wide SingleFlight).
+
+    Args:
+        client: Anthropic API client
+        params: Request parameters from one of the build_*_request() helpers
+        call_type: Kind of call (for usage accounting)
+        timeout_seconds: Per-attempt timeout in seconds
+
+    Returns:
+        anthropic Message
+
+    Raises:
+        SpecKitDocsError: If the circuit breaker is open
+        APIError: The last API error once retries are exhausted
+    """
+    memo = get_llm_memo()
+    if memo is not None and (cached := memo.get(call_type, params)) is not None:
+        return MemoizedMessage(cached)
+
+    def _send() -> Any:
+        limiter = get_rate_limiter()
+        input_tokens, output_tokens = estimate_request_tokens(params)
+        attempts = 0
+
+        def _attempt() -> Any:
+            nonlocal attempts
+            attempts += 1
+            return limiter.call(
+                lambda: client.messages.create(**params, timeout=timeout_seconds),
+                input_tokens,
+                output_tokens,
+            )
+
+        started = time.monotonic()
+        response = get_resilient_caller().call(_attempt)
+        record_usage(
+            response,
+            call_type,
+            params.get("model", DEFAULT_MODEL),
+            latency_seconds=time.monotonic() - started,
+            retries=attempts - 1,
+        )
+        if memo is not None:
+            memo.put(call_type, params, get_response_text(response))
+        return response
+
+    group = get_single_flight()
+    if group is None:
+        return _send()
+    return group.do(memo_key(call_type, params), _send)
+
+
+def stream_message(
+    client: "Anthropic",
+    params: dict[str, Any],
+    call_type: LLMCallType,
+    timeout_seconds: float,
+    on_event: JSONEventHandler | None = None,
+) -> StreamedMessage:
+    """Streaming variant of create_message().
+
+    The response JSON is parsed incrementally and every completed field or
+    array item is passed to ``on_event``; returning True aborts the stream.
+    Usage is recorded with the time to first token. A memoized response is
+    replayed through ``on_event``; only complete (not aborted) responses are
+    memoized. Callers merged into an identical in-flight stream
+    (SingleFlight) get the leader's text replayed through their own handler.
+
+    Args:
+        client: Anthropic API client
+        params: Request parameters from one of the build_*_request() helpers
+        call_type: Kind of call (for usage accounting)
+        timeout_seconds: Per-attempt timeout in seconds
+        on_event: JSONEvent handler (see speckit_docs.utils.llm_stream)
+
+    Returns:
+        StreamedMessage
+
+    Raises:
+        SpecKitDocsError: If the circuit breaker is open
+        APIError: The last API error once retries are exhausted
+    """
+    memo = get_llm_memo()
+    if memo is not None and (cached := memo.get(call_type, params)) is not None:
+        return replay_stream(cached, MemoizedMessage(cached), on_event)
+
+    led = False
+
+    def _send() -> StreamedMessage:
+        nonlocal led
+        led = True
+        limiter = get_rate_limiter()
+        input_tokens, output_tokens = estimate_request_tokens(params)
+        attempts = 0
+
+        def _attempt() -> StreamedMessage:
+            nonlocal attempts
+            attempts += 1
+            return limiter.call(
+                lambda: read_stream(
+                    lambda: client.messages.stream(**params, timeout=timeout_seconds), on_event
+                ),
+                input_tokens,
+                output_tokens,
+            )
+
+        started = time.monotonic()
+        streamed = get_resilient_caller().call(_attempt)
+        record_usage(
+            streamed.message,
+            call_type,
+            params.get("model", DEFAULT_MODEL),
+            streamed.ttft_seconds,
+            latency_seconds=time.monotonic() - started,
+            retries=attempts - 1,
         )
+        if memo is not None and not streamed.aborted:
+            memo.put(call_type, params, streamed.text)
+        return streamed
+
+    group = get_single_flight()
+    if group is None:
+        return _send()
+    streamed = group.do(STREAM_KEY_PREFIX + memo_key(call_type, params), _send)
+    return streamed if led else replay_stream(streamed.text, streamed.message, on_event)
 
-    except RateLimitError as e:
+
+def get_response_text(response: Any) -> str:
+    """Response text: the forced tool call's input as JSON, else the first text block.
+
+    Analysis requests force a tool call (see llm_schemas); transformations and
+    servers without tool support answer with text.
+    """
+    tool_input = tool_input_text(response)
+    if tool_input is not None:
+        return tool_input
+    text_block = cast("TextBlock", response.content[0])
+    return text_block.text
+
+
+def parse_target_audience_response(text: str, file_path: Path) -> TargetAudienceResult:
+    """Parse target audience detection JSON response."""
+    result_json = decode_response(text, TARGET_AUDIENCE_TOOL)
+    return TargetAudienceResult(
+        file_path=file_path,
+        audience_type=result_json["audience_type"],
+        confidence=result_json.get("confidence"),
+        reasoning=result_json.get("reasoning"),
+    )
+
+
+def parse_section_classification_response(
+    text: str, file_path: Path, heading: str
+) -> SectionClassification:
+    """Parse section classification JSON response."""
+    result_json = decode_response(text, SECTION_CLASSIFICATION_TOOL)
+    return SectionClassification(
+        file_path=file_path,
+        heading=heading,
+        section_type=result_json["section_type"],
+        confidence=result_json.get("confidence"),
+    )
+
+
+def parse_batch_classification_response(
+    text: str, sections: list[tuple[Path, LLMSection]]
+) -> list[SectionClassification]:
+    """Parse batched section classification JSON response.
+
+    Raises:
+        SpecKitDocsError: If the response does not classify every section
+    """
+    result_json = decode_response(text, BATCH_SECTION_CLASSIFICATION_TOOL)
+    by_index = {item["index"]: item for item in result_json["classifications"]}
+
+    missing = [index for index in range(len(sections)) if index not in by_index]
+    if missing:
         raise SpecKitDocsError(
-            f"Anthropic API rate limit exceeded: {e}.",
-            "Please wait a few minutes and retry later."
+            message=f"LLM response is missing classifications for {len(missing)} of {len(sections)} sections (indexes: {missing[:10]}).",
+            suggestion="Retry the classification. If this persists, reduce the token budget per request.",
+            file_path=sections[missing[0]][0],
+            error_type="LLM Response Error",
+        )
+
+    return [
+        SectionClassification(
+            file_path=file_path,
+            heading=section.heading,
+            section_type=by_index[index]["section_type"],
+            confidence=by_index[index].get("confidence"),
+        )
+        for index, (file_path, section) in enumerate(sections)
+    ]
+
+
+def parse_inconsistency_response(text: str) -> InconsistencyDetectionResult:
+    """Parse inconsistency detection JSON response."""
+    result_json = decode_response(text, INCONSISTENCY_TOOL)
+    return InconsistencyDetectionResult(
+        is_consistent=result_json["is_consistent"],
+        inconsistencies=[
+            Inconsistency(**item) for item in result_json["inconsistencies"]
+        ],
+        summary=result_json["summary"],
+    )
+
+
+def prioritized_section_from_item(
+    item: dict[str, Any], section_map: dict[tuple[str, str], LLMSection]
+) -> PrioritizedSection | None:
+    """Build a PrioritizedSection from one prioritized_sections item (None if unknown section)."""
+    key = (item["file"], item["heading"])
+    if key not in section_map:
+        return None
+    return PrioritizedSection(
+        section=section_map[key],
+        priority=item["priority"],
+        reason=item["reason"],
+    )
+
+
+def finalize_section_priority(
+    prioritized: list[PrioritizedSection],
+    sections: list[LLMSection],
+    preserve_order: bool = False,
+    packing: PackingStrategy = "optimal",
+) -> SectionPriorityResult:
+    """Pack prioritized sections into the token limit (T068).
+
+    Args:
+        prioritized: Sections ranked by the LLM
+        sections: All sections sent for prioritization (in document order)
+        preserve_order: Return the included sections in document order
+            instead of priority order
+        packing: "optimal" (knapsack over priority-weighted value) or "greedy"
+
+    Returns:
+        SectionPriorityResult
+    """
+    # T068: Section integration (within 10,000 tokens)
+    packed = pack_sections(prioritized, DEFAULT_TOKEN_BUDGET, packing)
+    prioritized_keys = {(ps.section.file, ps.section.heading) for ps in prioritized}
+    excluded_sections = [ps.section for ps in packed.excluded]
+
+    # Add sections not included in prioritized list to excluded
+    for section in sections:
+        key = (section.file, section.heading)
+        if key not in prioritized_keys:
+            excluded_sections.append(section)
+
+    included = packed.included
+    if preserve_order:
+        position = {(s.file, s.heading): i for i, s in enumerate(sections)}
+        included = sorted(included, key=lambda ps: position[(ps.section.file, ps.section.heading)])
+
+    return SectionPriorityResult(
+        prioritized_sections=included,
+        total_sections=len(sections),
+        included_sections=len(included),
+        excluded_sections=excluded_sections,
+        token_budget=DEFAULT_TOKEN_BUDGET,
+        included_tokens=packed.used_tokens,
+    )
+
+
+def parse_section_priority_response(
+    text: str, sections: list[LLMSection], preserve_order: bool = False
+) -> SectionPriorityResult:
+    """Parse section prioritization JSON response and apply the token limit (T068)."""
+    result_json = decode_response(text, SECTION_PRIORITY_TOOL)
+
+    # Map sections by (file, heading) for lookup
+    section_map: dict[tuple[str, str], LLMSection] = {(s.file, s.heading): s for s in sections}
+    prioritized = []
+    for item in result_json["prioritized_sections"]:
+        ps = prioritized_section_from_item(item, section_map)
+        if ps is not None:
+            prioritized.append(ps)
+
+    return finalize_section_priority(prioritized, sections, preserve_order)
+
+
+class InconsistencyStreamCollector:
+    """JSONEvent handler for streamed inconsistency detection.
+
+    Aborts the stream once ``is_consistent: false`` and the first
+    inconsistency item are known; the rest of the response is not needed to
+    fail the run.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the collector."""
+        self.is_consistent: bool | None = None
+        self.items: list[dict[str, Any]] = []
+
+    def __call__(self, event: JSONEvent) -> bool:
+        """Handle one event; return True to abort the stream."""
+        if event.kind == "field" and event.key == "is_consistent":
+            self.is_consistent = bool(event.value)
+        elif event.kind == "item" and event.key == "inconsistencies":
+            self.items.append(event.value)
+        else:
+            return False
+        return self.is_consistent is False and len(self.items) > 0
+
+    def result(self, streamed: StreamedMessage) -> InconsistencyDetectionResult:
+        """Build the detection result from the (possibly aborted) stream."""
+        if not streamed.aborted:
+            return parse_inconsistency_response(streamed.text)
+        return InconsistencyDetectionResult(
+            is_consistent=False,
+            inconsistencies=[Inconsistency(**item) for item in self.items],
+            summary="Stopped reading the response after the first inconsistency (streaming).",
         )
-    except APITimeoutError as e:
+
+
+class SectionPriorityStreamCollector:
+    """JSONEvent handler building PrioritizedSections as the items arrive."""
+
+    def __init__(
+        self,
+        sections: list[LLMSection],
+        on_section: Callable[[PrioritizedSection], None] | None = None,
+        preserve_order: bool = False,
+    ) -> None:
+        """Initialize the collector.
+
+        Args:
+            sections: Sections sent for prioritization
+            on_section: Called with each PrioritizedSection as soon as it is known
+            preserve_order: Return the included sections in document order
+        """
+        self.sections = sections
+        self.on_section = on_section
+        self.preserve_order = preserve_order
+        self.prioritized: list[PrioritizedSection] = []
+        self.complete = False
+        self._section_map: dict[tuple[str, str], LLMSection] = {
+            (s.file, s.heading): s for s in sections
+        }
+
+    def __call__(self, event: JSONEvent) -> bool:
+        """Handle one event (never aborts)."""
+        if event.key != "prioritized_sections":
+            return False
+        if event.kind == "field":
+            self.complete = True
+            return False
+        ps = prioritized_section_from_item(event.value, self._section_map)
+        if ps is not None:
+            self.prioritized.append(ps)
+            if self.on_section is not None:
+                self.on_section(ps)
+        return False
+
+    def result(self, streamed: StreamedMessage | None = None) -> SectionPriorityResult:
+        """Apply the token limit (T068) to the collected sections.
+
+        Raises:
+            SpecKitDocsError: If the stream did not contain a complete prioritized_sections list
+        """
+        if not self.complete and streamed is not None:
+            return parse_section_priority_response(streamed.text, self.sections, self.preserve_order)
+        return finalize_section_priority(self.prioritized, self.sections, self.preserve_order)
+
+
+def check_not_truncated(response: Any) -> None:
+    """Reject a transformation response cut off by max_tokens.
+
+    A truncated document can still pass the T069 check, so it would be
+    cached with its end missing.
+
+    Raises:
+        SpecKitDocsError: If the response stopped at max_tokens
+    """
+    if getattr(response, "stop_reason", None) == "max_tokens":
         raise SpecKitDocsError(
-            f"Anthropic API timeout after {timeout_seconds} seconds: {e}.",
-            "Please check your network connection and retry."
+            message="LLM変換結果が出力上限（max_tokens）で途切れています（ソース: spec.md）。",
+            suggestion="変換を再実行するか、spec.mdを短くしてください。",
+            error_type="LLM Transform Quality Error",
         )
-    except APIError as e:
+
+
+def parse_spec_transform_response(text: str, spec_content: str) -> LLMTransformResult:
+    """Validate (T069) and wrap a spec.md transformation response.
+
+    Raises:
+        SpecKitDocsError: If the transformed content fails the quality check
+    """
+    transformed_content = text.strip()
+    is_valid, error_message = validate_transformed_content(transformed_content, "spec.md")
+    if not is_valid:
         raise SpecKitDocsError(
-            f"Anthropic API error: {e}.",
-            "Please check your API key and account status. Set ANTHROPIC_API_KEY environment variable."
+            message=error_message or "LLM変換結果が不正です（ソース: spec.md）。",
+            suggestion="変換を再実行してください。",
+            error_type="LLM Transform Quality Error",
         )
 
+    return LLMTransformResult(
+        transform_type="spec_md_extraction",
+        source_content=spec_content,
+        transformed_content=transformed_content,
+        token_count=estimate_token_count(transformed_content),
+    )
+
+
+def llm_api_error(
+    error: Exception, timeout_seconds: float, file_path: Path | None = None
+) -> SpecKitDocsError:
+    """Convert an Anthropic API exception into a C002-compliant SpecKitDocsError.
+
+    Args:
+        error: Exception raised by the Anthropic client
+        timeout_seconds: Timeout used for the call (for the error message)
+        file_path: Optional file the call was made for
+
+    Returns:
+        SpecKitDocsError to raise
+    """
+    if isinstance(error, RateLimitError):
+        message = f"Anthropic API rate limit exceeded: {error}."
+        suggestion = "Please wait a few minutes and retry later."
+    elif isinstance(error, APITimeoutError):
+        message = f"Anthropic API timeout after {timeout_seconds} seconds: {error}."
+        suggestion = "Please check your network connection and retry."
+    else:
+        message = f"Anthropic API error: {error}."
+        suggestion = "Please check your API key and account status. Set ANTHROPIC_API_KEY environment variable."
+
+    return SpecKitDocsError(
+        message=message,
+        suggestion=suggestion,
+        file_path=file_path,
+        error_type="LLM API call failed",
+    )
+
+
+def inconsistency_error(
+    readme_file: Path, quickstart_file: Path, result: InconsistencyDetectionResult
+) -> SpecKitDocsError:
+    """Build the error raised when README.md and QUICKSTART.md are inconsistent."""
+    critical_count = len(
+        [i for i in result.inconsistencies if i.severity == "critical"]
+    )
+    inconsistency_details = "\n".join(
+        f"  • {i.type}: README says '{i.readme_claim}' but QUICKSTART says '{i.quickstart_claim}'"
+        for i in result.inconsistencies[:3]  # Show first 3
+    )
+    return SpecKitDocsError(
+        f"Inconsistency detected between {readme_file} and {quickstart_file}:\n"
+        f"{result.summary}\n"
+        f"Critical inconsistencies: {critical_count}\n"
+        f"Examples:\n{inconsistency_details}",
+        "Resolve inconsistencies in README.md and QUICKSTART.md, then retry."
+    )
+
+
+def section_heading_markdown(section: LLMSection) -> str:
+    """Markdown heading line of a section ("## Installation").
+
+    Headings that already carry ``#`` markers are returned unchanged.
+    """
+    if section.heading.startswith("#"):
+        return section.heading
+    return f"{'#' * int(section.level[1])} {section.heading}"
+
+
+def build_integrated_result(
+    readme_content: str, quickstart_content: str, priority_result: SectionPriorityResult
+) -> LLMTransformResult:
+    """Integrate prioritized sections into a single document (T068)."""
+    integrated_content = "\n\n".join(
+        [
+            f"{section_heading_markdown(ps.section)}\n\n{ps.section.content}"
+            for ps in priority_result.prioritized_sections
+        ]
+    )
+
+    return LLMTransformResult(
+        transform_type="section_priority",
+        source_content=readme_content + "\n\n---\n\n" + quickstart_content,
+        transformed_content=integrated_content,
+        token_count=sum(
+            ps.section.token_count for ps in priority_result.prioritized_sections
+        ),
+        section_priority_result=priority_result,
+    )
+
 
 # Anthropic API client initialization
 def get_anthropic_client() -> "Anthropic":
-    """Get Anthropic API client.
+    """Get the shared Anthropic API client of the process-wide LLM session.
+
+    The client (and its HTTP connection pool) is created once and reused by
+    every call; see speckit_docs.utils.llm_session.
 
     Returns:
         Anthropic API client
@@ -664,19 +1859,7 @@ def get_anthropic_client() -> "Anthropic":
     Raises:
         SpecKitDocsError: If ANTHROPIC_API_KEY environment variable is not set
     """
-    if Anthropic is None:
-        raise SpecKitDocsError(
-            "anthropic package is not installed.",
-            "Install it with: uv add anthropic"
-        )
-
-    api_key = os.environ.get("ANTHROPIC_API_KEY")
-    if not api_key:
-        raise SpecKitDocsError(
-            "ANTHROPIC_API_KEY environment variable is not set.",
-            "Set it to your Anthropic API key: export ANTHROPIC_API_KEY='sk-...'"
-        )
-    return Anthropic(api_key=api_key)
+    return get_llm_session().client
 
 
 # T063: spec.md minimal extraction
@@ -767,7 +1950,11 @@ def validate_transformed_content(
 
 # T065 + T066 + T067 + T068: README/QUICKSTART integration
 def integrate_readme_quickstart(
-    readme_file: Path, quickstart_file: Path, client: "Anthropic"
+    readme_file: Path,
+    quickstart_file: Path,
+    client: "Anthropic",
+    stream: bool = False,
+    speculative: bool = False,
 ) -> LLMTransformResult:
     """Integrate README.md and QUICKSTART.md content.
 
@@ -775,6 +1962,11 @@ def integrate_readme_quickstart(
         readme_file: README.md file path
         quickstart_file: QUICKSTART.md file path
         client: Anthropic API client
+        stream: Stream the analysis calls (early abort on inconsistency)
+        speculative: Prioritize sections in parallel with inconsistency
+            detection; the priority result is discarded if the files turn out
+            to be inconsistent (about half the wall-clock time, at the cost of
+            a wasted call for inconsistent features)
 
     Returns:
         LLMTransformResult
@@ -786,27 +1978,19 @@ def integrate_readme_quickstart(
     readme_content = readme_file.read_text()
     quickstart_content = quickstart_file.read_text()
 
+    if speculative:
+        return _integrate_speculatively(
+            readme_file, quickstart_file, readme_content, quickstart_content, client, stream
+        )
+
     # 2. Detect inconsistencies
     inconsistency_result = detect_inconsistency(
-        readme_content, quickstart_content, client
+        readme_content, quickstart_content, client, stream=stream
     )
 
     # 3. Raise error if inconsistencies found
     if not inconsistency_result.is_consistent:
-        critical_count = len(
-            [i for i in inconsistency_result.inconsistencies if i.severity == "critical"]
-        )
-        inconsistency_details = "\n".join(
-            f"  • {i.type}: README says '{i.readme_claim}' but QUICKSTART says '{i.quickstart_claim}'"
-            for i in inconsistency_result.inconsistencies[:3]  # Show first 3
-        )
-        raise SpecKitDocsError(
-            f"Inconsistency detected between {readme_file} and {quickstart_file}:\n"
-            f"{inconsistency_result.summary}\n"
-            f"Critical inconsistencies: {critical_count}\n"
-            f"Examples:\n{inconsistency_details}",
-            "Resolve inconsistencies in README.md and QUICKSTART.md, then retry."
-        )
+        raise inconsistency_error(readme_file, quickstart_file, inconsistency_result)
 
     # 4. Parse sections
     readme_sections = parse_markdown_sections(readme_content, "README.md")
@@ -814,23 +1998,47 @@ def integrate_readme_quickstart(
     all_sections = readme_sections + quickstart_sections
 
     # 5. Prioritize sections
-    priority_result = prioritize_sections(all_sections, client)
+    priority_result = prioritize_sections(all_sections, client, stream=stream)
 
-    # 6. Integrate sections in priority order
-    integrated_content = "\n\n".join(
-        [
-            f"{ps.section.heading}\n\n{ps.section.content}"
-            for ps in priority_result.prioritized_sections
-        ]
-    )
+    # 6-7. Integrate sections in priority order and return result
+    return build_integrated_result(readme_content, quickstart_content, priority_result)
 
-    # 7. Return result
-    return LLMTransformResult(
-        transform_type="section_priority",
-        source_content=readme_content + "\n\n---\n\n" + quickstart_content,
-        transformed_content=integrated_content,
-        token_count=sum(
-            ps.section.token_count for ps in priority_result.prioritized_sections
-        ),
-        section_priority_result=priority_result,
+
+def _integrate_speculatively(
+    readme_file: Path,
+    quickstart_file: Path,
+    readme_content: str,
+    quickstart_content: str,
+    client: "Anthropic",
+    stream: bool,
+) -> LLMTransformResult:
+    """Steps 2-7 of integrate_readme_quickstart() with prioritization in a worker thread."""
+    # 4. Parse sections first: prioritization starts before the verdict is known
+    all_sections = parse_markdown_sections(readme_content, "README.md") + parse_markdown_sections(
+        quickstart_content, "QUICKSTART.md"
     )
+
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="speckit-priority")
+    try:
+        # 5. Prioritize sections (speculative)
+        # Run in a copy of the caller's context (feature attribution of the call)
+        priority_future = executor.submit(
+            contextvars.copy_context().run, prioritize_sections, all_sections, client, stream=stream
+        )
+
+        # 2. Detect inconsistencies
+        inconsistency_result = detect_inconsistency(
+            readme_content, quickstart_content, client, stream=stream
+        )
+
+        # 3. Raise error if inconsistencies found (the priority result is discarded)
+        if not inconsistency_result.is_consistent:
+            raise inconsistency_error(readme_file, quickstart_file, inconsistency_result)
+
+        priority_result = priority_future.result()
+    finally:
+        # Do not wait for a discarded prioritization still in flight
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    # 6-7. Integrate sections in priority order and return result
+    return build_integrated_result(readme_content, quickstart_content, priority_result)
@@ -0,0 +1,167 @@
+"""LLM token usage accounting for speckit-docs.
+
+Every LLM call records the ``usage`` block of its response here, so the
+prompt cache savings (cache_read_input_tokens / cache_creation_input_tokens)
+can be verified per call type after a run. Each record also carries the
+call latency, retries and the feature the call was made for (see
+feature_scope()); listeners such as the JSONL telemetry sink receive every
+record as it is made.
+"""
+
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from speckit_docs.llm_entities import LLMCallType, LLMUsage
+
+
+def _as_int(value: Any) -> int:
+    """Return value if it is an int token count, else 0 (field absent or not reported)."""
+    return value if isinstance(value, int) and not isinstance(value, bool) else 0
+
+
+# Key of the feature whose LLM calls are running (set per task / thread)
+current_feature: ContextVar[str | None] = ContextVar("current_feature", default=None)
+
+
+@contextmanager
+def feature_scope(feature_key: str) -> Iterator[None]:
+    """Attribute the LLM calls made inside the block to a feature.
+
+    Args:
+        feature_key: Feature key (e.g. "001-user-auth")
+    """
+    token = current_feature.set(feature_key)
+    try:
+        yield
+    finally:
+        current_feature.reset(token)
+
+
+def extract_usage(
+    response: Any,
+    call_type: LLMCallType,
+    model: str,
+    ttft_seconds: float | None = None,
+    latency_seconds: float | None = None,
+    retries: int = 0,
+    feature: str | None = None,
+) -> LLMUsage:
+    """Build an LLMUsage from a Message response.
+
+    Args:
+        response: anthropic Message (or any object with a ``usage`` attribute)
+        call_type: Kind of call that produced the response
+        model: Requested model (used when the response does not report one)
+        ttft_seconds: Time to first token (streamed calls only)
+        latency_seconds: Wall-clock time of the call including retries
+        retries: Attempts beyond the first
+        feature: Key of the feature the call was made for
+
+    Returns:
+        LLMUsage (missing counters are 0)
+    """
+    usage = getattr(response, "usage", None)
+    response_model = getattr(response, "model", None)
+    return LLMUsage(
+        call_type=call_type,
+        model=response_model if isinstance(response_model, str) else model,
+        input_tokens=_as_int(getattr(usage, "input_tokens", 0)),
+        output_tokens=_as_int(getattr(usage, "output_tokens", 0)),
+        cache_creation_input_tokens=_as_int(getattr(usage, "cache_creation_input_tokens", 0)),
+        cache_read_input_tokens=_as_int(getattr(usage, "cache_read_input_tokens", 0)),
+        ttft_seconds=ttft_seconds,
+        latency_seconds=latency_seconds,
+        retries=retries,
+        feature=feature,
+    )
+
+
+class LLMUsageRecorder:
+    """Thread-safe collector of LLMUsage records."""
+
+    def __init__(self) -> None:
+        """Initialize an empty recorder."""
+        self._lock = threading.Lock()
+        self._records: list[LLMUsage] = []
+        self._listeners: list[Callable[[LLMUsage], None]] = []
+
+    def record(self, usage: LLMUsage) -> None:
+        """Append a usage record and pass it to the listeners."""
+        with self._lock:
+            self._records.append(usage)
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener(usage)
+
+    def add_listener(self, listener: Callable[[LLMUsage], None]) -> None:
+        """Call listener with every record made from now on."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[LLMUsage], None]) -> None:
+        """Stop calling a listener added with add_listener()."""
+        with self._lock:
+            self._listeners.remove(listener)
+
+    def records(self) -> list[LLMUsage]:
+        """Return a copy of all usage records."""
+        with self._lock:
+            return list(self._records)
+
+    def totals(self) -> dict[str, int]:
+        """Sum token counters over all records.
+
+        Returns:
+            Dictionary with calls, input_tokens, output_tokens,
+            cache_creation_input_tokens and cache_read_input_tokens
+        """
+        records = self.records()
+        return {
+            "calls": len(records),
+            "input_tokens": sum(r.input_tokens for r in records),
+            "output_tokens": sum(r.output_tokens for r in records),
+            "cache_creation_input_tokens": sum(r.cache_creation_input_tokens for r in records),
+            "cache_read_input_tokens": sum(r.cache_read_input_tokens for r in records),
+        }
+
+    def reset(self) -> None:
+        """Discard all usage records."""
+        with self._lock:
+            self._records.clear()
+
+
+# Process-wide recorder used by llm_transform, llm_engine and llm_batch
+usage_recorder = LLMUsageRecorder()
+
+
+def record_usage(
+    response: Any,
+    call_type: LLMCallType,
+    model: str,
+    ttft_seconds: float | None = None,
+    latency_seconds: float | None = None,
+    retries: int = 0,
+) -> LLMUsage:
+    """Extract usage from a response and record it in the process-wide recorder.
+
+    The call is attributed to the feature of the enclosing feature_scope().
+
+    Args:
+        response: anthropic Message
+        call_type: Kind of call that produced the response
+        model: Requested model
+        ttft_seconds: Time to first token (streamed calls only)
+        latency_seconds: Wall-clock time of the call including retries
+        retries: Attempts beyond the first
+
+    Returns:
+        The recorded LLMUsage
+    """
+    usage = extract_usage(
+        response, call_type, model, ttft_seconds, latency_seconds, retries, current_feature.get()
+    )
+    usage_recorder.record(usage)
+    return usage
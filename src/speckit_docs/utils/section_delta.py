@@ -0,0 +1,247 @@
+"""Section-level delta transforms of spec.md extracts.
+
+LLMTransformCache keys a transformation on the whole source, so editing one
+section of a long extract re-sends every section to the LLM. Here the
+extract is split into h2/h3 fragments (split_fragments()), and the
+transformed text of each fragment is cached under a normalized section hash.
+When the document changes, only the fragments without a cached
+transformation are sent, in a single small request. The result is then
+assembled from cached and fresh fragments in document order, which is the
+priority order of the extract.
+
+Normalization (section_hash()) ignores whitespace-only edits. A trailing
+footer after a thematic break (the "_Extracted from ..._" / "_Total tokens
+..._" metadata of SpecExtractionResult.to_markdown()) changes on every
+edit, so it is kept out of the fragments and passed through verbatim.
+"""
+
+import re
+import threading
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Literal, cast
+
+from markdown_it import MarkdownIt
+
+from speckit_docs.llm_entities import LLMSection
+from speckit_docs.utils.cache import TransformCache, compute_content_hash
+from speckit_docs.utils.cache_keys import transform_cache_key
+from speckit_docs.utils.llm_transform import estimate_token_count
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def section_hash(section: LLMSection) -> str:
+    """Normalized hash of a section: level, heading and whitespace-collapsed content.
+
+    Args:
+        section: Parsed section; its content runs to the next fragment
+
+    Returns:
+        Cache key of the "spec_section" transform type (see cache_keys)
+    """
+    normalized = "\x00".join(
+        [
+            section.level,
+            _WHITESPACE.sub(" ", section.heading).strip(),
+            _WHITESPACE.sub(" ", section.content).strip(),
+        ]
+    )
+    return transform_cache_key("spec_section", compute_content_hash(normalized))
+
+
+@dataclass(frozen=True)
+class SectionFragment:
+    """One h2/h3 section of a document.
+
+    Attributes:
+        section: Parsed section (key material)
+        markdown: Markdown source of the section, heading line included
+        key: Normalized section hash (cache key)
+    """
+
+    section: LLMSection
+    markdown: str
+    key: str
+
+
+@dataclass(frozen=True)
+class FragmentedDocument:
+    """A Markdown document split into section fragments.
+
+    Attributes:
+        preamble: Source before the first h2/h3 heading
+        fragments: Sections in document order
+        footer: Source from a trailing thematic break on (metadata)
+    """
+
+    preamble: str
+    fragments: tuple[SectionFragment, ...]
+    footer: str
+
+    def assemble(self, texts: Sequence[str]) -> str:
+        """Join transformed fragment texts (one per fragment) and the footer."""
+        body = "\n\n".join(text.strip() for text in texts)
+        return f"{body}\n\n{self.footer.strip()}" if self.footer.strip() else body
+
+
+def split_fragments(markdown_content: str) -> FragmentedDocument:
+    """Split a Markdown document into h2/h3 section fragments.
+
+    Each h2/h3 heading with text starts a fragment that runs to the next
+    one. Other headings (h1, h4+, an h2/h3 without text) stay inside the
+    fragment they appear in, or in the preamble before the first fragment.
+
+    Args:
+        markdown_content: Markdown document (e.g. SpecExtractionResult.to_markdown())
+
+    Returns:
+        FragmentedDocument (no fragments if the document has no h2/h3 heading)
+    """
+    lines = markdown_content.splitlines(keepends=True)
+    tokens = MarkdownIt().parse(markdown_content)
+    # (heading line, first body line, tag, heading text); a heading without
+    # text does not start a fragment and stays in the previous one (or the preamble)
+    headings = [
+        (t.map[0], t.map[1], t.tag, tokens[i + 1].content.strip())
+        for i, t in enumerate(tokens)
+        if t.type == "heading_open" and t.tag in ("h2", "h3") and t.map and tokens[i + 1].content.strip()
+    ]
+    if not headings:
+        return FragmentedDocument(preamble=markdown_content, fragments=(), footer="")
+
+    # A top-level thematic break after the last heading starts the footer
+    last_start = headings[-1][0]
+    breaks = [t.map[0] for t in tokens if t.type == "hr" and t.level == 0 and t.map and t.map[0] > last_start]
+    body_end = breaks[-1] if breaks else len(lines)
+
+    fragments = []
+    for n, (start, body_start, tag, heading) in enumerate(headings):
+        end = headings[n + 1][0] if n + 1 < len(headings) else body_end
+        content = "".join(lines[body_start:end]).strip("\n")
+        section = LLMSection(
+            file="spec.md",
+            heading=heading,
+            level=cast(Literal["h2", "h3"], tag),
+            content=content,
+            token_count=estimate_token_count(content),
+        )
+        markdown = "".join(lines[start:end]).strip("\n")
+        fragments.append(SectionFragment(section=section, markdown=markdown, key=section_hash(section)))
+    return FragmentedDocument(
+        preamble="".join(lines[: headings[0][0]]),
+        fragments=tuple(fragments),
+        footer="".join(lines[body_end:]),
+    )
+
+
+@dataclass(frozen=True)
+class SectionDeltaPlan:
+    """Which fragments of a document need the LLM.
+
+    Attributes:
+        document: The fragmented source document
+        cached: Transformed text of each fragment with a cached transformation
+        missing: Indices of fragments to transform
+    """
+
+    document: FragmentedDocument
+    cached: dict[int, str]
+    missing: tuple[int, ...]
+
+    @property
+    def is_partial(self) -> bool:
+        """True if some, but not all, fragments are cached (a delta transform applies).
+
+        Documents with a preamble are always transformed whole, since the
+        preamble has no cache entry of its own.
+        """
+        return bool(self.cached) and bool(self.missing) and not self.document.preamble.strip()
+
+    def delta_source(self) -> str:
+        """Markdown of the fragments to transform."""
+        return "\n\n".join(self.document.fragments[i].markdown for i in self.missing)
+
+    def assemble(self, fresh_texts: Sequence[str]) -> str:
+        """Assemble cached and freshly transformed fragments in document order.
+
+        Args:
+            fresh_texts: Transformed text of each missing fragment, in order
+        """
+        texts = dict(self.cached)
+        texts.update(zip(self.missing, fresh_texts, strict=True))
+        return self.document.assemble([texts[i] for i in range(len(self.document.fragments))])
+
+
+def plan_section_delta(markdown_content: str, cache: TransformCache) -> SectionDeltaPlan:
+    """Look up the cached transformation of every fragment of a document.
+
+    Args:
+        markdown_content: Source document
+        cache: Cache holding section transforms
+
+    Returns:
+        SectionDeltaPlan
+    """
+    document = split_fragments(markdown_content)
+    cached: dict[int, str] = {}
+    missing = []
+    for i, fragment in enumerate(document.fragments):
+        text = cache.get_cached_transform(fragment.key)
+        if text is None:
+            missing.append(i)
+        else:
+            cached[i] = text
+    return SectionDeltaPlan(document=document, cached=cached, missing=tuple(missing))
+
+
+def split_transformed(transformed: str, expected: int) -> list[str] | None:
+    """Split a transformation result into one text per source fragment.
+
+    The transform prompt keeps the h2/h3 structure of its input, so the
+    result has one fragment per source fragment. Returns None if it does not
+    (e.g. the model dropped a heading's text, or put text before the first heading).
+
+    Args:
+        transformed: Transformed Markdown
+        expected: Number of source fragments
+
+    Returns:
+        Fragment texts, or None if the heading structure changed
+    """
+    document = split_fragments(transformed)
+    if len(document.fragments) != expected or document.preamble.strip():
+        return None
+    # A footer in the output is dropped: assembly passes the source footer through
+    return [f.markdown for f in document.fragments]
+
+
+@dataclass
+class SectionDeltaStats:
+    """Counters of section-level delta transforms.
+
+    Attributes:
+        delta_documents: Documents transformed as a delta
+        sections_reused: Fragments taken from the cache
+        sections_sent: Fragments sent to the LLM (delta and whole-document calls)
+    """
+
+    delta_documents: int = 0
+    sections_reused: int = 0
+    sections_sent: int = 0
+    _lock: "threading.Lock" = field(default_factory=lambda: threading.Lock(), repr=False, compare=False)
+
+    def record(self, reused: int, sent: int, delta: bool) -> None:
+        """Count one transformed document."""
+        with self._lock:
+            self.delta_documents += int(delta)
+            self.sections_reused += reused
+            self.sections_sent += sent
+
+
+def store_section_transforms(
+    cache: TransformCache, fragments: Sequence[SectionFragment], texts: Sequence[str]
+) -> None:
+    """Cache the transformed text of each fragment under its section hash."""
+    for fragment, text in zip(fragments, texts, strict=True):
+        cache.set_cached_transform(fragment.key, fragment.markdown, text.strip())
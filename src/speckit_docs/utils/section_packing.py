@@ -0,0 +1,138 @@
+"""Token-budget packing of prioritized sections (T068).
+
+T068 integrates the prioritized README/QUICKSTART sections within 10,000
+tokens. Walking the sections in priority order and skipping whatever does
+not fit (greedy) lets one large mid-priority section push out several small
+high-priority ones. pack_sections() instead chooses the subset with the
+largest priority-weighted value whose token total fits the budget
+(0/1 knapsack, solved exactly by dynamic programming over token counts).
+
+Value of a section: ``n + 1 - priority`` for n prioritized sections, so
+priority 1 is worth n and the last priority is worth 1. Ties between
+equally valuable subsets are resolved toward higher-priority sections.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import reduce
+from math import gcd
+from typing import Literal
+
+from speckit_docs.llm_entities import PrioritizedSection
+
+PackingStrategy = Literal["greedy", "optimal"]
+
+DEFAULT_TOKEN_BUDGET = 10000
+
+# Value of a section given its priority and the number of prioritized sections
+SectionValue = Callable[[int, int], int]
+
+
+def linear_priority_value(priority: int, count: int) -> int:
+    """Default section value: count + 1 - priority (at least 1)."""
+    return max(1, count + 1 - priority)
+
+
+@dataclass(frozen=True)
+class PackingResult:
+    """Outcome of packing prioritized sections into a token budget.
+
+    Attributes:
+        included: Sections within the budget (in priority order)
+        excluded: Sections left out (in priority order)
+        used_tokens: Total token count of the included sections
+        value: Total value of the included sections
+    """
+
+    included: list[PrioritizedSection]
+    excluded: list[PrioritizedSection]
+    used_tokens: int
+    value: int
+
+
+def _greedy(sections: list[PrioritizedSection], budget: int) -> list[bool]:
+    """Take sections in priority order while they fit (the original T068 loop)."""
+    chosen = []
+    used = 0
+    for ps in sections:
+        fits = used + ps.section.token_count <= budget
+        if fits:
+            used += ps.section.token_count
+        chosen.append(fits)
+    return chosen
+
+
+def _optimal(sections: list[PrioritizedSection], budget: int, values: list[int]) -> list[bool]:
+    """0/1 knapsack by dynamic programming over (scaled) token counts."""
+    weights = [ps.section.token_count for ps in sections]
+    # Token counts sharing a common divisor shrink the DP table
+    scale = reduce(gcd, (w for w in weights if w > 0), 0) or 1
+    weights = [w // scale for w in weights]
+    capacity = budget // scale
+
+    best = [0] * (capacity + 1)
+    taken: list[bytearray] = []
+    # Last section first, so that among equal-value subsets the DP keeps the
+    # one with higher-priority sections: on equal value, the section being
+    # processed (earlier, so of higher priority) replaces the current choice
+    for i in reversed(range(len(sections))):
+        weight, value = weights[i], values[i]
+        row = bytearray(capacity + 1)
+        for c in range(capacity, weight - 1, -1):
+            candidate = best[c - weight] + value
+            if candidate > best[c] or (candidate == best[c] and weight > 0):
+                best[c] = candidate
+                row[c] = 1
+        taken.append(row)
+    taken.reverse()
+
+    chosen = []
+    c = capacity
+    for i, row in enumerate(taken):
+        if row[c]:
+            chosen.append(True)
+            c -= weights[i]
+        else:
+            chosen.append(False)
+    return chosen
+
+
+def pack_sections(
+    sections: list[PrioritizedSection],
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+    strategy: PackingStrategy = "optimal",
+    value: SectionValue = linear_priority_value,
+) -> PackingResult:
+    """Choose the prioritized sections to integrate within a token budget.
+
+    Args:
+        sections: Prioritized sections (any order)
+        token_budget: Maximum total token count of the included sections
+        strategy: "optimal" (knapsack) or "greedy" (priority order, skip what does not fit)
+        value: Section value from (priority, number of sections)
+
+    Returns:
+        PackingResult
+
+    Raises:
+        ValueError: If token_budget is negative
+    """
+    if token_budget < 0:
+        raise ValueError(f"token_budget must be non-negative, got {token_budget}")
+    ordered = sorted(sections, key=lambda ps: ps.priority)
+    values = [value(ps.priority, len(ordered)) for ps in ordered]
+
+    if sum(ps.section.token_count for ps in ordered) <= token_budget:
+        chosen = [True] * len(ordered)
+    elif strategy == "greedy":
+        chosen = _greedy(ordered, token_budget)
+    else:
+        chosen = _optimal(ordered, token_budget, values)
+
+    included = [ps for ps, keep in zip(ordered, chosen, strict=True) if keep]
+    return PackingResult(
+        included=included,
+        excluded=[ps for ps, keep in zip(ordered, chosen, strict=True) if not keep],
+        used_tokens=sum(ps.section.token_count for ps in included),
+        value=sum(v for v, keep in zip(values, chosen, strict=True) if keep),
+    )
@@ -12,6 +12,9 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+# Extracted tokens one spec.md transformation call accepts (T064)
+SPEC_TOKEN_LIMIT = 10000
+
 
 @dataclass(frozen=True)
 class UserStoryPurpose:
@@ -54,7 +57,8 @@ class SpecExtractionResult:
         user_story_purposes: ユーザーストーリーの目的セクションのリスト（最小1件）
         prerequisites: 前提条件セクション全体（Markdown）
         scope_boundaries: スコープ境界の「スコープ外」部分（Markdown）
-        total_token_count: 抽出されたコンテンツの総トークン数（0-10000）
+        total_token_count: 抽出されたコンテンツの総トークン数（0以上、
+            上限はextract_spec_minimal()のtoken_limitで検証）
         source_file: 抽出元のspec.mdファイルパス
     """
 
@@ -83,10 +87,8 @@ class SpecExtractionResult:
                 f"scope_boundaries must not be empty or whitespace-only: '{self.scope_boundaries}'"
             )
 
-        if not (0 <= self.total_token_count <= 10000):
-            raise ValueError(
-                f"total_token_count must be in range 0-10000: {self.total_token_count}"
-            )
+        if self.total_token_count < 0:
+            raise ValueError(f"total_token_count must be >= 0: {self.total_token_count}")
 
     def to_markdown(self) -> str:
         """抽出結果をMarkdown形式で出力
@@ -118,7 +120,9 @@ class SpecExtractionResult:
         return "\n".join(sections)
 
 
-def extract_spec_minimal(spec_file: Path) -> SpecExtractionResult:
+def extract_spec_minimal(
+    spec_file: Path, token_limit: int | None = SPEC_TOKEN_LIMIT
+) -> SpecExtractionResult:
     """spec.mdから最小限のコンテンツを抽出してLLM変換用に準備
 
     以下を抽出します:
@@ -128,14 +132,17 @@ def extract_spec_minimal(spec_file: Path) -> SpecExtractionResult:
 
     Args:
         spec_file: spec.mdファイルへのパス
+        token_limit: 抽出コンテンツの上限トークン数（デフォルト: 10,000）。
+            Noneの場合は検証せず、大きな抽出結果はtransform_spec_content()の
+            map-reduce変換でチャンクごとに処理されます
 
     Returns:
         SpecExtractionResult: 抽出されたコンテンツとトークン数
 
     Raises:
-        SpecKitDocsError: 抽出失敗時または10,000トークン超過時
+        SpecKitDocsError: 抽出失敗時またはトークン上限超過時
             - error_type="Missing Required Sections": 必須セクションが見つからない
-            - error_type="Token Limit Exceeded": 抽出コンテンツ > 10,000トークン
+            - error_type="Token Limit Exceeded": 抽出コンテンツ > token_limit
             - error_type="Content Extraction Error": その他の抽出失敗
 
     Implementation:
@@ -143,11 +150,12 @@ def extract_spec_minimal(spec_file: Path) -> SpecExtractionResult:
         2. ユーザーストーリーの目的を抽出（正規表現: **目的**: パターン）
         3. 前提条件セクションを抽出（## 前提条件 or ## Prerequisites）
         4. スコープ境界を抽出（## スコープ境界 -> **スコープ外**）
-        5. トークン数をカウントして10,000未満を検証
+        5. トークン数をカウントしてtoken_limit以下を検証
         6. SpecExtractionResultを返す
     """
     from speckit_docs.exceptions import SpecKitDocsError
     from speckit_docs.parsers.markdown_parser import MarkdownParser
+    from speckit_docs.utils.llm_tokens import count_tokens
     from speckit_docs.utils.llm_transform import estimate_token_count
 
     # 1. spec.mdファイルを読み込む
@@ -178,13 +186,18 @@ def extract_spec_minimal(spec_file: Path) -> SpecExtractionResult:
     total_content = "\n".join(
         [p.purpose_text for p in user_story_purposes] + [prerequisites, scope_boundaries]
     )
-    total_token_count = estimate_token_count(total_content)
+    # The 10,000-token gate uses the gate counter (exact with --exact-tokens)
+    count = estimate_token_count if token_limit is None else count_tokens
+    total_token_count = count(total_content)
 
     # 7. トークン数制限を検証
-    if total_token_count > 10000:
+    if token_limit is not None and total_token_count > token_limit:
         raise SpecKitDocsError(
-            message=f"Extracted content exceeds 10,000 token limit: {total_token_count} tokens.",
-            suggestion="Please reduce spec.md content in User Story Purpose, Prerequisites, or Scope sections.",
+            message=f"Extracted content exceeds {token_limit:,} token limit: {total_token_count} tokens.",
+            suggestion=(
+                "Please reduce spec.md content in User Story Purpose, Prerequisites, or Scope sections, "
+                "or transform it in chunks (doc_transform --map-reduce)."
+            ),
             file_path=spec_file,
             error_type="Token Limit Exceeded",
         )
@@ -0,0 +1,173 @@
+"""Cross-feature packing of small spec.md transformations.
+
+Many features have minimal extracts of a few hundred tokens. Sent one by
+one, each pays a request round-trip and the full instruction overhead of
+SPEC_TRANSFORM_PROMPT. Here several small extracts are packed into one
+request, each wrapped in a ``<document key="...">`` tag carrying its
+feature key, and the response is split back per key.
+
+A pack stays within a token budget (documents and instructions). When the
+response does not split cleanly (a key missing, duplicated or unknown, or
+the output truncated), or the request fails (timeout, API error), every
+document of the pack is transformed by a single request of its own; a
+document whose part fails the T069 quality check is retried alone as well.
+The timeout of a packed request grows with its max_tokens
+(pack_timeout_seconds()), since a long answer takes longer to generate.
+"""
+
+import re
+import threading
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from speckit_docs.utils.llm_routing import model_for
+from speckit_docs.utils.llm_transform import estimate_token_count, system_prompt
+
+# Extracts up to this size are packed; larger ones are sent alone
+PACK_DOCUMENT_TOKEN_LIMIT = 1500
+# Estimated input token budget per packed request
+PACK_TOKEN_BUDGET = 6000
+# Upper bound on documents per request (keeps the response well below max_tokens)
+PACK_MAX_DOCUMENTS = 8
+# Timeout of a packed request: a fixed part plus the time to generate max_tokens
+PACK_BASE_TIMEOUT_SECONDS = 60.0
+PACK_OUTPUT_TOKENS_PER_SECOND = 50.0
+
+SPEC_PACK_TRANSFORM_PROMPT = """
+You are a technical writer. Your task is to rewrite each of the feature specification extracts given in the user message as end-user documentation. Every extract is wrapped in a <document key="..."> tag and must be rewritten on its own.
+
+**Guidelines:**
+1. Write for non-technical readers (customers, product managers)
+2. Keep the document structure (## / ### headings) of each extract
+3. Explain what the feature does and why it is useful, not how it is implemented
+4. Keep the language of each extract (e.g., Japanese stays Japanese)
+5. Never move content from one document to another
+
+**Response format:**
+Return one <document key="..."> tag per extract, with the same key, in the same order, containing only the rewritten Markdown document (no preamble or code fences).
+"""
+
+SPEC_PACK_TRANSFORM_USER_TEMPLATE = """**Specification extracts:**
+{documents}
+"""
+
+_DOCUMENT = re.compile(r'<document key="([^"]*)">\s*\n?(.*?)\s*</document>', re.DOTALL)
+
+# A pack of (feature key, spec.md extract) jobs
+PackJob = tuple[str, str]
+
+
+def is_packable(spec_content: str, token_limit: int = PACK_DOCUMENT_TOKEN_LIMIT) -> bool:
+    """True if an extract is small enough to share a request with others."""
+    return estimate_token_count(spec_content) <= token_limit
+
+
+def plan_transform_packs(
+    jobs: Sequence[PackJob],
+    token_budget: int = PACK_TOKEN_BUDGET,
+    max_documents: int = PACK_MAX_DOCUMENTS,
+) -> list[list[PackJob]]:
+    """Group transform jobs into as few requests as the token budget allows.
+
+    Jobs are kept in their original order. A job whose estimate alone
+    exceeds the budget gets a pack of its own.
+
+    Args:
+        jobs: (feature key, spec.md extract) pairs
+        token_budget: Estimated input token budget per request
+        max_documents: Maximum number of documents per request
+
+    Returns:
+        List of packs, each a list of (feature key, extract) pairs
+    """
+    overhead = estimate_token_count(SPEC_PACK_TRANSFORM_PROMPT + SPEC_PACK_TRANSFORM_USER_TEMPLATE)
+    packs: list[list[PackJob]] = []
+    current: list[PackJob] = []
+    current_tokens = overhead
+
+    for job in jobs:
+        job_tokens = estimate_token_count(_document_tag(*job))
+        if current and (current_tokens + job_tokens > token_budget or len(current) >= max_documents):
+            packs.append(current)
+            current = []
+            current_tokens = overhead
+        current.append(job)
+        current_tokens += job_tokens
+
+    if current:
+        packs.append(current)
+    return packs
+
+
+def _document_tag(key: str, content: str) -> str:
+    return f'<document key="{key}">\n{content.strip()}\n</document>'
+
+
+def build_packed_transform_request(jobs: Sequence[PackJob]) -> dict[str, Any]:
+    """Build messages.create() parameters transforming several extracts at once."""
+    document_tokens = sum(estimate_token_count(content) for _, content in jobs)
+    return {
+        "model": model_for("transform"),
+        # Rewrites run about as long as their extracts; plus tag framing per document
+        "max_tokens": min(8192, 2 * document_tokens + 256 * len(jobs)),
+        "system": system_prompt(SPEC_PACK_TRANSFORM_PROMPT),
+        "messages": [
+            {
+                "role": "user",
+                "content": SPEC_PACK_TRANSFORM_USER_TEMPLATE.format(
+                    documents="\n\n".join(_document_tag(key, content) for key, content in jobs)
+                ),
+            }
+        ],
+    }
+
+
+def pack_timeout_seconds(max_tokens: int) -> float:
+    """Timeout of a packed request allowed to generate max_tokens output tokens."""
+    return PACK_BASE_TIMEOUT_SECONDS + max_tokens / PACK_OUTPUT_TOKENS_PER_SECOND
+
+
+def split_packed_response(text: str, keys: Sequence[str]) -> dict[str, str] | None:
+    """Split a packed transformation response into one text per feature key.
+
+    Args:
+        text: Response text
+        keys: Feature keys of the packed documents
+
+    Returns:
+        Transformed text by key, or None unless every key appears exactly
+        once, with non-empty content, and no other key appears
+    """
+    parts: dict[str, str] = {}
+    for key, content in _DOCUMENT.findall(text):
+        if key in parts or not content.strip():
+            return None
+        parts[key] = content.strip()
+    if set(parts) != set(keys):
+        return None
+    return parts
+
+
+@dataclass
+class TransformPackStats:
+    """Counters of packed transformations.
+
+    Attributes:
+        packed_requests: Requests carrying more than one document
+        packed_documents: Documents transformed by a packed request
+        fallback_documents: Documents sent alone after a pack did not split
+            cleanly or their part failed the quality check
+    """
+
+    packed_requests: int = 0
+    packed_documents: int = 0
+    fallback_documents: int = 0
+    _lock: "threading.Lock" = field(default_factory=lambda: threading.Lock(), repr=False, compare=False)
+
+    def record(self, packed: int, fallback: int) -> None:
+        """Count one packed request."""
+        with self._lock:
+            self.packed_requests += 1
+            self.packed_documents += packed
+            self.fallback_documents += fallback
@@ -0,0 +1,131 @@
+"""Integration tests for the Message Batches transform mode (llm_batch.py).
+
+The Anthropic client talks to the local stand-in server
+(speckit_docs.utils.llm_fake_server), which implements the Message Batches
+endpoints (create, retrieve, results).
+"""
+
+import shutil
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+from anthropic import Anthropic
+
+from speckit_docs.exceptions import SpecKitDocsError
+from speckit_docs.models import Feature, FeatureStatus
+from speckit_docs.utils.cache import LLMTransformCache
+from speckit_docs.utils.llm_batch import MessageBatchRunner, run_batch_transform
+from speckit_docs.utils.llm_fake_server import (
+    CANNED_TRANSFORM_TEXT,
+    FakeAnthropicServer,
+    FakeServerConfig,
+)
+
+VALID_SPEC = Path(__file__).parents[1] / "fixtures" / "sample_specs" / "valid_spec.md"
+
+
+@pytest.fixture
+def batch_server() -> Generator[FakeAnthropicServer, None, None]:
+    with FakeAnthropicServer() as server:
+        yield server
+
+
+def _client(server: FakeAnthropicServer) -> Anthropic:
+    return Anthropic(api_key="test-key", base_url=server.base_url, max_retries=0)
+
+
+def _feature(specs_dir: Path, dir_name: str, files: dict[str, str] | None = None) -> Feature:
+    feature_dir = specs_dir / dir_name
+    feature_dir.mkdir(parents=True)
+    shutil.copy(VALID_SPEC, feature_dir / "spec.md")
+    for name, content in (files or {}).items():
+        (feature_dir / name).write_text(content)
+    feature_id, name = dir_name.split("-", 1)
+    return Feature(
+        id=feature_id,
+        name=name,
+        directory_path=feature_dir,
+        spec_file=feature_dir / "spec.md",
+        status=FeatureStatus.DRAFT,
+    )
+
+
+@pytest.fixture
+def features(tmp_path: Path) -> list[Feature]:
+    specs_dir = tmp_path / "specs"
+    return [
+        _feature(specs_dir, "001-spec-only"),
+        _feature(
+            specs_dir,
+            "002-both",
+            {
+                "README.md": "# Project\n\n## Overview\n\nA Python project.",
+                "QUICKSTART.md": "# Quick\n\n## Install\n\npip install project",
+            },
+        ),
+        _feature(specs_dir, "003-readme", {"README.md": "# Readme\n\n## Usage\n\nRun it."}),
+    ]
+
+
+class TestBatchTransform:
+    """Tests for run_batch_transform() against the stand-in batch server."""
+
+    def test_batch_transform_full_run(self, batch_server, features, tmp_path: Path):
+        """All requests go into one batch, which is polled until it has ended."""
+        client = _client(batch_server)
+        cache = LLMTransformCache(tmp_path / "cache.json")
+        runner = MessageBatchRunner(client, poll_interval_seconds=0.0)
+
+        result = run_batch_transform(features, client, cache=cache, classify=True, runner=runner)
+
+        assert list(result.content_map) == ["001-spec-only", "002-both", "003-readme"]
+        assert result.content_map["001-spec-only"]["spec_content"] == CANNED_TRANSFORM_TEXT
+        assert result.content_map["002-both"]["spec_content"].startswith("## Overview\n\nA Python project.")
+        assert result.content_map["003-readme"]["spec_content"].startswith("# Readme")
+
+        assert len(batch_server.batches) == 1
+        batch = next(iter(batch_server.batches.values()))
+        # transform + inconsistency + priority (+ classify for 002 and 003)
+        assert len(batch["requests"]) == 5
+        assert batch["polls"] >= batch_server.config.batch_polls_until_ended
+        assert result.batch_ids == [next(iter(batch_server.batches))]
+        assert len(cache._cache) == 2
+        assert [c.section_type for c in result.classifications["003-readme"]] == ["both"]
+
+    def test_batch_transform_reuses_cache(self, batch_server, features, tmp_path: Path):
+        """A second run with a warm cache submits no batch at all."""
+        client = _client(batch_server)
+        cache = LLMTransformCache(tmp_path / "cache.json")
+        runner = MessageBatchRunner(client, poll_interval_seconds=0.0)
+        run_batch_transform(features, client, cache=cache, runner=runner)
+
+        second = run_batch_transform(
+            features, client, cache=cache, runner=MessageBatchRunner(client, poll_interval_seconds=0.0)
+        )
+
+        assert len(batch_server.batches) == 1
+        assert second.cached_features == 2
+        assert second.batch_ids == []
+
+    def test_batch_transform_errored_request(self, batch_server, features, tmp_path: Path):
+        """A failed request raises, but results of other features are cached."""
+        batch_server.errored_custom_ids = {"req-000000"}  # spec transform of 001
+        client = _client(batch_server)
+        cache = LLMTransformCache(tmp_path / "cache.json")
+
+        with pytest.raises(SpecKitDocsError, match="001-spec-only"):
+            run_batch_transform(
+                features, client, cache=cache, runner=MessageBatchRunner(client, poll_interval_seconds=0.0)
+            )
+
+        assert len(cache._cache) == 1
+
+    def test_batch_timeout(self, features):
+        """A batch that never ends raises after max_wait_seconds."""
+        with FakeAnthropicServer(FakeServerConfig(batch_polls_until_ended=1000)) as batch_server:
+            client = _client(batch_server)
+            runner = MessageBatchRunner(client, poll_interval_seconds=1.0, max_wait_seconds=3.0, sleep=lambda _: None)
+
+            with pytest.raises(SpecKitDocsError, match="did not finish"):
+                run_batch_transform(features, client, runner=runner)
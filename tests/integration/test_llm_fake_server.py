@@ -0,0 +1,276 @@
+"""Integration tests running the LLM pipeline against the fake Anthropic server.
+
+speckit_docs.utils.llm_fake_server stands in for the Anthropic API, so the
+transform pipeline runs end-to-end (real SDK, real HTTP) without API credits.
+"""
+
+import random
+import shutil
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+from anthropic import Anthropic, APITimeoutError
+
+from speckit_docs.models import Feature, FeatureStatus
+from speckit_docs.utils.llm_engine import run_transform_engine
+from speckit_docs.utils.llm_fake_server import (
+    CANNED_TRANSFORM_TEXT,
+    FakeAnthropicServer,
+    FakeServerConfig,
+    LatencyProfile,
+    canned_response_text,
+    classify_request,
+)
+from speckit_docs.utils.llm_resilience import ResilientCaller, RetryPolicy, set_resilient_caller
+from speckit_docs.utils.llm_session import LLMSession, LLMSessionConfig, set_llm_session
+from speckit_docs.utils.llm_singleflight import SingleFlight, set_single_flight
+from speckit_docs.utils.llm_transform import (
+    build_inconsistency_request,
+    build_section_priority_request,
+    build_spec_transform_request,
+    create_message,
+    get_response_text,
+    parse_inconsistency_response,
+    parse_section_priority_response,
+    stream_message,
+)
+from speckit_docs.utils.llm_usage import usage_recorder
+
+VALID_SPEC = Path(__file__).parents[1] / "fixtures" / "sample_specs" / "valid_spec.md"
+
+
+@pytest.fixture
+def server() -> Generator[FakeAnthropicServer, None, None]:
+    with FakeAnthropicServer(FakeServerConfig(latency=LatencyProfile("uniform", 0.01, 0.01))) as server:
+        yield server
+
+
+@pytest.fixture
+def session(server: FakeAnthropicServer) -> Generator[LLMSession, None, None]:
+    """Process-wide session (and fast retries) pointed at the fake server."""
+    session = LLMSession(LLMSessionConfig(base_url=server.base_url, api_key="test-key"))
+    previous_session = set_llm_session(session)
+    previous_caller = set_resilient_caller(ResilientCaller(RetryPolicy(base_delay_seconds=0.0)))
+    previous_group = set_single_flight(SingleFlight())
+    usage_recorder.reset()
+    yield session
+    session.close()
+    set_llm_session(previous_session)
+    set_resilient_caller(previous_caller)
+    set_single_flight(previous_group)
+    usage_recorder.reset()
+
+
+@pytest.fixture
+def features(tmp_path: Path) -> list[Feature]:
+    result = []
+    for dir_name, files in [
+        ("001-spec-only", {}),
+        (
+            "002-both",
+            {
+                "README.md": "# Project\n\n## Overview\n\nA Python project.",
+                "QUICKSTART.md": "# Quick\n\n## Install\n\npip install project",
+            },
+        ),
+    ]:
+        feature_dir = tmp_path / "specs" / dir_name
+        feature_dir.mkdir(parents=True)
+        shutil.copy(VALID_SPEC, feature_dir / "spec.md")
+        for name, content in files.items():
+            (feature_dir / name).write_text(content)
+        feature_id, name = dir_name.split("-", 1)
+        result.append(
+            Feature(
+                id=feature_id,
+                name=name,
+                directory_path=feature_dir,
+                spec_file=feature_dir / "spec.md",
+                status=FeatureStatus.DRAFT,
+            )
+        )
+    return result
+
+
+class TestCannedResponses:
+    """Canned responses are valid for the response parsers."""
+
+    def test_prompt_types(self):
+        assert classify_request(build_inconsistency_request("# A", "# B")) == "inconsistency"
+        assert classify_request(build_spec_transform_request("# Spec")) == "transform"
+        assert canned_response_text(build_spec_transform_request("# Spec")) == CANNED_TRANSFORM_TEXT
+
+    def test_priority_lists_every_section(self):
+        from speckit_docs.llm_entities import LLMSection
+
+        sections = [
+            LLMSection(file="README.md", heading="## A", level="h2", content="a", token_count=5),
+            LLMSection(file="QUICKSTART.md", heading="## B", level="h2", content="b", token_count=5),
+        ]
+        text = canned_response_text(build_section_priority_request(sections))
+
+        result = parse_section_priority_response(text, sections)
+
+        assert [ps.section.heading for ps in result.prioritized_sections] == ["## A", "## B"]
+
+    def test_latency_is_deterministic(self):
+        profile = LatencyProfile("lognormal", 0.5, 0.4)
+
+        first = [profile.sample(random.Random(7)) for _ in range(3)]
+        second = [profile.sample(random.Random(7)) for _ in range(3)]
+
+        assert first == second
+        assert all(value >= 0 for value in first)
+
+
+class TestPipelineAgainstFakeServer:
+    """The transform pipeline runs end-to-end against the fake server."""
+
+    @pytest.mark.parametrize("stream", [False, True])
+    def test_transform_engine(self, server, session, features, stream):
+        content_map = run_transform_engine(features, max_concurrency=2, stream=stream)
+
+        assert content_map["001-spec-only"]["spec_content"] == CANNED_TRANSFORM_TEXT
+        assert content_map["002-both"]["spec_content"] == "## Overview\n\nA Python project.\n\n## Install\n\npip install project"
+        kinds = sorted(classify_request(params) for params in server.requests)
+        assert kinds == ["inconsistency", "priority", "transform"]
+        assert all(u.latency_seconds is not None for u in usage_recorder.records())
+
+    def test_small_spec_extracts_are_packed(self, server, session, features):
+        second = features[0].directory_path.parent / "003-spec-only"
+        shutil.copytree(features[0].directory_path, second)
+        spec_features = [
+            features[0],
+            Feature(
+                id="003",
+                name="spec-only",
+                directory_path=second,
+                spec_file=second / "spec.md",
+                status=FeatureStatus.DRAFT,
+            ),
+        ]
+
+        content_map = run_transform_engine(spec_features)
+
+        assert content_map["003-spec-only"]["spec_content"] == CANNED_TRANSFORM_TEXT
+        assert [classify_request(params) for params in server.requests] == ["transform_pack"]
+
+    def test_timed_out_pack_falls_back_to_single_requests(self, features, monkeypatch):
+        from speckit_docs.utils import llm_engine
+        from speckit_docs.utils.transform_packing import TransformPackStats
+
+        second = features[0].directory_path.parent / "003-spec-only"
+        shutil.copytree(features[0].directory_path, second)
+        spec_features = [
+            features[0],
+            Feature(
+                id="003",
+                name="spec-only",
+                directory_path=second,
+                spec_file=second / "spec.md",
+                status=FeatureStatus.DRAFT,
+            ),
+        ]
+        monkeypatch.setattr(llm_engine, "pack_timeout_seconds", lambda max_tokens: 0.2)
+        stats = TransformPackStats()
+
+        with FakeAnthropicServer(FakeServerConfig(timeout_seconds=0.5)) as server:
+            session = LLMSession(LLMSessionConfig(base_url=server.base_url, api_key="test-key"))
+            previous_session = set_llm_session(session)
+            previous_caller = set_resilient_caller(
+                ResilientCaller(RetryPolicy(max_attempts=2, base_delay_seconds=0.0))
+            )
+            previous_group = set_single_flight(SingleFlight())
+            try:
+                server.inject("timeout", "timeout")
+                content_map = run_transform_engine(spec_features, pack_stats=stats)
+            finally:
+                session.close()
+                set_llm_session(previous_session)
+                set_resilient_caller(previous_caller)
+                set_single_flight(previous_group)
+
+        assert {key: content["spec_content"] for key, content in content_map.items()} == {
+            "001-spec-only": CANNED_TRANSFORM_TEXT,
+            "003-spec-only": CANNED_TRANSFORM_TEXT,
+        }
+        kinds = [classify_request(params) for params in server.requests]
+        assert kinds == ["transform_pack", "transform_pack", "transform", "transform"]
+        assert server.faults_injected == {"timeout": 2}
+        assert (stats.packed_documents, stats.fallback_documents) == (0, 2)
+
+    def test_injected_rate_limits_are_retried(self, server, session, features):
+        server.inject("rate_limit", "overloaded")
+
+        content_map = run_transform_engine(features[:1])
+
+        assert content_map["001-spec-only"]["spec_content"] == CANNED_TRANSFORM_TEXT
+        assert server.faults_injected == {"rate_limit": 1, "overloaded": 1}
+        [usage] = usage_recorder.records()
+        assert usage.retries == 2
+
+    def test_prompt_cache_counters(self, server, session):
+        client = session.client
+        params = build_spec_transform_request("# Spec")
+        params["system"] = [{**params["system"][0], "text": "x" * 4 * 1024, "cache_control": {"type": "ephemeral"}}]
+
+        first = client.messages.create(**params)
+        second = client.messages.create(**params)
+
+        assert first.usage.cache_creation_input_tokens > 0
+        assert second.usage.cache_read_input_tokens == first.usage.cache_creation_input_tokens
+
+    def test_short_marked_prefix_is_not_cached(self, server, session):
+        """Like the API, a marked prefix under the model's minimum length is processed in full."""
+        client = session.client
+        params = build_spec_transform_request("# Spec")
+        params["system"] = [{**params["system"][0], "cache_control": {"type": "ephemeral"}}]
+
+        client.messages.create(**params)
+        second = client.messages.create(**params)
+
+        assert not second.usage.cache_creation_input_tokens
+        assert not second.usage.cache_read_input_tokens
+
+    def test_injected_timeout(self):
+        with FakeAnthropicServer(FakeServerConfig(timeout_seconds=1.0)) as server:
+            server.inject("timeout")
+            client = Anthropic(api_key="test-key", base_url=server.base_url, max_retries=0, timeout=0.2)
+
+            with pytest.raises(APITimeoutError):
+                client.messages.create(**build_spec_transform_request("# Spec"))
+
+
+class TestToolUseResponses:
+    """Analysis calls are answered with forced tool_use blocks."""
+
+    def test_blocking_tool_use(self, server, session):
+        response = create_message(session.client, build_inconsistency_request("# A", "# B"), "inconsistency", 10.0)
+
+        assert response.stop_reason == "tool_use"
+        assert response.content[0].name == "record_inconsistencies"
+        assert parse_inconsistency_response(get_response_text(response)).is_consistent
+
+    def test_streamed_tool_use(self, server, session):
+        events = []
+
+        streamed = stream_message(
+            session.client,
+            build_inconsistency_request("# A", "# B"),
+            "inconsistency",
+            10.0,
+            on_event=lambda event: events.append(event) or False,
+        )
+
+        assert parse_inconsistency_response(streamed.text).is_consistent
+        assert events
+
+    def test_text_fallback_without_tool_support(self, session):
+        with FakeAnthropicServer(FakeServerConfig(tool_use=False)) as server:
+            client = Anthropic(api_key="test-key", base_url=server.base_url, max_retries=0)
+
+            response = create_message(client, build_inconsistency_request("# A", "# B"), "inconsistency", 10.0)
+
+        assert response.content[0].type == "text"
+        assert parse_inconsistency_response(get_response_text(response)).is_consistent
@@ -323,7 +323,6 @@ class TestSpecMinimalExtraction:
 class TestREADMEQuickstartIntegration:
     """Tests for README/QUICKSTART integration (T057)."""
 
-    @pytest.mark.skip(reason="parse_markdown_sections() has implementation bug (T066) - fixes out of scope for T055-T059")
     def test_readme_quickstart_integration_no_inconsistency(self, tmp_path: Path):
         """Test integration when README and QUICKSTART are consistent."""
         from speckit_docs.utils.llm_transform import parse_markdown_sections
@@ -370,6 +369,20 @@ myproject run
         assert any(s.heading == "Installation" for s in quickstart_sections)
 
 
+    def test_parse_sections_keeps_text_under_h1_and_empty_headings(self):
+        """A mid-document h1 or an empty heading does not end a section or drop its text."""
+        from speckit_docs.utils.llm_transform import parse_markdown_sections
+
+        content = "# P\n\n## A\n\na body\n\n# Usage\n\nusage body\n\n## \n\nempty body\n\n## B\n\nb\n"
+
+        sections = parse_markdown_sections(content, "README.md")
+
+        assert [s.heading for s in sections] == ["A", "B"]
+        assert "usage body" in sections[0].content
+        assert "empty body" in sections[0].content
+        assert sections[1].content == "b"
+
+
 class TestTransformedContentValidation:
     """Tests for transformed content validation (T058)."""
 
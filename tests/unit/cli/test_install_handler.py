@@ -182,9 +182,10 @@ class TestCopyBackendScripts:
         copied_files = copy_backend_scripts(force=True)
 
         # Verify files were copied (includes __init__.py)
-        assert len(copied_files) == 3
+        assert len(copied_files) == 4
         assert (tmp_path / ".specify" / "scripts" / "docs" / "doc_init.py").exists()
         assert (tmp_path / ".specify" / "scripts" / "docs" / "doc_update.py").exists()
+        assert (tmp_path / ".specify" / "scripts" / "docs" / "doc_transform.py").exists()
         assert (tmp_path / ".specify" / "scripts" / "docs" / "__init__.py").exists()
 
     def test_copy_backend_scripts_creates_directory(self, tmp_path, monkeypatch):
@@ -199,7 +200,7 @@ class TestCopyBackendScripts:
 
         # Verify directory was created (includes __init__.py)
         assert (tmp_path / ".specify" / "scripts" / "docs").exists()
-        assert len(copied_files) == 3
+        assert len(copied_files) == 4
 
     @patch("typer.confirm")
     def test_copy_backend_scripts_existing_file_confirmation(
@@ -222,4 +223,4 @@ class TestCopyBackendScripts:
 
         # Verify confirmation was requested (includes __init__.py)
         assert mock_confirm.called
-        assert len(copied_files) == 3
+        assert len(copied_files) == 4
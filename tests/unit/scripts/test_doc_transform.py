@@ -0,0 +1,32 @@
+"""Unit tests for doc_transform.py cache options."""
+
+import pytest
+from typer.testing import CliRunner
+
+from speckit_docs.scripts.doc_transform import app
+
+
+class TestCacheBackendOptions:
+    """SQLite-only cache options are rejected with another backend, not ignored."""
+
+    @pytest.mark.parametrize(
+        ("backend", "option"),
+        [
+            ("journal", ["--cache-max-mb", "16"]),
+            ("journal", ["--cache-ttl-days", "7"]),
+            ("journal", ["--cache-codec", "lzma"]),
+            ("mmap", ["--cache-max-mb", "0"]),
+            ("json", ["--cache-debug"]),
+            ("json", ["--cache-codec", "zlib"]),
+        ],
+    )
+    def test_sqlite_only_option_is_rejected(self, tmp_path, monkeypatch, backend, option):
+        monkeypatch.chdir(tmp_path)
+        output = tmp_path / "transformed.json"
+
+        result = CliRunner().invoke(app, ["--output", str(output), "--cache-backend", backend, *option])
+
+        assert option[0] in result.output
+        assert f"--cache-backend {backend} では使用できません" in result.output
+        assert not output.exists()
+        assert not (tmp_path / ".claude").exists()
@@ -294,3 +294,28 @@ nav:
 
         # Should return error
         assert result != 0
+
+    def test_doc_update_reports_llm_telemetry(self, tmp_path, monkeypatch, capsys):
+        """Test the LLM telemetry summary of the last doc_transform run is reported."""
+        from speckit_docs.llm_entities import LLMUsage
+        from speckit_docs.utils.llm_telemetry import JSONLTelemetrySink
+
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / ".specify").mkdir()
+        docs_dir = tmp_path / "docs"
+        docs_dir.mkdir()
+        (docs_dir / "conf.py").write_text("# Sphinx config")
+        (docs_dir / "index.md").write_text("# Documentation\n\n")
+        (tmp_path / "specs" / "001-feature-one").mkdir(parents=True)
+        (tmp_path / "specs" / "001-feature-one" / "spec.md").write_text("# Feature One")
+        transformed_content_file = tmp_path / "transformed_content.json"
+        transformed_content_file.write_text(json.dumps({"001-feature-one": {"spec_content": "# Feature One"}}))
+        sink = JSONLTelemetrySink(tmp_path / ".claude" / ".cache" / "llm-telemetry.jsonl")
+        sink(LLMUsage("transform", "claude-3-5-sonnet-20241022", input_tokens=100, latency_seconds=1.5, feature="001-feature-one"))
+
+        result = main(quick=False, transformed_content=transformed_content_file)
+
+        assert result == 0
+        output = capsys.readouterr().out
+        assert "p50 1.50秒" in output
+        assert "001-feature-one (1.5秒)" in output
@@ -248,6 +248,28 @@ class TestSectionPriorityResult:
                 excluded_sections=[],  # Should be 4 to match total_sections
             )
 
+    def test_section_priority_result_utilization(self):
+        """Test SectionPriorityResult reports the used share of the token budget."""
+        result = SectionPriorityResult(
+            prioritized_sections=[],
+            total_sections=0,
+            included_sections=0,
+            excluded_sections=[],
+            token_budget=8000,
+            included_tokens=6000,
+        )
+
+        assert result.utilization == 0.75
+
+        with pytest.raises(ValueError, match="included_tokens must be in range"):
+            SectionPriorityResult(
+                prioritized_sections=[],
+                total_sections=0,
+                included_sections=0,
+                excluded_sections=[],
+                included_tokens=10001,
+            )
+
 
 class TestLLMTransformResult:
     """Tests for LLMTransformResult entity (T054)."""
@@ -9,7 +9,7 @@ from pathlib import Path
 
 import pytest
 
-from speckit_docs.utils.cache import LLMTransformCache, compute_content_hash
+from speckit_docs.utils.cache import LLMTransformCache, cache_key_identity, compute_content_hash
 
 
 class TestComputeContentHash:
@@ -182,3 +182,27 @@ class TestLLMTransformCache:
 
         # Cache miss for different hash
         assert cache.get_cached_transform(different_hash) is None
+
+    def test_collect_garbage_ignores_model_and_prompt_version(self, cache: LLMTransformCache):
+        """Entries of a current source under another model or prompt version are kept."""
+        cache.set_cached_transform("spec_section:model-a:p1:v1:hash1", "Live", "a")
+        cache.set_cached_transform("spec_section:model-b:p2:v1:hash1", "Live", "b")
+        cache.set_cached_transform("spec_section:model-a:p1:v1:hash2", "Old", "old")
+
+        assert cache.collect_garbage({"spec_section:model-b:p2:v1:hash1"}) == 1
+        assert cache.get_cached_transform("spec_section:model-a:p1:v1:hash1") == "a"
+        assert cache.get_cached_transform("spec_section:model-a:p1:v1:hash2") is None
+
+    def test_cache_key_identity(self):
+        assert cache_key_identity("section_priority:claude:abc:v1:0123") == "section_priority:0123"
+        assert cache_key_identity("spec_section:bedrock.claude-v2:1:abc:v1:0123") == "spec_section:0123"
+        assert cache_key_identity("0123") == "0123"
+
+    def test_collect_garbage(self, cache: LLMTransformCache):
+        """Entries not referenced by a current feature are dropped."""
+        cache.set_cached_transform("live", "Live", "Transformed live")
+        cache.set_cached_transform("deleted", "Deleted", "Transformed deleted")
+
+        assert cache.collect_garbage({"live"}) == 1
+        assert cache.get_cached_transform("live") == "Transformed live"
+        assert cache.get_cached_transform("deleted") is None
@@ -0,0 +1,234 @@
+"""Unit tests for the append-only journal cache backend (cache_journal.py)."""
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from speckit_docs.utils import cache_journal
+from speckit_docs.utils.cache import LLMTransformCache
+from speckit_docs.utils.cache_journal import JournalTransformCache, migrate_json_to_journal
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _open(journal_file: Path, **kwargs: Any) -> JournalTransformCache:
+    cache = JournalTransformCache(journal_file, **kwargs)
+    cache.load_cache()
+    return cache
+
+
+class TestJournalTransformCache:
+    """Tests for JournalTransformCache."""
+
+    @pytest.fixture
+    def journal_file(self, tmp_path: Path) -> Path:
+        return tmp_path / ".claude" / ".cache" / "llm-transforms.journal"
+
+    def test_set_and_replay(self, journal_file: Path):
+        cache = _open(journal_file)
+        assert cache.get_cached_transform("h1") is None
+        cache.set_cached_transform("h1", "original", "変換済み")
+        cache.save_cache()
+        cache.close()
+
+        assert _open(journal_file).get_cached_transform("h1") == "変換済み"
+
+    def test_records_are_written_without_save(self, journal_file: Path):
+        """An interrupted run that never saves keeps every transform it set."""
+        writer = _open(journal_file)
+        writer.set_cached_transform("h1", "one", "1")
+        writer.set_cached_transform("h2", "two", "2")
+
+        reader = _open(journal_file)
+        assert reader.get_cached_transform("h1") == "1"
+        assert reader.get_cached_transform("h2") == "2"
+        writer.close()
+
+    def test_one_record_per_write(self, journal_file: Path):
+        cache = _open(journal_file)
+        cache.set_cached_transform("h1", "one", "1")
+        cache.set_cached_transform("h1", "one", "1 again")
+        cache.set_cached_transform("h2", "two", "2")
+        cache.close()
+
+        records = [json.loads(line) for line in journal_file.read_text(encoding="utf-8").splitlines()]
+        assert [(r["op"], r["key"]) for r in records] == [("set", "h1"), ("set", "h1"), ("set", "h2")]
+        replayed = _open(journal_file)
+        # The last record of a key wins
+        assert replayed.get_cached_transform("h1") == "1 again"
+        assert (replayed.records, replayed.dead_records) == (3, 1)
+
+    def test_original_is_stored_as_hash(self, journal_file: Path):
+        cache = _open(journal_file)
+        cache.set_cached_transform("h1", "元の長い内容", "1")
+        cache.close()
+
+        [record] = [json.loads(line) for line in journal_file.read_text(encoding="utf-8").splitlines()]
+        assert "original_content" not in record
+        assert record["original_hash"] == cache_journal.hash_original("元の長い内容")
+        assert _open(journal_file).get_cached_transform("h1") == "1"
+
+    def test_store_original(self, journal_file: Path):
+        cache = _open(journal_file, store_original=True)
+        cache.set_cached_transform("h1", "元の内容", "1")
+        cache.close()
+
+        [record] = [json.loads(line) for line in journal_file.read_text(encoding="utf-8").splitlines()]
+        assert record["original_content"] == "元の内容"
+
+        # Without debug mode, compaction drops the stored original
+        replayed = _open(journal_file)
+        replayed.compact()
+        [record] = [json.loads(line) for line in journal_file.read_text(encoding="utf-8").splitlines()]
+        assert "original_content" not in record
+        assert replayed.get_cached_transform("h1") == "1"
+
+    def test_collect_garbage_is_replayed(self, journal_file: Path):
+        cache = _open(journal_file)
+        cache.set_cached_transform("live", "one", "1")
+        cache.set_cached_transform("stale", "two", "2")
+
+        assert cache.collect_garbage({"live"}) == 1
+        cache.close()
+
+        replayed = _open(journal_file)
+        assert replayed.get_cached_transform("live") == "1"
+        assert replayed.get_cached_transform("stale") is None
+
+    def test_torn_record_is_truncated(self, journal_file: Path):
+        cache = _open(journal_file)
+        cache.set_cached_transform("h1", "one", "1")
+        cache.close()
+        with open(journal_file, "ab") as f:
+            f.write(b'{"op":"set","key":"h2","original_con')
+
+        recovered = _open(journal_file)
+        assert recovered.get_cached_transform("h1") == "1"
+        assert recovered.get_cached_transform("h2") is None
+        recovered.set_cached_transform("h3", "three", "3")
+        recovered.close()
+
+        replayed = _open(journal_file)
+        assert replayed.get_cached_transform("h3") == "3"
+        assert replayed.records == 2
+
+    def test_unreadable_record_is_skipped(self, journal_file: Path):
+        journal_file.parent.mkdir(parents=True)
+        journal_file.write_text(
+            "not json\n"
+            + json.dumps({"op": "unknown", "key": "x"})
+            + "\n"
+            + json.dumps({"op": "set", "key": "h1", "original_content": "o", "transformed_content": "1", "timestamp": "t"})
+            + "\n",
+            encoding="utf-8",
+        )
+
+        cache = _open(journal_file)
+
+        assert cache.get_cached_transform("h1") == "1"
+        assert (cache.records, cache.dead_records) == (3, 2)
+
+    def test_fsync_is_batched(self, journal_file: Path, monkeypatch):
+        syncs: list[int] = []
+        real_fsync = cache_journal.os.fsync
+        monkeypatch.setattr(cache_journal.os, "fsync", lambda fd: syncs.append(fd) or real_fsync(fd))
+        clock = FakeClock()
+        cache = _open(journal_file, sync_every=3, sync_interval_seconds=10.0, clock=clock)
+
+        for n in range(5):
+            cache.set_cached_transform(f"h{n}", "o", str(n))
+        assert len(syncs) == 1
+
+        clock.now += 10.0
+        cache.set_cached_transform("h5", "o", "5")
+        assert len(syncs) == 2
+
+        cache.set_cached_transform("h6", "o", "6")
+        cache.save_cache()
+        assert len(syncs) == 3
+        cache.save_cache()
+        assert len(syncs) == 3
+        cache.close()
+
+    def test_save_compacts_over_dead_ratio(self, journal_file: Path):
+        cache = _open(journal_file, compact_ratio=0.5, compact_min_records=4)
+        cache.set_cached_transform("h1", "one", "1")
+        cache.set_cached_transform("h2", "two", "2")
+        cache.set_cached_transform("h1", "one", "1 again")
+        cache.save_cache()
+        assert cache.compactions == 0
+
+        cache.set_cached_transform("h2", "two", "2 again")
+        cache.save_cache()
+
+        assert cache.compactions == 1
+        assert (cache.records, cache.dead_records) == (2, 0)
+        assert len(journal_file.read_text(encoding="utf-8").splitlines()) == 2
+        assert not journal_file.with_name(journal_file.name + ".tmp").exists()
+
+        # Appends continue on the compacted journal
+        cache.set_cached_transform("h3", "three", "3")
+        cache.close()
+        replayed = _open(journal_file)
+        assert {key: replayed.get_cached_transform(key) for key in ("h1", "h2", "h3")} == {
+            "h1": "1 again",
+            "h2": "2 again",
+            "h3": "3",
+        }
+
+    def test_explicit_compact(self, journal_file: Path):
+        cache = _open(journal_file)
+        cache.set_cached_transform("h1", "one", "1")
+        cache.set_cached_transform("h2", "two", "2")
+        cache.collect_garbage({"h2"})
+
+        cache.compact()
+
+        assert [json.loads(line)["key"] for line in journal_file.read_text(encoding="utf-8").splitlines()] == ["h2"]
+
+    def test_invalid_options(self, journal_file: Path):
+        with pytest.raises(ValueError):
+            JournalTransformCache(journal_file, sync_every=0)
+        with pytest.raises(ValueError):
+            JournalTransformCache(journal_file, compact_ratio=0)
+
+
+class TestMigrateJsonToJournal:
+    """Tests for migrate_json_to_journal()."""
+
+    def test_entries_are_imported(self, tmp_path: Path):
+        json_cache = LLMTransformCache(tmp_path / "llm-transforms.json")
+        json_cache.set_cached_transform("h1", "one", "1")
+        json_cache.set_cached_transform("h2", "two", "2")
+        json_cache.save_cache()
+        cache = _open(tmp_path / "llm-transforms.journal")
+        cache.set_cached_transform("h2", "two", "newer")
+
+        assert migrate_json_to_journal(tmp_path / "llm-transforms.json", cache) == 1
+        cache.close()
+        journal = (tmp_path / "llm-transforms.journal").read_text(encoding="utf-8")
+        assert '"original_content"' not in journal
+
+        replayed = _open(tmp_path / "llm-transforms.journal")
+        assert replayed.get_cached_transform("h1") == "1"
+        # Entries already in the journal win
+        assert replayed.get_cached_transform("h2") == "newer"
+
+    def test_malformed_files(self, tmp_path: Path):
+        json_file = tmp_path / "llm-transforms.json"
+        cache = _open(tmp_path / "llm-transforms.journal")
+
+        assert migrate_json_to_journal(json_file, cache) == 0
+        json_file.write_text("invalid json content")
+        assert migrate_json_to_journal(json_file, cache) == 0
+        json_file.write_text(json.dumps({"h1": {"original_content": "no result"}, "h2": "bad"}))
+        assert migrate_json_to_journal(json_file, cache) == 0
+        assert cache.records == 0
@@ -0,0 +1,157 @@
+"""Unit tests for versioned transform cache keys (cache_keys.py)."""
+
+import shutil
+from collections.abc import Generator
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from speckit_docs.models import Feature, FeatureStatus
+from speckit_docs.utils import cache_keys
+from speckit_docs.utils.cache import LLMTransformCache, compute_content_hash
+from speckit_docs.utils.cache_keys import (
+    TRANSFORM_SCHEMA_VERSION,
+    transform_cache_key,
+    transform_prompt_version,
+)
+from speckit_docs.utils.llm_engine import run_transform_engine
+from speckit_docs.utils.llm_routing import (
+    FAST_MODEL,
+    LARGE_MODEL,
+    get_model_routing,
+    set_model_routing,
+)
+
+VALID_SPEC = Path(__file__).parents[2] / "fixtures" / "sample_specs" / "valid_spec.md"
+
+TRANSFORMED_SPEC = (
+    "## ユーザーストーリーの目的\n\n"
+    "この機能を使うと、コマンドを一つ実行するだけでプロジェクトのドキュメントを簡単に作成できます。"
+)
+
+
+@pytest.fixture
+def restore_routing() -> Generator[None, None, None]:
+    previous = get_model_routing()
+    yield
+    set_model_routing(previous)
+
+
+def _mock_create(**kwargs: Any) -> MagicMock:
+    content = kwargs["messages"][0]["content"]
+    if "README.md content:" in content:
+        text = '{"is_consistent": true, "inconsistencies": [], "summary": "Consistent."}'
+    elif "Sections from README.md" in content:
+        text = '{"prioritized_sections": [{"file": "README.md", "heading": "Overview", "priority": 1, "reason": "Intro"}]}'
+    else:
+        text = TRANSFORMED_SPEC
+    response = MagicMock()
+    response.content = [MagicMock(text=text)]
+    return response
+
+
+def _feature(specs_dir: Path, dir_name: str, files: dict[str, str] | None = None) -> Feature:
+    feature_dir = specs_dir / dir_name
+    feature_dir.mkdir(parents=True)
+    shutil.copy(VALID_SPEC, feature_dir / "spec.md")
+    for name, content in (files or {}).items():
+        (feature_dir / name).write_text(content)
+    feature_id, name = dir_name.split("-", 1)
+    return Feature(
+        id=feature_id,
+        name=name,
+        directory_path=feature_dir,
+        spec_file=feature_dir / "spec.md",
+        status=FeatureStatus.DRAFT,
+    )
+
+
+class TestTransformCacheKey:
+    """Tests for transform_cache_key()."""
+
+    def test_components(self):
+        content_hash = compute_content_hash("extract")
+
+        key = transform_cache_key("spec_md_extraction", content_hash)
+
+        assert key.split(":") == [
+            "spec_md_extraction",
+            LARGE_MODEL,
+            transform_prompt_version("spec_md_extraction"),
+            f"v{TRANSFORM_SCHEMA_VERSION}",
+            content_hash,
+        ]
+
+    def test_transform_type_separates_keys(self):
+        content_hash = compute_content_hash("same source")
+
+        keys = {
+            transform_cache_key(transform_type, content_hash)
+            for transform_type in ("spec_md_extraction", "section_priority", "spec_section")
+        }
+
+        assert len(keys) == 3
+
+    def test_model_change_invalidates_its_transform_type_only(self, restore_routing):
+        content_hash = compute_content_hash("extract")
+        spec_key = transform_cache_key("spec_md_extraction", content_hash)
+        paired_key = transform_cache_key("section_priority", content_hash)
+
+        set_model_routing(get_model_routing().with_overrides({"transform": FAST_MODEL}))
+
+        assert transform_cache_key("spec_md_extraction", content_hash) != spec_key
+        assert transform_cache_key("section_priority", content_hash) == paired_key
+
+    def test_prompt_edit_invalidates_its_transform_type_only(self, monkeypatch):
+        content_hash = compute_content_hash("README + QUICKSTART")
+        spec_key = transform_cache_key("spec_md_extraction", content_hash)
+        paired_key = transform_cache_key("section_priority", content_hash)
+
+        templates = cache_keys._PROMPT_TEMPLATES["section_priority"]
+        monkeypatch.setitem(
+            cache_keys._PROMPT_TEMPLATES, "section_priority", (*templates[:-1], templates[-1] + " ")
+        )
+
+        assert transform_cache_key("section_priority", content_hash) != paired_key
+        assert transform_cache_key("spec_md_extraction", content_hash) == spec_key
+
+    def test_schema_version_bump_invalidates(self, monkeypatch):
+        content_hash = compute_content_hash("extract")
+        key = transform_cache_key("spec_section", content_hash)
+
+        monkeypatch.setattr(cache_keys, "TRANSFORM_SCHEMA_VERSION", TRANSFORM_SCHEMA_VERSION + 1)
+
+        assert transform_cache_key("spec_section", content_hash) != key
+
+
+class TestEngineCacheKeys:
+    """Cached transformations are reused only under the same model and prompts."""
+
+    def test_model_change_retransforms_affected_features(self, tmp_path: Path, restore_routing):
+        cache = LLMTransformCache(tmp_path / "cache.json")
+        features = [
+            _feature(tmp_path / "specs", "001-spec"),
+            _feature(
+                tmp_path / "specs",
+                "002-both",
+                {
+                    "README.md": "# Project\n\n## Overview\n\nA Python project.",
+                    "QUICKSTART.md": "# Quick\n\n## Install\n\npip install project",
+                },
+            ),
+        ]
+        first = MagicMock()
+        first.messages.create = AsyncMock(side_effect=_mock_create)
+        run_transform_engine(features, client=first, cache=cache)
+
+        set_model_routing(get_model_routing().with_overrides({"transform": FAST_MODEL}))
+        second = MagicMock()
+        second.messages.create = AsyncMock(side_effect=_mock_create)
+        run_transform_engine(features, client=second, cache=cache)
+
+        # Only the spec.md transformation is re-sent, to the new model
+        [call] = second.messages.create.call_args_list
+        assert call.kwargs["model"] == FAST_MODEL
+        assert "Specification extract" in call.kwargs["messages"][0]["content"]
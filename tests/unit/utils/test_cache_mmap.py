@@ -0,0 +1,238 @@
+"""Unit tests for the memory-mapped index cache backend (cache_mmap.py)."""
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from speckit_docs.utils import cache_mmap
+from speckit_docs.utils.cache import LLMTransformCache, compute_content_hash
+from speckit_docs.utils.cache_mmap import MappedTransformCache, migrate_json_to_mapped
+
+
+@pytest.fixture
+def data_file(tmp_path: Path) -> Path:
+    return tmp_path / ".claude" / ".cache" / "llm-transforms.data"
+
+
+class TestMappedTransformCache:
+    """Tests for MappedTransformCache."""
+
+    def test_set_and_get(self, data_file: Path):
+        with MappedTransformCache(data_file) as cache:
+            assert cache.get_cached_transform("h1") is None
+            cache.set_cached_transform("h1", "original", "変換済み")
+            assert cache.get_cached_transform("h1") == "変換済み"
+            cache.save_cache()
+
+        with MappedTransformCache(data_file) as cache:
+            assert cache.get_cached_transform("h1") == "変換済み"
+            assert not cache.rebuilt
+        assert data_file.with_suffix(".idx").exists()
+
+    @pytest.mark.parametrize("store_original", [False, True])
+    def test_original_is_stored_as_hash(self, data_file: Path, store_original: bool):
+        with MappedTransformCache(data_file, store_original=store_original) as cache:
+            cache.set_cached_transform("h1", "元の長い内容", "1")
+            cache.save_cache()
+
+        assert ("元の長い内容".encode() in data_file.read_bytes()) is store_original
+        with MappedTransformCache(data_file) as cache:
+            assert cache.get_cached_transform("h1") == "1"
+
+    def test_startup_reads_no_record(self, data_file: Path, monkeypatch):
+        """Opening maps the index; a lookup decodes exactly one record."""
+        with MappedTransformCache(data_file) as cache:
+            for n in range(200):
+                cache.set_cached_transform(compute_content_hash(str(n)), str(n), f"変換 {n}")
+            cache.save_cache()
+
+        decoded: list[int] = []
+        decode = cache_mmap._decode_record
+        monkeypatch.setattr(cache_mmap, "_decode_record", lambda raw: decoded.append(len(raw)) or decode(raw))
+
+        with MappedTransformCache(data_file) as cache:
+            assert decoded == []
+            assert cache.get_cached_transform(compute_content_hash("123")) == "変換 123"
+            assert len(decoded) == 1
+            assert cache.get_cached_transform(compute_content_hash("missing")) is None
+            assert len(cache) == 200
+
+    def test_unsaved_records_are_recovered(self, data_file: Path):
+        """An interrupted run that never saves keeps every transform it set."""
+        with MappedTransformCache(data_file) as cache:
+            cache.set_cached_transform("h1", "one", "1")
+            cache.save_cache()
+            cache.set_cached_transform("h2", "two", "2")
+            cache.set_cached_transform("h1", "one", "1 again")
+
+        with MappedTransformCache(data_file) as cache:
+            assert cache.get_cached_transform("h1") == "1 again"
+            assert cache.get_cached_transform("h2") == "2"
+
+    def test_torn_record_is_truncated(self, data_file: Path):
+        with MappedTransformCache(data_file) as cache:
+            cache.set_cached_transform("h1", "one", "1")
+            cache.save_cache()
+            cache.set_cached_transform("h2", "two", "2")
+        size = data_file.stat().st_size
+        with open(data_file, "r+b") as f:
+            f.truncate(size - 3)
+
+        with MappedTransformCache(data_file) as cache:
+            assert cache.get_cached_transform("h1") == "1"
+            assert cache.get_cached_transform("h2") is None
+            cache.set_cached_transform("h3", "three", "3")
+            cache.save_cache()
+
+        with MappedTransformCache(data_file) as cache:
+            assert cache.get_cached_transform("h3") == "3"
+
+    def test_corrupted_middle_record_is_skipped(self, data_file: Path):
+        """A bad record that fits in the file does not drop the records after it."""
+        with MappedTransformCache(data_file) as cache:
+            for n in range(5):
+                cache.set_cached_transform(f"h{n}", str(n), f"変換 {n}")
+            cache.save_cache()
+        raw = bytearray(data_file.read_bytes())
+        position = raw.index("変換 1".encode())
+        raw[position] ^= 0xFF
+        data_file.write_bytes(bytes(raw))
+        data_file.with_suffix(".idx").unlink()
+
+        with MappedTransformCache(data_file) as cache:
+            assert cache.rebuilt
+            assert cache.get_cached_transform("h1") is None
+            for n in (0, 2, 3, 4):
+                assert cache.get_cached_transform(f"h{n}") == f"変換 {n}"
+        assert data_file.stat().st_size == len(raw)
+
+    def test_collect_garbage(self, data_file: Path):
+        with MappedTransformCache(data_file) as cache:
+            cache.set_cached_transform("live", "one", "1")
+            cache.set_cached_transform("stale", "two", "2")
+            cache.save_cache()
+
+            assert cache.collect_garbage({"live"}) == 1
+            assert cache.get_cached_transform("stale") is None
+            cache.save_cache()
+
+        with MappedTransformCache(data_file) as cache:
+            assert cache.get_cached_transform("live") == "1"
+            assert cache.get_cached_transform("stale") is None
+            assert len(cache) == 1
+
+    def test_collect_garbage_ignores_model_version(self, data_file: Path):
+        with MappedTransformCache(data_file) as cache:
+            cache.set_cached_transform("spec_section:model-a:p1:v1:hash1", "one", "1")
+            cache.set_cached_transform("spec_section:model-a:p1:v1:hash2", "two", "2")
+
+            assert cache.collect_garbage({"spec_section:model-b:p1:v1:hash1"}) == 1
+            assert cache.get_cached_transform("spec_section:model-a:p1:v1:hash1") == "1"
+            assert cache.get_cached_transform("spec_section:model-a:p1:v1:hash2") is None
+
+    @pytest.mark.parametrize("damage", ["missing", "truncated", "garbage"])
+    def test_index_is_rebuilt(self, data_file: Path, damage: str):
+        with MappedTransformCache(data_file) as cache:
+            cache.set_cached_transform("h1", "one", "1")
+            cache.set_cached_transform("h2", "two", "2")
+            cache.save_cache()
+        index_file = data_file.with_suffix(".idx")
+        if damage == "missing":
+            index_file.unlink()
+        elif damage == "truncated":
+            index_file.write_bytes(index_file.read_bytes()[:100])
+        else:
+            index_file.write_bytes(b"\x00" * index_file.stat().st_size)
+
+        with MappedTransformCache(data_file) as cache:
+            assert cache.rebuilt
+            assert cache.get_cached_transform("h2") == "2"
+            cache.save_cache()
+
+        with MappedTransformCache(data_file) as cache:
+            assert not cache.rebuilt
+            assert cache.get_cached_transform("h1") == "1"
+
+    def test_save_compacts_over_dead_ratio(self, data_file: Path):
+        with MappedTransformCache(data_file, compact_ratio=0.4, compact_min_bytes=0) as cache:
+            cache.set_cached_transform("h1", "one", "1")
+            cache.set_cached_transform("h2", "two", "2")
+            cache.save_cache()
+            assert cache.compactions == 0
+            old_index = data_file.with_suffix(".idx").read_bytes()
+
+            # Both first records are superseded: half of the data is dead
+            cache.set_cached_transform("h1", "one", "3")
+            cache.set_cached_transform("h2", "two", "4")
+            size_before = cache.data_bytes()
+            cache.save_cache()
+
+            assert cache.compactions == 1
+            assert data_file.stat().st_size == cache.data_bytes() < size_before
+            assert cache.get_cached_transform("h1") == "3"
+
+        # An index from before the compaction does not match the new data file
+        data_file.with_suffix(".idx").write_bytes(old_index)
+        with MappedTransformCache(data_file) as cache:
+            assert cache.rebuilt
+            assert cache.get_cached_transform("h2") == "4"
+
+    def test_corrupted_data_file_is_moved_aside(self, data_file: Path):
+        data_file.parent.mkdir(parents=True)
+        data_file.write_bytes(b"not a cache data file")
+
+        with MappedTransformCache(data_file) as cache:
+            assert len(cache) == 0
+            cache.set_cached_transform("h1", "one", "1")
+            assert cache.get_cached_transform("h1") == "1"
+
+        assert data_file.with_name(data_file.name + ".corrupt").read_bytes() == b"not a cache data file"
+
+    def test_invalid_compact_ratio(self, data_file: Path):
+        with pytest.raises(ValueError):
+            MappedTransformCache(data_file, compact_ratio=1.5)
+
+
+class TestMigrateJsonToMapped:
+    """Tests for migrate_json_to_mapped()."""
+
+    def test_entries_are_imported(self, tmp_path: Path):
+        json_cache = LLMTransformCache(tmp_path / "llm-transforms.json")
+        json_cache.set_cached_transform("h1", "one", "1")
+        json_cache.set_cached_transform("h2", "two", "2")
+        json_cache.save_cache()
+
+        with MappedTransformCache(tmp_path / "llm-transforms.data") as cache:
+            cache.set_cached_transform("h2", "two", "newer")
+
+            assert migrate_json_to_mapped(tmp_path / "llm-transforms.json", cache) == 1
+            assert cache.get_cached_transform("h1") == "1"
+            assert b'"original_content"' not in (tmp_path / "llm-transforms.data").read_bytes()
+            # Entries already in the cache win
+            assert cache.get_cached_transform("h2") == "newer"
+
+    def test_malformed_files(self, tmp_path: Path):
+        json_file = tmp_path / "llm-transforms.json"
+
+        with MappedTransformCache(tmp_path / "llm-transforms.data") as cache:
+            assert migrate_json_to_mapped(json_file, cache) == 0
+            json_file.write_text("invalid json content")
+            assert migrate_json_to_mapped(json_file, cache) == 0
+            json_file.write_text(json.dumps({"h1": {"original_content": "no result"}, "h2": "bad"}))
+            assert migrate_json_to_mapped(json_file, cache) == 0
+            assert len(cache) == 0
+
+
+def test_copied_cache_is_usable(tmp_path: Path):
+    """Data and index files can be moved together (offsets are file-relative)."""
+    source = tmp_path / "a" / "llm-transforms.data"
+    with MappedTransformCache(source) as cache:
+        cache.set_cached_transform("h1", "one", "1")
+        cache.save_cache()
+    shutil.copytree(tmp_path / "a", tmp_path / "b")
+
+    with MappedTransformCache(tmp_path / "b" / "llm-transforms.data") as cache:
+        assert not cache.rebuilt
+        assert cache.get_cached_transform("h1") == "1"
@@ -0,0 +1,267 @@
+"""Unit tests for the SQLite storage backend of the LLM transform cache (cache_sqlite.py)."""
+
+import base64
+import json
+import multiprocessing
+import random
+import shutil
+import sqlite3
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from speckit_docs.models import Feature, FeatureStatus
+from speckit_docs.utils.cache import LLMTransformCache, compute_content_hash
+from speckit_docs.utils.cache_sqlite import SQLiteTransformCache, migrate_json_cache
+from speckit_docs.utils.llm_engine import run_transform_engine
+
+VALID_SPEC = Path(__file__).parents[2] / "fixtures" / "sample_specs" / "valid_spec.md"
+
+TRANSFORMED_SPEC = (
+    "## ユーザーストーリーの目的\n\n"
+    "この機能を使うと、コマンドを一つ実行するだけでプロジェクトのドキュメントを簡単に作成できます。"
+)
+
+
+def _async_client() -> MagicMock:
+    response = MagicMock()
+    response.content = [MagicMock(text=TRANSFORMED_SPEC)]
+    client = MagicMock()
+    client.messages.create = AsyncMock(return_value=response)
+    return client
+
+
+def _write_entries(db_file: Path, prefix: str, count: int) -> None:
+    """Worker process: set entries one by one on a cache of its own."""
+    with SQLiteTransformCache(db_file) as cache:
+        for i in range(count):
+            cache.set_cached_transform(f"{prefix}{i}", "original", f"{prefix} transformed {i}")
+
+
+class TestSQLiteTransformCache:
+    """Tests for SQLiteTransformCache."""
+
+    @pytest.fixture
+    def db_file(self, tmp_path: Path) -> Path:
+        return tmp_path / ".claude" / ".cache" / "llm-transforms.sqlite3"
+
+    def test_set_and_get(self, db_file: Path):
+        content_hash = compute_content_hash("original")
+
+        with SQLiteTransformCache(db_file) as cache:
+            assert cache.get_cached_transform(content_hash) is None
+            cache.set_cached_transform(content_hash, "original", "変換済み")
+
+            assert cache.get_cached_transform(content_hash) == "変換済み"
+
+    def test_entries_are_committed_without_save(self, db_file: Path):
+        """Each set is its own transaction: a run that never saves keeps its entries."""
+        writer = SQLiteTransformCache(db_file)
+        writer.load_cache()
+        writer.set_cached_transform("abc", "original", "transformed")
+
+        reader = SQLiteTransformCache(db_file)
+        assert reader.get_cached_transform("abc") == "transformed"
+        writer.close()
+        reader.close()
+
+    def test_upsert_replaces_entry(self, db_file: Path):
+        with SQLiteTransformCache(db_file) as cache:
+            cache.set_cached_transform("abc", "v1", "first")
+            cache.set_cached_transform("abc", "v2", "second")
+
+            assert cache.get_cached_transform("abc") == "second"
+            assert len(cache) == 1
+
+    def test_wal_mode(self, db_file: Path):
+        with SQLiteTransformCache(db_file) as cache:
+            cache.save_cache()
+
+        connection = sqlite3.connect(db_file)
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        connection.close()
+
+    def test_concurrent_processes(self, db_file: Path):
+        """Two processes writing at once lose no entries."""
+        SQLiteTransformCache(db_file).load_cache()
+        context = multiprocessing.get_context("spawn")
+        workers = [context.Process(target=_write_entries, args=(db_file, prefix, 50)) for prefix in "ab"]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=60)
+
+        assert [worker.exitcode for worker in workers] == [0, 0]
+        with SQLiteTransformCache(db_file) as cache:
+            assert len(cache) == 100
+            assert cache.get_cached_transform("b49") == "b transformed 49"
+
+    def test_corrupted_file_is_moved_aside(self, db_file: Path):
+        db_file.parent.mkdir(parents=True)
+        db_file.write_bytes(b"not a database" * 100)
+
+        with SQLiteTransformCache(db_file) as cache:
+            assert cache.get_cached_transform("abc") is None
+            cache.set_cached_transform("abc", "original", "transformed")
+
+        assert db_file.with_name(db_file.name + ".corrupt").read_bytes().startswith(b"not a database")
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestBoundedCache:
+    """Compressed, deduplicated blobs; LRU/TTL eviction; garbage collection."""
+
+    def test_identical_transforms_share_a_compressed_blob(self, tmp_path: Path):
+        text = "## 概要\n\n" + "同じ変換結果です。" * 200
+
+        with SQLiteTransformCache(tmp_path / "cache.sqlite3") as cache:
+            cache.set_cached_transform("h1", "one", text)
+            cache.set_cached_transform("h2", "two", text)
+
+            assert cache.get_cached_transform("h2") == text
+            assert cache.stored_bytes() < len(text.encode("utf-8")) // 10
+
+    @pytest.mark.parametrize("codec", ["zlib", "lzma"])
+    def test_codecs(self, tmp_path: Path, codec):
+        text = "compressible " * 100
+
+        with SQLiteTransformCache(tmp_path / "cache.sqlite3", codec=codec) as cache:
+            cache.set_cached_transform("h", "original", text)
+
+            assert cache.get_cached_transform("h") == text
+
+    def test_original_is_stored_only_in_debug_mode(self, tmp_path: Path):
+        with SQLiteTransformCache(tmp_path / "cache.sqlite3") as cache:
+            cache.set_cached_transform("h", "original", "transformed")
+            assert cache.get_original_content("h") is None
+
+        with SQLiteTransformCache(tmp_path / "debug.sqlite3", store_original=True) as cache:
+            cache.set_cached_transform("h", "original", "transformed")
+            assert cache.get_original_content("h") == "original"
+
+    def test_least_recently_used_entries_are_evicted(self, tmp_path: Path):
+        clock = FakeClock()
+        # Random contents: about 750 bytes each once compressed
+        with SQLiteTransformCache(tmp_path / "cache.sqlite3", max_bytes=2000, clock=clock) as cache:
+            for key in ("a", "b", "c"):
+                cache.set_cached_transform(key, key, base64.b64encode(random.Random(key).randbytes(750)).decode())
+                clock.now += 1
+            cache.get_cached_transform("a")
+
+            cache.save_cache()
+
+            assert cache.get_cached_transform("b") is None
+            assert cache.get_cached_transform("a") is not None
+            assert cache.get_cached_transform("c") is not None
+            assert cache.evicted == 1
+            assert cache.stored_bytes() <= 2000
+
+    def test_ttl(self, tmp_path: Path):
+        clock = FakeClock()
+        with SQLiteTransformCache(tmp_path / "cache.sqlite3", ttl_seconds=60, clock=clock) as cache:
+            cache.set_cached_transform("old", "o", "old transform")
+            clock.now += 50
+            cache.set_cached_transform("new", "n", "new transform")
+            clock.now += 20
+
+            assert cache.get_cached_transform("old") is None
+            assert cache.get_cached_transform("new") == "new transform"
+            cache.save_cache()
+            assert len(cache) == 1
+
+    def test_collect_garbage(self, tmp_path: Path):
+        with SQLiteTransformCache(tmp_path / "cache.sqlite3") as cache:
+            cache.set_cached_transform("live", "l", "live transform")
+            cache.set_cached_transform("deleted", "d", "deleted transform")
+
+            assert cache.collect_garbage({"live", "unknown"}) == 1
+            assert cache.get_cached_transform("live") == "live transform"
+            assert cache.get_cached_transform("deleted") is None
+            assert cache.stored_bytes() == len("live transform")
+
+    def test_collect_garbage_ignores_model_version(self, tmp_path: Path):
+        with SQLiteTransformCache(tmp_path / "cache.sqlite3") as cache:
+            cache.set_cached_transform("spec_section:model-a:p1:v1:hash1", "l", "a")
+            cache.set_cached_transform("spec_section:model-a:p1:v1:hash2", "d", "old")
+
+            assert cache.collect_garbage({"spec_section:model-b:p1:v1:hash1"}) == 1
+            assert cache.get_cached_transform("spec_section:model-a:p1:v1:hash1") == "a"
+            assert cache.get_cached_transform("spec_section:model-a:p1:v1:hash2") is None
+
+    def test_schema_1_is_upgraded(self, tmp_path: Path):
+        db_file = tmp_path / "cache.sqlite3"
+        connection = sqlite3.connect(db_file)
+        connection.execute(
+            "CREATE TABLE transforms (content_hash TEXT PRIMARY KEY, original_content TEXT NOT NULL, "
+            "transformed_content TEXT NOT NULL, timestamp TEXT NOT NULL)"
+        )
+        connection.execute("INSERT INTO transforms VALUES ('h', 'original', 'transformed', '2025-10-17T12:00:00')")
+        connection.execute("PRAGMA user_version=1")
+        connection.commit()
+        connection.close()
+
+        with SQLiteTransformCache(db_file) as cache:
+            assert cache.get_cached_transform("h") == "transformed"
+
+
+class TestMigrateJsonCache:
+    """Tests for migrate_json_cache()."""
+
+    def test_entries_are_imported(self, tmp_path: Path):
+        json_cache = LLMTransformCache(tmp_path / "llm-transforms.json")
+        json_cache.set_cached_transform("h1", "one", "1")
+        json_cache.set_cached_transform("h2", "two", "2")
+        json_cache.save_cache()
+
+        with SQLiteTransformCache(tmp_path / "llm-transforms.sqlite3") as cache:
+            cache.set_cached_transform("h2", "two", "newer")
+
+            assert migrate_json_cache(tmp_path / "llm-transforms.json", cache) == 1
+            assert cache.get_cached_transform("h1") == "1"
+            # Entries already in the database win
+            assert cache.get_cached_transform("h2") == "newer"
+        assert (tmp_path / "llm-transforms.json").exists()
+
+    def test_malformed_files(self, tmp_path: Path):
+        json_file = tmp_path / "llm-transforms.json"
+
+        with SQLiteTransformCache(tmp_path / "llm-transforms.sqlite3") as cache:
+            assert migrate_json_cache(json_file, cache) == 0
+            json_file.write_text("invalid json content")
+            assert migrate_json_cache(json_file, cache) == 0
+            json_file.write_text(json.dumps({"h1": {"original_content": "no result"}, "h2": "bad"}))
+            assert migrate_json_cache(json_file, cache) == 0
+            assert len(cache) == 0
+
+
+class TestEngineWithSQLiteCache:
+    """The transform engine runs on the SQLite backend unchanged."""
+
+    def test_second_run_is_served_from_cache(self, tmp_path: Path):
+        feature_dir = tmp_path / "specs" / "001-spec"
+        feature_dir.mkdir(parents=True)
+        shutil.copy(VALID_SPEC, feature_dir / "spec.md")
+        feature = Feature(
+            id="001",
+            name="spec",
+            directory_path=feature_dir,
+            spec_file=feature_dir / "spec.md",
+            status=FeatureStatus.DRAFT,
+        )
+        with SQLiteTransformCache(tmp_path / "llm-transforms.sqlite3") as cache:
+            run_transform_engine([feature], client=_async_client(), cache=cache)
+
+        client = _async_client()
+        with SQLiteTransformCache(tmp_path / "llm-transforms.sqlite3") as cache:
+            result = run_transform_engine([feature], client=client, cache=cache)
+
+        assert result["001-spec"]["spec_content"] == TRANSFORMED_SPEC
+        client.messages.create.assert_not_called()
@@ -0,0 +1,445 @@
+"""Unit tests for document chunking (doc_chunking.py) and map-reduce analysis of long documents."""
+
+import asyncio
+import json
+import threading
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from speckit_docs.utils.doc_chunking import iter_file_chunks, iter_markdown_chunks, read_head
+from speckit_docs.utils.llm_transform import (
+    SECTION_CLASSIFICATION_CONTENT_CHARS,
+    TARGET_AUDIENCE_CONTENT_CHARS,
+    map_chunks,
+    split_spec_extract,
+)
+from speckit_docs.utils.spec_extractor import SPEC_TOKEN_LIMIT
+
+PREREQUISITES_AND_SCOPE = """## 前提条件
+
+Python 3.11以上がインストールされ、データベースに接続できる環境が必要です。
+
+## スコープ境界
+
+**スコープ外**:
+- モバイルアプリからの利用は今回の対象外です
+"""
+
+
+def _lines(text: str) -> list[str]:
+    return text.splitlines(keepends=True)
+
+
+class TestReadHead:
+    """Tests for read_head()."""
+
+    def test_reads_prefix_only(self, tmp_path: Path):
+        path = tmp_path / "doc.md"
+        path.write_text("a" * 100, encoding="utf-8")
+
+        assert read_head(path, 10) == ("a" * 10, True)
+        assert read_head(path, 100) == ("a" * 100, False)
+
+    def test_missing_file(self, tmp_path: Path):
+        with pytest.raises(FileNotFoundError):
+            read_head(tmp_path / "missing.md", 10)
+
+
+class TestIterMarkdownChunks:
+    """Tests for iter_markdown_chunks()/iter_file_chunks()."""
+
+    def test_packs_sections_up_to_max_size(self):
+        text = "# A\n" + "a" * 20 + "\n## B\n" + "b" * 20 + "\n## C\n" + "c" * 20 + "\n"
+
+        chunks = list(iter_markdown_chunks(_lines(text), 60))
+
+        assert "".join(chunks) == text
+        assert [c.splitlines()[0] for c in chunks] == ["# A", "## C"]
+        assert all(len(c) <= 60 for c in chunks)
+
+    def test_headings_in_code_fences_are_not_boundaries(self):
+        text = "## A\n```\n# not a heading\n```\n" + "x" * 30 + "\n## B\nb\n"
+
+        chunks = list(iter_markdown_chunks(_lines(text), 60))
+
+        assert chunks[0].startswith("## A") and "# not a heading" in chunks[0]
+        assert chunks[1] == "## B\nb\n"
+
+    def test_oversized_section_splits_at_paragraphs(self):
+        paragraphs = ["p" * 30, "q" * 30, "r" * 30]
+        text = "## Big\n" + "\n\n".join(paragraphs) + "\n"
+
+        chunks = list(iter_markdown_chunks(_lines(text), 40))
+
+        assert "".join(chunks) == text
+        assert all(len(c) <= 40 for c in chunks)
+        assert len(chunks) == 3
+
+    def test_oversized_line_splits_at_characters(self):
+        chunks = list(iter_markdown_chunks(["x" * 25], 10))
+
+        assert chunks == ["x" * 10, "x" * 10, "x" * 5]
+
+    def test_custom_size(self):
+        text = "## A\none two three\n## B\nfour five\n"
+
+        chunks = list(iter_markdown_chunks(_lines(text), 5, size=lambda t: len(t.split())))
+
+        assert chunks == ["## A\none two three\n", "## B\nfour five\n"]
+
+    def test_invalid_max_size(self):
+        with pytest.raises(ValueError, match="max_size"):
+            list(iter_markdown_chunks(["a"], 0))
+
+    def test_file_chunks(self, tmp_path: Path):
+        path = tmp_path / "doc.md"
+        text = "".join(f"## S{i}\n{'x' * 50}\n\n" for i in range(10))
+        path.write_text(text, encoding="utf-8")
+
+        chunks = list(iter_file_chunks(path, 130))
+
+        assert "".join(chunks) == text
+        assert len(chunks) == 5
+
+    def test_split_spec_extract_by_tokens(self):
+        story = "### ストーリー\n" + "ユーザーはログインできます。" * 200 + "\n"
+        extract = "## ユーザーストーリーの目的\n" + story * 4
+
+        chunks = split_spec_extract(extract, token_limit=SPEC_TOKEN_LIMIT // 2)
+
+        assert "".join(chunks) == extract
+        assert len(chunks) > 1
+        assert all(c.lstrip().startswith("##") for c in chunks)
+
+
+class TestMapChunks:
+    """Tests for map_chunks()."""
+
+    def test_results_in_chunk_order_with_bounded_concurrency(self):
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def _work(n: int) -> int:
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            threading.Event().wait(0.005)
+            with lock:
+                active -= 1
+            return n * n
+
+        assert map_chunks(_work, iter(range(10)), max_workers=3) == [n * n for n in range(10)]
+        assert peak <= 3
+
+    def test_failure_stops_reading_chunks(self):
+        pulled: list[int] = []
+
+        def _chunks() -> Any:
+            for n in range(100):
+                pulled.append(n)
+                yield n
+
+        def _work(n: int) -> int:
+            if n == 0:
+                raise ValueError("boom")
+            threading.Event().wait(0.01)
+            return n
+
+        with pytest.raises(ValueError, match="boom"):
+            map_chunks(_work, _chunks(), max_workers=2)
+        assert len(pulled) < 100
+
+
+def _response(payload: dict[str, Any] | str) -> MagicMock:
+    response = MagicMock()
+    text = payload if isinstance(payload, str) else json.dumps(payload)
+    response.content = [MagicMock(text=text)]
+    return response
+
+
+def _user_text(kwargs: dict[str, Any]) -> str:
+    return str(kwargs["messages"][0]["content"])
+
+
+class TestTargetAudienceMapReduce:
+    """Long documents are analysed chunk by chunk instead of truncated."""
+
+    @pytest.fixture
+    def long_doc(self, tmp_path: Path) -> Path:
+        path = tmp_path / "README.md"
+        path.write_text(
+            "## Install\n" + "pip install foo\n" * 600 + "## API\n" + "def foo(): pass\n" * 400,
+            encoding="utf-8",
+        )
+        assert path.stat().st_size > TARGET_AUDIENCE_CONTENT_CHARS
+        return path
+
+    def test_short_document_single_call(self, tmp_path: Path):
+        from speckit_docs.utils.llm_transform import detect_target_audience
+
+        path = tmp_path / "README.md"
+        path.write_text("## Usage\nRun it.\n", encoding="utf-8")
+        client = MagicMock()
+        client.messages.create.return_value = _response({"audience_type": "end_user", "confidence": 0.8})
+
+        result = detect_target_audience(path, client=client)
+
+        assert result.audience_type == "end_user"
+        assert client.messages.create.call_count == 1
+
+    def test_disagreeing_chunks_are_merged(self, long_doc: Path):
+        from speckit_docs.utils.llm_transform import (
+            TARGET_AUDIENCE_MERGE_PROMPT,
+            detect_target_audience,
+        )
+
+        merge_requests: list[str] = []
+
+        def create(**kwargs: Any) -> MagicMock:
+            if kwargs["system"][0]["text"] == TARGET_AUDIENCE_MERGE_PROMPT.strip():
+                merge_requests.append(_user_text(kwargs))
+                return _response({"audience_type": "both", "confidence": 0.7, "reasoning": "mixed"})
+            audience = "developer" if "def foo" in _user_text(kwargs) else "end_user"
+            return _response({"audience_type": audience, "confidence": 0.9})
+
+        client = MagicMock()
+        client.messages.create.side_effect = create
+
+        result = detect_target_audience(long_doc, client=client)
+
+        assert result.audience_type == "both"
+        assert len(merge_requests) == 1
+        assert '"developer"' in merge_requests[0] and '"end_user"' in merge_requests[0]
+        # Every chunk request fits the single-call limit
+        chunk_calls = client.messages.create.call_count - 1
+        assert chunk_calls >= 2
+
+    def test_unanimous_chunks_skip_merge_call(self, long_doc: Path):
+        from speckit_docs.utils.llm_engine import detect_target_audience_async
+
+        calls = 0
+
+        async def create(**kwargs: Any) -> MagicMock:
+            nonlocal calls
+            calls += 1
+            return _response({"audience_type": "developer", "confidence": 0.6 + 0.01 * calls})
+
+        client = MagicMock()
+        client.messages.create = create
+
+        result = asyncio.run(detect_target_audience_async(long_doc, client))
+
+        assert result.audience_type == "developer"
+        assert result.confidence == pytest.approx(0.61)
+        assert calls >= 2
+
+    def test_map_reduce_disabled_truncates(self, long_doc: Path):
+        from speckit_docs.utils.llm_transform import detect_target_audience
+
+        client = MagicMock()
+        client.messages.create.return_value = _response({"audience_type": "end_user"})
+
+        detect_target_audience(long_doc, client=client, map_reduce=False)
+
+        assert client.messages.create.call_count == 1
+        assert "def foo" not in _user_text(client.messages.create.call_args.kwargs)
+
+
+class TestClassifySectionMapReduce:
+    """Long section bodies are classified chunk by chunk."""
+
+    def test_long_section_is_merged(self, tmp_path: Path):
+        from speckit_docs.utils.llm_transform import (
+            SECTION_CLASSIFICATION_MERGE_PROMPT,
+            classify_section,
+        )
+
+        content = "Click the button.\n\n" * 300 + "```python\nimport foo\n```\n\n" * 150
+        assert len(content) > SECTION_CLASSIFICATION_CONTENT_CHARS
+
+        def create(**kwargs: Any) -> MagicMock:
+            if kwargs["system"][0]["text"] == SECTION_CLASSIFICATION_MERGE_PROMPT.strip():
+                assert "## Guide" in _user_text(kwargs)
+                return _response({"section_type": "both", "confidence": 0.75})
+            section_type = "developer" if "import foo" in _user_text(kwargs) else "end_user"
+            return _response({"section_type": section_type, "confidence": 0.9})
+
+        client = MagicMock()
+        client.messages.create.side_effect = create
+
+        result = classify_section(tmp_path / "README.md", "## Guide", content, client=client)
+
+        assert (result.heading, result.section_type, result.confidence) == ("## Guide", "both", 0.75)
+
+
+class TestSpecTransformMapReduce:
+    """spec.md extracts over SPEC_TOKEN_LIMIT tokens are transformed in chunks."""
+
+    @staticmethod
+    def _big_feature(tmp_path: Path) -> Any:
+        from speckit_docs.models import Feature, FeatureStatus
+
+        feature_dir = tmp_path / "specs" / "001-big"
+        feature_dir.mkdir(parents=True)
+        stories = "".join(
+            f"### ユーザーストーリー{i}: 機能{i} (優先度: P1)\n\n**目的**: "
+            + "大量のデータを処理して結果を利用者に分かりやすく表示します。" * 150
+            + "\n\n"
+            for i in range(1, 9)
+        )
+        (feature_dir / "spec.md").write_text(
+            "# 大きな機能\n\n## ユーザーストーリー\n\n" + stories
+            + PREREQUISITES_AND_SCOPE,
+            encoding="utf-8",
+        )
+        return Feature(
+            id="001",
+            name="big",
+            directory_path=feature_dir,
+            spec_file=feature_dir / "spec.md",
+            status=FeatureStatus.DRAFT,
+        )
+
+    def test_engine_transforms_oversized_spec(self, tmp_path: Path):
+        from speckit_docs.utils.llm_engine import AsyncTransformEngine
+        from speckit_docs.utils.llm_transform import SPEC_MERGE_PROMPT
+
+        transform_inputs: list[str] = []
+        merge_calls: list[dict[str, Any]] = []
+
+        async def create(**kwargs: Any) -> MagicMock:
+            if kwargs["system"][0]["text"] == SPEC_MERGE_PROMPT.strip():
+                merge_calls.append(kwargs)
+                return _response({"transitions": [{"boundary": 1, "text": "# 見出し\n続いて次の機能を説明します。"}]})
+            transform_inputs.append(_user_text(kwargs))
+            return _response(f"## 部分{len(transform_inputs)}\n\n" + "この部分の機能をエンドユーザー向けに説明します。" * 2)
+
+        client = MagicMock()
+        client.messages.create = create
+
+        content = asyncio.run(AsyncTransformEngine(client=client).transform_feature(self._big_feature(tmp_path)))
+
+        parts = len(transform_inputs)
+        assert parts >= 2
+        # Every part is kept, in order, with the transition after part 1
+        assert content.startswith("## 部分1")
+        positions = [content.index(f"## 部分{n}\n") for n in range(1, parts + 1)]
+        assert positions == sorted(positions)
+        assert content.index("続いて次の機能を説明します。") < positions[1]
+        assert "# 見出し" not in content
+        [merge] = merge_calls
+        assert '<boundary index="1">' in _user_text(merge)
+        assert f'<boundary index="{parts - 1}">' in _user_text(merge)
+        assert merge["max_tokens"] == min(4096, 256 * (parts - 1))
+        assert merge["tool_choice"] == {"type": "tool", "name": "record_transitions"}
+
+    def test_truncated_merge_keeps_every_part(self, tmp_path: Path):
+        from speckit_docs.utils.llm_engine import AsyncTransformEngine
+        from speckit_docs.utils.llm_transform import SPEC_MERGE_PROMPT
+
+        transform_inputs: list[str] = []
+
+        async def create(**kwargs: Any) -> MagicMock:
+            if kwargs["system"][0]["text"] == SPEC_MERGE_PROMPT.strip():
+                response = _response('{"transitions": [{"boundary": 1, "text": "途中')
+                response.stop_reason = "max_tokens"
+                return response
+            transform_inputs.append(_user_text(kwargs))
+            return _response(f"## 部分{len(transform_inputs)}\n\n" + "この部分の機能をエンドユーザー向けに説明します。" * 2)
+
+        client = MagicMock()
+        client.messages.create = create
+
+        content = asyncio.run(AsyncTransformEngine(client=client).transform_feature(self._big_feature(tmp_path)))
+
+        last = len(transform_inputs)
+        assert last >= 2
+        assert content.rstrip().endswith("この部分の機能をエンドユーザー向けに説明します。")
+        assert f"## 部分{last}\n" in content
+        assert "途中" not in content
+
+    def test_sync_map_reduce_keeps_last_part(self):
+        from speckit_docs.utils.llm_transform import (
+            SPEC_MERGE_PROMPT,
+            transform_spec_content_map_reduce,
+        )
+
+        spec_content = "".join(
+            f"## ユーザーストーリー{i}\n\n" + "大量のデータを処理して結果を表示します。" * 300 + "\n\n"
+            for i in range(1, 4)
+        )
+        chunks = split_spec_extract(spec_content)
+        assert len(chunks) >= 2
+
+        def create(**kwargs: Any) -> MagicMock:
+            if kwargs["system"][0]["text"] == SPEC_MERGE_PROMPT.strip():
+                return _response("not json")
+            text = _user_text(kwargs)
+            first = text.split("## ", 1)[1].split("\n", 1)[0]
+            return _response(f"## {first}\n\n" + "この部分の機能をエンドユーザー向けに説明します。" * 2)
+
+        client = MagicMock()
+        client.messages.create.side_effect = create
+
+        result = transform_spec_content_map_reduce(spec_content, client)
+
+        last_heading = chunks[-1].split("## ", 1)[1].split("\n", 1)[0]
+        assert f"## {last_heading}" in result.transformed_content
+        assert result.transformed_content.startswith("## ユーザーストーリー1")
+
+    def test_truncated_chunk_is_rejected(self, tmp_path: Path):
+        from speckit_docs.exceptions import SpecKitDocsError
+        from speckit_docs.utils.llm_engine import AsyncTransformEngine
+
+        async def create(**kwargs: Any) -> MagicMock:
+            response = _response("## 部分\n\n" + "この部分の機能をエンドユーザー向けに説明します。" * 2)
+            response.stop_reason = "max_tokens"
+            return response
+
+        client = MagicMock()
+        client.messages.create = create
+
+        with pytest.raises(SpecKitDocsError) as exc_info:
+            asyncio.run(AsyncTransformEngine(client=client).transform_feature(self._big_feature(tmp_path)))
+        assert exc_info.value.error_type == "LLM Transform Quality Error"
+
+    def test_join_drops_heading_repeated_across_parts(self):
+        from speckit_docs.utils.llm_transform import join_spec_parts
+
+        parts = ["## 使い方\n\n手順1", "## 使い方\n\n手順2\n\n## 制限\n\n制限事項", "## 制限\n\n続き"]
+
+        joined = join_spec_parts(parts, {2: "補足です。", 3: "範囲外"})
+
+        assert joined == "## 使い方\n\n手順1\n\n手順2\n\n## 制限\n\n制限事項\n\n補足です。\n\n続き"
+
+    def test_engine_without_map_reduce_keeps_token_limit(self, tmp_path: Path):
+        from speckit_docs.exceptions import SpecKitDocsError
+        from speckit_docs.models import Feature, FeatureStatus
+        from speckit_docs.utils.llm_engine import AsyncTransformEngine
+
+        feature_dir = tmp_path / "specs" / "001-big"
+        feature_dir.mkdir(parents=True)
+        (feature_dir / "spec.md").write_text(
+            "# 機能\n\n## ユーザーストーリー\n\n### ユーザーストーリー1: 処理 (優先度: P1)\n\n**目的**: "
+            + "詳細な説明が続きます。" * 3000
+            + "\n\n"
+            + PREREQUISITES_AND_SCOPE,
+            encoding="utf-8",
+        )
+        feature = Feature(
+            id="001",
+            name="big",
+            directory_path=feature_dir,
+            spec_file=feature_dir / "spec.md",
+            status=FeatureStatus.DRAFT,
+        )
+        engine = AsyncTransformEngine(client=MagicMock(), map_reduce=False)
+
+        with pytest.raises(SpecKitDocsError) as exc_info:
+            asyncio.run(engine.transform_feature(feature))
+        assert exc_info.value.error_type == "Token Limit Exceeded"
@@ -0,0 +1,318 @@
+"""Unit tests for the concurrent LLM transform engine (llm_engine.py)."""
+
+import asyncio
+import shutil
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from speckit_docs.exceptions import SpecKitDocsError
+from speckit_docs.models import Feature, FeatureStatus
+from speckit_docs.utils.cache import LLMTransformCache
+from speckit_docs.utils.llm_engine import (
+    AsyncTransformEngine,
+    referenced_cache_keys,
+    run_transform_engine,
+)
+
+VALID_SPEC = Path(__file__).parents[2] / "fixtures" / "sample_specs" / "valid_spec.md"
+
+TRANSFORMED_SPEC = (
+    "## ユーザーストーリーの目的\n\n"
+    "この機能を使うと、コマンドを一つ実行するだけでプロジェクトのドキュメントを簡単に作成できます。"
+)
+
+
+def _response(text: str) -> MagicMock:
+    response = MagicMock()
+    response.content = [MagicMock(text=text)]
+    return response
+
+
+def _mock_create(**kwargs: Any) -> MagicMock:
+    content = kwargs["messages"][0]["content"]
+    if "README.md content:" in content:
+        return _response('{"is_consistent": true, "inconsistencies": [], "summary": "Consistent."}')
+    if "Sections from README.md" in content:
+        return _response(
+            '{"prioritized_sections": [{"file": "README.md", "heading": "Overview", "priority": 1, "reason": "Intro"}]}'
+        )
+    return _response(TRANSFORMED_SPEC)
+
+
+def _async_client(side_effect: Any = None) -> MagicMock:
+    client = MagicMock()
+    client.messages.create = AsyncMock(side_effect=side_effect or _mock_create)
+    return client
+
+
+def _feature(specs_dir: Path, dir_name: str, files: dict[str, str] | None = None) -> Feature:
+    feature_dir = specs_dir / dir_name
+    feature_dir.mkdir(parents=True)
+    shutil.copy(VALID_SPEC, feature_dir / "spec.md")
+    for name, content in (files or {}).items():
+        (feature_dir / name).write_text(content)
+    feature_id, name = dir_name.split("-", 1)
+    return Feature(
+        id=feature_id,
+        name=name,
+        directory_path=feature_dir,
+        spec_file=feature_dir / "spec.md",
+        status=FeatureStatus.DRAFT,
+    )
+
+
+class TestAsyncTransformEngine:
+    """Tests for AsyncTransformEngine."""
+
+    def test_readme_only_is_passed_through(self, tmp_path: Path):
+        """README.md alone is used as-is without any LLM call."""
+        client = _async_client()
+        feature = _feature(tmp_path, "001-readme", {"README.md": "# Readme\n\nHello"})
+
+        result = run_transform_engine([feature], client=client)
+
+        assert result == {"001-readme": {"spec_content": "# Readme\n\nHello"}}
+        client.messages.create.assert_not_called()
+
+    def test_readme_and_quickstart_are_integrated(self, tmp_path: Path):
+        """README.md + QUICKSTART.md run inconsistency detection then prioritization."""
+        client = _async_client()
+        feature = _feature(
+            tmp_path,
+            "001-both",
+            {
+                "README.md": "# Project\n\n## Overview\n\nA Python project.",
+                "QUICKSTART.md": "# Quick\n\n## Install\n\npip install project",
+            },
+        )
+
+        result = run_transform_engine([feature], client=client)
+
+        assert result["001-both"]["spec_content"].startswith("## Overview\n\nA Python project.")
+        assert client.messages.create.await_count == 2
+
+    def test_spec_is_transformed(self, tmp_path: Path):
+        """spec.md minimal extraction is sent to the LLM for end-user rewriting."""
+        client = _async_client()
+        feature = _feature(tmp_path, "001-spec")
+
+        result = run_transform_engine([feature], client=client)
+
+        assert result["001-spec"]["spec_content"] == TRANSFORMED_SPEC
+        sent = client.messages.create.call_args.kwargs["messages"][0]["content"]
+        assert "ユーザーストーリーの目的" in sent
+
+    def test_concurrency_is_bounded(self, tmp_path: Path):
+        """No more than max_concurrency features are in flight at once."""
+        in_flight = 0
+        max_in_flight = 0
+
+        async def slow_create(**kwargs: Any) -> MagicMock:
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return _mock_create(**kwargs)
+
+        client = _async_client(slow_create)
+        features = [_feature(tmp_path, f"{i:03d}-spec") for i in range(1, 11)]
+
+        result = run_transform_engine(features, max_concurrency=3, client=client)
+
+        assert list(result) == [f"{i:03d}-spec" for i in range(1, 11)]
+        assert max_in_flight == 3
+
+    def test_cache_hit_skips_llm(self, tmp_path: Path):
+        """Cached transforms are reused and fresh transforms are stored."""
+        cache = LLMTransformCache(tmp_path / "cache.json")
+        features = [_feature(tmp_path / "specs", "001-spec")]
+
+        first_client = _async_client()
+        run_transform_engine(features, client=first_client, cache=cache)
+        assert first_client.messages.create.await_count == 1
+
+        second_client = _async_client()
+        result = run_transform_engine(features, client=second_client, cache=cache)
+
+        assert result["001-spec"]["spec_content"] == TRANSFORMED_SPEC
+        second_client.messages.create.assert_not_called()
+
+    def test_failure_is_raised(self, tmp_path: Path):
+        """The first failing feature aborts the run with SpecKitDocsError."""
+        client = _async_client()
+        features = [
+            _feature(tmp_path, "001-spec"),
+            _feature(tmp_path, "002-empty"),
+        ]
+        (features[1].directory_path / "spec.md").write_text("# Empty spec\n")
+
+        with pytest.raises(SpecKitDocsError):
+            run_transform_engine(features, client=client)
+
+    def test_referenced_cache_keys(self, tmp_path: Path):
+        """Garbage collection keeps exactly the entries a run looks up or stores."""
+        cache = LLMTransformCache(tmp_path / "cache.json")
+        features = [
+            _feature(tmp_path / "specs", "001-spec"),
+            _feature(
+                tmp_path / "specs",
+                "002-both",
+                {
+                    "README.md": "# Project\n\n## Overview\n\nA Python project.",
+                    "QUICKSTART.md": "# Quick\n\n## Install\n\npip install project",
+                },
+            ),
+            _feature(tmp_path / "specs", "003-readme", {"README.md": "# Readme"}),
+        ]
+        run_transform_engine(features, client=_async_client(), cache=cache)
+        cache.set_cached_transform("deleted-feature", "Deleted", "Transformed deleted")
+
+        keys = referenced_cache_keys(features)
+
+        assert set(cache._cache) - keys == {"deleted-feature"}
+        assert any(key.startswith("spec_section:") for key in keys)
+        assert cache.collect_garbage(keys) == 1
+
+    def test_model_override_run_keeps_default_entries(self, tmp_path: Path):
+        """Garbage collection after a run with another model drops no entry of the default model."""
+        from speckit_docs.utils.llm_routing import get_model_routing, set_model_routing
+
+        cache = LLMTransformCache(tmp_path / "cache.json")
+        features = [_feature(tmp_path / "specs", "001-spec")]
+        run_transform_engine(features, client=_async_client(), cache=cache)
+        default_keys = set(cache._cache)
+
+        previous = set_model_routing(get_model_routing().with_overrides({"transform": "claude-other"}))
+        try:
+            run_transform_engine(features, client=_async_client(), cache=cache)
+            keys = referenced_cache_keys(features)
+        finally:
+            set_model_routing(previous)
+
+        assert keys.isdisjoint(default_keys)
+        assert cache.collect_garbage(keys) == 0
+        assert default_keys <= set(cache._cache)
+
+    def test_invalid_concurrency(self):
+        """max_concurrency must be at least 1."""
+        with pytest.raises(ValueError, match="max_concurrency"):
+            AsyncTransformEngine(client=_async_client(), max_concurrency=0)
+
+
+class TestClassifySectionsAsync:
+    """Tests for classify_sections_async()."""
+
+    def test_batches_are_classified_concurrently(self):
+        """Each planned batch becomes one request; results keep input order."""
+        from speckit_docs.llm_entities import LLMSection
+        from speckit_docs.utils.llm_engine import classify_sections_async
+
+        readme = Path("README.md")
+        sections = [
+            (readme, LLMSection(file="README.md", heading=f"## S{i}", level="h2", content="x" * 4000, token_count=1000))
+            for i in range(6)
+        ]
+
+        async def create(**kwargs: Any) -> MagicMock:
+            import json
+
+            payload = kwargs["messages"][0]["content"].split("**Sections (JSON list):**\n", 1)[1]
+            items = json.loads(payload.split("\n\n", 1)[0])
+            return _response(
+                json.dumps({"classifications": [{"index": item["index"], "section_type": "end_user"} for item in items]})
+            )
+
+        client = _async_client(create)
+        results = asyncio.run(classify_sections_async(sections, client, token_budget=2500))
+
+        assert client.messages.create.await_count > 1
+        assert [r.heading for r in results] == [f"## S{i}" for i in range(6)]
+
+
+class TestSpeculativeIntegration:
+    """Prioritization runs in parallel with inconsistency detection (speculative=True)."""
+
+    README = "# Project\n\n## Overview\n\nA CLI tool."
+    QUICKSTART = "# Quickstart\n\n## Install\n\npip install tool"
+
+    def _files(self, tmp_path: Path) -> tuple[Path, Path]:
+        readme = tmp_path / "README.md"
+        quickstart = tmp_path / "QUICKSTART.md"
+        readme.write_text(self.README)
+        quickstart.write_text(self.QUICKSTART)
+        return readme, quickstart
+
+    def test_async_calls_overlap(self, tmp_path: Path):
+        from speckit_docs.utils.llm_engine import integrate_readme_quickstart_async
+
+        events: list[str] = []
+
+        async def create(**kwargs: Any) -> MagicMock:
+            kind = "inconsistency" if "README.md content:" in kwargs["messages"][0]["content"] else "priority"
+            events.append(f"start {kind}")
+            await asyncio.sleep(0.01)
+            events.append(f"end {kind}")
+            return _mock_create(**kwargs)
+
+        readme, quickstart = self._files(tmp_path)
+
+        result = asyncio.run(
+            integrate_readme_quickstart_async(readme, quickstart, _async_client(create), speculative=True)
+        )
+
+        assert sorted(events[:2]) == ["start inconsistency", "start priority"]
+        assert result.section_priority_result is not None
+
+    def test_async_inconsistent_cancels_prioritization(self, tmp_path: Path):
+        from speckit_docs.utils.llm_engine import integrate_readme_quickstart_async
+
+        priority_cancelled = asyncio.Event()
+
+        async def create(**kwargs: Any) -> MagicMock:
+            if "README.md content:" in kwargs["messages"][0]["content"]:
+                await asyncio.sleep(0.01)
+                return _response(
+                    '{"is_consistent": false, "inconsistencies": [{"type": "purpose", '
+                    '"readme_claim": "CLI", "quickstart_claim": "Web", "severity": "critical"}], "summary": "Differs"}'
+                )
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                priority_cancelled.set()
+                raise
+            raise AssertionError("prioritization should have been cancelled")
+
+        async def _run() -> None:
+            readme, quickstart = self._files(tmp_path)
+            with pytest.raises(SpecKitDocsError, match="Inconsistency detected"):
+                await integrate_readme_quickstart_async(
+                    readme, quickstart, _async_client(create), speculative=True
+                )
+            await asyncio.wait_for(priority_cancelled.wait(), timeout=1)
+
+        asyncio.run(_run())
+
+    def test_sync_speculative_integration(self, tmp_path: Path):
+        import threading
+
+        from speckit_docs.utils.llm_transform import integrate_readme_quickstart
+
+        both_started = threading.Barrier(2, timeout=5)
+
+        def create(**kwargs: Any) -> MagicMock:
+            # Both requests must be in flight at the same time to pass the barrier
+            both_started.wait()
+            return _mock_create(**kwargs)
+
+        client = MagicMock()
+        client.messages.create.side_effect = create
+        readme, quickstart = self._files(tmp_path)
+
+        result = integrate_readme_quickstart(readme, quickstart, client, speculative=True)
+
+        assert client.messages.create.call_count == 2
+        assert result.transform_type == "section_priority"
@@ -0,0 +1,184 @@
+"""Unit tests for memoization of LLM analysis calls (llm_memo.py)."""
+
+import asyncio
+import json
+from collections.abc import Generator
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from speckit_docs.llm_entities import LLMSection
+from speckit_docs.utils.llm_memo import LLMCallMemo, memo_key, set_llm_memo
+from speckit_docs.utils.llm_usage import usage_recorder
+
+CONSISTENT = '{"is_consistent": true, "inconsistencies": [], "summary": "OK"}'
+
+
+def _client(text: str) -> MagicMock:
+    response = MagicMock()
+    response.content = [MagicMock(text=text)]
+    client = MagicMock()
+    client.messages.create.return_value = response
+    return client
+
+
+@pytest.fixture
+def memo() -> Generator[LLMCallMemo, None, None]:
+    memo = LLMCallMemo()
+    previous = set_llm_memo(memo)
+    usage_recorder.reset()
+    yield memo
+    set_llm_memo(previous)
+    usage_recorder.reset()
+
+
+class TestMemoKey:
+    """Tests for memo_key()."""
+
+    def test_key_components(self):
+        from speckit_docs.utils.llm_transform import build_inconsistency_request
+
+        params = build_inconsistency_request("# A", "# B")
+
+        call_type, version, model, input_hash = memo_key("inconsistency", params).split(":")
+
+        assert call_type == "inconsistency"
+        assert model == params["model"]
+        assert memo_key("inconsistency", build_inconsistency_request("# A", "# B")).endswith(input_hash)
+        assert not memo_key("inconsistency", build_inconsistency_request("# A", "# C")).endswith(input_hash)
+        assert memo_key("inconsistency", {**params, "model": "other"}) != memo_key("inconsistency", params)
+        edited = {**params, "system": [{"type": "text", "text": "new prompt"}]}
+        assert memo_key("inconsistency", edited).split(":")[1] != version
+
+
+class TestLLMCallMemo:
+    """Tests for LLMCallMemo."""
+
+    def test_put_get_and_stats(self):
+        memo = LLMCallMemo()
+        params = {"model": "m", "messages": [{"role": "user", "content": "x"}]}
+
+        assert memo.get("classify", params) is None
+        memo.put("classify", params, '{"section_type": "both"}')
+
+        assert memo.get("classify", params) == '{"section_type": "both"}'
+        assert (memo.hits, memo.misses) == (1, 1)
+
+    def test_invalid_json_and_transform_are_not_memoized(self):
+        memo = LLMCallMemo()
+        params = {"model": "m", "messages": []}
+
+        memo.put("classify", params, "Sorry, I cannot help")
+        memo.put("transform", params, '{"x": 1}')
+
+        assert len(memo) == 0
+        assert memo.get("transform", params) is None
+
+    def test_persistence(self, tmp_path: Path):
+        cache_file = tmp_path / ".cache" / "llm-analysis.json"
+        params = {"model": "m", "messages": []}
+        memo = LLMCallMemo(cache_file)
+        memo.put("priority", params, '{"prioritized_sections": []}')
+        memo.save()
+
+        reloaded = LLMCallMemo(cache_file)
+        reloaded.load()
+
+        assert reloaded.get("priority", params) == '{"prioritized_sections": []}'
+
+    def test_outdated_or_corrupted_file_is_ignored(self, tmp_path: Path):
+        cache_file = tmp_path / "llm-analysis.json"
+        cache_file.write_text(json.dumps({"version": 0, "entries": {"k": {}}}))
+        memo = LLMCallMemo(cache_file)
+        memo.load()
+        assert len(memo) == 0
+
+        cache_file.write_text("{not json")
+        memo.load()
+        assert len(memo) == 0
+
+
+class TestMemoizedAnalysisCalls:
+    """Unchanged inputs never reach the API once memoized."""
+
+    def test_detect_inconsistency(self, memo: LLMCallMemo):
+        from speckit_docs.utils.llm_transform import detect_inconsistency
+
+        client = _client(CONSISTENT)
+
+        first = detect_inconsistency("# A", "# B", client)
+        second = detect_inconsistency("# A", "# B", client)
+        detect_inconsistency("# A", "# changed", client)
+
+        assert first == second
+        assert client.messages.create.call_count == 2
+        assert memo.hits == 1
+        # Memo hits are not API calls and record no usage
+        assert len(usage_recorder.records()) == 2
+
+    def test_classify_and_audience(self, memo: LLMCallMemo, tmp_path: Path):
+        from speckit_docs.utils.llm_transform import classify_section, detect_target_audience
+
+        readme = tmp_path / "README.md"
+        readme.write_text("# Project\n\nUsage guide")
+        classify_client = _client('{"section_type": "end_user", "confidence": 0.9}')
+        audience_client = _client('{"audience_type": "end_user", "confidence": 0.9}')
+
+        for _ in range(3):
+            classification = classify_section(readme, "## Usage", "Run it", client=classify_client)
+            audience = detect_target_audience(readme, client=audience_client)
+
+        assert classification.section_type == "end_user"
+        assert audience.audience_type == "end_user"
+        assert classify_client.messages.create.call_count == 1
+        assert audience_client.messages.create.call_count == 1
+
+    def test_prioritize_sections_streamed_replay(self, memo: LLMCallMemo):
+        from speckit_docs.utils.llm_transform import prioritize_sections
+
+        sections = [
+            LLMSection(file="README.md", heading="## Overview", level="h2", content="x", token_count=10)
+        ]
+        client = _client(
+            '{"prioritized_sections": [{"file": "README.md", "heading": "## Overview", "priority": 1, "reason": "Intro"}]}'
+        )
+        prioritize_sections(sections, client)
+        received = []
+
+        # The memoized response is replayed through the stream handlers
+        result = prioritize_sections(sections, client, stream=True, on_section=received.append)
+
+        assert client.messages.create.call_count == 1
+        client.messages.stream.assert_not_called()
+        assert [ps.section.heading for ps in received] == ["## Overview"]
+        assert result.included_sections == 1
+
+    def test_async_variant(self, memo: LLMCallMemo):
+        from speckit_docs.utils.llm_engine import detect_inconsistency_async
+
+        response = MagicMock()
+        response.content = [MagicMock(text=CONSISTENT)]
+        client = MagicMock()
+        client.messages.create = AsyncMock(return_value=response)
+
+        async def _run() -> None:
+            await detect_inconsistency_async("# A", "# B", client)
+            await detect_inconsistency_async("# A", "# B", client)
+
+        asyncio.run(_run())
+
+        assert client.messages.create.await_count == 1
+
+    def test_disabled_by_default(self):
+        from speckit_docs.utils.llm_transform import detect_inconsistency
+
+        previous = set_llm_memo(None)
+        try:
+            client = _client(CONSISTENT)
+            detect_inconsistency("# A", "# B", client)
+            detect_inconsistency("# A", "# B", client)
+        finally:
+            set_llm_memo(previous)
+
+        assert client.messages.create.call_count == 2
@@ -0,0 +1,209 @@
+"""Unit tests for adaptive (AIMD) LLM concurrency control (llm_ratelimit.py)."""
+
+import asyncio
+import threading
+from collections.abc import Generator
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+from anthropic import RateLimitError
+
+from speckit_docs.utils.llm_ratelimit import (
+    AdaptiveRateLimiter,
+    RateLimitState,
+    set_rate_limiter,
+)
+from speckit_docs.utils.llm_resilience import ResilientCaller, set_resilient_caller
+
+NOW = datetime(2025, 10, 18, 12, 0, 0, tzinfo=UTC)
+
+
+def _headers(dimension: str, remaining: int, reset_in: float) -> dict[str, str]:
+    reset = (NOW + timedelta(seconds=reset_in)).isoformat().replace("+00:00", "Z")
+    return {
+        f"anthropic-ratelimit-{dimension}-remaining": str(remaining),
+        f"anthropic-ratelimit-{dimension}-reset": reset,
+    }
+
+
+def _rate_limit_error() -> RateLimitError:
+    request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+    return RateLimitError("429", response=httpx.Response(429, request=request), body=None)
+
+
+class TestAIMD:
+    """Additive increase / multiplicative decrease of the concurrency limit."""
+
+    def test_additive_increase(self):
+        limiter = AdaptiveRateLimiter(initial_limit=2, max_limit=4)
+
+        limiter.on_success()
+        assert limiter.limit == 2  # +1/limit per success
+
+        for _ in range(2):
+            limiter.on_success()
+        assert limiter.limit == 3
+
+        for _ in range(20):
+            limiter.on_success()
+        assert limiter.limit == 4  # capped at max_limit
+
+    def test_multiplicative_decrease(self):
+        now = [0.0]
+        limiter = AdaptiveRateLimiter(initial_limit=8, max_limit=8, clock=lambda: now[0])
+
+        limiter.on_rate_limited()
+        assert limiter.limit == 4
+
+        limiter.on_rate_limited()  # same burst of 429s
+        assert limiter.limit == 4
+
+        now[0] = 2.0
+        limiter.on_rate_limited()
+        assert limiter.limit == 2
+        assert limiter.rate_limited == 3
+
+    def test_limit_never_below_min(self):
+        now = [0.0]
+        limiter = AdaptiveRateLimiter(initial_limit=2, min_limit=1, clock=lambda: now[0])
+        for i in range(5):
+            now[0] = float(i * 10)
+            limiter.on_rate_limited()
+
+        assert limiter.limit == 1
+
+    def test_invalid_limits(self):
+        with pytest.raises(ValueError):
+            AdaptiveRateLimiter(initial_limit=10, max_limit=5)
+        with pytest.raises(ValueError):
+            AdaptiveRateLimiter(decrease_factor=1.5)
+
+    def test_call_feeds_back_rate_limit(self):
+        limiter = AdaptiveRateLimiter(initial_limit=4, max_limit=4)
+
+        def _fail() -> None:
+            raise _rate_limit_error()
+
+        with pytest.raises(RateLimitError):
+            limiter.call(_fail)
+
+        assert limiter.limit == 2
+        assert limiter.in_flight == 0
+
+    def test_in_flight_requests_are_capped(self):
+        limiter = AdaptiveRateLimiter(initial_limit=2, max_limit=2)
+        peak = 0
+        active = 0
+        lock = threading.Lock()
+        release = threading.Event()
+
+        def _request() -> None:
+            nonlocal peak, active
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            release.wait(timeout=5)
+            with lock:
+                active -= 1
+
+        threads = [threading.Thread(target=limiter.call, args=(_request,)) for _ in range(5)]
+        for t in threads:
+            t.start()
+        release.set()
+        for t in threads:
+            t.join(timeout=5)
+
+        assert peak <= 2
+
+    def test_async_in_flight_requests_are_capped(self):
+        limiter = AdaptiveRateLimiter(initial_limit=3, max_limit=3)
+        peak = 0
+        active = 0
+
+        async def _request() -> None:
+            nonlocal peak, active
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+        async def _run() -> None:
+            await asyncio.gather(*(limiter.acall(_request) for _ in range(10)))
+
+        asyncio.run(_run())
+
+        assert peak == 3
+        assert limiter.successes == 10
+
+
+class TestHeaderThrottling:
+    """Pre-emptive throttling from anthropic-ratelimit-* headers."""
+
+    def test_reserve_within_remaining_capacity(self):
+        state = RateLimitState(now=lambda: NOW)
+        state.update(_headers("input-tokens", 1000, 30))
+
+        assert state.reserve(input_tokens=600, output_tokens=0) == 0.0
+        assert state.remaining("input-tokens") == 400
+
+    def test_wait_until_reset_when_exhausted(self):
+        state = RateLimitState(now=lambda: NOW)
+        state.update({**_headers("input-tokens", 1000, 30), **_headers("output-tokens", 100, 12)})
+
+        assert state.reserve(input_tokens=600, output_tokens=4096) == 12.0
+        assert state.reserve(input_tokens=1200, output_tokens=0) == 30.0
+
+    def test_expired_window_is_ignored(self):
+        now = [NOW]
+        state = RateLimitState(now=lambda: now[0])
+        state.update(_headers("requests", 0, 5))
+
+        now[0] = NOW + timedelta(seconds=6)
+
+        assert state.reserve(input_tokens=1, output_tokens=1) == 0.0
+
+    def test_limiter_sleeps_before_sending(self):
+        sleeps: list[float] = []
+        now = [NOW]
+
+        def _sleep(delay: float) -> None:
+            sleeps.append(delay)
+            now[0] += timedelta(seconds=delay)
+
+        limiter = AdaptiveRateLimiter(state=RateLimitState(now=lambda: now[0]), sleep=_sleep)
+        limiter.observe_headers(_headers("requests", 0, 8))
+
+        assert limiter.call(lambda: "ok") == "ok"
+        assert sleeps == [8.0]
+        assert limiter.throttle_seconds == 8.0
+
+
+class TestCreateMessageIntegration:
+    """llm_transform calls go through the process-wide limiter."""
+
+    @pytest.fixture
+    def limiter(self) -> Generator[AdaptiveRateLimiter, None, None]:
+        limiter = AdaptiveRateLimiter(initial_limit=4, max_limit=4)
+        previous_limiter = set_rate_limiter(limiter)
+        previous_caller = set_resilient_caller(ResilientCaller(sleep=lambda _: None))
+        yield limiter
+        set_rate_limiter(previous_limiter)
+        set_resilient_caller(previous_caller)
+
+    def test_rate_limit_shrinks_limit_and_retries(self, limiter: AdaptiveRateLimiter):
+        from speckit_docs.utils.llm_transform import classify_section
+
+        response = MagicMock()
+        response.content = [MagicMock(text='{"section_type": "both", "confidence": 0.5}')]
+        client = MagicMock()
+        client.messages.create.side_effect = [_rate_limit_error(), response]
+
+        result = classify_section(Path("README.md"), "## Overview", "text", client=client)
+
+        assert result.section_type == "both"
+        assert limiter.rate_limited == 1
+        assert limiter.successes == 1
+        assert limiter.limit == 2
@@ -0,0 +1,212 @@
+"""Unit tests for the resilient LLM call layer (llm_resilience.py)."""
+
+import asyncio
+import random
+from collections.abc import Generator
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+from anthropic import APITimeoutError, BadRequestError, InternalServerError, RateLimitError
+
+from speckit_docs.exceptions import SpecKitDocsError
+from speckit_docs.utils.llm_resilience import (
+    CircuitBreaker,
+    ResilientCaller,
+    RetryBudget,
+    RetryPolicy,
+    is_retryable,
+    retry_after_seconds,
+    set_resilient_caller,
+)
+
+REQUEST = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+
+
+def _status_error(cls, status: int, headers: dict[str, str] | None = None):
+    response = httpx.Response(status, headers=headers or {}, request=REQUEST)
+    return cls(f"HTTP {status}", response=response, body=None)
+
+
+def _rate_limit(retry_after: str | None = None) -> RateLimitError:
+    return _status_error(RateLimitError, 429, {"retry-after": retry_after} if retry_after else None)
+
+
+def _caller(**kwargs) -> tuple[ResilientCaller, list[float]]:
+    sleeps: list[float] = []
+    caller = ResilientCaller(sleep=sleeps.append, rng=random.Random(0), **kwargs)
+    return caller, sleeps
+
+
+class _Flaky:
+    """Callable failing with the given errors before returning "ok"."""
+
+    def __init__(self, *errors: Exception) -> None:
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self) -> str:
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+class TestRetryClassification:
+    """Tests for is_retryable() and retry_after_seconds()."""
+
+    def test_retryable_errors(self):
+        assert is_retryable(_rate_limit())
+        assert is_retryable(_status_error(InternalServerError, 529))
+        assert is_retryable(APITimeoutError(request=REQUEST))
+        assert not is_retryable(_status_error(BadRequestError, 400))
+        assert not is_retryable(Exception("API error"))
+
+    def test_retry_after_header(self):
+        assert retry_after_seconds(_rate_limit("7")) == 7.0
+        headers = {"retry-after-ms": "1500", "retry-after": "9"}
+        assert retry_after_seconds(_status_error(RateLimitError, 429, headers)) == 1.5
+        assert retry_after_seconds(_rate_limit("Wed, 21 Oct 2015 07:28:00 GMT")) == 0.0
+        assert retry_after_seconds(_rate_limit()) is None
+
+
+class TestResilientCaller:
+    """Tests for ResilientCaller.call()/acall()."""
+
+    def test_retries_transient_errors(self):
+        caller, sleeps = _caller()
+        fn = _Flaky(_rate_limit(), APITimeoutError(request=REQUEST))
+
+        assert caller.call(fn) == "ok"
+
+        assert fn.calls == 3
+        assert len(sleeps) == 2
+        assert caller.metrics.retries == 2
+        assert caller.metrics.retries_by_reason == {"429": 1, "timeout": 1}
+        assert caller.metrics.attempts == 3
+
+    def test_honours_retry_after(self):
+        caller, sleeps = _caller(policy=RetryPolicy(base_delay_seconds=0.5, max_delay_seconds=1.0))
+
+        caller.call(_Flaky(_rate_limit("20")))
+
+        assert 20.0 <= sleeps[0] <= 20.5
+
+    def test_backoff_is_capped(self):
+        caller, _ = _caller(policy=RetryPolicy(base_delay_seconds=1.0, max_delay_seconds=4.0))
+
+        delays = [caller.backoff_delay(attempt, _rate_limit()) for attempt in range(1, 10)]
+
+        assert all(0 <= d <= 4.0 for d in delays)
+
+    def test_non_retryable_error_is_raised_immediately(self):
+        caller, sleeps = _caller()
+        fn = _Flaky(_status_error(BadRequestError, 400))
+
+        with pytest.raises(BadRequestError):
+            caller.call(fn)
+
+        assert fn.calls == 1
+        assert sleeps == []
+
+    def test_gives_up_after_max_attempts(self):
+        caller, _ = _caller(policy=RetryPolicy(max_attempts=3))
+        fn = _Flaky(*[_rate_limit() for _ in range(5)])
+
+        with pytest.raises(RateLimitError):
+            caller.call(fn)
+
+        assert fn.calls == 3
+        assert caller.metrics.gave_up == 1
+
+    def test_retry_budget_is_shared_by_calls(self):
+        caller, _ = _caller(budget=RetryBudget(max_retries=1))
+
+        caller.call(_Flaky(_rate_limit()))
+        with pytest.raises(RateLimitError):
+            caller.call(_Flaky(_rate_limit()))
+
+        assert caller.budget.remaining == 0
+        assert caller.metrics.budget_exhausted == 1
+
+    def test_async_call(self):
+        sleeps: list[float] = []
+
+        async def _sleep(delay: float) -> None:
+            sleeps.append(delay)
+
+        caller = ResilientCaller(async_sleep=_sleep, rng=random.Random(0))
+        create = AsyncMock(side_effect=[_rate_limit(), "ok"])
+
+        assert asyncio.run(caller.acall(create)) == "ok"
+        assert len(sleeps) == 1
+        assert caller.metrics.retries == 1
+
+
+class TestCircuitBreaker:
+    """Tests for CircuitBreaker."""
+
+    def test_opens_after_consecutive_failures_and_fails_fast(self):
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=2, cooldown_seconds=30.0, clock=lambda: now[0])
+        caller, _ = _caller(policy=RetryPolicy(max_attempts=2), breaker=breaker)
+
+        with pytest.raises(RateLimitError):
+            caller.call(_Flaky(_rate_limit(), _rate_limit()))
+        assert breaker.state == "open"
+
+        fn = _Flaky()
+        with pytest.raises(SpecKitDocsError, match="circuit breaker"):
+            caller.call(fn)
+        assert fn.calls == 0
+        assert caller.metrics.circuit_rejections == 1
+
+    def test_half_open_trial_closes_circuit(self):
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=1, cooldown_seconds=30.0, clock=lambda: now[0])
+        breaker.record_failure()
+        assert not breaker.allow_request()
+
+        now[0] = 31.0
+        assert breaker.state == "half_open"
+        assert breaker.allow_request()
+        assert not breaker.allow_request()  # only one trial call
+
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+
+class TestLLMTransformRetries:
+    """llm_transform functions go through the process-wide caller."""
+
+    @pytest.fixture
+    def caller(self) -> Generator[ResilientCaller, None, None]:
+        caller = ResilientCaller(sleep=lambda _: None)
+        previous = set_resilient_caller(caller)
+        yield caller
+        set_resilient_caller(previous)
+
+    def test_rate_limit_is_retried(self, caller: ResilientCaller):
+        from speckit_docs.utils.llm_transform import classify_section
+
+        response = MagicMock()
+        response.content = [MagicMock(text='{"section_type": "developer", "confidence": 0.8}')]
+        client = MagicMock()
+        client.messages.create.side_effect = [_rate_limit("1"), response]
+
+        result = classify_section(Path("README.md"), "## API", "def f(): ...", client=client)
+
+        assert result.section_type == "developer"
+        assert client.messages.create.call_count == 2
+        assert caller.metrics.retries == 1
+
+    def test_exhausted_retries_raise_llm_api_error(self, caller: ResilientCaller):
+        from speckit_docs.utils.llm_transform import classify_section
+
+        caller.budget = RetryBudget(max_retries=0)
+        client = MagicMock()
+        client.messages.create.side_effect = _rate_limit()
+
+        with pytest.raises(SpecKitDocsError):
+            classify_section(Path("README.md"), "## API", "def f(): ...", client=client)
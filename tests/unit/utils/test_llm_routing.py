@@ -0,0 +1,80 @@
+"""Unit tests for model routing by call type (llm_routing.py)."""
+
+from collections.abc import Generator
+
+import pytest
+
+from speckit_docs.exceptions import SpecKitDocsError
+from speckit_docs.llm_entities import LLMSection
+from speckit_docs.utils.llm_routing import (
+    FAST_MODEL,
+    LARGE_MODEL,
+    ModelRoutingPolicy,
+    get_model_routing,
+    parse_model_overrides,
+    set_model_routing,
+)
+from speckit_docs.utils.llm_transform import (
+    build_batch_classification_request,
+    build_inconsistency_request,
+    build_section_classification_request,
+    build_section_priority_request,
+    build_spec_transform_request,
+    build_target_audience_request,
+)
+
+
+@pytest.fixture
+def restore_routing() -> Generator[None, None, None]:
+    previous = get_model_routing()
+    yield
+    set_model_routing(previous)
+
+
+class TestModelRoutingPolicy:
+    """Tests for ModelRoutingPolicy."""
+
+    def test_default_tiers(self):
+        policy = ModelRoutingPolicy()
+
+        assert policy.model_for("classify") == FAST_MODEL
+        assert policy.model_for("audience") == FAST_MODEL
+        assert policy.model_for("transform") == LARGE_MODEL
+        assert policy.model_for("inconsistency") == LARGE_MODEL
+
+    def test_single_model_and_overrides(self):
+        policy = ModelRoutingPolicy.single_model().with_overrides({"priority": "claude-custom"})
+
+        assert policy.model_for("classify") == LARGE_MODEL
+        assert policy.model_for("priority") == "claude-custom"
+
+    def test_unknown_call_type_is_rejected(self):
+        with pytest.raises(ValueError, match="unknown call types"):
+            ModelRoutingPolicy(models={"summarize": "m"})  # type: ignore[dict-item]
+
+
+class TestParseModelOverrides:
+    """Tests for parse_model_overrides()."""
+
+    def test_valid(self):
+        assert parse_model_overrides(["classify = m1", "transform=m2"]) == {"classify": "m1", "transform": "m2"}
+
+    @pytest.mark.parametrize("spec", ["classify", "summarize=m", "classify="])
+    def test_invalid(self, spec):
+        with pytest.raises(SpecKitDocsError, match="Invalid model routing"):
+            parse_model_overrides([spec])
+
+
+class TestRoutedRequests:
+    """build_*_request() helpers use the process-wide policy."""
+
+    def test_requests_follow_policy(self, restore_routing):
+        section = LLMSection(file="README.md", heading="## A", level="h2", content="a", token_count=1)
+        set_model_routing(ModelRoutingPolicy().with_overrides({"priority": "claude-priority"}))
+
+        assert build_target_audience_request("x")["model"] == FAST_MODEL
+        assert build_section_classification_request("## A", "a")["model"] == FAST_MODEL
+        assert build_batch_classification_request([]).get("model") == FAST_MODEL
+        assert build_inconsistency_request("a", "b")["model"] == LARGE_MODEL
+        assert build_section_priority_request([section])["model"] == "claude-priority"
+        assert build_spec_transform_request("# Spec")["model"] == LARGE_MODEL
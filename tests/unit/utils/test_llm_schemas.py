@@ -0,0 +1,117 @@
+"""Unit tests for tool-use response schemas (llm_schemas.py)."""
+
+import json
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from speckit_docs.exceptions import SpecKitDocsError
+from speckit_docs.llm_entities import LLMSection
+from speckit_docs.utils.llm_schemas import (
+    INCONSISTENCY_TOOL,
+    SECTION_PRIORITY_TOOL,
+    TARGET_AUDIENCE_TOOL,
+    decode_response,
+    schema_errors,
+    tool_input_text,
+)
+from speckit_docs.utils.llm_transform import (
+    build_batch_classification_request,
+    build_inconsistency_request,
+    build_section_classification_request,
+    build_section_priority_request,
+    build_spec_transform_request,
+    build_target_audience_request,
+    get_response_text,
+    parse_inconsistency_response,
+    parse_target_audience_response,
+)
+
+
+class TestSchemaErrors:
+    """Tests for schema_errors()."""
+
+    def test_valid_inconsistency(self):
+        value = {
+            "is_consistent": False,
+            "inconsistencies": [
+                {"type": "features", "readme_claim": "a", "quickstart_claim": "b", "severity": "minor"}
+            ],
+            "summary": "One difference.",
+        }
+
+        assert schema_errors(value, INCONSISTENCY_TOOL.schema) == []
+
+    def test_violations_are_reported_with_paths(self):
+        value = {"prioritized_sections": [{"file": "README.md", "heading": "## A", "priority": 0}]}
+
+        errors = schema_errors(value, SECTION_PRIORITY_TOOL.schema)
+
+        assert "$.prioritized_sections[0]: missing 'reason'" in errors
+        assert "$.prioritized_sections[0].priority: 0 is less than 1" in errors
+
+    def test_types_enums_and_optional_nulls(self):
+        assert schema_errors({"audience_type": "robots"}, TARGET_AUDIENCE_TOOL.schema) == [
+            "$.audience_type: 'robots' is not one of ['end_user', 'developer', 'both']"
+        ]
+        assert schema_errors({"audience_type": "both", "confidence": True}, TARGET_AUDIENCE_TOOL.schema) == [
+            "$.confidence: expected number, got bool"
+        ]
+        assert schema_errors({"audience_type": "both", "confidence": None}, TARGET_AUDIENCE_TOOL.schema) == []
+
+
+class TestDecodeResponse:
+    """Tests for decode_response() and get_response_text()."""
+
+    def test_text_fallback_extracts_fenced_object(self):
+        text = 'Here is the result:\n```json\n{"audience_type": "developer", "confidence": 0.8}\n```'
+
+        assert decode_response(text, TARGET_AUDIENCE_TOOL) == {"audience_type": "developer", "confidence": 0.8}
+
+    def test_no_object(self):
+        with pytest.raises(SpecKitDocsError) as exc_info:
+            decode_response("I cannot answer that.", TARGET_AUDIENCE_TOOL)
+        assert exc_info.value.error_type == "LLM Response Error"
+
+    def test_schema_mismatch(self):
+        with pytest.raises(SpecKitDocsError, match="record_inconsistencies"):
+            parse_inconsistency_response('{"is_consistent": "yes", "inconsistencies": [], "summary": ""}')
+
+    def test_tool_use_block_is_decoded(self):
+        block = MagicMock(type="tool_use", input={"audience_type": "end_user", "reasoning": "手順書"})
+        response = MagicMock(content=[block])
+
+        text = get_response_text(response)
+        result = parse_target_audience_response(text, Path("README.md"))
+
+        assert json.loads(text) == block.input
+        assert tool_input_text(response) == text
+        assert (result.audience_type, result.reasoning) == ("end_user", "手順書")
+
+    def test_text_block_without_tool_use(self):
+        response = MagicMock(content=[MagicMock(type="text", text="# Doc")])
+
+        assert get_response_text(response) == "# Doc"
+
+
+class TestForcedToolChoice:
+    """Analysis requests force their tool; transformations stay free text."""
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            build_target_audience_request("# Doc"),
+            build_section_classification_request("## A", "a"),
+            build_batch_classification_request([(Path("README.md"), LLMSection("README.md", "## A", "h2", "a", 1))]),
+            build_inconsistency_request("# A", "# B"),
+            build_section_priority_request([LLMSection("README.md", "## A", "h2", "a", 1)]),
+        ],
+    )
+    def test_analysis_requests(self, params):
+        [tool] = params["tools"]
+        assert params["tool_choice"] == {"type": "tool", "name": tool["name"]}
+        assert tool["input_schema"]["type"] == "object"
+
+    def test_transform_request_has_no_tool(self):
+        assert "tools" not in build_spec_transform_request("# Spec")
@@ -0,0 +1,110 @@
+"""Unit tests for the shared LLM client session (llm_session.py)."""
+
+import asyncio
+from collections.abc import Generator
+
+import pytest
+
+from speckit_docs.exceptions import SpecKitDocsError
+from speckit_docs.utils.llm_session import (
+    LLMSession,
+    LLMSessionConfig,
+    configure_llm_session,
+    get_llm_session,
+    set_llm_session,
+)
+
+
+@pytest.fixture(autouse=True)
+def _isolated_session(monkeypatch: pytest.MonkeyPatch) -> Generator[None, None, None]:
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    previous = set_llm_session(None)
+    yield
+    current = set_llm_session(previous)
+    if current is not None:
+        current.close()
+
+
+class TestLLMSessionConfig:
+    """Tests for LLMSessionConfig validation."""
+
+    def test_invalid_pool_size(self):
+        with pytest.raises(ValueError, match="max_connections"):
+            LLMSessionConfig(max_connections=0)
+
+    def test_keepalive_above_pool_size(self):
+        with pytest.raises(ValueError, match="max_keepalive_connections"):
+            LLMSessionConfig(max_connections=2, max_keepalive_connections=3)
+
+
+class TestLLMSession:
+    """Tests for LLMSession."""
+
+    def test_client_is_reused(self):
+        session = LLMSession()
+
+        assert session.client is session.client
+
+    def test_pool_and_timeout_configuration(self):
+        session = LLMSession(
+            LLMSessionConfig(
+                max_connections=4,
+                max_keepalive_connections=2,
+                timeout_seconds=12.0,
+                base_url="http://127.0.0.1:9999",
+            )
+        )
+
+        client = session.client
+
+        assert str(client.base_url).startswith("http://127.0.0.1:9999")
+        assert client.timeout.read == 12.0
+        pool = client._client._transport._pool  # type: ignore[attr-defined]
+        assert pool._max_connections == 4
+        assert pool._max_keepalive_connections == 2
+
+    def test_missing_api_key(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.delenv("ANTHROPIC_API_KEY")
+
+        with pytest.raises(SpecKitDocsError, match="ANTHROPIC_API_KEY"):
+            LLMSession().client
+
+    def test_async_client_is_bound_to_event_loop(self):
+        session = LLMSession()
+
+        async def _two_lookups():
+            return session.async_client, session.async_client
+
+        first_a, first_b = asyncio.run(_two_lookups())
+        second_a, _ = asyncio.run(_two_lookups())
+
+        assert first_a is first_b
+        assert second_a is not first_a
+
+
+class TestProcessWideSession:
+    """Tests for the process-wide session used by llm_transform and llm_engine."""
+
+    def test_get_anthropic_client_uses_shared_session(self):
+        from speckit_docs.utils.llm_transform import get_anthropic_client
+
+        assert get_anthropic_client() is get_anthropic_client()
+        assert get_anthropic_client() is get_llm_session().client
+
+    def test_injected_session(self):
+        from speckit_docs.utils.llm_transform import get_anthropic_client
+
+        session = LLMSession(LLMSessionConfig(api_key="injected-key"))
+        set_llm_session(session)
+
+        assert get_anthropic_client() is session.client
+        assert session.client.api_key == "injected-key"
+
+    def test_configure_replaces_session(self):
+        first = get_llm_session()
+
+        second = configure_llm_session(LLMSessionConfig(max_connections=3, max_keepalive_connections=1))
+
+        assert second is not first
+        assert get_llm_session() is second
+        assert second.config.max_connections == 3
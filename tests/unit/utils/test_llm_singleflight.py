@@ -0,0 +1,159 @@
+"""Unit tests for single-flight deduplication of LLM requests (llm_singleflight.py)."""
+
+import asyncio
+import threading
+import time
+from collections.abc import Generator
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from speckit_docs.utils.llm_singleflight import SingleFlight, set_single_flight
+
+CONSISTENT = '{"is_consistent": true, "inconsistencies": [], "summary": "OK"}'
+
+
+@pytest.fixture
+def group() -> Generator[SingleFlight, None, None]:
+    group = SingleFlight()
+    previous = set_single_flight(group)
+    yield group
+    set_single_flight(previous)
+
+
+class TestSingleFlight:
+    """Tests for SingleFlight.do()/ado()."""
+
+    def test_concurrent_threads_share_one_call(self):
+        group = SingleFlight()
+        release = threading.Event()
+        calls = 0
+
+        def _request() -> str:
+            nonlocal calls
+            calls += 1
+            release.wait(timeout=5)
+            return "result"
+
+        results: list[str] = []
+        threads = [
+            threading.Thread(target=lambda: results.append(group.do("key", _request))) for _ in range(4)
+        ]
+        for t in threads:
+            t.start()
+        deadline = time.monotonic() + 5
+        while group.shared < 3 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        release.set()
+        for t in threads:
+            t.join(timeout=5)
+
+        assert calls == 1
+        assert results == ["result"] * 4
+        assert (group.leaders, group.shared) == (1, 3)
+
+    def test_sequential_calls_are_not_merged(self):
+        group = SingleFlight()
+
+        assert group.do("key", lambda: 1) == 1
+        assert group.do("key", lambda: 2) == 2
+        assert group.shared == 0
+
+    def test_error_is_shared(self):
+        group = SingleFlight()
+
+        async def _run() -> list[Any]:
+            async def _fail() -> str:
+                await asyncio.sleep(0.01)
+                raise ValueError("boom")
+
+            return await asyncio.gather(
+                group.ado("key", _fail), group.ado("key", _fail), return_exceptions=True
+            )
+
+        results = asyncio.run(_run())
+
+        assert [type(r) for r in results] == [ValueError, ValueError]
+        assert group.leaders == 1
+
+    def test_cancelled_leader_hands_over(self):
+        group = SingleFlight()
+        calls = 0
+
+        async def _request() -> str:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return "result"
+
+        async def _run() -> str:
+            leader = asyncio.create_task(group.ado("key", _request))
+            await asyncio.sleep(0)
+            follower = asyncio.create_task(group.ado("key", _request))
+            await asyncio.sleep(0)
+            leader.cancel()
+            return await follower
+
+        assert asyncio.run(_run()) == "result"
+        assert calls == 2
+
+
+class TestDeduplicatedLLMCalls:
+    """Identical concurrent LLM requests reach the API once."""
+
+    def test_concurrent_identical_requests(self, group: SingleFlight):
+        from speckit_docs.utils.llm_engine import detect_inconsistency_async
+
+        create_calls = 0
+
+        async def create(**kwargs: Any) -> MagicMock:
+            nonlocal create_calls
+            create_calls += 1
+            await asyncio.sleep(0.01)
+            response = MagicMock()
+            response.content = [MagicMock(text=CONSISTENT)]
+            return response
+
+        client = MagicMock()
+        client.messages.create = create
+
+        async def _run() -> list[Any]:
+            return await asyncio.gather(
+                detect_inconsistency_async("# Boilerplate", "# Same", client),
+                detect_inconsistency_async("# Boilerplate", "# Same", client),
+                detect_inconsistency_async("# Boilerplate", "# Different", client),
+            )
+
+        results = asyncio.run(_run())
+
+        assert all(r.is_consistent for r in results)
+        assert create_calls == 2
+        assert group.shared == 1
+
+    def test_sync_identical_requests(self, group: SingleFlight):
+        from speckit_docs.utils.llm_transform import detect_inconsistency
+
+        def create(**kwargs: Any) -> MagicMock:
+            # Hold the leader until the second caller has joined it
+            deadline = time.monotonic() + 5
+            while group.shared < 1 and time.monotonic() < deadline:
+                time.sleep(0.001)
+            response = MagicMock()
+            response.content = [MagicMock(text=CONSISTENT)]
+            return response
+
+        client = MagicMock()
+        client.messages.create.side_effect = create
+        results: list[Any] = []
+        threads = [
+            threading.Thread(target=lambda: results.append(detect_inconsistency("# A", "# B", client)))
+            for _ in range(2)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=5)
+
+        assert client.messages.create.call_count == 1
+        assert len(results) == 2
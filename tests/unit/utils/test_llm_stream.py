@@ -0,0 +1,259 @@
+"""Unit tests for streaming LLM responses with incremental JSON parsing (llm_stream.py)."""
+
+import asyncio
+import json
+from collections.abc import AsyncIterator, Generator, Iterator
+
+import httpx
+import pytest
+from anthropic import Anthropic, AsyncAnthropic
+
+from speckit_docs.llm_entities import LLMSection, PrioritizedSection
+from speckit_docs.utils.llm_stream import IncrementalJSONParser, JSONEvent
+from speckit_docs.utils.llm_usage import usage_recorder
+
+INCONSISTENT = json.dumps(
+    {
+        "is_consistent": False,
+        "inconsistencies": [
+            {
+                "type": "technology_stack",
+                "readme_claim": "Python project",
+                "quickstart_claim": "Rust project",
+                "severity": "critical",
+            },
+            {
+                "type": "purpose",
+                "readme_claim": "CLI",
+                "quickstart_claim": "Web service",
+                "severity": "critical",
+            },
+        ],
+        "summary": "Different projects.",
+    }
+)
+
+PRIORITIES = json.dumps(
+    {
+        "prioritized_sections": [
+            {"file": "QUICKSTART.md", "heading": "## Install", "priority": 2, "reason": "Setup"},
+            {"file": "README.md", "heading": "## Overview", "priority": 1, "reason": "Intro"},
+        ]
+    }
+)
+
+
+def _events(text: str, chunk_size: int) -> list[JSONEvent]:
+    parser = IncrementalJSONParser()
+    events: list[JSONEvent] = []
+    for i in range(0, len(text), chunk_size):
+        events.extend(parser.feed(text[i : i + chunk_size]))
+    assert parser.done
+    return events
+
+
+def _sse(event: str, data: dict) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode()
+
+
+def _sse_chunks(text: str, chunk_size: int = 8) -> list[bytes]:
+    chunks = [
+        _sse(
+            "message_start",
+            {
+                "type": "message_start",
+                "message": {
+                    "id": "msg_1",
+                    "type": "message",
+                    "role": "assistant",
+                    "model": "claude-3-5-sonnet-20241022",
+                    "content": [],
+                    "stop_reason": None,
+                    "stop_sequence": None,
+                    "usage": {"input_tokens": 25, "output_tokens": 1, "cache_read_input_tokens": 300},
+                },
+            },
+        ),
+        _sse(
+            "content_block_start",
+            {"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}},
+        ),
+    ]
+    for i in range(0, len(text), chunk_size):
+        chunks.append(
+            _sse(
+                "content_block_delta",
+                {
+                    "type": "content_block_delta",
+                    "index": 0,
+                    "delta": {"type": "text_delta", "text": text[i : i + chunk_size]},
+                },
+            )
+        )
+    chunks += [
+        _sse("content_block_stop", {"type": "content_block_stop", "index": 0}),
+        _sse(
+            "message_delta",
+            {
+                "type": "message_delta",
+                "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                "usage": {"output_tokens": 40},
+            },
+        ),
+        _sse("message_stop", {"type": "message_stop"}),
+    ]
+    return chunks
+
+
+class _StreamingServer:
+    """httpx transport answering every request with an SSE stream of ``text``."""
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.sent_chunks = 0
+        self.total_chunks = 0
+        self.requests: list[dict] = []
+
+    def _body(self) -> Iterator[bytes]:
+        chunks = _sse_chunks(self.text)
+        self.total_chunks = len(chunks)
+        for chunk in chunks:
+            self.sent_chunks += 1
+            yield chunk
+
+    async def _async_body(self) -> AsyncIterator[bytes]:
+        for chunk in self._body():
+            yield chunk
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(json.loads(request.content))
+        return httpx.Response(200, headers={"content-type": "text/event-stream"}, content=self._body())
+
+    async def async_handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(json.loads(await request.aread()))
+        return httpx.Response(
+            200, headers={"content-type": "text/event-stream"}, content=self._async_body()
+        )
+
+    def client(self) -> Anthropic:
+        return Anthropic(
+            api_key="test-key",
+            max_retries=0,
+            http_client=httpx.Client(transport=httpx.MockTransport(self.handler)),
+        )
+
+
+@pytest.fixture(autouse=True)
+def _reset_recorder() -> Generator[None, None, None]:
+    usage_recorder.reset()
+    yield
+    usage_recorder.reset()
+
+
+def _section(file: str, heading: str) -> LLMSection:
+    return LLMSection(file=file, heading=heading, level="h2", content="text", token_count=10)  # type: ignore[arg-type]
+
+
+class TestIncrementalJSONParser:
+    """Tests for IncrementalJSONParser."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 17, 10_000])
+    def test_events_are_independent_of_chunking(self, chunk_size: int):
+        events = _events(INCONSISTENT, chunk_size)
+
+        assert [(e.kind, e.key) for e in events] == [
+            ("field", "is_consistent"),
+            ("item", "inconsistencies"),
+            ("item", "inconsistencies"),
+            ("field", "inconsistencies"),
+            ("field", "summary"),
+        ]
+        assert events[0].value is False
+        assert events[1].value["quickstart_claim"] == "Rust project"
+
+    def test_item_is_emitted_before_the_array_closes(self):
+        parser = IncrementalJSONParser()
+        head = PRIORITIES[: PRIORITIES.index("}") + 1]
+
+        events = parser.feed(head)
+
+        assert events == [JSONEvent("item", "prioritized_sections", json.loads(PRIORITIES)["prioritized_sections"][0])]
+        assert not parser.done
+
+    def test_preamble_fence_and_escapes(self):
+        text = 'Sure:\n```json\n{"a": "x \\"}\\" y", "b": [1, "s", null, {"c": [2]}], "d": 1.5e3}\n```'
+
+        events = _events(text, 2)
+
+        assert [(e.kind, e.key, e.value) for e in events] == [
+            ("field", "a", 'x "}" y'),
+            ("item", "b", 1),
+            ("item", "b", "s"),
+            ("item", "b", None),
+            ("item", "b", {"c": [2]}),
+            ("field", "b", [1, "s", None, {"c": [2]}]),
+            ("field", "d", 1500.0),
+        ]
+
+
+class TestStreamedAnalysis:
+    """detect_inconsistency / prioritize_sections with stream=True."""
+
+    def test_inconsistency_aborts_early(self):
+        from speckit_docs.utils.llm_transform import detect_inconsistency
+
+        server = _StreamingServer(INCONSISTENT)
+
+        result = detect_inconsistency("# A", "# B", server.client(), stream=True)
+
+        assert result.is_consistent is False
+        assert [i.quickstart_claim for i in result.inconsistencies] == ["Rust project"]
+        assert server.sent_chunks < server.total_chunks
+        assert server.requests[0]["stream"] is True
+        [usage] = usage_recorder.records()
+        assert usage.call_type == "inconsistency"
+        assert usage.ttft_seconds is not None
+        assert usage.cache_read_input_tokens == 300
+
+    def test_consistent_result_reads_whole_stream(self):
+        from speckit_docs.utils.llm_transform import detect_inconsistency
+
+        server = _StreamingServer('{"is_consistent": true, "inconsistencies": [], "summary": "OK"}')
+
+        result = detect_inconsistency("# A", "# B", server.client(), stream=True)
+
+        assert result.is_consistent is True
+        assert result.summary == "OK"
+        assert server.sent_chunks == server.total_chunks
+        assert usage_recorder.records()[0].output_tokens == 40
+
+    def test_prioritized_sections_arrive_incrementally(self):
+        from speckit_docs.utils.llm_transform import prioritize_sections
+
+        sections = [_section("README.md", "## Overview"), _section("QUICKSTART.md", "## Install")]
+        received: list[PrioritizedSection] = []
+
+        result = prioritize_sections(
+            sections, _StreamingServer(PRIORITIES).client(), stream=True, on_section=received.append
+        )
+
+        assert [ps.section.heading for ps in received] == ["## Install", "## Overview"]
+        assert [ps.section.heading for ps in result.prioritized_sections] == ["## Overview", "## Install"]
+        assert result.included_sections == 2
+
+    def test_async_streaming(self):
+        from speckit_docs.utils.llm_engine import detect_inconsistency_async
+
+        server = _StreamingServer(INCONSISTENT)
+        client = AsyncAnthropic(
+            api_key="test-key",
+            max_retries=0,
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(server.async_handler)),
+        )
+
+        result = asyncio.run(detect_inconsistency_async("# A", "# B", client, stream=True))
+
+        assert result.is_consistent is False
+        assert len(result.inconsistencies) == 1
+        assert server.sent_chunks < server.total_chunks
+        assert usage_recorder.records()[0].ttft_seconds is not None
@@ -0,0 +1,157 @@
+"""Unit tests for per-call LLM telemetry (llm_telemetry.py)."""
+
+import asyncio
+import json
+from collections.abc import Generator
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from speckit_docs.llm_entities import LLMUsage
+from speckit_docs.utils.llm_telemetry import (
+    JSONLTelemetrySink,
+    estimate_cost,
+    load_telemetry,
+    summarize,
+    summarize_by_model,
+)
+from speckit_docs.utils.llm_usage import feature_scope, usage_recorder
+
+CONSISTENT = '{"is_consistent": true, "inconsistencies": [], "summary": "OK"}'
+
+
+@pytest.fixture(autouse=True)
+def _reset_recorder() -> Generator[None, None, None]:
+    usage_recorder.reset()
+    yield
+    usage_recorder.reset()
+
+
+class TestEstimateCost:
+    """Tests for estimate_cost()."""
+
+    def test_cache_tokens_are_priced_relative_to_input(self):
+        usage = LLMUsage(
+            "transform",
+            "claude-3-5-sonnet-20241022",
+            input_tokens=1_000_000,
+            output_tokens=1_000_000,
+            cache_creation_input_tokens=1_000_000,
+            cache_read_input_tokens=1_000_000,
+        )
+
+        assert estimate_cost(usage) == pytest.approx(3.0 + 15.0 + 3.75 + 0.3)
+
+    def test_unknown_model_costs_nothing(self):
+        assert estimate_cost(LLMUsage("transform", "other-model", input_tokens=100)) == 0.0
+
+
+class TestSummarize:
+    """Tests for summarize()."""
+
+    def test_percentiles_tokens_and_slowest_features(self):
+        records = [
+            LLMUsage("transform", "m", input_tokens=10, output_tokens=5, latency_seconds=float(i), feature=f"00{i % 3}")
+            for i in range(1, 21)
+        ]
+        records.append(LLMUsage("priority", "m", cache_read_input_tokens=100, retries=2))
+
+        summary = summarize(records, top=2)
+
+        assert summary.calls == 21
+        assert summary.total_tokens == 20 * 15 + 100
+        assert summary.retries == 2
+        assert (summary.p50_latency, summary.p95_latency) == (10.0, 19.0)
+        assert [key for key, _ in summary.slowest_features] == ["002", "001"]
+
+    def test_no_latency_data(self):
+        summary = summarize([LLMUsage("transform", "m")])
+
+        assert summary.p50_latency is None
+        assert summary.slowest_features == ()
+
+
+class TestSummarizeByModel:
+    """Tests for summarize_by_model()."""
+
+    def test_stats_per_model(self):
+        records = [
+            LLMUsage("classify", "claude-3-5-haiku-20241022", output_tokens=10, latency_seconds=0.2),
+            LLMUsage("audience", "claude-3-5-haiku-20241022", output_tokens=20, latency_seconds=0.4),
+            LLMUsage("transform", "claude-3-5-sonnet-20241022", output_tokens=500, latency_seconds=3.0),
+        ]
+
+        fast, large = summarize_by_model(records)
+
+        assert (fast.model, fast.calls, fast.call_types) == ("claude-3-5-haiku-20241022", 2, ("audience", "classify"))
+        assert fast.mean_output_tokens == 15
+        assert fast.p50_latency == 0.2
+        assert large.p95_latency == 3.0
+        assert large.estimated_cost > fast.estimated_cost
+
+
+class TestJSONLTelemetry:
+    """Tests for JSONLTelemetrySink / load_telemetry()."""
+
+    def test_round_trip(self, tmp_path: Path):
+        path = tmp_path / ".cache" / "llm-telemetry.jsonl"
+        sink = JSONLTelemetrySink(path)
+        usage = LLMUsage("classify", "m", input_tokens=3, latency_seconds=0.5, retries=1, feature="001-a")
+        sink(usage)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write('{"call_type": "transform", "model"')  # truncated line
+
+        assert load_telemetry(path) == [usage]
+        assert load_telemetry(tmp_path / "missing.jsonl") == []
+
+    def test_recorder_listener(self, tmp_path: Path):
+        path = tmp_path / "llm-telemetry.jsonl"
+        sink = JSONLTelemetrySink(path)
+        usage_recorder.add_listener(sink)
+        try:
+            usage_recorder.record(LLMUsage("priority", "m"))
+        finally:
+            usage_recorder.remove_listener(sink)
+        usage_recorder.record(LLMUsage("priority", "m"))
+
+        assert [json.loads(line)["call_type"] for line in path.read_text().splitlines()] == ["priority"]
+
+
+class TestCallTelemetry:
+    """LLM calls record latency, retries and the owning feature."""
+
+    def test_sync_call(self):
+        from speckit_docs.utils.llm_transform import detect_inconsistency
+
+        response = MagicMock()
+        response.content = [MagicMock(text=CONSISTENT)]
+        client = MagicMock()
+        client.messages.create.return_value = response
+
+        with feature_scope("001-user-auth"):
+            detect_inconsistency("# telemetry A", "# telemetry B", client)
+
+        [usage] = usage_recorder.records()
+        assert usage.feature == "001-user-auth"
+        assert usage.latency_seconds is not None and usage.latency_seconds >= 0
+        assert usage.retries == 0
+
+    def test_async_calls_are_attributed_per_task(self):
+        from speckit_docs.utils.llm_engine import detect_inconsistency_async
+
+        response = MagicMock()
+        response.content = [MagicMock(text=CONSISTENT)]
+        client = MagicMock()
+        client.messages.create = AsyncMock(return_value=response)
+
+        async def _feature(key: str) -> None:
+            with feature_scope(key):
+                await detect_inconsistency_async(f"# {key}", "# telemetry", client)
+
+        async def _run() -> None:
+            await asyncio.gather(_feature("001-a"), _feature("002-b"))
+
+        asyncio.run(_run())
+
+        assert sorted(u.feature or "" for u in usage_recorder.records()) == ["001-a", "002-b"]
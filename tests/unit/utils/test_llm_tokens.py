@@ -0,0 +1,194 @@
+"""Unit tests for token counting (llm_tokens.py)."""
+
+import asyncio
+import threading
+from collections.abc import Generator
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+from anthropic import APIConnectionError
+
+from speckit_docs.utils.llm_resilience import ResilientCaller, RetryPolicy, set_resilient_caller
+from speckit_docs.utils.llm_tokens import (
+    AnthropicTokenCounter,
+    ApproximateTokenCounter,
+    MemoizedTokenCounter,
+    count_tokens_async,
+    get_token_counter,
+    set_token_counter,
+)
+
+VALID_SPEC = Path(__file__).parents[2] / "fixtures" / "sample_specs" / "valid_spec.md"
+
+
+class _CountingCounter:
+    """Counter returning len(text) and recording every call."""
+
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def count(self, text: str) -> int:
+        self.calls.append(text)
+        return len(text)
+
+
+class TestApproximateTokenCounter:
+    """Tests for the per-script approximation."""
+
+    def test_ascii_text(self):
+        counter = ApproximateTokenCounter()
+
+        assert counter.count("") == 0
+        assert counter.count("abc") == 1
+        assert counter.count("a" * 400) == 100
+
+    def test_japanese_counts_about_one_token_per_character(self):
+        counter = ApproximateTokenCounter()
+        text = "ユーザーストーリーの目的を抽出します。"
+
+        assert counter.count(text) == len(text)
+        # The old len(text) // 4 estimate undercounted Japanese by 4x
+        assert counter.count(text) > len(text) // 4 * 3
+
+    def test_mixed_scripts(self):
+        counter = ApproximateTokenCounter()
+
+        # 8 ASCII (2) + 4 CJK (4) + 2 accented Latin (1)
+        assert counter.count("Python3 インストéé") == 7
+
+    def test_custom_ratios(self):
+        counter = ApproximateTokenCounter(ascii_chars_per_token=2.0, cjk_chars_per_token=2.0)
+
+        assert counter.count("abcd日本") == 3
+        with pytest.raises(ValueError):
+            ApproximateTokenCounter(cjk_chars_per_token=0)
+
+
+class TestMemoizedTokenCounter:
+    """Tests for the content-hash LRU memo."""
+
+    def test_repeated_counts_are_free(self):
+        inner = _CountingCounter()
+        counter = MemoizedTokenCounter(inner)
+
+        assert counter.count("section body") == 12
+        assert counter.count("section body") == 12
+
+        assert inner.calls == ["section body"]
+        assert (counter.hits, counter.misses) == (1, 1)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        inner = _CountingCounter()
+        counter = MemoizedTokenCounter(inner, maxsize=2)
+
+        counter.count("a")
+        counter.count("b")
+        counter.count("a")  # "b" becomes least recently used
+        counter.count("c")
+        counter.count("a")
+        counter.count("b")
+
+        assert inner.calls == ["a", "b", "c", "b"]
+
+
+class TestAnthropicTokenCounter:
+    """Tests for the count-tokens endpoint counter."""
+
+    def test_uses_count_tokens_endpoint(self):
+        client = MagicMock()
+        client.messages.count_tokens.return_value = MagicMock(input_tokens=42)
+        counter = AnthropicTokenCounter(client, "claude-test")
+
+        assert counter.count("日本語のテキスト") == 42
+        client.messages.count_tokens.assert_called_once_with(
+            model="claude-test", messages=[{"role": "user", "content": "日本語のテキスト"}]
+        )
+        assert counter.count("") == 0
+        assert counter.api_calls == 1
+
+    def test_falls_back_to_approximation(self):
+        client = MagicMock()
+        client.messages.count_tokens.side_effect = APIConnectionError(
+            request=httpx.Request("POST", "https://api.anthropic.com/v1/messages/count_tokens")
+        )
+        counter = AnthropicTokenCounter(
+            client, "claude-test", caller=ResilientCaller(policy=RetryPolicy(max_attempts=1))
+        )
+
+        assert counter.count("日本語") == 3
+        assert counter.fallbacks == 1
+
+    def test_failures_do_not_trip_the_messages_breaker(self):
+        """Counting has its own retries and breaker, separate from messages.create."""
+        client = MagicMock()
+        client.messages.count_tokens.side_effect = APIConnectionError(
+            request=httpx.Request("POST", "https://api.anthropic.com/v1/messages/count_tokens")
+        )
+        messages_caller = ResilientCaller(policy=RetryPolicy(max_attempts=1))
+        previous = set_resilient_caller(messages_caller)
+        try:
+            counter = AnthropicTokenCounter(
+                client, "claude-test", caller=ResilientCaller(policy=RetryPolicy(max_attempts=1))
+            )
+            for n in range(10):
+                counter.count(f"text {n}")
+        finally:
+            set_resilient_caller(previous)
+
+        assert counter.caller is not messages_caller
+        assert messages_caller.breaker.state == "closed"
+
+
+class TestProcessWideCounter:
+    """estimate_token_count() goes through the process-wide counter."""
+
+    @pytest.fixture
+    def inner(self) -> Generator[_CountingCounter, None, None]:
+        inner = _CountingCounter()
+        previous = set_token_counter(MemoizedTokenCounter(inner))
+        yield inner
+        set_token_counter(previous)
+
+    def test_default_counter_is_memoized_approximation(self):
+        previous = set_token_counter(None)
+        try:
+            counter = get_token_counter()
+            assert isinstance(counter, MemoizedTokenCounter)
+            assert isinstance(counter.counter, ApproximateTokenCounter)
+        finally:
+            set_token_counter(previous)
+
+    def test_estimates_do_not_use_gate_counter(self, inner: _CountingCounter):
+        from speckit_docs.utils.llm_transform import estimate_token_count, parse_markdown_sections
+
+        assert estimate_token_count("abcdef") == 2
+        parse_markdown_sections("## A\n\nabcdef", "README.md")
+
+        assert inner.calls == []
+
+    def test_token_gates_use_gate_counter(self, inner: _CountingCounter):
+        from speckit_docs.utils.spec_extractor import extract_spec_minimal
+
+        extract_spec_minimal(VALID_SPEC)
+        assert len(inner.calls) == 1
+
+        extract_spec_minimal(VALID_SPEC, token_limit=None)
+        assert len(inner.calls) == 1
+
+    def test_count_tokens_async_runs_off_the_event_loop(self):
+        threads: list[int] = []
+
+        class _ThreadRecorder:
+            def count(self, text: str) -> int:
+                threads.append(threading.get_ident())
+                return len(text)
+
+        previous = set_token_counter(_ThreadRecorder())
+        try:
+            assert asyncio.run(count_tokens_async("abc")) == 3
+        finally:
+            set_token_counter(previous)
+
+        assert threads and threads[0] != threading.get_ident()
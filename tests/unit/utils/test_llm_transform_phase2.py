@@ -325,3 +325,103 @@ class TestPrioritizeSections:
 
         with pytest.raises(Exception):
             prioritize_sections(sections, client=mock_client)
+
+
+class TestClassifySections:
+    """Tests for batched classify_sections() function (FR-038-classify)."""
+
+    @staticmethod
+    def _sections(count: int, content: str = "Section body") -> list:
+        from speckit_docs.llm_entities import LLMSection
+
+        readme = Path("specs/001-feature/README.md")
+        return [
+            (
+                readme,
+                LLMSection(
+                    file="README.md",
+                    heading=f"## Section {i}",
+                    level="h2",
+                    content=content,
+                    token_count=len(content) // 4,
+                ),
+            )
+            for i in range(count)
+        ]
+
+    @staticmethod
+    def _classify_all(*args, **kwargs):
+        import json
+
+        payload = json.loads(
+            kwargs["messages"][0]["content"].split("**Sections (JSON list):**\n", 1)[1].split("\n\n", 1)[0]
+        )
+        response = MagicMock()
+        response.content = [
+            MagicMock(
+                text=json.dumps(
+                    {
+                        "classifications": [
+                            {"index": item["index"], "section_type": "developer", "confidence": 0.8}
+                            for item in reversed(payload)
+                        ]
+                    }
+                )
+            )
+        ]
+        return response
+
+    def test_classify_sections_single_request(self):
+        """All sections of a document are classified in one request, in input order."""
+        from speckit_docs.utils.llm_transform import classify_sections
+
+        mock_client = MagicMock()
+        mock_client.messages.create.side_effect = self._classify_all
+        sections = self._sections(40)
+
+        results = classify_sections(sections, client=mock_client)
+
+        assert mock_client.messages.create.call_count == 1
+        assert [r.heading for r in results] == [f"## Section {i}" for i in range(40)]
+        assert all(isinstance(r, SectionClassification) for r in results)
+        assert results[0].section_type == "developer"
+
+    def test_classify_sections_splits_on_token_budget(self):
+        """Sections are split into several requests only when the budget is exceeded."""
+        from speckit_docs.utils.llm_transform import classify_sections, plan_classification_batches
+
+        mock_client = MagicMock()
+        mock_client.messages.create.side_effect = self._classify_all
+        sections = self._sections(10, content="x" * 4000)  # ~1,000 tokens each
+
+        batches = plan_classification_batches(sections, token_budget=3000)
+        results = classify_sections(sections, client=mock_client, token_budget=3000)
+
+        assert len(batches) > 1
+        assert sum(len(batch) for batch in batches) == 10
+        assert mock_client.messages.create.call_count == len(batches)
+        assert [r.heading for r in results] == [f"## Section {i}" for i in range(10)]
+
+    def test_classify_sections_missing_classification(self):
+        """A response that skips a section raises SpecKitDocsError."""
+        from speckit_docs.exceptions import SpecKitDocsError
+        from speckit_docs.utils.llm_transform import classify_sections
+
+        mock_client = MagicMock()
+        mock_response = MagicMock()
+        mock_response.content = [
+            MagicMock(text='{"classifications": [{"index": 0, "section_type": "both"}]}')
+        ]
+        mock_client.messages.create.return_value = mock_response
+
+        with pytest.raises(SpecKitDocsError, match="missing classifications"):
+            classify_sections(self._sections(2), client=mock_client)
+
+    def test_classify_sections_empty(self):
+        """No sections means no request."""
+        from speckit_docs.utils.llm_transform import classify_sections
+
+        mock_client = MagicMock()
+
+        assert classify_sections([], client=mock_client) == []
+        mock_client.messages.create.assert_not_called()
@@ -0,0 +1,152 @@
+"""Unit tests for prompt caching request layout and LLM usage accounting."""
+
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from speckit_docs.llm_entities import LLMSection, LLMUsage
+from speckit_docs.utils.llm_transform import (
+    INCONSISTENCY_DETECTION_PROMPT,
+    TARGET_AUDIENCE_PROMPT,
+    build_batch_classification_request,
+    build_inconsistency_request,
+    build_section_classification_request,
+    build_section_priority_request,
+    build_spec_transform_request,
+    build_target_audience_request,
+)
+from speckit_docs.utils.llm_usage import LLMUsageRecorder, extract_usage, usage_recorder
+
+
+@pytest.fixture(autouse=True)
+def _reset_recorder():
+    usage_recorder.reset()
+    yield
+    usage_recorder.reset()
+
+
+def _usage_response(text: str, **usage: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        content=[SimpleNamespace(text=text)],
+        model="claude-3-5-sonnet-20241022",
+        usage=SimpleNamespace(**usage),
+    )
+
+
+class TestSystemPrompt:
+    """Static instructions go to a system block, variable content to the user turn."""
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            build_target_audience_request("# Doc"),
+            build_section_classification_request("## Install", "pip install x"),
+            build_batch_classification_request(
+                [(Path("README.md"), LLMSection(file="README.md", heading="## A", level="h2", content="a", token_count=1))]
+            ),
+            build_inconsistency_request("# Readme", "# Quickstart"),
+            build_section_priority_request(
+                [LLMSection(file="README.md", heading="## A", level="h2", content="a", token_count=1)]
+            ),
+            build_spec_transform_request("## Spec"),
+        ],
+    )
+    def test_system_block_is_not_marked(self, params):
+        """The built-in prompts are below the minimum cacheable prefix of every model."""
+        system = params["system"]
+        assert len(system) == 1
+        assert system[0]["type"] == "text"
+        assert "cache_control" not in system[0]
+        assert system[0]["text"] not in params["messages"][0]["content"]
+
+    def test_static_prefix_is_identical_across_calls(self):
+        first = build_inconsistency_request("# A", "# B")
+        second = build_inconsistency_request("# C", "# D")
+
+        assert first["system"] == second["system"]
+        assert first["system"][0]["text"] == INCONSISTENCY_DETECTION_PROMPT.strip()
+        assert "# A" in first["messages"][0]["content"]
+        assert "# C" in second["messages"][0]["content"]
+
+    def test_user_turn_holds_only_variable_content(self):
+        params = build_target_audience_request("Hello docs")
+
+        content = params["messages"][0]["content"]
+        assert "Hello docs" in content
+        assert "Audience types" not in content
+        assert "Audience types" in TARGET_AUDIENCE_PROMPT
+
+
+class TestExtractUsage:
+    """Tests for extract_usage()."""
+
+    def test_cache_counters_are_extracted(self):
+        response = _usage_response(
+            "{}",
+            input_tokens=20,
+            output_tokens=7,
+            cache_creation_input_tokens=0,
+            cache_read_input_tokens=1500,
+        )
+
+        usage = extract_usage(response, "inconsistency", "fallback-model")
+
+        assert usage == LLMUsage(
+            call_type="inconsistency",
+            model="claude-3-5-sonnet-20241022",
+            input_tokens=20,
+            output_tokens=7,
+            cache_creation_input_tokens=0,
+            cache_read_input_tokens=1500,
+        )
+        assert usage.total_input_tokens == 1520
+
+    def test_missing_counters_default_to_zero(self):
+        usage = extract_usage(MagicMock(), "classify", "fallback-model")
+
+        assert usage.model == "fallback-model"
+        assert usage.input_tokens == 0
+        assert usage.cache_read_input_tokens == 0
+
+
+class TestLLMUsageRecorder:
+    """Tests for LLMUsageRecorder."""
+
+    def test_totals(self):
+        recorder = LLMUsageRecorder()
+        recorder.record(LLMUsage("priority", "m", input_tokens=10, cache_creation_input_tokens=1200))
+        recorder.record(LLMUsage("priority", "m", input_tokens=12, cache_read_input_tokens=1200))
+
+        assert recorder.totals() == {
+            "calls": 2,
+            "input_tokens": 22,
+            "output_tokens": 0,
+            "cache_creation_input_tokens": 1200,
+            "cache_read_input_tokens": 1200,
+        }
+
+        recorder.reset()
+        assert recorder.records() == []
+
+    @patch("speckit_docs.utils.llm_transform.get_anthropic_client")
+    def test_llm_calls_are_recorded(self, mock_get_client):
+        mock_client = MagicMock()
+        mock_client.messages.create.return_value = _usage_response(
+            '{"section_type": "developer", "confidence": 0.9}',
+            input_tokens=30,
+            output_tokens=5,
+            cache_read_input_tokens=800,
+        )
+        mock_get_client.return_value = mock_client
+
+        from speckit_docs.utils.llm_transform import classify_section
+
+        classify_section(Path("README.md"), "## API", "def f(): ...")
+
+        kwargs = mock_client.messages.create.call_args.kwargs
+        assert "cache_control" not in kwargs["system"][0]
+        [usage] = usage_recorder.records()
+        assert usage.call_type == "classify"
+        assert usage.cache_read_input_tokens == 800
@@ -0,0 +1,179 @@
+"""Unit tests for section-level delta transforms (section_delta.py)."""
+
+import asyncio
+import re
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+from speckit_docs.utils.cache import LLMTransformCache
+from speckit_docs.utils.llm_engine import AsyncTransformEngine
+from speckit_docs.utils.section_delta import (
+    plan_section_delta,
+    section_hash,
+    split_fragments,
+    split_transformed,
+    store_section_transforms,
+)
+
+SPEC = """## ユーザーストーリーの目的
+
+### ログイン
+ユーザーはログインできます。
+
+### ログアウト
+ユーザーはログアウトできます。
+
+
+## 前提条件
+
+Python 3.11
+
+
+## スコープ境界
+
+モバイル対応は対象外
+
+
+---
+
+_Extracted from: specs/001/spec.md_
+_Total tokens: 42_
+"""
+
+
+def _rewrite(extract: str) -> str:
+    """Stand-in for the LLM: keeps headings, rewrites each body."""
+    out = []
+    for fragment in split_fragments(extract).fragments:
+        heading = fragment.markdown.splitlines()[0]
+        out.append(f"{heading}\n\n変換済み（{len(fragment.section.content)}文字）: {fragment.section.content.strip()}。エンドユーザー向けに説明します。")
+    return "\n\n".join(out)
+
+
+def _client() -> MagicMock:
+    async def create(**kwargs: Any) -> MagicMock:
+        extract = kwargs["messages"][0]["content"].split("**Specification extract:**\n", 1)[1]
+        response = MagicMock()
+        response.content = [MagicMock(text=_rewrite(extract))]
+        return response
+
+    client = MagicMock()
+    client.messages.create = AsyncMock(side_effect=create)
+    return client
+
+
+def _sent_headings(client: MagicMock) -> list[str]:
+    content = client.messages.create.call_args.kwargs["messages"][0]["content"]
+    return re.findall(r"^#{2,3} (.+)$", content, flags=re.MULTILINE)
+
+
+class TestSplitFragments:
+    """Tests for split_fragments() / section_hash()."""
+
+    def test_fragments_and_footer(self):
+        document = split_fragments(SPEC)
+
+        assert [f.section.heading for f in document.fragments] == [
+            "ユーザーストーリーの目的",
+            "ログイン",
+            "ログアウト",
+            "前提条件",
+            "スコープ境界",
+        ]
+        assert document.footer.startswith("---")
+        assert "_Total tokens" not in document.fragments[-1].markdown
+
+    def test_hash_is_normalized(self):
+        [original] = split_fragments("## A\n\nsome text\n").fragments
+        [reflowed] = split_fragments("##  A\n\nsome   text\n\n").fragments
+        [edited] = split_fragments("## A\n\nother text\n").fragments
+
+        assert section_hash(original.section) == section_hash(reflowed.section)
+        assert original.key != edited.key
+
+    def test_heading_without_text_stays_in_previous_fragment(self):
+        assert split_fragments("## \n\ntext\n").fragments == ()
+
+        document = split_fragments("## A\n\nx\n\n## \n\ny\n\n### B\n\nz\n")
+
+        assert [f.section.heading for f in document.fragments] == ["A", "B"]
+        assert "y" in document.fragments[0].section.content
+        assert document.fragments[0].markdown.endswith("## \n\ny")
+
+    def test_split_transformed_requires_same_structure(self):
+        assert split_transformed("## A\n\nx\n\n## B\n\ny", 2) == ["## A\n\nx", "## B\n\ny"]
+        assert split_transformed("## A\n\nx and y", 2) is None
+        assert split_transformed("## A\n\nx\n\n## \n\ny", 2) is None
+
+
+class TestSectionDeltaPlan:
+    """Tests for plan_section_delta()."""
+
+    def test_only_changed_sections_are_missing(self, tmp_path: Path):
+        cache = LLMTransformCache(tmp_path / "cache.json")
+        fragments = split_fragments(SPEC).fragments
+        store_section_transforms(cache, fragments, [f"T{i}" for i in range(len(fragments))])
+
+        plan = plan_section_delta(SPEC.replace("Python 3.11", "Python 3.12"), cache)
+
+        assert plan.is_partial
+        assert plan.missing == (3,)
+        assert plan.assemble(["NEW"]).startswith("T0\n\nT1\n\nT2\n\nNEW\n\nT4\n\n---")
+
+
+class TestEngineDeltaTransform:
+    """AsyncTransformEngine sends only the changed sections of a spec.md extract."""
+
+    def test_incremental_update_sends_changed_section(self, tmp_path: Path):
+        cache = LLMTransformCache(tmp_path / "cache.json")
+        client = _client()
+        engine = AsyncTransformEngine(client=client, cache=cache)
+
+        first = asyncio.run(engine._transform_spec(SPEC))
+        changed = SPEC.replace("ユーザーはログアウトできます。", "ユーザーはいつでもログアウトできます。")
+        second = asyncio.run(engine._transform_spec(changed))
+
+        assert client.messages.create.await_count == 2
+        assert _sent_headings(client) == ["ログアウト"]
+        assert second.transformed_content.count("変換済み") == 5
+        assert "いつでもログアウト" in second.transformed_content
+        assert second.transformed_content.endswith("_Total tokens: 42_")
+        # Unchanged sections are spliced from the first (whole-document) result
+        assert first.transformed_content.split("\n\n### ログアウト")[0] in second.transformed_content
+        assert (engine.delta_stats.delta_documents, engine.delta_stats.sections_reused) == (1, 4)
+
+    def test_heading_without_text_in_source_and_output(self, tmp_path: Path):
+        """An empty heading neither breaks section seeding nor the delta of the next run."""
+        spec = SPEC.replace("## 前提条件", "## \n\n## 前提条件")
+
+        async def create(**kwargs: Any) -> MagicMock:
+            extract = kwargs["messages"][0]["content"].split("**Specification extract:**\n", 1)[1]
+            response = MagicMock()
+            # The model drops the text of one heading
+            response.content = [MagicMock(text=_rewrite(extract).replace("### ログアウト", "### "))]
+            return response
+
+        cache = LLMTransformCache(tmp_path / "cache.json")
+        client = MagicMock()
+        client.messages.create = AsyncMock(side_effect=create)
+        engine = AsyncTransformEngine(client=client, cache=cache)
+
+        result = asyncio.run(engine._transform_spec(spec))
+        asyncio.run(engine._transform_spec(spec.replace("Python 3.11", "Python 3.12")))
+
+        assert "変換済み" in result.transformed_content
+        # The output did not split into the source sections: nothing was seeded, no delta
+        assert engine.delta_stats.delta_documents == 0
+        assert client.messages.create.await_count == 2
+
+    def test_disabled(self, tmp_path: Path):
+        cache = LLMTransformCache(tmp_path / "cache.json")
+        client = _client()
+        engine = AsyncTransformEngine(client=client, cache=cache, section_delta=False)
+
+        asyncio.run(engine._transform_spec(SPEC))
+        asyncio.run(engine._transform_spec(SPEC.replace("3.11", "3.12")))
+
+        assert len(_sent_headings(client)) == 5
+        assert engine.delta_stats.sections_sent == 0
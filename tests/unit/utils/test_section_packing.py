@@ -0,0 +1,113 @@
+"""Unit tests for token-budget packing of prioritized sections (section_packing.py)."""
+
+import itertools
+import random
+
+import pytest
+
+from speckit_docs.llm_entities import LLMSection, PrioritizedSection
+from speckit_docs.utils.section_packing import linear_priority_value, pack_sections
+
+
+def _ps(heading: str, priority: int, tokens: int) -> PrioritizedSection:
+    section = LLMSection(file="README.md", heading=heading, level="h2", content=heading, token_count=tokens)
+    return PrioritizedSection(section=section, priority=priority, reason="test")
+
+
+def _headings(sections: list[PrioritizedSection]) -> list[str]:
+    return [ps.section.heading for ps in sections]
+
+
+# A large mid-priority section crowds out several smaller ones under greedy packing
+CROWDED = [
+    _ps("## Overview", 1, 1000),
+    _ps("## Architecture", 2, 6000),
+    _ps("## Install", 3, 4000),
+    _ps("## Usage", 4, 4000),
+    _ps("## License", 5, 500),
+]
+
+
+class TestPackSections:
+    """Tests for pack_sections()."""
+
+    def test_everything_fits(self):
+        result = pack_sections(CROWDED, token_budget=20000)
+
+        assert _headings(result.included) == _headings(CROWDED)
+        assert result.excluded == []
+        assert result.used_tokens == 15500
+
+    def test_optimal_beats_greedy(self):
+        greedy = pack_sections(CROWDED, token_budget=10000, strategy="greedy")
+        optimal = pack_sections(CROWDED, token_budget=10000)
+
+        assert _headings(greedy.included) == ["## Overview", "## Architecture", "## License"]
+        assert greedy.value == 10
+        assert _headings(optimal.included) == ["## Overview", "## Install", "## Usage", "## License"]
+        assert optimal.value == 11
+        assert optimal.used_tokens == 9500
+        assert _headings(optimal.excluded) == ["## Architecture"]
+
+    def test_ties_prefer_higher_priority(self):
+        # {1, 2} and {1, 3, 4} are both worth 7
+        sections = [_ps("## A", 1, 1000), _ps("## B", 2, 6000), _ps("## C", 3, 4000), _ps("## D", 4, 4000)]
+
+        result = pack_sections(sections, token_budget=10000)
+
+        assert _headings(result.included) == ["## A", "## B"]
+
+    def test_section_larger_than_budget_is_excluded(self):
+        result = pack_sections([_ps("## Huge", 1, 12000), _ps("## Small", 2, 10)], token_budget=10000)
+
+        assert _headings(result.included) == ["## Small"]
+
+    def test_matches_brute_force(self):
+        rng = random.Random(7)
+        for _ in range(30):
+            sections = [_ps(f"## S{i}", i + 1, rng.randint(0, 4000)) for i in range(8)]
+            budget = rng.randint(1000, 12000)
+
+            result = pack_sections(sections, token_budget=budget)
+
+            best = max(
+                sum(linear_priority_value(ps.priority, 8) for ps in subset)
+                for r in range(9)
+                for subset in itertools.combinations(sections, r)
+                if sum(ps.section.token_count for ps in subset) <= budget
+            )
+            assert result.value == best
+            assert result.used_tokens <= budget
+
+    def test_negative_budget(self):
+        with pytest.raises(ValueError):
+            pack_sections(CROWDED, token_budget=-1)
+
+
+class TestFinalizeSectionPriority:
+    """T068 integration uses the packing engine."""
+
+    def test_utilization_and_document_order(self):
+        from speckit_docs.utils.llm_transform import finalize_section_priority
+
+        sections = [ps.section for ps in CROWDED]
+        ranked = [CROWDED[4], CROWDED[0], CROWDED[2], CROWDED[3], CROWDED[1]]
+
+        by_priority = finalize_section_priority(ranked, sections)
+        in_document_order = finalize_section_priority(
+            [_ps(h, p, t) for h, p, t in [("## Usage", 1, 4000), ("## Overview", 2, 1000)]],
+            sections,
+            preserve_order=True,
+        )
+
+        assert _headings(by_priority.prioritized_sections) == [
+            "## Overview",
+            "## Install",
+            "## Usage",
+            "## License",
+        ]
+        assert by_priority.included_tokens == 9500
+        assert by_priority.utilization == pytest.approx(0.95)
+        assert _headings(in_document_order.prioritized_sections) == ["## Overview", "## Usage"]
+        assert in_document_order.total_sections == 5
+        assert len(in_document_order.excluded_sections) == 3
@@ -205,13 +205,14 @@ def test_spec_extraction_result_token_count():
     assert result.total_token_count <= 10000
 
     # 抽出されたコンテンツの総文字数とトークン数の関係
-    # （推定: 1トークン ≈ 4文字）
-    total_chars = (
-        sum(len(p.purpose_text) for p in result.user_story_purposes)
-        + len(result.prerequisites)
-        + len(result.scope_boundaries)
+    # （推定: 英数字は1トークン ≈ 4文字、日本語は1トークン ≈ 1文字）
+    text = (
+        "".join(p.purpose_text for p in result.user_story_purposes)
+        + result.prerequisites
+        + result.scope_boundaries
     )
-    estimated_tokens = total_chars / 4
+    ascii_chars = sum(1 for c in text if c.isascii())
+    estimated_tokens = ascii_chars / 4 + (len(text) - ascii_chars)
 
     # トークン数が推定値の50%-150%の範囲内
     assert estimated_tokens * 0.5 <= result.total_token_count <= estimated_tokens * 1.5
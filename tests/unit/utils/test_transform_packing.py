@@ -0,0 +1,192 @@
+"""Unit tests for cross-feature packing of spec.md transforms (transform_packing.py)."""
+
+import re
+import shutil
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+from speckit_docs.models import Feature, FeatureStatus
+from speckit_docs.utils.cache import LLMTransformCache
+from speckit_docs.utils.llm_engine import run_transform_engine
+from speckit_docs.utils.llm_transform import estimate_token_count
+from speckit_docs.utils.transform_packing import (
+    SPEC_PACK_TRANSFORM_PROMPT,
+    TransformPackStats,
+    build_packed_transform_request,
+    is_packable,
+    pack_timeout_seconds,
+    plan_transform_packs,
+    split_packed_response,
+)
+
+VALID_SPEC = Path(__file__).parents[2] / "fixtures" / "sample_specs" / "valid_spec.md"
+
+TRANSFORMED = "## 概要\n\nこの機能を使うと、コマンドを一つ実行するだけでドキュメントを簡単に作成できます（{key}）。"
+
+
+def _feature(specs_dir: Path, dir_name: str) -> Feature:
+    feature_dir = specs_dir / dir_name
+    feature_dir.mkdir(parents=True)
+    shutil.copy(VALID_SPEC, feature_dir / "spec.md")
+    feature_id, name = dir_name.split("-", 1)
+    return Feature(
+        id=feature_id,
+        name=name,
+        directory_path=feature_dir,
+        spec_file=feature_dir / "spec.md",
+        status=FeatureStatus.DRAFT,
+    )
+
+
+def _client(drop: str | None = None, short: str | None = None) -> MagicMock:
+    """Stand-in for the LLM answering packed and single transforms.
+
+    ``drop`` leaves a key out of packed responses; ``short`` answers a key
+    with a part failing the T069 quality check.
+    """
+
+    async def create(**kwargs: Any) -> MagicMock:
+        content = kwargs["messages"][0]["content"]
+        keys = re.findall(r'<document key="([^"]*)">', content)
+        if keys:
+            text = "\n\n".join(
+                f'<document key="{key}">\n{"短い" if key == short else TRANSFORMED.format(key=key)}\n</document>'
+                for key in keys
+                if key != drop
+            )
+        else:
+            text = TRANSFORMED.format(key="single")
+        response = MagicMock()
+        response.content = [MagicMock(text=text)]
+        return response
+
+    client = MagicMock()
+    client.messages.create = AsyncMock(side_effect=create)
+    return client
+
+
+def _packed_calls(client: MagicMock) -> int:
+    return sum(
+        call.kwargs["system"][0]["text"] == SPEC_PACK_TRANSFORM_PROMPT
+        for call in client.messages.create.call_args_list
+    )
+
+
+class TestPlanTransformPacks:
+    """Tests for plan_transform_packs() and is_packable()."""
+
+    def test_budget_and_order(self):
+        jobs = [(f"{i:03d}-f", "本文" * 200) for i in range(5)]
+        per_job = estimate_token_count('<document key="000-f">\n' + "本文" * 200 + "\n</document>")
+        overhead = estimate_token_count(SPEC_PACK_TRANSFORM_PROMPT)
+
+        packs = plan_transform_packs(jobs, token_budget=overhead + 2 * per_job + 50)
+
+        assert [[key for key, _ in pack] for pack in packs] == [
+            ["000-f", "001-f"],
+            ["002-f", "003-f"],
+            ["004-f"],
+        ]
+
+    def test_max_documents(self):
+        jobs = [(f"{i}", "x") for i in range(5)]
+
+        assert [len(pack) for pack in plan_transform_packs(jobs, max_documents=2)] == [2, 2, 1]
+
+    def test_is_packable(self):
+        assert is_packable("短い抽出")
+        assert not is_packable("x" * 10000, token_limit=1000)
+
+
+class TestSplitPackedResponse:
+    """Tests for split_packed_response()."""
+
+    def test_round_trip(self):
+        params = build_packed_transform_request([("001-a", "# A"), ("002-b", "# B")])
+        content = params["messages"][0]["content"]
+        text = 'Sure.\n<document key="002-b">\n## B\n</document>\n<document key="001-a">\n## A\n</document>'
+
+        assert '<document key="001-a">\n# A\n</document>' in content
+        assert split_packed_response(text, ["001-a", "002-b"]) == {"001-a": "## A", "002-b": "## B"}
+
+    def test_unclean_splits(self):
+        keys = ["001-a", "002-b"]
+
+        # Missing key, duplicated key, unknown key, empty document, truncated output
+        assert split_packed_response('<document key="001-a">A</document>', keys) is None
+        assert split_packed_response('<document key="001-a">A</document>' * 2, keys) is None
+        assert split_packed_response(
+            '<document key="001-a">A</document><document key="002-b">B</document><document key="003">C</document>', keys
+        ) is None
+        assert split_packed_response('<document key="001-a"> </document><document key="002-b">B</document>', keys) is None
+        assert split_packed_response('<document key="001-a">A</document><document key="002-b">B', keys) is None
+
+
+class TestEnginePacking:
+    """AsyncTransformEngine packs small spec.md transforms across features."""
+
+    def test_small_extracts_share_one_request(self, tmp_path: Path):
+        client = _client()
+        stats = TransformPackStats()
+        features = [_feature(tmp_path, f"{i:03d}-spec") for i in range(1, 4)]
+
+        result = run_transform_engine(features, client=client, pack_stats=stats)
+
+        assert client.messages.create.await_count == 1
+        assert list(result) == ["001-spec", "002-spec", "003-spec"]
+        assert result["002-spec"]["spec_content"] == TRANSFORMED.format(key="002-spec")
+        assert (stats.packed_requests, stats.packed_documents, stats.fallback_documents) == (1, 3, 0)
+
+    def test_unclean_split_falls_back_to_single_requests(self, tmp_path: Path):
+        client = _client(drop="002-spec")
+        stats = TransformPackStats()
+        features = [_feature(tmp_path, f"{i:03d}-spec") for i in range(1, 4)]
+
+        result = run_transform_engine(features, client=client, pack_stats=stats)
+
+        assert client.messages.create.await_count == 4
+        assert {content["spec_content"] for content in result.values()} == {TRANSFORMED.format(key="single")}
+        assert (stats.packed_documents, stats.fallback_documents) == (0, 3)
+
+    def test_failed_part_is_retried_alone(self, tmp_path: Path):
+        client = _client(short="002-spec")
+        stats = TransformPackStats()
+        features = [_feature(tmp_path, f"{i:03d}-spec") for i in range(1, 4)]
+
+        result = run_transform_engine(features, client=client, pack_stats=stats)
+
+        assert client.messages.create.await_count == 2
+        assert result["001-spec"]["spec_content"] == TRANSFORMED.format(key="001-spec")
+        assert result["002-spec"]["spec_content"] == TRANSFORMED.format(key="single")
+        assert (stats.packed_documents, stats.fallback_documents) == (2, 1)
+
+    def test_timeout_grows_with_max_tokens(self, tmp_path: Path):
+        client = _client()
+        features = [_feature(tmp_path, f"{i:03d}-spec") for i in range(1, 4)]
+
+        run_transform_engine(features, client=client)
+
+        [call] = client.messages.create.call_args_list
+        assert call.kwargs["timeout"] == pack_timeout_seconds(call.kwargs["max_tokens"])
+        assert pack_timeout_seconds(8192) > 2 * pack_timeout_seconds(256)
+
+    def test_packed_results_are_cached(self, tmp_path: Path):
+        cache = LLMTransformCache(tmp_path / "cache.json")
+        features = [_feature(tmp_path / "specs", f"{i:03d}-spec") for i in range(1, 3)]
+        run_transform_engine(features, client=_client(), cache=cache)
+
+        client = _client()
+        result = run_transform_engine(features, client=client, cache=cache)
+
+        client.messages.create.assert_not_called()
+        assert result["001-spec"]["spec_content"] == TRANSFORMED.format(key="001-spec")
+
+    def test_disabled(self, tmp_path: Path):
+        client = _client()
+        features = [_feature(tmp_path, f"{i:03d}-spec") for i in range(1, 4)]
+
+        run_transform_engine(features, client=client, pack=False)
+
+        assert client.messages.create.await_count == 3
+        assert _packed_calls(client) == 0